@@ -0,0 +1,59 @@
+"""Risk snapshots - persisted fleet risk scores.
+
+Revision ID: 002_risk_snapshots
+Revises: 001_initial
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "002_risk_snapshots"
+down_revision: str | None = "001_initial"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # --- risk_snapshots ---
+    op.create_table(
+        "risk_snapshots",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("cluster_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("hosts_scored", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_risk", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("average_risk", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("by_level", sa.JSON(), nullable=False, server_default=sa.text("'{}'")),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["cluster_id"], ["clusters.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_risk_snapshots_cluster_id", "risk_snapshots", ["cluster_id"])
+    op.create_index("ix_risk_snapshots_created_at", "risk_snapshots", ["created_at"])
+
+    # --- risk_snapshot_entries ---
+    op.create_table(
+        "risk_snapshot_entries",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("snapshot_id", sa.Integer(), nullable=False),
+        sa.Column("host_id", sa.Integer(), nullable=True),
+        sa.Column("target", sa.String(255), nullable=False),
+        sa.Column("risk_score", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("risk_level", sa.String(20), nullable=False),
+        sa.Column("max_severity", sa.String(20), nullable=False),
+        sa.Column("factor_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("factor_counts", sa.JSON(), nullable=False, server_default=sa.text("'{}'")),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["snapshot_id"], ["risk_snapshots.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["host_id"], ["hosts.id"], ondelete="SET NULL"),
+    )
+    op.create_index("ix_risk_snapshot_entries_snapshot_score", "risk_snapshot_entries", ["snapshot_id", "risk_score"])
+    op.create_index("ix_risk_snapshot_entries_snapshot_level", "risk_snapshot_entries", ["snapshot_id", "risk_level"])
+
+
+def downgrade() -> None:
+    op.drop_table("risk_snapshot_entries")
+    op.drop_table("risk_snapshots")
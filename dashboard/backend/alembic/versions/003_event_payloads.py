@@ -0,0 +1,32 @@
+"""Event payloads - spill table for the LISTEN/NOTIFY event bus.
+
+Revision ID: 003_event_payloads
+Revises: 002_risk_snapshots
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "003_event_payloads"
+down_revision: str | None = "002_risk_snapshots"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_payloads",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("payload", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_event_payloads_created_at", "event_payloads", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("event_payloads")
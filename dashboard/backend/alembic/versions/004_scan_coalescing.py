@@ -0,0 +1,35 @@
+"""Scan coalescing - link duplicate scan requests to the scan that ran.
+
+Revision ID: 004_scan_coalescing
+Revises: 003_event_payloads
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "004_scan_coalescing"
+down_revision: str | None = "003_event_payloads"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("scans") as batch_op:
+        batch_op.add_column(sa.Column("coalesced_into_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_scans_coalesced_into_id", "scans", ["coalesced_into_id"], ["id"], ondelete="SET NULL"
+        )
+    op.create_index("ix_scans_coalesced_into_id", "scans", ["coalesced_into_id"])
+    op.create_index("ix_scans_host_scanner_status", "scans", ["host_id", "scanner", "status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scans_host_scanner_status", table_name="scans")
+    op.drop_index("ix_scans_coalesced_into_id", table_name="scans")
+    with op.batch_alter_table("scans") as batch_op:
+        batch_op.drop_constraint("fk_scans_coalesced_into_id", type_="foreignkey")
+        batch_op.drop_column("coalesced_into_id")
@@ -0,0 +1,64 @@
+"""Scan campaigns - selector-based batch scans and host selector indexes.
+
+Revision ID: 005_scan_campaigns
+Revises: 004_scan_coalescing
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "005_scan_campaigns"
+down_revision: str | None = "004_scan_coalescing"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "scan_campaigns",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(255), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("scanner", sa.String(50), nullable=False),
+        sa.Column("profile", sa.String(100), nullable=True),
+        sa.Column("selector", sa.JSON(), nullable=False),
+        sa.Column("rate_per_minute", sa.Integer(), nullable=False),
+        sa.Column("max_concurrency", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("total_hosts", sa.Integer(), nullable=False),
+        sa.Column("dispatched", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_scan_campaigns_status", "scan_campaigns", ["status"])
+
+    with op.batch_alter_table("scans") as batch_op:
+        batch_op.add_column(sa.Column("campaign_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_scans_campaign_id", "scan_campaigns", ["campaign_id"], ["id"], ondelete="SET NULL"
+        )
+    op.create_index("ix_scans_campaign_id", "scans", ["campaign_id"])
+
+    op.create_index("ix_hosts_cluster_namespace", "hosts", ["cluster_id", "k8s_namespace"])
+    op.create_index("ix_hosts_os_family", "hosts", ["os_family"])
+    op.create_index("ix_hosts_host_type", "hosts", ["host_type"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_hosts_host_type", table_name="hosts")
+    op.drop_index("ix_hosts_os_family", table_name="hosts")
+    op.drop_index("ix_hosts_cluster_namespace", table_name="hosts")
+    op.drop_index("ix_scans_campaign_id", table_name="scans")
+    with op.batch_alter_table("scans") as batch_op:
+        batch_op.drop_constraint("fk_scans_campaign_id", type_="foreignkey")
+        batch_op.drop_column("campaign_id")
+    op.drop_index("ix_scan_campaigns_status", table_name="scan_campaigns")
+    op.drop_table("scan_campaigns")
@@ -0,0 +1,33 @@
+"""Leader leases - elect the replica that runs the scheduler.
+
+Revision ID: 006_leader_leases
+Revises: 005_scan_campaigns
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "006_leader_leases"
+down_revision: str | None = "005_scan_campaigns"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "leader_leases",
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("holder", sa.String(255), nullable=False),
+        sa.Column("acquired_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("renewed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("name"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("leader_leases")
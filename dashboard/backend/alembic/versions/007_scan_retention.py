@@ -0,0 +1,81 @@
+"""Scan retention - created_at index and range-partitioned scan_results.
+
+On PostgreSQL ``scan_results`` becomes a table partitioned by RANGE
+(scan_id) so retention can drop whole partitions of expired findings
+instead of deleting them row by row. Other databases only get the index.
+
+Revision ID: 007_scan_retention
+Revises: 006_leader_leases
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+from app.config import get_settings
+
+revision: str = "007_scan_retention"
+down_revision: str | None = "006_leader_leases"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_COLUMNS = """
+    id INTEGER NOT NULL DEFAULT nextval('scan_results_id_seq'),
+    scan_id INTEGER NOT NULL REFERENCES scans (id) ON DELETE CASCADE,
+    rule_id VARCHAR(100) NOT NULL,
+    title VARCHAR(500) NOT NULL,
+    description TEXT,
+    severity VARCHAR(20) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    category VARCHAR(100),
+    remediation TEXT,
+    "references" JSON NOT NULL DEFAULT '[]'
+"""
+
+
+def _rename_old_table() -> None:
+    op.execute("ALTER TABLE scan_results RENAME TO scan_results_old")
+    op.execute("ALTER INDEX ix_scan_results_scan_id RENAME TO ix_scan_results_old_scan_id")
+    op.execute("ALTER INDEX ix_scan_results_rule_id RENAME TO ix_scan_results_old_rule_id")
+    op.execute("ALTER TABLE scan_results_old RENAME CONSTRAINT scan_results_pkey TO scan_results_old_pkey")
+    # Keep the id sequence alive when the old table is dropped
+    op.execute("ALTER SEQUENCE scan_results_id_seq OWNED BY NONE")
+
+
+def _finish_copy() -> None:
+    op.execute("INSERT INTO scan_results SELECT * FROM scan_results_old")
+    op.execute("ALTER SEQUENCE scan_results_id_seq OWNED BY scan_results.id")
+    op.execute("DROP TABLE scan_results_old")
+    op.create_index("ix_scan_results_scan_id", "scan_results", ["scan_id"])
+    op.create_index("ix_scan_results_rule_id", "scan_results", ["rule_id"])
+
+
+def upgrade() -> None:
+    op.create_index("ix_scans_created_at", "scans", ["created_at"])
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    span = max(get_settings().scan_results_partition_span, 1)
+    _rename_old_table()
+    op.execute(f"CREATE TABLE scan_results ({_COLUMNS}, PRIMARY KEY (id, scan_id)) PARTITION BY RANGE (scan_id)")
+    op.execute("CREATE TABLE scan_results_default PARTITION OF scan_results DEFAULT")
+
+    newest = op.get_bind().execute(sa.text("SELECT COALESCE(MAX(id), 0) FROM scans")).scalar()
+    for low in range(0, (newest // span + 2) * span, span):
+        op.execute(
+            f"CREATE TABLE scan_results_p{low} PARTITION OF scan_results FOR VALUES FROM ({low}) TO ({low + span})"
+        )
+    _finish_copy()
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _rename_old_table()
+        op.execute(f"CREATE TABLE scan_results ({_COLUMNS}, PRIMARY KEY (id))")
+        _finish_copy()
+
+    op.drop_index("ix_scans_created_at", table_name="scans")
@@ -0,0 +1,102 @@
+"""Rule catalog - move repeated rule text out of scan_results.
+
+Creates ``rules`` keyed by (scanner, rule_id), fills it from the existing
+findings and replaces the rule text on ``scan_results`` with a catalog id
+plus a title override kept only where it differs from the catalog title.
+Severity and category stay on ``scan_results``: rule ids such as Lynis'
+positional LYNIS-SUGG-0001 do not pin them down.
+
+Revision ID: 008_rule_catalog
+Revises: 007_scan_retention
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "008_rule_catalog"
+down_revision: str | None = "007_scan_retention"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_TEXT_COLUMNS = ("rule_id", "title", "description", "remediation", "references")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "rules",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("scanner", sa.String(50), nullable=False),
+        sa.Column("rule_id", sa.String(200), nullable=False),
+        sa.Column("title", sa.String(500), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("remediation", sa.Text(), nullable=True),
+        sa.Column("references", sa.JSON(), nullable=False, server_default=sa.text("'[]'")),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("scanner", "rule_id", name="uq_rules_scanner_rule_id"),
+    )
+
+    # One catalog row per (scanner, rule_id) seen so far
+    op.execute(
+        """
+        INSERT INTO rules (scanner, rule_id, title, description, remediation)
+        SELECT s.scanner, r.rule_id, MIN(r.title), MIN(r.description), MIN(r.remediation)
+        FROM scan_results r JOIN scans s ON s.id = r.scan_id
+        GROUP BY s.scanner, r.rule_id
+        """
+    )
+
+    op.add_column("scan_results", sa.Column("catalog_id", sa.Integer(), nullable=True))
+    op.add_column("scan_results", sa.Column("detail", sa.String(500), nullable=True))
+    op.execute(
+        """
+        UPDATE scan_results SET catalog_id = (
+            SELECT ru.id FROM rules ru JOIN scans s ON s.scanner = ru.scanner
+            WHERE s.id = scan_results.scan_id AND ru.rule_id = scan_results.rule_id
+        )
+        """
+    )
+    op.execute(
+        """
+        UPDATE scan_results SET detail = title
+        WHERE title <> (SELECT ru.title FROM rules ru WHERE ru.id = scan_results.catalog_id)
+        """
+    )
+
+    op.drop_index("ix_scan_results_rule_id", table_name="scan_results")
+    with op.batch_alter_table("scan_results") as batch_op:
+        batch_op.alter_column("catalog_id", existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key("fk_scan_results_catalog_id", "rules", ["catalog_id"], ["id"])
+        for column in _TEXT_COLUMNS:
+            batch_op.drop_column(column)
+    op.create_index("ix_scan_results_catalog_id", "scan_results", ["catalog_id"])
+
+
+def downgrade() -> None:
+    op.add_column("scan_results", sa.Column("rule_id", sa.String(100), nullable=True))
+    op.add_column("scan_results", sa.Column("title", sa.String(500), nullable=True))
+    op.add_column("scan_results", sa.Column("description", sa.Text(), nullable=True))
+    op.add_column("scan_results", sa.Column("remediation", sa.Text(), nullable=True))
+    op.add_column("scan_results", sa.Column("references", sa.JSON(), nullable=False, server_default=sa.text("'[]'")))
+    op.execute(
+        """
+        UPDATE scan_results SET
+            rule_id = (SELECT ru.rule_id FROM rules ru WHERE ru.id = scan_results.catalog_id),
+            title = COALESCE(detail, (SELECT ru.title FROM rules ru WHERE ru.id = scan_results.catalog_id)),
+            description = (SELECT ru.description FROM rules ru WHERE ru.id = scan_results.catalog_id),
+            remediation = (SELECT ru.remediation FROM rules ru WHERE ru.id = scan_results.catalog_id)
+        """
+    )
+
+    op.drop_index("ix_scan_results_catalog_id", table_name="scan_results")
+    with op.batch_alter_table("scan_results") as batch_op:
+        for column in ("rule_id", "title"):
+            batch_op.alter_column(column, existing_type=sa.String(), nullable=False)
+        batch_op.drop_constraint("fk_scan_results_catalog_id", type_="foreignkey")
+        batch_op.drop_column("catalog_id")
+        batch_op.drop_column("detail")
+    op.create_index("ix_scan_results_rule_id", "scan_results", ["rule_id"])
+    op.drop_table("rules")
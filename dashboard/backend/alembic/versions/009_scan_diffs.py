@@ -0,0 +1,54 @@
+"""Scan diffs - failing findings new/resolved since the previous scan.
+
+Revision ID: 009_scan_diffs
+Revises: 008_rule_catalog
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "009_scan_diffs"
+down_revision: str | None = "008_rule_catalog"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("scans") as batch_op:
+        batch_op.add_column(sa.Column("previous_scan_id", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("findings_new", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("findings_resolved", sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column("findings_persisting", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_scans_previous_scan_id", "scans", ["previous_scan_id"], ["id"], ondelete="SET NULL"
+        )
+
+    op.create_table(
+        "scan_finding_changes",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("scan_id", sa.Integer(), nullable=False),
+        sa.Column("catalog_id", sa.Integer(), nullable=False),
+        sa.Column("detail", sa.String(500), nullable=True),
+        sa.Column("severity", sa.String(20), nullable=False),
+        sa.Column("category", sa.String(100), nullable=True),
+        sa.Column("change", sa.String(10), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.ForeignKeyConstraint(["scan_id"], ["scans.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["catalog_id"], ["rules.id"]),
+    )
+    op.create_index("ix_scan_finding_changes_scan_id", "scan_finding_changes", ["scan_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scan_finding_changes_scan_id", table_name="scan_finding_changes")
+    op.drop_table("scan_finding_changes")
+    with op.batch_alter_table("scans") as batch_op:
+        batch_op.drop_constraint("fk_scans_previous_scan_id", type_="foreignkey")
+        batch_op.drop_column("findings_persisting")
+        batch_op.drop_column("findings_resolved")
+        batch_op.drop_column("findings_new")
+        batch_op.drop_column("previous_scan_id")
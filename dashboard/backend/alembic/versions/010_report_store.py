@@ -0,0 +1,45 @@
+"""Report store - content-addressed, compressed scanner reports.
+
+Creates ``report_objects`` (one row per distinct report payload with the
+number of scans referencing it) and ``scans.report_digest``. Reports
+written before this revision keep their ``report_path`` files.
+
+Revision ID: 010_report_store
+Revises: 009_scan_diffs
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "010_report_store"
+down_revision: str | None = "009_scan_diffs"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "report_objects",
+        sa.Column("digest", sa.String(64), nullable=False),
+        sa.Column("encoding", sa.String(10), nullable=False),
+        sa.Column("media_type", sa.String(100), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("stored_size", sa.BigInteger(), nullable=False),
+        sa.Column("refcount", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("digest"),
+    )
+    with op.batch_alter_table("scans") as batch_op:
+        batch_op.add_column(sa.Column("report_digest", sa.String(64), nullable=True))
+    op.create_index("ix_scans_report_digest", "scans", ["report_digest"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scans_report_digest", table_name="scans")
+    with op.batch_alter_table("scans") as batch_op:
+        batch_op.drop_column("report_digest")
+    op.drop_table("report_objects")
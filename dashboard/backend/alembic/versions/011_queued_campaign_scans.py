@@ -0,0 +1,27 @@
+"""Queued campaign scans - own status for scans waiting on a campaign rollout.
+
+Campaign scans not yet started were stored as ``pending``, which let API
+requests attach to them. They now use ``queued``.
+
+Revision ID: 011_queued_campaign_scans
+Revises: 010_report_store
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "011_queued_campaign_scans"
+down_revision: str | None = "010_report_store"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE scans SET status = 'queued' WHERE campaign_id IS NOT NULL AND status = 'pending'")
+
+
+def downgrade() -> None:
+    op.execute("UPDATE scans SET status = 'pending' WHERE status = 'queued'")
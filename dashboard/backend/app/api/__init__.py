@@ -2,7 +2,20 @@
 
 from fastapi import APIRouter
 
-from app.api import auth, clusters, dashboard, health, hosts, notifications, scans, schedules, users, ws
+from app.api import (
+    archive,
+    auth,
+    campaigns,
+    clusters,
+    dashboard,
+    health,
+    hosts,
+    notifications,
+    scans,
+    schedules,
+    users,
+    ws,
+)
 
 api_router = APIRouter()
 
@@ -13,6 +26,8 @@
 api_router.include_router(hosts.router, prefix="/hosts", tags=["hosts"])
 api_router.include_router(scans.router, prefix="/scans", tags=["scans"])
 api_router.include_router(schedules.router, prefix="/schedules", tags=["schedules"])
+api_router.include_router(campaigns.router, prefix="/campaigns", tags=["campaigns"])
+api_router.include_router(archive.router, prefix="/archive", tags=["archive"])
 api_router.include_router(notifications.router, prefix="/notifications", tags=["notifications"])
 api_router.include_router(clusters.router, prefix="/clusters", tags=["clusters"])
 api_router.include_router(ws.router, tags=["websocket"])
@@ -0,0 +1,56 @@
+"""Archived scan history endpoints (cold storage written by retention)."""
+
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query, status
+
+from app.api.deps import CurrentUser
+from app.schemas import ArchivedScan, ArchiveSegment
+from app.services.archive import scan_archive
+
+router = APIRouter()
+
+
+@router.get("/segments", response_model=list[ArchiveSegment])
+async def list_segments(current_user: CurrentUser) -> list[dict]:
+    """List archive segments with their host, scanner and time-range index."""
+    return scan_archive.segments()
+
+
+@router.get("/scans", response_model=list[ArchivedScan])
+async def query_archived_scans(
+    current_user: CurrentUser,
+    host_id: int | None = None,
+    host: str | None = None,
+    scanner: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    include_results: bool = False,
+    limit: int = Query(100, ge=1, le=1000),
+) -> list[dict]:
+    """Query archived scans by host and time range, newest first.
+
+    Reads the matching segments from disk; nothing is loaded back into the
+    database.
+    """
+    return await scan_archive.query(
+        host_id=host_id,
+        host_name=host,
+        scanner=scanner,
+        since=since,
+        until=until,
+        limit=limit,
+        include_results=include_results,
+    )
+
+
+@router.get("/scans/{scan_id}", response_model=ArchivedScan)
+async def get_archived_scan(scan_id: int, current_user: CurrentUser) -> dict:
+    """Get one archived scan with its findings."""
+    record = await scan_archive.get_scan(scan_id)
+    if record is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Archived scan not found",
+        )
+    return record
@@ -6,7 +6,7 @@
 
 from app.api.deps import CurrentUser, DbSession
 from app.schemas import EmailUpdate, PasswordChange, RefreshTokenRequest, Token, UserCreate, UserLogin, UserResponse
-from app.services.auth import AuthService
+from app.services.auth import AuthService, invalidate_user
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
@@ -173,6 +173,7 @@ async def update_email(
     current_user.email = new_email
     await session.flush()
     await session.refresh(current_user)
+    invalidate_user(current_user.id, session)
     return {"message": "Email updated successfully", "email": current_user.email}
 
 
@@ -0,0 +1,124 @@
+"""Scan campaign endpoints (selector-based batch scans)."""
+
+from fastapi import APIRouter, HTTPException, status
+
+from app.api.deps import CurrentUser, DbSession, OperatorUser
+from app.schemas import CampaignCreate, CampaignProgress, CampaignResponse, CampaignSelector
+from app.services.campaign import CampaignService, compute_progress
+
+router = APIRouter()
+
+
+@router.get("", response_model=list[CampaignResponse])
+async def list_campaigns(
+    session: DbSession,
+    current_user: CurrentUser,
+    status_filter: str | None = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> list[CampaignResponse]:
+    """List campaigns with their aggregate progress."""
+    service = CampaignService(session)
+    campaigns = await service.get_all_campaigns(status=status_filter, limit=limit, offset=offset)
+    counts = await service.status_counts([c.id for c in campaigns])
+
+    result = []
+    for campaign in campaigns:
+        response = CampaignResponse.model_validate(campaign)
+        response.progress = CampaignProgress(**compute_progress(campaign, counts[campaign.id]))
+        result.append(response)
+    return result
+
+
+@router.post("/preview")
+async def preview_campaign(
+    selector: CampaignSelector,
+    session: DbSession,
+    current_user: CurrentUser,
+) -> dict:
+    """Count the hosts a selector would target without creating anything."""
+    host_ids = await CampaignService(session).resolve_hosts(selector)
+    return {"matched": len(host_ids), "host_ids": host_ids[:100]}
+
+
+@router.get("/{campaign_id}", response_model=CampaignResponse)
+async def get_campaign(
+    campaign_id: int,
+    session: DbSession,
+    current_user: CurrentUser,
+) -> CampaignResponse:
+    """Get a campaign with progress and ETA."""
+    service = CampaignService(session)
+    campaign = await service.get_campaign(campaign_id)
+
+    if not campaign:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Campaign not found",
+        )
+
+    response = CampaignResponse.model_validate(campaign)
+    response.progress = CampaignProgress(**await service.get_progress(campaign))
+    return response
+
+
+@router.post("", response_model=CampaignResponse, status_code=status.HTTP_201_CREATED)
+async def create_campaign(
+    campaign_data: CampaignCreate,
+    session: DbSession,
+    current_user: OperatorUser,
+) -> CampaignResponse:
+    """Queue a scan for every host matched by the selector.
+
+    Scans are started by the scheduler's campaign dispatcher within the
+    campaign's rate and concurrency limits; the first batch starts now.
+    """
+    service = CampaignService(session)
+    try:
+        campaign = await service.create_campaign(campaign_data, user_id=current_user.id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+    await session.commit()
+
+    from app.services.audit import log_action
+
+    await log_action(
+        session,
+        "campaign_created",
+        user_id=current_user.id,
+        username=current_user.username,
+        resource_type="campaign",
+        resource_id=str(campaign.id),
+        detail=f"scanner={campaign.scanner} hosts={campaign.total_hosts}",
+    )
+
+    await service.dispatch(campaign)
+    await session.commit()
+
+    response = CampaignResponse.model_validate(campaign)
+    response.progress = CampaignProgress(**await service.get_progress(campaign))
+    return response
+
+
+@router.post("/{campaign_id}/cancel", response_model=CampaignResponse)
+async def cancel_campaign(
+    campaign_id: int,
+    session: DbSession,
+    current_user: OperatorUser,
+) -> CampaignResponse:
+    """Cancel a running campaign, its queued scans and its running scans."""
+    service = CampaignService(session)
+    campaign = await service.cancel_campaign(campaign_id)
+
+    if not campaign:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Campaign not found or not running",
+        )
+
+    response = CampaignResponse.model_validate(campaign)
+    response.progress = CampaignProgress(**await service.get_progress(campaign))
+    return response
@@ -3,14 +3,16 @@
 import asyncio
 import logging
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
 
 from app.api.deps import AdminUser, CurrentUser, DbSession, OperatorUser
 from app.models import Cluster
+from app.responses import ORJSONResponse
 from app.schemas.cluster import ClusterCreate, ClusterResponse, ClusterTestResult, ClusterUpdate, DiscoveryResult
 from app.services.discovery import DiscoveryService
 from app.services.k8s_connector import K8sConnector
 from app.services.k8s_hardening import K8sHardeningScanner
+from app.services.rbac_graph import get_cluster_graph, invalidate_cluster_graph
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +82,7 @@ async def update_cluster(
     cluster = await svc.update_cluster(cluster_id, data)
     if not cluster:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cluster not found")
+    invalidate_cluster_graph(cluster_id)
     return ClusterResponse.model_validate(cluster)
 
 
@@ -94,6 +97,7 @@ async def delete_cluster(
     deleted = await svc.delete_cluster(cluster_id)
     if not deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cluster not found")
+    invalidate_cluster_graph(cluster_id)
 
 
 # ------------------------------------------------------------------
@@ -167,18 +171,41 @@ async def discover_cluster(
     return DiscoveryResult(**result)
 
 
+@router.get("/{cluster_id}/discovery-status", response_model=dict)
+async def get_discovery_status(
+    cluster_id: int,
+    session: DbSession,
+    current_user: CurrentUser,
+) -> dict:
+    """Background auto-discovery state for a cluster."""
+    from app.services.discovery_scheduler import discovery_scheduler
+
+    svc = DiscoveryService(session)
+    cluster = await svc.get_cluster_by_id(cluster_id)
+    if not cluster:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cluster not found")
+
+    state = discovery_scheduler.get_status(cluster_id)
+    return {
+        "cluster_id": cluster_id,
+        "auto_discover": cluster.auto_discover,
+        "scheduled": state is not None,
+        **(state or {}),
+    }
+
+
 # ------------------------------------------------------------------
 # K8s Hardening Scan
 # ------------------------------------------------------------------
 
 
-@router.post("/{cluster_id}/hardening-scan", response_model=dict)
+@router.post("/{cluster_id}/hardening-scan", response_model=dict, response_class=ORJSONResponse)
 async def run_hardening_scan(
     cluster_id: int,
     session: DbSession,
     current_user: OperatorUser,
     namespace: str | None = None,
-) -> dict:
+) -> ORJSONResponse:
     """Run Kubernetes hardening checks against the cluster."""
     svc = DiscoveryService(session)
     cluster = await svc.get_cluster_by_id(cluster_id)
@@ -192,7 +219,7 @@ async def run_hardening_scan(
 
     scan_ns = namespace or cluster.k8s_namespace
     result = await asyncio.to_thread(_run_k8s_hardening, cluster, scan_ns)
-    return result
+    return ORJSONResponse(result)
 
 
 def _run_k8s_hardening(cluster: Cluster, namespace: str | None) -> dict:
@@ -217,17 +244,91 @@ def _run_k8s_hardening(cluster: Cluster, namespace: str | None) -> dict:
         return {"success": False, "error": str(e)}
 
 
+# ------------------------------------------------------------------
+# RBAC analysis
+# ------------------------------------------------------------------
+
+
+@router.get("/{cluster_id}/rbac/who-can", response_model=dict)
+async def rbac_who_can(
+    cluster_id: int,
+    session: DbSession,
+    current_user: OperatorUser,
+    verb: str,
+    resource: str,
+    namespace: str | None = None,
+    api_group: str = "",
+    resource_name: str | None = None,
+    refresh: bool = False,
+) -> dict:
+    """List subjects that can perform ``verb`` on ``resource`` (cluster-wide or in a namespace)."""
+    cluster = await _get_k8s_cluster(session, cluster_id)
+    graph = await asyncio.to_thread(get_cluster_graph, cluster, refresh)
+    subjects = graph.who_can(verb, resource, namespace=namespace, api_group=api_group, resource_name=resource_name)
+    return {
+        "verb": verb,
+        "resource": resource,
+        "namespace": namespace,
+        "api_group": api_group,
+        "count": len(subjects),
+        "subjects": subjects,
+    }
+
+
+@router.get("/{cluster_id}/rbac/permissions", response_model=dict)
+async def rbac_effective_permissions(
+    cluster_id: int,
+    session: DbSession,
+    current_user: OperatorUser,
+    kind: str,
+    name: str,
+    namespace: str | None = None,
+    refresh: bool = False,
+) -> dict:
+    """Effective permissions of a User, Group or ServiceAccount."""
+    cluster = await _get_k8s_cluster(session, cluster_id)
+    graph = await asyncio.to_thread(get_cluster_graph, cluster, refresh)
+    rules = graph.effective_permissions(kind, name, namespace=namespace)
+    return {"kind": kind, "name": name, "namespace": namespace, "count": len(rules), "rules": rules}
+
+
+@router.get("/{cluster_id}/rbac/privileged", response_model=list[dict])
+async def rbac_privileged_subjects(
+    cluster_id: int,
+    session: DbSession,
+    current_user: OperatorUser,
+    refresh: bool = False,
+) -> list[dict]:
+    """Subjects with wildcard, escalate, bind or impersonate permissions."""
+    cluster = await _get_k8s_cluster(session, cluster_id)
+    graph = await asyncio.to_thread(get_cluster_graph, cluster, refresh)
+    return graph.privileged_subjects()
+
+
+async def _get_k8s_cluster(session: DbSession, cluster_id: int) -> Cluster:
+    svc = DiscoveryService(session)
+    cluster = await svc.get_cluster_by_id(cluster_id)
+    if not cluster:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cluster not found")
+    if cluster.cluster_type != "kubernetes":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="RBAC analysis is only supported for Kubernetes clusters",
+        )
+    return cluster
+
+
 # ------------------------------------------------------------------
 # Cluster hosts listing
 # ------------------------------------------------------------------
 
 
-@router.get("/{cluster_id}/hosts", response_model=list[dict])
+@router.get("/{cluster_id}/hosts", response_model=list[dict], response_class=ORJSONResponse)
 async def list_cluster_hosts(
     cluster_id: int,
     session: DbSession,
     current_user: CurrentUser,
-) -> list[dict]:
+) -> ORJSONResponse:
     """List all hosts belonging to a cluster."""
     from sqlalchemy import select
 
@@ -240,24 +341,26 @@ async def list_cluster_hosts(
 
     result = await session.execute(select(Host).where(Host.cluster_id == cluster_id).order_by(Host.name))
     hosts = result.scalars().all()
-    return [
-        {
-            "id": h.id,
-            "name": h.name,
-            "display_name": h.display_name,
-            "host_type": h.host_type,
-            "status": h.status,
-            "os_family": h.os_family,
-            "k8s_namespace": h.k8s_namespace,
-            "k8s_pod_name": h.k8s_pod_name,
-            "k8s_node_name": h.k8s_node_name,
-            "container_image": h.container_image,
-            "container_runtime": h.container_runtime,
-            "security_context": h.security_context,
-            "last_scan_score": h.last_scan_score,
-        }
-        for h in hosts
-    ]
+    return ORJSONResponse(
+        [
+            {
+                "id": h.id,
+                "name": h.name,
+                "display_name": h.display_name,
+                "host_type": h.host_type,
+                "status": h.status,
+                "os_family": h.os_family,
+                "k8s_namespace": h.k8s_namespace,
+                "k8s_pod_name": h.k8s_pod_name,
+                "k8s_node_name": h.k8s_node_name,
+                "container_image": h.container_image,
+                "container_runtime": h.container_runtime,
+                "security_context": h.security_context,
+                "last_scan_score": h.last_scan_score,
+            }
+            for h in hosts
+        ]
+    )
 
 
 # ------------------------------------------------------------------
@@ -315,7 +418,7 @@ def _run_podman_drift(cluster: Cluster, host_data: list[dict]) -> dict:
     from app.services.drift_detector import DriftDetector
 
     try:
-        podman_client = DiscoveryService._get_podman_client(cluster)
+        podman_client = DiscoveryService.get_podman_client(cluster)
         detector = DriftDetector(podman_client=podman_client)
         result = detector.detect_podman_drift(host_data)
         podman_client.close()
@@ -342,7 +445,7 @@ def _run_k8s_drift(cluster: Cluster, namespace: str | None) -> dict:
         # Try to get podman client on same node for runtime inspect
         podman_client = None
         if cluster.podman_host:
-            podman_client = DiscoveryService._get_podman_client(cluster)
+            podman_client = DiscoveryService.get_podman_client(cluster)
 
         detector = DriftDetector(connector=connector, podman_client=podman_client)
         result = detector.detect_k8s_pod_drift(namespace=namespace)
@@ -401,37 +504,86 @@ async def check_images(
 # ------------------------------------------------------------------
 
 
-@router.post("/{cluster_id}/risk-score", response_model=dict)
+@router.post("/{cluster_id}/risk-score", response_model=dict, response_class=ORJSONResponse)
 async def calculate_risk_scores(
     cluster_id: int,
     session: DbSession,
     current_user: OperatorUser,
-) -> dict:
-    """Calculate risk scores for all hosts in a cluster."""
-    from sqlalchemy import select
-
-    from app.models import Host
-    from app.services.risk_scorer import RiskScorer
+    top_n: int = Query(20, ge=1, le=200),
+) -> ORJSONResponse:
+    """Score all hosts in a cluster and store the result as a risk snapshot."""
+    from app.services.risk_snapshot import RiskSnapshotService, entry_to_dict, snapshot_to_dict
 
     svc = DiscoveryService(session)
     cluster = await svc.get_cluster_by_id(cluster_id)
     if not cluster:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Cluster not found")
 
-    result = await session.execute(select(Host).where(Host.cluster_id == cluster_id))
-    hosts = result.scalars().all()
+    risk_svc = RiskSnapshotService(session)
+    snapshot, _ = await risk_svc.create_snapshot(cluster_id)
+    _, top = await risk_svc.get_entries(snapshot.id, limit=top_n)
 
-    host_data = [
+    return ORJSONResponse(
         {
-            "name": h.name,
-            "host_type": h.host_type,
-            "container_image": h.container_image or "",
-            "security_context": h.security_context,
-            "k8s_namespace": h.k8s_namespace,
-            "k8s_labels": h.k8s_labels,
+            "success": True,
+            **snapshot_to_dict(snapshot),
+            "top_risks": [entry_to_dict(e) for e in top],
         }
-        for h in hosts
-    ]
+    )
+
+
+@router.get("/{cluster_id}/risk-score", response_model=dict, response_class=ORJSONResponse)
+async def get_risk_scores(
+    cluster_id: int,
+    session: DbSession,
+    current_user: CurrentUser,
+    level: str | None = Query(None, pattern="^(critical|high|medium|low|info)$"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+) -> ORJSONResponse:
+    """Page through the latest risk snapshot of a cluster without recomputing it."""
+    from app.services.risk_snapshot import RiskSnapshotService, snapshot_to_dict
+
+    risk_svc = RiskSnapshotService(session)
+    snapshot = await risk_svc.get_latest_snapshot(cluster_id)
+    if not snapshot:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No risk snapshot for this cluster")
+
+    page = await risk_svc.get_entries_page(snapshot.id, level=level, limit=limit, offset=offset)
+    return ORJSONResponse({**snapshot_to_dict(snapshot), **page})
 
-    scorer = RiskScorer()
-    return scorer.score_hosts(host_data)
+
+@router.get("/{cluster_id}/risk-snapshots", response_model=list[dict])
+async def list_risk_snapshots(
+    cluster_id: int,
+    session: DbSession,
+    current_user: CurrentUser,
+    limit: int = Query(20, ge=1, le=100),
+) -> list[dict]:
+    """List stored risk snapshots for a cluster, newest first."""
+    from app.services.risk_snapshot import RiskSnapshotService, snapshot_to_dict
+
+    snapshots = await RiskSnapshotService(session).list_snapshots(cluster_id, limit=limit)
+    return [snapshot_to_dict(s) for s in snapshots]
+
+
+@router.get("/{cluster_id}/risk-snapshots/{snapshot_id}", response_model=dict, response_class=ORJSONResponse)
+async def get_risk_snapshot(
+    cluster_id: int,
+    snapshot_id: int,
+    session: DbSession,
+    current_user: CurrentUser,
+    level: str | None = Query(None, pattern="^(critical|high|medium|low|info)$"),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+) -> ORJSONResponse:
+    """Page through a specific stored risk snapshot."""
+    from app.services.risk_snapshot import RiskSnapshotService, snapshot_to_dict
+
+    risk_svc = RiskSnapshotService(session)
+    snapshot = await risk_svc.get_snapshot(cluster_id, snapshot_id)
+    if not snapshot:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Risk snapshot not found")
+
+    page = await risk_svc.get_entries_page(snapshot.id, level=level, limit=limit, offset=offset)
+    return ORJSONResponse({**snapshot_to_dict(snapshot), **page})
@@ -1,18 +1,24 @@
 """Dashboard aggregation endpoints."""
 
+import hashlib
 import logging
 import socket
+import time
 from datetime import UTC, datetime, timedelta
 
 import httpx
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
 from sqlalchemy import func, select
 from sqlalchemy.orm import selectinload
 
 from app.api.deps import CurrentUser, DbSession
-from app.models import Host, Scan, ScanSchedule
+from app.config import get_settings
+from app.http_cache import REVALIDATE, not_modified
+from app.models import Host, Rule, Scan, ScanSchedule
 from app.models.scan import ScanResult
+from app.responses import ORJSONResponse
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -144,20 +150,30 @@ async def _get_severity_breakdown(session, since):
 
 async def _get_top_failing_rules(session, since):
     """Fetch top 20 failing rules."""
-    query = (
-        select(
-            ScanResult.rule_id,
-            ScanResult.title,
-            ScanResult.severity,
-            ScanResult.category,
-            Scan.scanner,
-            func.count(ScanResult.id).label("occurrence_count"),
-        )
+    # Rank on integer catalog ids plus the per-finding columns, then fetch
+    # the text of the 20 winners. A catalog id alone would merge distinct
+    # findings sharing a positional rule id (e.g. LYNIS-SUGG-0001).
+    group = (ScanResult.catalog_id, ScanResult.detail, ScanResult.severity, ScanResult.category)
+    top = (
+        select(*group, func.count(ScanResult.id).label("occurrence_count"))
         .join(Scan, ScanResult.scan_id == Scan.id)
         .where(Scan.created_at >= since, Scan.status == "completed", ScanResult.status == "fail")
-        .group_by(ScanResult.rule_id, ScanResult.title, ScanResult.severity, ScanResult.category, Scan.scanner)
+        .group_by(*group)
         .order_by(func.count(ScanResult.id).desc())
         .limit(20)
+        .subquery()
+    )
+    query = (
+        select(
+            Rule.rule_id,
+            func.coalesce(top.c.detail, Rule.title).label("title"),
+            top.c.severity,
+            top.c.category,
+            Rule.scanner,
+            top.c.occurrence_count,
+        )
+        .join(top, top.c.catalog_id == Rule.id)
+        .order_by(top.c.occurrence_count.desc())
     )
     result = await session.execute(query)
     return [
@@ -337,14 +353,50 @@ async def _get_falco_events():
     return falco_events
 
 
-@router.get("/stats")
+async def _stats_etag(session, days: float, hours: int | None) -> str:
+    """ETag of the dashboard stats from the rollup version of their tables.
+
+    The version is the row count and latest ``updated_at`` of hosts, scans
+    and schedules, so any insert, update or delete changes it. Windows are
+    relative to now and Falco data is live, so the tag also changes every
+    DASHBOARD_ETAG_SECONDS; it is weak because those parts may differ
+    within one period.
+    """
+    version = (
+        await session.execute(
+            select(
+                *(
+                    subquery
+                    for model in (Host, Scan, ScanSchedule)
+                    for subquery in (
+                        select(func.count()).select_from(model).scalar_subquery(),
+                        select(func.max(model.updated_at)).scalar_subquery(),
+                    )
+                )
+            )
+        )
+    ).one()
+    period = int(time.time() // max(settings.dashboard_etag_seconds, 1))
+    key = repr((tuple(version), days, hours, period)).encode()
+    return f'W/"stats-{hashlib.sha256(key).hexdigest()[:20]}"'
+
+
+@router.get("/stats", response_model=dict, response_class=ORJSONResponse)
 async def get_dashboard_stats(
     session: DbSession,
     current_user: CurrentUser,
+    request: Request,
     days: float = 30,
     hours: int | None = None,
-) -> dict:
-    """Get aggregated dashboard statistics."""
+) -> Response:
+    """Get aggregated dashboard statistics.
+
+    Polls sending the previous ETag in ``If-None-Match`` get a 304 without
+    any aggregation while the rollup version is unchanged.
+    """
+    etag = await _stats_etag(session, days, hours)
+    if response := not_modified(request, etag, REVALIDATE):
+        return response
 
     # --- Host stats ---
     host_query = select(Host).where(Host.is_active == True)  # noqa: E712
@@ -374,31 +426,34 @@ async def get_dashboard_stats(
     scan_activity = await _get_scan_activity(session, since)
     falco_events = await _get_falco_events()
 
-    return {
-        "hostname": socket.gethostname(),
-        "summary": {
-            "total_hosts": total_hosts,
-            "online_hosts": online_hosts,
-            "offline_hosts": offline_hosts,
-            "scanning_hosts": scanning_hosts,
-            "total_scans": total_scans,
-            "avg_score": avg_score,
-            "avg_duration": avg_duration,
-            "active_schedules": active_schedules,
-            "total_findings": total_findings,
-            "failed_findings": failed_findings,
+    return ORJSONResponse(
+        {
+            "hostname": socket.gethostname(),
+            "summary": {
+                "total_hosts": total_hosts,
+                "online_hosts": online_hosts,
+                "offline_hosts": offline_hosts,
+                "scanning_hosts": scanning_hosts,
+                "total_scans": total_scans,
+                "avg_score": avg_score,
+                "avg_duration": avg_duration,
+                "active_schedules": active_schedules,
+                "total_findings": total_findings,
+                "failed_findings": failed_findings,
+            },
+            "score_distribution": score_distribution,
+            "scans_by_status": scans_by_status,
+            "scans_by_scanner": scans_by_scanner,
+            "score_trend": score_trend,
+            "scanner_comparison": scanner_comparison,
+            "findings_by_severity": findings_by_severity,
+            "findings_by_status": findings_by_status,
+            "top_failing_rules": top_failing_rules,
+            "host_scores": host_scores,
+            "recent_scans": recent_scans,
+            "upcoming_scans": upcoming_scans,
+            "scan_activity": scan_activity,
+            "falco_events": falco_events,
         },
-        "score_distribution": score_distribution,
-        "scans_by_status": scans_by_status,
-        "scans_by_scanner": scans_by_scanner,
-        "score_trend": score_trend,
-        "scanner_comparison": scanner_comparison,
-        "findings_by_severity": findings_by_severity,
-        "findings_by_status": findings_by_status,
-        "top_failing_rules": top_failing_rules,
-        "host_scores": host_scores,
-        "recent_scans": recent_scans,
-        "upcoming_scans": upcoming_scans,
-        "scan_activity": scan_activity,
-        "falco_events": falco_events,
-    }
+        headers={"ETag": etag, "Cache-Control": REVALIDATE},
+    )
@@ -29,7 +29,7 @@ async def get_current_user(
         )
 
     auth_service = AuthService(session)
-    user = await auth_service.get_user_by_id(token_data.user_id)
+    user = await auth_service.get_current_user(token_data.user_id)
 
     if user is None:
         raise HTTPException(
@@ -4,6 +4,7 @@
 from pydantic import BaseModel
 from sqlalchemy import text
 
+from app.api.deps import CurrentUser
 from app.config import get_settings
 
 router = APIRouter()
@@ -27,6 +28,19 @@ class ReadinessResponse(BaseModel):
     scheduler: str
 
 
+class LeaderResponse(BaseModel):
+    """Scheduler leadership as seen by this replica."""
+
+    role: str
+    identity: str
+    backend: str
+    is_leader: bool
+    leader_since: str | None
+    leader: str | None
+    lease_renewed_at: str | None
+    lease_expires_at: str | None
+
+
 @router.get("/health", response_model=HealthResponse)
 async def health_check() -> HealthResponse:
     """Health check endpoint with database connectivity verification."""
@@ -63,8 +77,15 @@ async def readiness_check() -> ReadinessResponse:
     except Exception:
         db_status = "unhealthy"
 
-    # Check scheduler
-    scheduler_status = "healthy" if scheduler_service.scheduler.running else "stopped"
+    # Check scheduler (followers keep it stopped until elected)
+    from app.services.leader import scheduler_leader
+
+    if scheduler_service.scheduler.running:
+        scheduler_status = "healthy"
+    elif settings.leader_election_enabled and settings.scheduler_enabled and not scheduler_leader.is_leader:
+        scheduler_status = "standby"
+    else:
+        scheduler_status = "stopped"
 
     overall_status = "ready" if db_status == "healthy" else "not_ready"
 
@@ -73,3 +94,11 @@ async def readiness_check() -> ReadinessResponse:
         database=db_status,
         scheduler=scheduler_status,
     )
+
+
+@router.get("/leader", response_model=LeaderResponse)
+async def leader_status(current_user: CurrentUser) -> LeaderResponse:
+    """Which replica currently runs the scheduler, and whether it is this one."""
+    from app.services.leader import scheduler_leader
+
+    return LeaderResponse(**await scheduler_leader.describe())
@@ -5,6 +5,7 @@
 from app.api.deps import AdminUser, CurrentUser, DbSession, OperatorUser
 from app.schemas import HostCreate, HostResponse, HostUpdate
 from app.services.host import HostService
+from app.services.host_status import HostStatusRefresher
 
 router = APIRouter()
 
@@ -120,6 +121,16 @@ async def check_host_status(
     return {"host_id": host_id, "status": status_result}
 
 
+@router.post("/refresh-status", response_model=dict)
+async def refresh_host_statuses(
+    session: DbSession,
+    current_user: OperatorUser,
+) -> dict:
+    """Refresh the status of all active hosts in one pass."""
+    refresher = HostStatusRefresher(session)
+    return await refresher.refresh_all()
+
+
 @router.post("/sync-podman", response_model=list[HostResponse])
 async def sync_podman_containers(
     session: DbSession,
@@ -1,5 +1,7 @@
 """Notification settings and test endpoints."""
 
+import asyncio
+
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
@@ -49,7 +51,8 @@ async def test_notification(current_user: CurrentUser) -> dict:
     if not settings.smtp_user or not settings.smtp_password:
         raise HTTPException(status_code=400, detail="SMTP credentials not configured")
 
-    success = send_scan_notification(
+    success = await asyncio.to_thread(
+        send_scan_notification,
         host_name="test-host",
         scanner="test",
         status="completed",
@@ -1,18 +1,47 @@
 """Scan management endpoints."""
 
+import asyncio
 import csv
 import io
 import json
+from collections.abc import AsyncIterator
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from fastapi.responses import FileResponse, StreamingResponse
 
 from app.api.deps import CurrentUser, DbSession, OperatorUser
-from app.schemas import ScanCreate, ScanResponse, ScanSummary
-from app.services.scan import ScanService
+from app.http_cache import IMMUTABLE, REVALIDATE, byte_range, not_modified
+from app.models import Scan
+from app.schemas import FindingChange, ScanCreate, ScanDiffResponse, ScanResponse, ScanSummary
+from app.schemas.scan import ScanResultResponse
+from app.services.diff import ScanDiffService, diff_summary
+from app.services.report_store import EXTENSIONS, report_store
+from app.services.scan import ACTIVE_STATUSES, ScanService
+from app.services.scan_stream import format_sse, scan_tails
 
 router = APIRouter()
 
+# Seconds between SSE keep-alive comments while a scan is quiet
+SSE_HEARTBEAT_SECONDS = 15
+
+
+def _scan_etag(scan: Scan, variant: str, source: Scan | None = None) -> str:
+    """Strong ETag of one representation of a scan's output.
+
+    ``source`` is the scan the findings come from when ``scan`` was
+    coalesced into another one.
+    """
+    scans = (scan,) if source is None or source is scan else (scan, source)
+    versions = "-".join(
+        f"{s.id}-{s.status}-{int(s.completed_at.timestamp() * 1_000_000) if s.completed_at else 0}" for s in scans
+    )
+    return f'"scan-{versions}-{variant}"'
+
+
+def _scan_cache_control(scan: Scan) -> str:
+    finished = scan.status not in ACTIVE_STATUSES and scan.completed_at is not None
+    return IMMUTABLE if finished else REVALIDATE
+
 
 @router.get("", response_model=list[ScanSummary])
 async def list_scans(
@@ -49,6 +78,8 @@ async def list_scans(
             started_at=scan.started_at,
             completed_at=scan.completed_at,
             duration_seconds=scan.duration_seconds,
+            findings_new=scan.findings_new,
+            findings_resolved=scan.findings_resolved,
         )
         result.append(summary)
 
@@ -72,7 +103,56 @@ async def get_scan(
             detail="Scan not found",
         )
 
-    return ScanResponse.model_validate(scan)
+    response = ScanResponse.model_validate(scan)
+    # Coalesced requests share the findings of the scan that actually ran
+    if scan.coalesced_into_id and not scan.results:
+        parent = await scan_service.get_scan_by_id(scan.coalesced_into_id, include_results=True)
+        if parent:
+            response.results = [ScanResultResponse.model_validate(r) for r in parent.results]
+    return response
+
+
+@router.get("/{scan_id}/diff", response_model=ScanDiffResponse)
+async def get_scan_diff(
+    scan_id: int,
+    session: DbSession,
+    current_user: CurrentUser,
+    include_persisting: bool = False,
+) -> ScanDiffResponse:
+    """What changed since the previous completed scan of the same host, scanner and profile.
+
+    The diff is computed once when the scan completes; this only reads it.
+    """
+    scan_service = ScanService(session)
+    scan = await scan_service.get_scan_by_id(scan_id)
+
+    if not scan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scan not found",
+        )
+    # Coalesced requests report the diff of the scan that actually ran
+    if scan.coalesced_into_id:
+        scan = await scan_service.get_scan_by_id(scan.coalesced_into_id) or scan
+
+    summary = diff_summary(scan)
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Scan has no diff (not completed)",
+        )
+
+    changes = await ScanDiffService(session).get_changes(scan, include_persisting=include_persisting)
+    return ScanDiffResponse(
+        scan_id=scan_id,
+        previous_scan_id=summary["previous_scan_id"],
+        new=summary["new"],
+        resolved=summary["resolved"],
+        persisting=summary["persisting"],
+        new_findings=[FindingChange.model_validate(c) for c in changes["new"]],
+        resolved_findings=[FindingChange.model_validate(c) for c in changes["resolved"]],
+        persisting_findings=[FindingChange.model_validate(c) for c in changes["persisting"]],
+    )
 
 
 @router.post("", response_model=ScanResponse, status_code=status.HTTP_201_CREATED)
@@ -80,16 +160,26 @@ async def create_scan(
     scan_data: ScanCreate,
     session: DbSession,
     current_user: OperatorUser,
+    response: Response,
 ) -> ScanResponse:
-    """Create and start a new scan."""
+    """Create and start a new scan.
+
+    An identical host/scanner/profile request that is already pending or
+    running (or completed within SCAN_REUSE_WINDOW) is returned instead of
+    starting another scan; ``X-Scan-Coalesced`` is then ``attached`` or
+    ``reused``.
+    """
     scan_service = ScanService(session)
 
     # Create scan and commit so background task can see it
-    scan = await scan_service.create_scan(scan_data, user_id=current_user.id)
+    scan, coalesced = await scan_service.get_or_create_scan(scan_data, user_id=current_user.id)
     await session.commit()
 
     from app.services.audit import log_action
 
+    detail = f"scanner={scan_data.scanner} host_id={scan_data.host_id}"
+    if coalesced:
+        detail += f" coalesced={coalesced}"
     await log_action(
         session,
         "scan_started",
@@ -97,12 +187,15 @@ async def create_scan(
         username=current_user.username,
         resource_type="scan",
         resource_id=str(scan.id),
-        detail=f"scanner={scan_data.scanner} host_id={scan_data.host_id}",
+        detail=detail,
     )
 
-    # Start scan immediately
-    await scan_service.start_scan(scan.id)
-    await session.commit()
+    if coalesced:
+        response.headers["X-Scan-Coalesced"] = coalesced
+    else:
+        # Start scan immediately
+        await scan_service.start_scan(scan.id)
+        await session.commit()
 
     # Refresh to get updated status with results eagerly loaded
     scan = await scan_service.get_scan_by_id(scan.id, include_results=True)
@@ -154,9 +247,16 @@ async def get_scan_report(
     scan_id: int,
     session: DbSession,
     current_user: CurrentUser,
+    request: Request,
     format: str = "html",
-) -> FileResponse:
-    """Download scan report."""
+) -> Response:
+    """Download scan report.
+
+    Stored reports are sent compressed with ``Content-Encoding`` when the
+    client accepts the stored encoding, otherwise decompressed on the fly.
+    Responses carry a strong ETag (the content hash for stored reports),
+    answer ``If-None-Match`` with 304 and serve single ``Range`` requests.
+    """
     scan_service = ScanService(session)
     scan = await scan_service.get_scan_by_id(scan_id)
 
@@ -166,17 +266,57 @@ async def get_scan_report(
             detail="Scan not found",
         )
 
+    digest = scan.report_digest
+    if digest is None and scan.coalesced_into_id is not None:
+        parent = await scan_service.get_scan_by_id(scan.coalesced_into_id)
+        digest = parent.report_digest if parent else None
+    report = await report_store.get(session, digest) if digest else None
+
+    cache_control = _scan_cache_control(scan)
     if format == "html" and scan.html_report_path:
-        return FileResponse(
+        etag = _scan_etag(scan, "html")
+        # FileResponse handles Range / If-Range itself
+        return not_modified(request, etag, cache_control) or FileResponse(
             scan.html_report_path,
             media_type="text/html",
             filename=f"scan_{scan_id}_report.html",
+            headers={"ETag": etag, "Cache-Control": cache_control},
+        )
+    elif report is not None:
+        passthrough = _accepts_encoding(request.headers.get("accept-encoding", ""), report.encoding)
+        etag = f'"{report.digest}.{report.encoding}"' if passthrough else f'"{report.digest}"'
+        if response := not_modified(request, etag, cache_control):
+            return response
+
+        headers = {
+            "Content-Disposition": f'attachment; filename="scan_{scan_id}_report.{EXTENSIONS.get(report.media_type, "txt")}"',
+            "Vary": "Accept-Encoding",
+            "ETag": etag,
+            "Cache-Control": cache_control,
+            "Accept-Ranges": "bytes",
+        }
+        if passthrough:
+            headers["Content-Encoding"] = report.encoding
+        # Ranges apply to the representation sent: compressed bytes or plain text
+        size = report.stored_size if passthrough else report.size
+        start, end = byte_range(request, etag, size) or (0, size)
+        headers["Content-Length"] = str(end - start)
+        partial = end - start != size
+        if partial:
+            headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+        return StreamingResponse(
+            report_store.stream(report, decompress=not passthrough, start=start, end=end),
+            status_code=status.HTTP_206_PARTIAL_CONTENT if partial else status.HTTP_200_OK,
+            media_type=report.media_type,
+            headers=headers,
         )
     elif scan.report_path:
-        return FileResponse(
+        etag = _scan_etag(scan, "report")
+        return not_modified(request, etag, cache_control) or FileResponse(
             scan.report_path,
             media_type="application/xml",
             filename=f"scan_{scan_id}_report.xml",
+            headers={"ETag": etag, "Cache-Control": cache_control},
         )
     else:
         raise HTTPException(
@@ -185,16 +325,90 @@ async def get_scan_report(
         )
 
 
+def _accepts_encoding(header: str, encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows ``encoding`` (q=0 refuses it)."""
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() not in (encoding, "*"):
+            continue
+        quality = params.strip().removeprefix("q=").strip()
+        try:
+            return not quality or float(quality) > 0
+        except ValueError:
+            return False
+    return False
+
+
+@router.get("/{scan_id}/stream")
+async def stream_scan_output(
+    scan_id: int,
+    request: Request,
+    session: DbSession,
+    current_user: CurrentUser,
+) -> StreamingResponse:
+    """Tail a running scan as Server-Sent Events.
+
+    Events: ``line`` (one line of scanner output, starting with recent
+    backlog), ``progress`` (same body as the ``scan_progress`` WebSocket
+    event) and a final ``done`` with the scan status. Scans that are not
+    running in this process get a single ``done`` event.
+    """
+    scan_service = ScanService(session)
+    scan = await scan_service.get_scan_by_id(scan_id)
+
+    if not scan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Scan not found",
+        )
+
+    return StreamingResponse(
+        _tail_events(scan_id, scan.status, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _tail_events(scan_id: int, scan_status: str, request: Request) -> AsyncIterator[str]:
+    subscription = scan_tails.subscribe(scan_id)
+    if subscription is None:
+        yield format_sse("done", {"scan_id": scan_id, "status": scan_status})
+        return
+
+    backlog, progress, queue = subscription
+    try:
+        for line in backlog:
+            yield format_sse("line", {"line": line})
+        if progress:
+            yield format_sse("progress", progress)
+        while not await request.is_disconnected():
+            try:
+                event, data = await asyncio.wait_for(queue.get(), timeout=SSE_HEARTBEAT_SECONDS)
+            except TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_sse(event, data)
+            if event == "done":
+                break
+    finally:
+        scan_tails.unsubscribe(scan_id, queue)
+
+
 @router.get("/{scan_id}/export")
 async def export_scan_results(
     scan_id: int,
     session: DbSession,
     current_user: CurrentUser,
+    request: Request,
     format: str = "csv",
 ):
-    """Export scan results as CSV or JSON."""
+    """Export scan results as CSV or JSON.
+
+    A matching ``If-None-Match`` is answered with 304 before any finding
+    is loaded.
+    """
     scan_service = ScanService(session)
-    scan = await scan_service.get_scan_by_id(scan_id, include_results=True)
+    scan = await scan_service.get_scan_by_id(scan_id)
 
     if not scan:
         raise HTTPException(
@@ -202,8 +416,20 @@ async def export_scan_results(
             detail="Scan not found",
         )
 
+    # Coalesced requests export the findings of the scan that actually ran
+    source = scan
+    if scan.coalesced_into_id is not None:
+        source = await scan_service.get_scan_by_id(scan.coalesced_into_id) or scan
+
+    etag = _scan_etag(scan, "json" if format == "json" else "csv", source)
+    cache_control = _scan_cache_control(scan)
+    if response := not_modified(request, etag, cache_control):
+        return response
+    cache_headers = {"ETag": etag, "Cache-Control": cache_control}
+    await session.refresh(source, ["results"])
+
     results_data = []
-    for r in scan.results or []:
+    for r in source.results or []:
         results_data.append(
             {
                 "rule_id": r.rule_id,
@@ -230,7 +456,7 @@ async def export_scan_results(
         return StreamingResponse(
             io.BytesIO(content.encode("utf-8")),
             media_type="application/json",
-            headers={"Content-Disposition": f"attachment; filename=scan_{scan_id}_results.json"},
+            headers={"Content-Disposition": f"attachment; filename=scan_{scan_id}_results.json", **cache_headers},
         )
 
     # Default: CSV
@@ -242,5 +468,5 @@ async def export_scan_results(
     return StreamingResponse(
         io.BytesIO(output.getvalue().encode("utf-8")),
         media_type="text/csv",
-        headers={"Content-Disposition": f"attachment; filename=scan_{scan_id}_results.csv"},
+        headers={"Content-Disposition": f"attachment; filename=scan_{scan_id}_results.csv", **cache_headers},
     )
@@ -6,7 +6,7 @@
 from app.api.deps import AdminUser, DbSession
 from app.models import User
 from app.schemas import UserCreate, UserResponse
-from app.services.auth import AuthService
+from app.services.auth import AuthService, invalidate_user
 
 router = APIRouter()
 
@@ -73,6 +73,7 @@ async def delete_user(
         )
 
     await session.delete(user)
+    invalidate_user(user_id, session)
 
 
 @router.patch("/{user_id}/role", response_model=UserResponse)
@@ -102,6 +103,7 @@ async def update_user_role(
     user.role = new_role
     await session.flush()
     await session.refresh(user)
+    invalidate_user(user_id, session)
     return UserResponse.model_validate(user)
 
 
@@ -129,4 +131,5 @@ async def toggle_user_active(
     user.is_active = not user.is_active
     await session.flush()
     await session.refresh(user)
+    invalidate_user(user_id, session)
     return UserResponse.model_validate(user)
@@ -1,5 +1,6 @@
 """WebSocket endpoint for real-time scan notifications."""
 
+import json
 import logging
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
@@ -16,17 +17,44 @@ async def scan_notifications(websocket: WebSocket):
     """WebSocket endpoint for receiving scan status updates.
 
     Messages are JSON objects with fields:
-      - type: "scan_started" | "scan_completed" | "scan_failed"
+      - type: "scan_started" | "scan_progress" | "scan_completed" | "scan_failed" | "scan_cancelled"
       - scan_id: int
       - scanner: str (optional)
-      - host_name: str (optional)
+      - host_id / host_name / cluster_id (optional)
       - score: int (optional, on completion)
       - error: str (optional, on failure)
+
+    Clients may narrow what they receive by sending
+    ``{"action": "subscribe", "types": [...], "scanners": [...],
+    "hosts": [...], "clusters": [...]}``; omitted filters match anything
+    and ``{"action": "unsubscribe"}`` clears all filters. Invalid filters
+    are answered with ``{"type": "error", "message": ...}`` and leave the
+    current ones in place. Any other text (e.g. pings) is ignored.
     """
     await ws_manager.connect(websocket)
     try:
         while True:
-            # Keep connection alive; client can send ping/pong
-            await websocket.receive_text()
+            text = await websocket.receive_text()
+            try:
+                data = json.loads(text)
+            except ValueError:
+                continue
+            if not isinstance(data, dict):
+                continue
+            action = data.get("action")
+            if action == "subscribe":
+                try:
+                    subscription = ws_manager.subscribe(websocket, data)
+                except ValueError as e:
+                    ws_manager.send_to(websocket, {"type": "error", "message": str(e)})
+                    continue
+            elif action == "unsubscribe":
+                subscription = ws_manager.subscribe(websocket, {})
+            else:
+                continue
+            if subscription is not None:
+                ws_manager.send_to(websocket, {"type": "subscribed", "filters": subscription.to_dict()})
     except WebSocketDisconnect:
+        pass
+    finally:
         ws_manager.disconnect(websocket)
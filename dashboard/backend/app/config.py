@@ -28,11 +28,19 @@ class Settings(BaseSettings):
     host: str = "0.0.0.0"  # nosec B104
     port: int = 8000
 
+    # Response compression (brotli when the brotli package is installed, else gzip)
+    response_compression_min_size: int = 1024  # bytes; 0 disables compression
+    response_gzip_level: int = 6
+    response_brotli_quality: int = 4
+    dashboard_etag_seconds: int = 10  # max age of a dashboard stats ETag (bounds staleness of live Falco data)
+
     # Security
     secret_key: str = Field(default="")
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    user_cache_ttl: float = 30.0  # seconds an authenticated user row is reused (0 disables)
+    bcrypt_workers: int = 2  # threads hashing/verifying passwords off the event loop
 
     # CORS
     cors_origins: list[str] = [
@@ -70,14 +78,86 @@ class Settings(BaseSettings):
     smtp_password: str = ""
     smtp_from: str = ""
     notification_email: str = ""
+    smtp_starttls: bool = True
+    smtp_timeout: float = 30.0  # seconds per SMTP command
+    smtp_idle_timeout: float = 60.0  # seconds an unused SMTP session is kept open
+    notification_digest_window: float = 60.0  # seconds scans are collected into one email per recipient
+    notification_queue_size: int = 10000
 
     # Scanning
     reports_dir: str = "./reports"
     scan_timeout: int = 600  # 10 minutes
+    scan_timeouts: dict[str, int] = {}  # per-scanner overrides, e.g. {"openscap": 1800}
+    scan_coalesce_enabled: bool = True  # attach duplicate host/scanner/profile requests to the active scan
+    scan_reuse_window: int = 0  # seconds a completed scan is reused for identical requests (0 = never)
+    scan_progress_interval: float = 1.0  # min seconds between scan_progress events per scan
+    scan_tail_backlog: int = 500  # output lines replayed to a new SSE tail subscriber
+
+    # Scan retention (0 days = keep forever)
+    scan_retention_days: int = 30
+    scan_retention_scanners: dict[str, int] = {}  # per-scanner days, e.g. {"trivy": 7}
+    scan_retention_hosts: dict[str, int] = {}  # per-host days by host name; wins over scanner policies
+    retention_batch_size: int = 500  # scans deleted per transaction
+    retention_results_batch: int = 5000  # findings deleted per statement
+    retention_batch_pause: float = 0.5  # seconds between batches
+    scan_results_partition_span: int = 10000  # scan ids per scan_results partition (PostgreSQL)
+    scan_archive_enabled: bool = True  # archive expired scans under reports_dir/archive before deleting them
+    scan_archive_compression: str = "gzip"  # gzip or zstd (needs the zstandard package)
+    report_store_compression: str = "gzip"  # scanner reports under reports_dir/objects: gzip or zstd
+    report_store_grace: int = 3600  # seconds a stored report file is kept before it must be referenced by a scan
+
+    # Scan campaigns (selector-based batch scans)
+    campaign_tick_seconds: int = 5  # how often the dispatcher starts queued campaign scans
+    campaign_default_rate: int = 30  # scans started per minute when a campaign sets none (0 = unlimited)
+    campaign_default_concurrency: int = 10  # running scans per campaign when it sets none
+
+    # Risk scoring
+    risk_snapshot_retention: int = 10  # snapshots kept per cluster
+
+    # RBAC analysis
+    rbac_graph_ttl: int = 300  # seconds a loaded RBAC graph is reused
 
     # Scheduler
     scheduler_enabled: bool = True
     scheduler_timezone: str = "UTC"
+    scheduler_jitter_window: int = 300  # seconds schedules sharing a cron are spread over (capped at half the period)
+    scheduler_max_running_scans: int = 20  # scheduled and campaign scans wait while this many scans are running
+    scheduler_sync_interval: int = 30  # seconds between reloads of schedules edited on other replicas
+    scheduler_admission_poll: float = 5.0  # seconds between admission checks while at capacity
+
+    # Leader election (only the leader replica runs the scheduler)
+    leader_election_enabled: bool = True
+    leader_lease_ttl: int = 15  # seconds a lease stays valid without renewal (SQLite backend)
+    leader_renew_interval: int = 5  # seconds between renew / takeover attempts
+
+    # Background discovery (clusters with auto_discover)
+    discovery_enabled: bool = True
+    discovery_tick_seconds: int = 30
+    discovery_default_interval: int = 600
+    discovery_min_interval: int = 120
+    discovery_max_interval: int = 3600
+    discovery_jitter: float = 0.2  # +/- fraction of the interval
+    discovery_max_concurrency: int = 4
+    discovery_timeout: int = 300  # per cluster, seconds
+
+    # Host status refresh
+    host_status_refresh_interval: int = 300  # seconds, 0 disables the scheduled refresh
+    host_status_ssh_concurrency: int = 32
+
+    # WebSocket notifications
+    event_bus_backend: Literal["auto", "memory", "postgres"] = "auto"  # auto: LISTEN/NOTIFY on PostgreSQL
+    event_bus_channel: str = "scan_events"
+    event_spill_retention: int = 300  # seconds spilled large event payloads are kept
+    ws_message_queue_size: int = 10000  # events waiting for the broadcast worker
+    ws_client_queue_size: int = 256  # pending messages per client before the oldest is dropped
+    ws_send_timeout: float = 5.0  # seconds; slower clients are disconnected
+
+    # Audit log
+    audit_mode: Literal["batched", "sync"] = "batched"  # sync: write every entry inside its request
+    audit_batch_size: int = 500  # entries per multi-row insert
+    audit_flush_interval: float = 1.0  # seconds a partial batch waits before it is written
+    audit_queue_size: int = 10000  # queued entries before log_action falls back to a synchronous write
+    audit_durable_actions: list[str] = ["user_registered", "user_login", "password_changed"]
 
     # Admin seeding
     admin_default_password: str = ""
@@ -0,0 +1,60 @@
+"""HTTP validators: ETags, conditional GET and byte ranges."""
+
+from fastapi import HTTPException, Request, Response, status
+
+# Completed scans never change; everything else must be revalidated
+IMMUTABLE = "private, max-age=31536000, immutable"
+REVALIDATE = "private, no-cache"
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    wanted = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == wanted for tag in if_none_match.split(","))
+
+
+def not_modified(request: Request, etag: str, cache_control: str) -> Response | None:
+    """A 304 response when the client already holds ``etag``, else None."""
+    if request.method in ("GET", "HEAD") and etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, "Cache-Control": cache_control}
+        )
+    return None
+
+
+def byte_range(request: Request, etag: str, size: int) -> tuple[int, int] | None:
+    """The single byte range requested, as (start, end exclusive).
+
+    Returns None for a full response: no Range header, an If-Range that
+    no longer matches ``etag``, several ranges or a malformed header.
+    Raises 416 when the range lies beyond ``size``.
+    """
+    header = request.headers.get("range")
+    if not header:
+        return None
+    if_range = request.headers.get("if-range")
+    if if_range is not None and if_range != etag:  # If-Range needs a strong match
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first:
+            start = int(first)
+            end = min(int(last) + 1, size) if last else size
+        else:
+            start, end = max(size - int(last), 0), size
+    except ValueError:
+        return None
+    if start >= size or start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
@@ -1,14 +1,11 @@
 """FastAPI application entry point."""
 
-import asyncio
-import contextlib
 import logging
 import traceback
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from prometheus_client import make_asgi_app
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
@@ -17,6 +14,8 @@
 from app.api import api_router
 from app.config import get_settings
 from app.database import init_db
+from app.middleware import CompressionMiddleware
+from app.responses import ORJSONResponse
 from app.services.scheduler import scheduler_service
 from app.tracing import setup_tracing
 
@@ -56,29 +55,34 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized")
 
-    # Start scheduler
-    await scheduler_service.start()
+    # Start scheduler (on the elected replica only when several share the DB)
+    from app.services.leader import scheduler_leader
 
-    # Start WebSocket broadcast worker
-    from app.services.ws_manager import message_queue, ws_manager
+    if settings.leader_election_enabled:
+        await scheduler_leader.start(scheduler_service.start, scheduler_service.stop)
+    else:
+        await scheduler_service.start()
 
-    async def _ws_broadcast_worker():
-        while True:
-            try:
-                msg = await message_queue.get()
-                await ws_manager.broadcast(msg)
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.error("WS broadcast error: %s", e)
+    # Deliver scan events to WebSocket clients
+    from app.services.event_bus import event_bus
+    from app.services.ws_manager import ws_manager
 
-    ws_task = asyncio.create_task(_ws_broadcast_worker())  # noqa: F823
+    await event_bus.start(ws_manager.broadcast)
+
+    # Write audit entries in batches
+    from app.services.audit import audit_writer
+
+    if settings.audit_mode == "batched":
+        await audit_writer.start()
+
+    # Send scan notifications as per-recipient digests
+    from app.services.notifications import notification_dispatcher
+
+    await notification_dispatcher.start()
 
     yield
 
-    ws_task.cancel()
-    with contextlib.suppress(asyncio.CancelledError):
-        await ws_task
+    await event_bus.stop()
 
     # Shutdown
     logger.info("Shutting down...")
@@ -98,8 +102,12 @@ async def _ws_broadcast_worker():
                 logger.error("Scan task error during shutdown: %s", r)
         logger.info("All scan tasks stopped")
 
+    await scheduler_leader.stop()
     await scheduler_service.stop()
 
+    await audit_writer.stop()
+    await notification_dispatcher.stop()
+
 
 def create_app() -> FastAPI:
     """Create and configure FastAPI application."""
@@ -127,6 +135,15 @@ def create_app() -> FastAPI:
         allow_headers=["Authorization", "Content-Type", "Accept"],
     )
 
+    # Compress large responses (added after CORS so it wraps it)
+    if settings.response_compression_min_size > 0:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.response_compression_min_size,
+            gzip_level=settings.response_gzip_level,
+            brotli_quality=settings.response_brotli_quality,
+        )
+
     # Setup tracing
     setup_tracing(app)
 
@@ -155,7 +172,7 @@ async def global_exception_handler(request: Request, exc: Exception):
             content = {"detail": str(exc), "traceback": error_detail}
         else:
             content = {"detail": "Internal server error"}
-        return JSONResponse(status_code=500, content=content)
+        return ORJSONResponse(status_code=500, content=content)
 
     return app
 
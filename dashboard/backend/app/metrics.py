@@ -22,12 +22,154 @@
     ["scanner"],
 )
 
+scans_timed_out_total = Counter(
+    "scans_timed_out_total",
+    "Scans stopped after exceeding their timeout",
+    ["scanner"],
+)
+
+scans_cancelled_total = Counter(
+    "scans_cancelled_total",
+    "Running scans stopped by a user cancellation",
+    ["scanner"],
+)
+
+scans_coalesced_total = Counter(
+    "scans_coalesced_total",
+    "Scan requests served by an equivalent active or recently completed scan",
+    ["scanner", "mode"],
+)
+
+schedule_lateness_seconds = Histogram(
+    "schedule_lateness_seconds",
+    "Delay between a schedule's jittered due time and its scan being started",
+    buckets=[1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600],
+)
+
+scheduler_admission_backlog = Gauge(
+    "scheduler_admission_backlog",
+    "Fired schedules waiting for their jitter slot or for scan capacity",
+)
+
+scheduler_is_leader = Gauge(
+    "scheduler_is_leader",
+    "1 while this replica holds scheduler leadership",
+)
+
+leader_transitions_total = Counter(
+    "leader_transitions_total",
+    "Scheduler leadership changes on this replica",
+    ["event"],
+)
+
+campaign_scans_dispatched_total = Counter(
+    "campaign_scans_dispatched_total",
+    "Campaign scans started by the rollout dispatcher",
+    ["scanner"],
+)
+
+retention_deleted_total = Counter(
+    "retention_deleted_total",
+    "Rows (and unreferenced report files) removed by scan retention",
+    ["kind"],
+)
+
+scans_archived_total = Counter(
+    "scans_archived_total",
+    "Expired scans written to the cold archive",
+)
+
 # Host metrics
 active_hosts_gauge = Gauge(
     "active_hosts_total",
     "Number of active hosts",
 )
 
+host_status_refresh_duration_seconds = Histogram(
+    "host_status_refresh_duration_seconds",
+    "Duration of a fleet-wide host status refresh",
+    buckets=[0.5, 1, 2, 5, 10, 30, 60, 120],
+)
+
+# Discovery metrics
+discovery_runs_total = Counter(
+    "discovery_runs_total",
+    "Background cluster discovery runs",
+    ["cluster", "result"],
+)
+
+discovery_duration_seconds = Histogram(
+    "discovery_duration_seconds",
+    "Cluster discovery duration in seconds",
+    ["cluster"],
+    buckets=[1, 5, 15, 30, 60, 120, 300, 600],
+)
+
+discovery_objects = Gauge(
+    "discovery_objects",
+    "Hosts seen by the last discovery run per cluster",
+    ["cluster", "kind"],
+)
+
+discovery_interval_seconds = Gauge(
+    "discovery_interval_seconds",
+    "Current adaptive discovery interval per cluster",
+    ["cluster"],
+)
+
+# WebSocket metrics
+ws_connections = Gauge(
+    "ws_connections",
+    "Open WebSocket notification connections",
+)
+
+ws_queue_depth = Gauge(
+    "ws_queue_depth",
+    "Messages waiting in WebSocket client send queues",
+)
+
+ws_messages_dropped_total = Counter(
+    "ws_messages_dropped_total",
+    "WebSocket messages dropped or coalesced before delivery",
+    ["reason"],
+)
+
+ws_delivery_latency_seconds = Histogram(
+    "ws_delivery_latency_seconds",
+    "Time from broadcast to a message being written to a client socket",
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5],
+)
+
+# Audit metrics
+audit_queue_depth = Gauge(
+    "audit_queue_depth",
+    "Audit entries waiting for the batch writer",
+)
+
+audit_entries_total = Counter(
+    "audit_entries_total",
+    "Audit entries written, by path (sync, batched) or lost (failed)",
+    ["path"],
+)
+
+audit_flush_duration_seconds = Histogram(
+    "audit_flush_duration_seconds",
+    "Time to write one batch of audit entries",
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5],
+)
+
+# Notification metrics
+notifications_sent_total = Counter(
+    "notifications_sent_total",
+    "Notification emails sent or failed",
+    ["result"],
+)
+
+notifications_pending = Gauge(
+    "notifications_pending",
+    "Scan events waiting in open notification digests",
+)
+
 # Auth metrics
 auth_login_total = Counter(
     "auth_login_total",
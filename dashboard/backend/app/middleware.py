@@ -0,0 +1,183 @@
+"""Response compression middleware (brotli or gzip, by Accept-Encoding)."""
+
+import zlib
+
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip covers every client
+    brotli = None
+
+# Media types sent as is: event streams must not be buffered by a
+# compressor, the others are compressed already
+PASSTHROUGH_TYPES = frozenset(
+    {
+        "text/event-stream",
+        "application/gzip",
+        "application/x-gzip",
+        "application/zip",
+        "application/zstd",
+        "font/woff",
+        "font/woff2",
+        "image/avif",
+        "image/gif",
+        "image/jpeg",
+        "image/png",
+        "image/webp",
+        "audio/*",
+        "video/*",
+    }
+)
+
+# Body chunks at least this large are compressed in a worker thread
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+
+def _accepted(header: str) -> set[str]:
+    """Content codings an Accept-Encoding header allows (q=0 excluded)."""
+    codings = set()
+    for item in header.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        quality = params.strip().removeprefix("q=").strip()
+        try:
+            if quality and float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+        codings.add(name.strip())
+    return codings
+
+
+class _GzipCodec:
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self.level = level
+        self._compressor = None  # allocated only for responses that get compressed
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        flush = zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+        return self._compressor.compress(body) + self._compressor.flush(flush)
+
+
+class _BrotliCodec:
+    name = "br"
+
+    def __init__(self, quality: int):
+        self.quality = quality
+        self._compressor = None
+
+    def compress(self, body: bytes, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = brotli.Compressor(quality=self.quality)
+        data = self._compressor.process(body)
+        return data + (self._compressor.flush() if more_body else self._compressor.finish())
+
+
+class _Responder:
+    """Compresses one response with ``codec``.
+
+    The start message is held back until the first body chunk shows
+    whether the response is large enough to compress. Streamed bodies are
+    flushed chunk by chunk, so clients see each chunk as it is sent.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int, codec: _GzipCodec | _BrotliCodec):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.codec = codec
+        self.send: Send | None = None
+        self.start: Message | None = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            media_type = headers.get("content-type", "").partition(";")[0].strip().lower()
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] == 206
+                or media_type in PASSTHROUGH_TYPES
+                or media_type.partition("/")[0] + "/*" in PASSTHROUGH_TYPES
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+            return
+
+        if self.passthrough or kind != "http.response.body":
+            if self.start is not None:  # e.g. http.response.pathsend: sent as is
+                await self.send(self.start)
+                self.start = None
+                self.passthrough = True
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            if len(body) < self.minimum_size and not more_body:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            body = await self._compress(body, more_body)
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            headers["Content-Encoding"] = self.codec.name
+            if more_body or start.get("trailers", False):
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            await self.send(start)
+        else:
+            body = await self._compress(body, more_body)
+        await self.send({**message, "body": body})
+
+    async def _compress(self, body: bytes, more_body: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await run_in_threadpool(self.codec.compress, body, more_body)
+        return self.codec.compress(body, more_body)
+
+
+class CompressionMiddleware:
+    """Compress responses of at least ``minimum_size`` bytes.
+
+    Brotli is preferred when the client accepts it and the ``brotli``
+    package is installed, gzip otherwise. Responses that already carry a
+    Content-Encoding (stored scan reports), partial content, SSE streams
+    and already-compressed media types are passed through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        codings = _accepted(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in codings:
+            codec = _BrotliCodec(self.brotli_quality)
+        elif "gzip" in codings:
+            codec = _GzipCodec(self.gzip_level)
+        else:
+            await self.app(scope, receive, send)
+            return
+        await _Responder(self.app, self.minimum_size, codec)(scope, receive, send)
@@ -2,9 +2,32 @@
 
 from app.models.audit import AuditLog
 from app.models.base import Base
+from app.models.campaign import ScanCampaign
 from app.models.cluster import Cluster
+from app.models.event import EventPayload
 from app.models.host import Host
-from app.models.scan import Scan, ScanResult, ScanSchedule
+from app.models.leader import LeaderLease
+from app.models.report import ReportObject
+from app.models.risk import RiskSnapshot, RiskSnapshotEntry
+from app.models.rule import Rule
+from app.models.scan import Scan, ScanFindingChange, ScanResult, ScanSchedule
 from app.models.user import User
 
-__all__ = ["AuditLog", "Base", "Cluster", "Host", "Scan", "ScanResult", "ScanSchedule", "User"]
+__all__ = [
+    "AuditLog",
+    "Base",
+    "Cluster",
+    "EventPayload",
+    "Host",
+    "LeaderLease",
+    "ReportObject",
+    "RiskSnapshot",
+    "RiskSnapshotEntry",
+    "Rule",
+    "Scan",
+    "ScanCampaign",
+    "ScanFindingChange",
+    "ScanResult",
+    "ScanSchedule",
+    "User",
+]
@@ -0,0 +1,44 @@
+"""Scan campaign model for selector-based batch scans."""
+
+from datetime import datetime
+from typing import Literal
+
+from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base, TimestampMixin
+
+CampaignStatus = Literal["running", "completed", "cancelled"]
+
+
+class ScanCampaign(Base, TimestampMixin):
+    """One scanner run across every host matched by a selector.
+
+    Scans are created up front as pending rows (``Scan.campaign_id``) and
+    started by the campaign dispatcher within the rate/concurrency limits.
+    """
+
+    __tablename__ = "scan_campaigns"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(255))
+    user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
+
+    # What to run and where (see CampaignSelector)
+    scanner: Mapped[str] = mapped_column(String(50))
+    profile: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    selector: Mapped[dict] = mapped_column(JSON, default=dict)
+
+    # Rollout limits
+    rate_per_minute: Mapped[int] = mapped_column(Integer, default=30)  # 0 = unlimited
+    max_concurrency: Mapped[int] = mapped_column(Integer, default=10)
+
+    # Progress
+    status: Mapped[str] = mapped_column(String(20), default="running", index=True)
+    total_hosts: Mapped[int] = mapped_column(Integer, default=0)
+    dispatched: Mapped[int] = mapped_column(Integer, default=0)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<ScanCampaign(id={self.id}, name={self.name}, status={self.status}, hosts={self.total_hosts})>"
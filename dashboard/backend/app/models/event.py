@@ -0,0 +1,23 @@
+"""Spill table for event bus messages too large for a NOTIFY payload."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Text, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class EventPayload(Base):
+    """Event body referenced by id from a LISTEN/NOTIFY message."""
+
+    __tablename__ = "event_payloads"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    payload: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<EventPayload(id={self.id}, size={len(self.payload or '')})>"
@@ -2,7 +2,7 @@
 
 from typing import TYPE_CHECKING, Literal
 
-from sqlalchemy import JSON, Boolean, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, Boolean, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
@@ -19,6 +19,8 @@ class Host(Base, TimestampMixin):
     """Host model representing a scan target."""
 
     __tablename__ = "hosts"
+    # Selector lookups (campaigns): cluster + namespace, then OS / type
+    __table_args__ = (Index("ix_hosts_cluster_namespace", "cluster_id", "k8s_namespace"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), unique=True, index=True)
@@ -26,14 +28,14 @@ class Host(Base, TimestampMixin):
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     # Connection settings
-    host_type: Mapped[str] = mapped_column(String(50), default="container")  # container, ssh, local
+    host_type: Mapped[str] = mapped_column(String(50), default="container", index=True)  # container, ssh, local
     address: Mapped[str | None] = mapped_column(String(255), nullable=True)  # IP or container name
     port: Mapped[int | None] = mapped_column(nullable=True)  # SSH port
     ssh_user: Mapped[str | None] = mapped_column(String(100), nullable=True)
     ssh_key_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
 
     # Host info
-    os_family: Mapped[str | None] = mapped_column(String(50), nullable=True)  # debian, fedora, centos, etc.
+    os_family: Mapped[str | None] = mapped_column(String(50), nullable=True, index=True)  # debian, fedora, centos, etc.
     os_version: Mapped[str | None] = mapped_column(String(50), nullable=True)
     architecture: Mapped[str | None] = mapped_column(String(20), nullable=True)
 
@@ -0,0 +1,27 @@
+"""Leader lease model for electing the replica that runs the scheduler."""
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class LeaderLease(Base):
+    """Current holder of a named leadership role.
+
+    On SQLite the row itself is the lock (held until ``expires_at``); on
+    PostgreSQL an advisory lock decides and the row records the holder.
+    """
+
+    __tablename__ = "leader_leases"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(255))
+    acquired_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    renewed_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True))
+
+    def __repr__(self) -> str:
+        return f"<LeaderLease(name={self.name}, holder={self.holder}, expires_at={self.expires_at})>"
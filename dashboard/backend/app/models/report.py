@@ -0,0 +1,29 @@
+"""Content-addressed report objects shared by scans with identical reports."""
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class ReportObject(Base):
+    """One stored (compressed) report payload, keyed by the SHA-256 of its content.
+
+    ``refcount`` is the number of scans whose ``report_digest`` points
+    here; retention removes the object when it drops to zero.
+    """
+
+    __tablename__ = "report_objects"
+
+    digest: Mapped[str] = mapped_column(String(64), primary_key=True)
+    encoding: Mapped[str] = mapped_column(String(10))  # gzip, zstd
+    media_type: Mapped[str] = mapped_column(String(100))
+    size: Mapped[int] = mapped_column(BigInteger)  # uncompressed bytes
+    stored_size: Mapped[int] = mapped_column(BigInteger)
+    refcount: Mapped[int] = mapped_column(default=0)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<ReportObject(digest={self.digest[:12]}, refcount={self.refcount})>"
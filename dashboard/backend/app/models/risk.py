@@ -0,0 +1,60 @@
+"""Risk snapshot models for persisted fleet risk scores."""
+
+from datetime import datetime
+
+from sqlalchemy import JSON, DateTime, Float, ForeignKey, Index, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.models.base import Base
+
+
+class RiskSnapshot(Base):
+    """One fleet-wide risk scoring run for a cluster."""
+
+    __tablename__ = "risk_snapshots"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    cluster_id: Mapped[int] = mapped_column(ForeignKey("clusters.id", ondelete="CASCADE"), index=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
+
+    # Aggregates (same shape as RiskScorer.score_hosts)
+    hosts_scored: Mapped[int] = mapped_column(Integer, default=0)
+    total_risk: Mapped[int] = mapped_column(Integer, default=0)
+    average_risk: Mapped[float] = mapped_column(Float, default=0.0)
+    by_level: Mapped[dict] = mapped_column(JSON, default=dict)
+
+    entries: Mapped[list["RiskSnapshotEntry"]] = relationship(
+        "RiskSnapshotEntry", back_populates="snapshot", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    def __repr__(self) -> str:
+        return f"<RiskSnapshot(id={self.id}, cluster_id={self.cluster_id}, hosts={self.hosts_scored})>"
+
+
+class RiskSnapshotEntry(Base):
+    """Per-host risk score stored with a snapshot."""
+
+    __tablename__ = "risk_snapshot_entries"
+    __table_args__ = (
+        Index("ix_risk_snapshot_entries_snapshot_score", "snapshot_id", "risk_score"),
+        Index("ix_risk_snapshot_entries_snapshot_level", "snapshot_id", "risk_level"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    snapshot_id: Mapped[int] = mapped_column(ForeignKey("risk_snapshots.id", ondelete="CASCADE"))
+    host_id: Mapped[int | None] = mapped_column(ForeignKey("hosts.id", ondelete="SET NULL"), nullable=True)
+
+    target: Mapped[str] = mapped_column(String(255))
+    risk_score: Mapped[int] = mapped_column(Integer, default=0)
+    risk_level: Mapped[str] = mapped_column(String(20))
+    max_severity: Mapped[str] = mapped_column(String(20))
+    factor_count: Mapped[int] = mapped_column(Integer, default=0)
+    # {factor_id: occurrences}; expanded against RISK_WEIGHTS when read
+    factor_counts: Mapped[dict] = mapped_column(JSON, default=dict)
+
+    snapshot: Mapped["RiskSnapshot"] = relationship("RiskSnapshot", back_populates="entries")
+
+    def __repr__(self) -> str:
+        return f"<RiskSnapshotEntry(target={self.target}, score={self.risk_score}, level={self.risk_level})>"
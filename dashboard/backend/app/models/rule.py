@@ -0,0 +1,28 @@
+"""Rule catalog model: static rule text shared by every finding of a rule."""
+
+from sqlalchemy import JSON, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class Rule(Base):
+    """One scanner rule, stored once and referenced by ``scan_results``.
+
+    Severity and category are not here: they stay on each finding.
+    """
+
+    __tablename__ = "rules"
+    __table_args__ = (UniqueConstraint("scanner", "rule_id", name="uq_rules_scanner_rule_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    scanner: Mapped[str] = mapped_column(String(50))
+    rule_id: Mapped[str] = mapped_column(String(200))
+
+    title: Mapped[str] = mapped_column(String(500))
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    remediation: Mapped[str | None] = mapped_column(Text, nullable=True)
+    references: Mapped[list] = mapped_column(JSON, default=list)
+
+    def __repr__(self) -> str:
+        return f"<Rule(id={self.id}, scanner={self.scanner}, rule_id={self.rule_id})>"
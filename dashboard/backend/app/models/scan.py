@@ -3,16 +3,17 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Literal
 
-from sqlalchemy import JSON, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models.base import Base, TimestampMixin
 
 if TYPE_CHECKING:
     from app.models.host import Host
+    from app.models.rule import Rule
     from app.models.user import User
 
-ScanStatus = Literal["pending", "running", "completed", "failed", "cancelled"]
+ScanStatus = Literal["queued", "pending", "running", "completed", "failed", "cancelled"]
 ScannerType = Literal["openscap", "lynis", "trivy", "atomic"]
 
 
@@ -20,6 +21,10 @@ class Scan(Base, TimestampMixin):
     """Scan job model."""
 
     __tablename__ = "scans"
+    __table_args__ = (
+        Index("ix_scans_host_scanner_status", "host_id", "scanner", "status"),
+        Index("ix_scans_created_at", "created_at"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
 
@@ -27,6 +32,13 @@ class Scan(Base, TimestampMixin):
     host_id: Mapped[int] = mapped_column(ForeignKey("hosts.id"), index=True)
     user_id: Mapped[int | None] = mapped_column(ForeignKey("users.id"), nullable=True)
     schedule_id: Mapped[int | None] = mapped_column(ForeignKey("scan_schedules.id"), nullable=True)
+    campaign_id: Mapped[int | None] = mapped_column(
+        ForeignKey("scan_campaigns.id", ondelete="SET NULL"), nullable=True, index=True
+    )
+    # Set when this request was coalesced into an equivalent scan; results live on that scan
+    coalesced_into_id: Mapped[int | None] = mapped_column(
+        ForeignKey("scans.id", ondelete="SET NULL"), nullable=True, index=True
+    )
 
     # Scan info
     scanner: Mapped[str] = mapped_column(String(50))  # openscap, lynis, trivy, atomic
@@ -48,10 +60,17 @@ class Scan(Base, TimestampMixin):
     # Report paths
     report_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
     html_report_path: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    report_digest: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)  # report_objects.digest
 
     # Error info
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # Failing-finding diff against the previous completed scan of the same host/scanner/profile
+    previous_scan_id: Mapped[int | None] = mapped_column(ForeignKey("scans.id", ondelete="SET NULL"), nullable=True)
+    findings_new: Mapped[int | None] = mapped_column(nullable=True)
+    findings_resolved: Mapped[int | None] = mapped_column(nullable=True)
+    findings_persisting: Mapped[int | None] = mapped_column(nullable=True)
+
     # Relationships
     host: Mapped["Host"] = relationship("Host", back_populates="scans")
     user: Mapped["User | None"] = relationship("User", back_populates="scans")
@@ -65,30 +84,81 @@ def __repr__(self) -> str:
 
 
 class ScanResult(Base):
-    """Individual scan result/finding."""
+    """Individual scan result/finding.
+
+    Static rule text lives once per (scanner, rule_id) in the ``rules``
+    catalog; a finding keeps the catalog id, its status, severity and
+    category, and its own title only when that differs from the catalog's.
+    Severity and category stay per finding because a rule id does not
+    always identify one rule: Lynis ids are positional counters and Trivy
+    severities depend on the distro. The properties below expose the
+    remaining flat attributes for the API and exports.
+    """
 
     __tablename__ = "scan_results"
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     scan_id: Mapped[int] = mapped_column(ForeignKey("scans.id", ondelete="CASCADE"), index=True)
+    catalog_id: Mapped[int] = mapped_column(ForeignKey("rules.id"), index=True)
 
-    # Result info
-    rule_id: Mapped[str] = mapped_column(String(100), index=True)
-    title: Mapped[str] = mapped_column(String(500))
-    description: Mapped[str | None] = mapped_column(Text, nullable=True)
     severity: Mapped[str] = mapped_column(String(20))  # critical, high, medium, low, info
     status: Mapped[str] = mapped_column(String(20))  # pass, fail, error, notapplicable
     category: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    detail: Mapped[str | None] = mapped_column(String(500), nullable=True)  # title when it differs from the rule's
 
-    # Remediation
-    remediation: Mapped[str | None] = mapped_column(Text, nullable=True)
-    references: Mapped[list] = mapped_column(JSON, default=list)
-
-    # Relationship
+    # Relationships
     scan: Mapped["Scan"] = relationship("Scan", back_populates="results")
+    rule: Mapped["Rule"] = relationship("Rule", lazy="joined", innerjoin=True)
+
+    @property
+    def rule_id(self) -> str:
+        return self.rule.rule_id
+
+    @property
+    def title(self) -> str:
+        return self.detail or self.rule.title
+
+    @property
+    def description(self) -> str | None:
+        return self.rule.description
+
+    @property
+    def remediation(self) -> str | None:
+        return self.rule.remediation
+
+    @property
+    def references(self) -> list:
+        return self.rule.references
+
+    def __repr__(self) -> str:
+        return f"<ScanResult(id={self.id}, catalog_id={self.catalog_id}, status={self.status})>"
+
+
+class ScanFindingChange(Base):
+    """A failing finding that appeared or was resolved since the previous scan."""
+
+    __tablename__ = "scan_finding_changes"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    scan_id: Mapped[int] = mapped_column(ForeignKey("scans.id", ondelete="CASCADE"), index=True)
+    catalog_id: Mapped[int] = mapped_column(ForeignKey("rules.id"))
+    detail: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    severity: Mapped[str] = mapped_column(String(20))
+    category: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    change: Mapped[str] = mapped_column(String(10))  # new, resolved
+
+    rule: Mapped["Rule"] = relationship("Rule", lazy="joined", innerjoin=True)
+
+    @property
+    def rule_id(self) -> str:
+        return self.rule.rule_id
+
+    @property
+    def title(self) -> str:
+        return self.detail or self.rule.title
 
     def __repr__(self) -> str:
-        return f"<ScanResult(id={self.id}, rule_id={self.rule_id}, status={self.status})>"
+        return f"<ScanFindingChange(scan_id={self.scan_id}, catalog_id={self.catalog_id}, change={self.change})>"
 
 
 class ScanSchedule(Base, TimestampMixin):
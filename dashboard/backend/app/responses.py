@@ -0,0 +1,39 @@
+"""JSON response class backed by orjson."""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    """Types orjson does not serialize natively."""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, set | frozenset):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson.
+
+    Large dict payloads are returned as ``ORJSONResponse(...)`` so FastAPI
+    neither validates nor copies them; routes with a Pydantic response
+    model keep FastAPI's own path, where Pydantic writes the JSON bytes.
+    Datetimes, UUIDs, dataclasses and numpy values (risk scoring) are
+    written natively.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
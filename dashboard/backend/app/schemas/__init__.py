@@ -1,5 +1,6 @@
 """Pydantic schemas for API."""
 
+from app.schemas.archive import ArchivedScan, ArchiveSegment
 from app.schemas.auth import (
     EmailUpdate,
     PasswordChange,
@@ -10,10 +11,13 @@
     UserLogin,
     UserResponse,
 )
+from app.schemas.campaign import CampaignCreate, CampaignProgress, CampaignResponse, CampaignSelector
 from app.schemas.cluster import ClusterCreate, ClusterResponse, ClusterTestResult, ClusterUpdate, DiscoveryResult
 from app.schemas.host import HostCreate, HostResponse, HostUpdate
 from app.schemas.scan import (
+    FindingChange,
     ScanCreate,
+    ScanDiffResponse,
     ScanResponse,
     ScanResultResponse,
     ScanScheduleCreate,
@@ -23,6 +27,8 @@
 )
 
 __all__ = [
+    "ArchivedScan",
+    "ArchiveSegment",
     "EmailUpdate",
     "PasswordChange",
     "RefreshTokenRequest",
@@ -31,6 +37,10 @@
     "UserCreate",
     "UserLogin",
     "UserResponse",
+    "CampaignCreate",
+    "CampaignProgress",
+    "CampaignResponse",
+    "CampaignSelector",
     "ClusterCreate",
     "ClusterResponse",
     "ClusterTestResult",
@@ -39,7 +49,9 @@
     "HostCreate",
     "HostResponse",
     "HostUpdate",
+    "FindingChange",
     "ScanCreate",
+    "ScanDiffResponse",
     "ScanResponse",
     "ScanResultResponse",
     "ScanScheduleCreate",
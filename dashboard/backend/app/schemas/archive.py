@@ -0,0 +1,32 @@
+"""Scan archive schemas."""
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+from app.schemas.scan import ScanResponse
+
+
+class ArchivedScan(ScanResponse):
+    """A scan read back from the cold archive."""
+
+    host_name: str | None = None
+    segment: str
+
+
+class ArchiveSegment(BaseModel):
+    """Index of one archive segment."""
+
+    segment: str
+    compression: str
+    created_at: datetime
+    scans: int
+    results: int
+    first_id: int
+    last_id: int
+    start: datetime | None
+    end: datetime | None
+    host_ids: list[int]
+    hosts: list[str | None]
+    scanners: list[str]
+    bytes: int | None = None
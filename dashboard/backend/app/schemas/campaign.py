@@ -0,0 +1,63 @@
+"""Scan campaign schemas."""
+
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class CampaignSelector(BaseModel):
+    """Hosts targeted by a campaign; every given filter must match (empty = any)."""
+
+    cluster_ids: list[int] = Field(default_factory=list)
+    namespaces: list[str] = Field(default_factory=list)
+    os_families: list[str] = Field(default_factory=list)
+    host_types: list[str] = Field(default_factory=list)
+    tags: list[str] = Field(default_factory=list)  # host must carry all tags
+    labels: dict[str, str] = Field(default_factory=dict)  # k8s_labels that must all match
+
+
+class CampaignCreate(BaseModel):
+    """Schema for creating a scan campaign."""
+
+    name: str = Field(..., min_length=1, max_length=255)
+    scanner: str = "lynis"
+    profile: str | None = None
+    selector: CampaignSelector = Field(default_factory=CampaignSelector)
+    rate_per_minute: int | None = Field(default=None, ge=0)  # scans started per minute, 0 = unlimited
+    max_concurrency: int | None = Field(default=None, ge=1)
+
+
+class CampaignProgress(BaseModel):
+    """Aggregate progress of a campaign's scans."""
+
+    total: int
+    pending: int
+    running: int
+    completed: int
+    failed: int
+    cancelled: int
+    percent: float
+    scans_per_minute: float | None
+    eta_seconds: int | None
+
+
+class CampaignResponse(BaseModel):
+    """Schema for scan campaign response."""
+
+    id: int
+    name: str
+    user_id: int | None
+    scanner: str
+    profile: str | None
+    selector: dict
+    rate_per_minute: int
+    max_concurrency: int
+    status: str
+    total_hosts: int
+    dispatched: int
+    started_at: datetime | None
+    completed_at: datetime | None
+    created_at: datetime
+    progress: CampaignProgress | None = None
+
+    model_config = {"from_attributes": True}
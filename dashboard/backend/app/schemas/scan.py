@@ -28,6 +28,8 @@ class ScanSummary(BaseModel):
     started_at: datetime | None
     completed_at: datetime | None
     duration_seconds: int | None
+    findings_new: int | None = None
+    findings_resolved: int | None = None
 
     model_config = {"from_attributes": True}
 
@@ -55,6 +57,7 @@ class ScanResponse(BaseModel):
     host_id: int
     user_id: int | None
     schedule_id: int | None
+    coalesced_into_id: int | None = None
     scanner: str
     profile: str | None
     status: str
@@ -69,12 +72,40 @@ class ScanResponse(BaseModel):
     report_path: str | None
     html_report_path: str | None
     error_message: str | None
+    previous_scan_id: int | None = None
+    findings_new: int | None = None
+    findings_resolved: int | None = None
+    findings_persisting: int | None = None
     created_at: datetime
     results: list[ScanResultResponse] = Field(default_factory=list)
 
     model_config = {"from_attributes": True}
 
 
+class FindingChange(BaseModel):
+    """A failing finding in a scan-to-scan diff."""
+
+    rule_id: str
+    title: str
+    severity: str
+    category: str | None
+
+    model_config = {"from_attributes": True}
+
+
+class ScanDiffResponse(BaseModel):
+    """Failing findings new, resolved and persisting since the previous scan."""
+
+    scan_id: int
+    previous_scan_id: int | None
+    new: int
+    resolved: int
+    persisting: int
+    new_findings: list[FindingChange] = Field(default_factory=list)
+    resolved_findings: list[FindingChange] = Field(default_factory=list)
+    persisting_findings: list[FindingChange] = Field(default_factory=list)
+
+
 class ScanScheduleCreate(BaseModel):
     """Schema for creating a scan schedule."""
 
@@ -0,0 +1,310 @@
+"""Cold archive of expired scans as compressed NDJSON segments."""
+
+import asyncio
+import io
+import json
+import logging
+import os
+from datetime import UTC, datetime
+from pathlib import Path
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.metrics import scans_archived_total
+from app.models import Host, Rule, Scan
+from app.models.scan import ScanResult
+from app.services import compression
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".idx.json"
+_SCAN_COLUMNS = [c.key for c in Scan.__table__.columns]
+# Findings are archived self-contained, with their catalog text inlined
+_RESULT_COLUMNS = (
+    ScanResult.id,
+    Rule.rule_id,
+    func.coalesce(ScanResult.detail, Rule.title).label("title"),
+    Rule.description,
+    ScanResult.severity,
+    ScanResult.status,
+    ScanResult.category,
+    Rule.remediation,
+    Rule.references,
+)
+_RESULT_KEYS = [column.key for column in _RESULT_COLUMNS]
+# Lines handed to the writer thread at a time
+_WRITE_CHUNK = 1 << 20
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+def _iso(value: datetime) -> str:
+    # Index and record times are UTC ISO strings, so they compare as text
+    return _aware(value).astimezone(UTC).isoformat()
+
+
+def _jsonable(value):
+    return _iso(value) if isinstance(value, datetime) else value
+
+
+class SegmentWriter:
+    """Writes one immutable segment and its index, both renamed into place.
+
+    A segment only becomes visible once complete; a crash mid-write leaves
+    a hidden ``.tmp`` file that the next run overwrites or ignores.
+    """
+
+    __slots__ = ("directory", "compression", "name", "index", "_tmp", "_raw", "_stream", "_buffer", "_buffered")
+
+    def __init__(self, directory: Path, compression: str):
+        self.directory = directory
+        self.compression = compression
+        self.name = ""
+        self.index: dict = {}
+        self._tmp: Path | None = None
+        self._raw = None
+        self._stream = None
+        self._buffer: list[str] = []
+        self._buffered = 0
+
+    def open(self, first_id: int, last_id: int) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S")
+        self.name = f"scans-{stamp}-{first_id}-{last_id}.ndjson{compression.SUFFIXES[self.compression]}"
+        self._tmp = self.directory / f".{self.name}.tmp"
+        self._raw, self._stream = compression.open_writer(self._tmp, self.compression)
+        self.index = {
+            "segment": self.name,
+            "compression": self.compression,
+            "created_at": datetime.now(UTC).isoformat(),
+            "scans": 0,
+            "results": 0,
+            "first_id": first_id,
+            "last_id": last_id,
+            "start": None,
+            "end": None,
+            "host_ids": [],
+            "hosts": [],
+            "scanners": [],
+        }
+
+    def add(self, record: dict) -> int:
+        """Buffer one scan record; returns the buffered size in characters."""
+        index = self.index
+        index["scans"] += 1
+        index["results"] += len(record["results"])
+        created = record["created_at"]
+        if index["start"] is None or created < index["start"]:
+            index["start"] = created
+        if index["end"] is None or created > index["end"]:
+            index["end"] = created
+        if record["host_id"] not in index["host_ids"]:
+            index["host_ids"].append(record["host_id"])
+            index["hosts"].append(record["host_name"])
+        if record["scanner"] not in index["scanners"]:
+            index["scanners"].append(record["scanner"])
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        self._buffer.append(line)
+        self._buffered += len(line)
+        return self._buffered
+
+    async def flush(self) -> None:
+        if self._buffer:
+            data, self._buffer, self._buffered = "".join(self._buffer).encode(), [], 0
+            await asyncio.to_thread(self._stream.write, data)
+
+    async def close(self) -> dict:
+        """Finish the segment durably and publish its index."""
+        await self.flush()
+        await asyncio.to_thread(self._finish)
+        return self.index
+
+    def _finish(self) -> None:
+        self._stream.close()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._raw.close()
+        path = self.directory / self.name
+        os.replace(self._tmp, path)
+        self.index["bytes"] = path.stat().st_size
+
+        index_tmp = self.directory / f".{self.name}{INDEX_SUFFIX}.tmp"
+        index_tmp.write_text(json.dumps(self.index))
+        os.replace(index_tmp, self.directory / f"{self.name}{INDEX_SUFFIX}")
+
+    def abort(self) -> None:
+        for handle in (self._stream, self._raw):
+            try:
+                if handle is not None:
+                    handle.close()
+            except Exception as e:
+                logger.debug(f"Closing aborted archive segment: {e}")
+        if self._tmp is not None:
+            self._tmp.unlink(missing_ok=True)
+
+
+class ScanArchive:
+    """Append-only archive of scans removed by retention.
+
+    Each archived batch becomes one compressed NDJSON segment (one scan
+    with its findings per line) under REPORTS_DIR/archive, next to a small
+    JSON index of its hosts, scanners, scan ids and time range. Queries use
+    the indexes to pick segments and stream only those from disk.
+    """
+
+    def __init__(self, directory: Path | None = None):
+        self._directory = directory
+        self._indexes: dict[str, dict] = {}
+
+    @property
+    def directory(self) -> Path:
+        return self._directory or Path(settings.reports_dir) / "archive"
+
+    async def archive_scans(self, session: AsyncSession, scan_ids: list[int]) -> dict | None:
+        """Write the given scans and their findings to a new segment.
+
+        Returns the segment index, or None when none of the scans exist.
+        Raises if the segment cannot be written, so callers keep the rows.
+        """
+        result = await session.execute(
+            select(Scan, Host.name).outerjoin(Host, Host.id == Scan.host_id).where(Scan.id.in_(scan_ids))
+        )
+        scans = {scan.id: (scan, host_name) for scan, host_name in result.all()}
+        if not scans:
+            return None
+
+        ids = sorted(scans)
+        writer = SegmentWriter(
+            self.directory, compression.choose(settings.scan_archive_compression, "SCAN_ARCHIVE_COMPRESSION")
+        )
+        writer.open(ids[0], ids[-1])
+        try:
+            # Findings arrive in scan id order, so each scan is written as
+            # soon as the next one's findings start
+            findings = await session.stream(
+                select(ScanResult.scan_id, *_RESULT_COLUMNS)
+                .join(Rule, Rule.id == ScanResult.catalog_id)
+                .where(ScanResult.scan_id.in_(ids))
+                .order_by(ScanResult.scan_id, ScanResult.id)
+                .execution_options(yield_per=2000)
+            )
+            position, current = 0, []
+            async for row in findings:
+                while ids[position] != row.scan_id:
+                    await self._add(writer, *scans[ids[position]], current)
+                    position, current = position + 1, []
+                current.append({key: row._mapping[key] for key in _RESULT_KEYS})
+            for scan_id in ids[position:]:
+                await self._add(writer, *scans[scan_id], current)
+                current = []
+            index = await writer.close()
+        except BaseException:
+            writer.abort()
+            raise
+
+        self._indexes[index["segment"]] = index
+        scans_archived_total.inc(index["scans"])
+        logger.info(f"Archived {index['scans']} scans ({index['results']} findings) to {index['segment']}")
+        return index
+
+    @staticmethod
+    async def _add(writer: SegmentWriter, scan: Scan, host_name: str | None, results: list[dict]) -> None:
+        record = {key: _jsonable(getattr(scan, key)) for key in _SCAN_COLUMNS}
+        record["host_name"] = host_name
+        record["results"] = results
+        if writer.add(record) >= _WRITE_CHUNK:
+            await writer.flush()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def segments(self) -> list[dict]:
+        """Indexes of every published segment, newest data first."""
+        directory = self.directory
+        if not directory.is_dir():
+            return []
+        names = {p.name[: -len(INDEX_SUFFIX)] for p in directory.glob(f"*{INDEX_SUFFIX}")}
+        for name in names - self._indexes.keys():
+            try:
+                self._indexes[name] = json.loads((directory / f"{name}{INDEX_SUFFIX}").read_text())
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable archive index {name}: {e}")
+        for name in self._indexes.keys() - names:
+            del self._indexes[name]
+        return sorted(self._indexes.values(), key=lambda index: index["end"] or "", reverse=True)
+
+    async def query(
+        self,
+        host_id: int | None = None,
+        host_name: str | None = None,
+        scanner: str | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = 100,
+        include_results: bool = False,
+    ) -> list[dict]:
+        """Archived scans matching the filters, newest first.
+
+        Segments are opened newest-first and only while they can still
+        contribute one of the ``limit`` newest matches.
+        """
+        since_iso = _iso(since) if since else None
+        until_iso = _iso(until) if until else None
+
+        def matches(record: dict) -> bool:
+            return (
+                (host_id is None or record["host_id"] == host_id)
+                and (host_name is None or record["host_name"] == host_name)
+                and (scanner is None or record["scanner"] == scanner)
+                and (since_iso is None or record["created_at"] >= since_iso)
+                and (until_iso is None or record["created_at"] <= until_iso)
+            )
+
+        found: list[dict] = []
+        for index in self.segments():
+            if host_id is not None and host_id not in index["host_ids"]:
+                continue
+            if host_name is not None and host_name not in index["hosts"]:
+                continue
+            if scanner is not None and scanner not in index["scanners"]:
+                continue
+            if (since_iso and index["end"] < since_iso) or (until_iso and index["start"] > until_iso):
+                continue
+            if len(found) >= limit and index["end"] < found[limit - 1]["created_at"]:
+                continue  # every record here is older than what we already have
+            found.extend(await asyncio.to_thread(self._read, index, matches, include_results))
+            found.sort(key=lambda record: record["created_at"], reverse=True)
+        return found[:limit]
+
+    async def get_scan(self, scan_id: int) -> dict | None:
+        """One archived scan with its findings."""
+        for index in self.segments():
+            if index["first_id"] <= scan_id <= index["last_id"]:
+                records = await asyncio.to_thread(self._read, index, lambda r: r["id"] == scan_id, True)
+                if records:
+                    return records[0]
+        return None
+
+    def _read(self, index: dict, matches, include_results: bool) -> list[dict]:
+        records = []
+        path = self.directory / index["segment"]
+        with io.TextIOWrapper(compression.open_reader(path, index["compression"]), encoding="utf-8") as stream:
+            for line in stream:
+                record = json.loads(line)
+                if matches(record):
+                    if not include_results:
+                        record["results"] = []
+                    record["segment"] = index["segment"]
+                    records.append(record)
+        return records
+
+
+# Singleton instance
+scan_archive = ScanArchive()
@@ -1,14 +1,122 @@
 """Audit logging service for compliance tracking."""
 
+import asyncio
+import contextlib
 import logging
+import time
+from datetime import UTC, datetime
 from typing import Any
 
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
+from app.database import engine
+from app.metrics import audit_entries_total, audit_flush_duration_seconds, audit_queue_depth
 from app.models.audit import AuditLog
 
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Rows per INSERT statement; 9 columns each stays below every driver's bind-parameter limit
+ROWS_PER_INSERT = 1000
+
+
+class AuditWriter:
+    """Writes audit entries in batches from a background task.
+
+    ``submit`` never waits on the database: entries go onto a bounded queue
+    that one task drains into multi-row INSERTs, each batch closed after
+    ``batch_size`` entries or ``flush_interval`` seconds. Entries still
+    queued at shutdown are written by ``stop``.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_size: int):
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self._max_size = max_size
+        self._queue: asyncio.Queue[dict[str, Any]] | None = None
+        self._task: asyncio.Task | None = None
+        self._batch: list[dict[str, Any]] = []
+
+    @property
+    def queue(self) -> asyncio.Queue[dict[str, Any]]:
+        # Created lazily so it binds to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_size)
+        return self._queue
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def submit(self, values: dict[str, Any]) -> bool:
+        """Queue one entry; False when the writer is stopped or full."""
+        if not self.running:
+            return False
+        try:
+            self.queue.put_nowait(values)
+        except asyncio.QueueFull:
+            logger.warning("Audit queue full, writing %s synchronously", values.get("action"))
+            return False
+        audit_queue_depth.set(self.queue.qsize())
+        return True
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and write everything still queued."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        while not self.queue.empty():
+            self._batch.append(self.queue.get_nowait())
+            if len(self._batch) >= self.batch_size:
+                await self._flush()
+        await self._flush()
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch.append(await self.queue.get())
+            deadline = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                if not self.queue.empty():
+                    self._batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    async with asyncio.timeout(timeout):
+                        self._batch.append(await self.queue.get())
+                except TimeoutError:
+                    break
+            await self._flush()
+
+    async def _flush(self) -> None:
+        batch = self._batch
+        if not batch:
+            return
+        audit_queue_depth.set(self.queue.qsize())
+        start = time.perf_counter()
+        try:
+            async with engine.begin() as conn:
+                for i in range(0, len(batch), ROWS_PER_INSERT):
+                    await conn.execute(insert(AuditLog).values(batch[i : i + ROWS_PER_INSERT]))
+        except asyncio.CancelledError:
+            raise  # the batch is kept and written by stop()
+        except Exception as e:
+            audit_entries_total.labels(path="failed").inc(len(batch))
+            logger.error("Audit flush failed, %d entries lost: %s; entries: %s", len(batch), e, batch)
+        else:
+            audit_entries_total.labels(path="batched").inc(len(batch))
+            audit_flush_duration_seconds.observe(time.perf_counter() - start)
+        self._batch = []
+
 
 async def log_action(
     session: AsyncSession,
@@ -21,20 +129,36 @@ async def log_action(
     detail: str | None = None,
     ip_address: str | None = None,
     user_agent: str | None = None,
-) -> AuditLog:
-    """Record an audit log entry."""
-    entry = AuditLog(
-        user_id=user_id,
-        username=username,
-        action=action,
-        resource_type=resource_type,
-        resource_id=resource_id,
-        detail=detail,
-        ip_address=ip_address,
-        user_agent=user_agent,
-    )
+    durable: bool | None = None,
+) -> AuditLog | None:
+    """Record an audit log entry.
+
+    Entries go to the batch writer and None is returned. Durable entries
+    (``durable=True``, an action listed in ``audit_durable_actions``, or
+    ``audit_mode="sync"``) are written in ``session`` instead, so they
+    commit or roll back with the request; so is everything while the
+    writer is stopped or its queue is full.
+    """
+    values = {
+        "timestamp": datetime.now(UTC),
+        "user_id": user_id,
+        "username": username,
+        "action": action,
+        "resource_type": resource_type,
+        "resource_id": resource_id,
+        "detail": detail,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+    }
+    if durable is None:
+        durable = settings.audit_mode == "sync" or action in settings.audit_durable_actions
+    if not durable and audit_writer.submit(values):
+        return None
+
+    entry = AuditLog(**values)
     session.add(entry)
     await session.flush()
+    audit_entries_total.labels(path="sync").inc()
     return entry
 
 
@@ -46,3 +170,7 @@ def _extract_request_info(request: Any) -> dict:
         ip = getattr(request.client, "host", None) if request.client else None
         ua = request.headers.get("user-agent", "")[:512] if hasattr(request, "headers") else None
     return {"ip_address": ip, "user_agent": ua}
+
+
+# Singleton instance
+audit_writer = AuditWriter(settings.audit_batch_size, settings.audit_flush_interval, settings.audit_queue_size)
@@ -1,11 +1,18 @@
 """Authentication service."""
 
+import asyncio
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime, timedelta
+from functools import lru_cache
 
 import bcrypt
 from jose import JWTError, jwt
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.config import get_settings
 from app.models import User
@@ -13,6 +20,13 @@
 
 settings = get_settings()
 
+# Decoded tokens kept by the claims LRU
+TOKEN_CACHE_SIZE = 4096
+
+# bcrypt is deliberately slow (~250ms); it gets its own small pool so logins
+# neither block the event loop nor starve the default executor
+_bcrypt_pool = ThreadPoolExecutor(max_workers=max(settings.bcrypt_workers, 1), thread_name_prefix="bcrypt")
+
 
 class AuthService:
     """Service for authentication operations."""
@@ -30,6 +44,18 @@ def get_password_hash(password: str) -> str:
         """Hash a password."""
         return str(bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8"))
 
+    @staticmethod
+    async def check_password(plain_password: str, hashed_password: str) -> bool:
+        """verify_password on the bcrypt pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_bcrypt_pool, AuthService.verify_password, plain_password, hashed_password)
+
+    @staticmethod
+    async def hash_password(password: str) -> str:
+        """get_password_hash on the bcrypt pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_bcrypt_pool, AuthService.get_password_hash, password)
+
     @staticmethod
     def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
         """Create a JWT access token."""
@@ -48,19 +74,25 @@ def create_refresh_token(data: dict) -> str:
 
     @staticmethod
     def decode_token(token: str, expected_type: str = "access") -> TokenData | None:
-        """Decode and validate a JWT token."""
-        try:
-            payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-            if payload.get("type") != expected_type:
-                return None
-            username: str = payload.get("sub")
-            user_id: int = payload.get("user_id")
-            role: str = payload.get("role")
-            if username is None:
-                return None
-            return TokenData(username=username, user_id=user_id, role=role)
-        except JWTError:
+        """Decode and validate a JWT token.
+
+        The signature check is cached per token; expiry is checked on
+        every call.
+        """
+        payload = _decode_claims(token, settings.secret_key, settings.algorithm)
+        if payload is None:
             return None
+        expires = payload.get("exp")
+        if expires is not None and expires < time.time():
+            return None
+        if payload.get("type") != expected_type:
+            return None
+        username: str = payload.get("sub")
+        user_id: int = payload.get("user_id")
+        role: str = payload.get("role")
+        if username is None:
+            return None
+        return TokenData(username=username, user_id=user_id, role=role)
 
     async def get_user_by_username(self, username: str) -> User | None:
         """Get user by username."""
@@ -77,18 +109,44 @@ async def get_user_by_id(self, user_id: int) -> User | None:
         result = await self.session.execute(select(User).where(User.id == user_id))
         return result.scalar_one_or_none()
 
+    async def get_current_user(self, user_id: int) -> User | None:
+        """Get the user behind a request, from the user cache when fresh.
+
+        A cached row is merged into this session without a SELECT, so
+        changes to it are flushed as usual. Entries live ``user_cache_ttl``
+        seconds and are dropped by invalidate_user() when a user changes.
+        """
+        if settings.user_cache_ttl <= 0:
+            return await self.get_user_by_id(user_id)
+        with _user_lock:
+            cached = _user_cache.get(user_id)
+        if cached is not None and time.monotonic() - cached[0] < settings.user_cache_ttl:
+            user = User(**cached[1])
+            make_transient_to_detached(user)
+            return await self.session.merge(user, load=False)
+
+        generation = _user_generation
+        user = await self.get_user_by_id(user_id)
+        if user is not None:
+            values = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+            with _user_lock:
+                # Skip rows read before an invalidation: they may predate the change
+                if generation == _user_generation:
+                    _user_cache[user_id] = (time.monotonic(), values)
+        return user
+
     async def authenticate_user(self, username: str, password: str) -> User | None:
         """Authenticate a user with username and password."""
         user = await self.get_user_by_username(username)
         if not user:
             return None
-        if not self.verify_password(password, user.hashed_password):
+        if not await self.check_password(password, user.hashed_password):
             return None
         return user
 
     async def create_user(self, user_data: UserCreate) -> User:
         """Create a new user."""
-        hashed_password = self.get_password_hash(user_data.password)
+        hashed_password = await self.hash_password(user_data.password)
         user = User(
             username=user_data.username,
             email=user_data.email,
@@ -116,10 +174,66 @@ def create_token_for_user(self, user: User) -> Token:
 
     async def change_password(self, user: User, current_password: str, new_password: str) -> bool:
         """Change user password and clear must_change_password flag."""
-        if not self.verify_password(current_password, user.hashed_password):
+        if not await self.check_password(current_password, user.hashed_password):
             return False
-        user.hashed_password = self.get_password_hash(new_password)
+        user.hashed_password = await self.hash_password(new_password)
         user.must_change_password = False
         user.password_changed_at = datetime.now(UTC)
         await self.session.flush()
+        invalidate_user(user.id, self.session)
         return True
+
+
+# ------------------------------------------------------------------
+# Token and user caches
+# ------------------------------------------------------------------
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _decode_claims(token: str, secret_key: str, algorithm: str) -> dict | None:
+    """Verify a token's signature and return its claims (None if invalid).
+
+    Expiry is not checked here so cached claims still expire; the key
+    and algorithm are part of the cache key. Callers must not mutate the
+    returned dict.
+    """
+    try:
+        return jwt.decode(token, secret_key, algorithms=[algorithm], options={"verify_exp": False})
+    except JWTError:
+        return None
+
+
+_user_cache: dict[int, tuple[float, dict]] = {}
+_user_lock = threading.Lock()
+# Bumped by every invalidation; a lookup that started before one does not cache
+_user_generation = 0
+# Users to drop again once the session holding their change commits
+_pending_invalidations: weakref.WeakKeyDictionary[Session, set[int | None]] = weakref.WeakKeyDictionary()
+
+
+def invalidate_user(user_id: int | None = None, session: AsyncSession | None = None) -> None:
+    """Drop one cached user (all users when ``user_id`` is None).
+
+    Pass the ``session`` holding the change when it is not committed yet:
+    the entry is dropped again once it commits, since a request running
+    in between can re-cache the old row. Other replicas keep their copy
+    until ``user_cache_ttl`` runs out.
+    """
+    global _user_generation
+    with _user_lock:
+        _user_generation += 1
+        if user_id is None:
+            _user_cache.clear()
+        else:
+            _user_cache.pop(user_id, None)
+    if session is not None:
+        with _user_lock:
+            _pending_invalidations.setdefault(session.sync_session, set()).add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session) -> None:
+    with _user_lock:
+        user_ids = _pending_invalidations.pop(session, ())
+    for user_id in user_ids:
+        invalidate_user(user_id)
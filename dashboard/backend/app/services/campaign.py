@@ -0,0 +1,267 @@
+"""Selector-based batch scan campaigns with rate-limited rollout."""
+
+import logging
+from collections.abc import Sequence
+from datetime import UTC, datetime
+
+from sqlalchemy import cast, func, insert, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models import Host, Scan, ScanCampaign
+from app.schemas import CampaignCreate, CampaignSelector
+from app.services.scan import QUEUED
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes
+    return value if value.tzinfo is not None else value.replace(tzinfo=UTC)
+
+
+def _json_matches(selector: CampaignSelector, tags: list | None, labels: dict | None) -> bool:
+    if selector.tags and not set(selector.tags) <= set(tags or ()):
+        return False
+    labels = labels or {}
+    return all(labels.get(key) == value for key, value in selector.labels.items())
+
+
+def compute_progress(campaign: ScanCampaign, counts: dict[str, int], now: datetime | None = None) -> dict:
+    """Aggregate progress and ETA from per-status scan counts.
+
+    The ETA extrapolates the throughput observed since the campaign started
+    and never promises more than the rate limit allows for the scans still
+    queued.
+    """
+    total = campaign.total_hosts
+    done = sum(counts.get(s, 0) for s in FINISHED_STATUSES)
+    pending = counts.get(QUEUED, 0)
+    progress = {
+        "total": total,
+        "pending": pending,
+        "running": counts.get("running", 0),
+        "completed": counts.get("completed", 0),
+        "failed": counts.get("failed", 0),
+        "cancelled": counts.get("cancelled", 0),
+        "percent": round(done * 100 / total, 1) if total else 100.0,
+        "scans_per_minute": None,
+        "eta_seconds": None,
+    }
+    if campaign.status != "running" or done >= total:
+        progress["eta_seconds"] = 0
+        return progress
+    if campaign.started_at is None or not done:
+        return progress
+
+    elapsed = ((now or datetime.now(UTC)) - _aware(campaign.started_at)).total_seconds()
+    if elapsed <= 0:
+        return progress
+    per_minute = done * 60 / elapsed
+    eta = (total - done) * 60 / per_minute
+    if campaign.rate_per_minute > 0:
+        eta = max(eta, pending * 60 / campaign.rate_per_minute)
+    progress["scans_per_minute"] = round(per_minute, 2)
+    progress["eta_seconds"] = int(eta)
+    return progress
+
+
+class CampaignService:
+    """Service for scan campaign operations."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def resolve_hosts(self, selector: CampaignSelector) -> list[int]:
+        """IDs of the active hosts matched by a selector, in one query.
+
+        Column filters use the host indexes; tag/label containment is pushed
+        into SQL on PostgreSQL and checked on the narrowed rows elsewhere.
+        """
+        query = select(Host.id, Host.tags, Host.k8s_labels).where(Host.is_active == True)  # noqa: E712
+        if selector.cluster_ids:
+            query = query.where(Host.cluster_id.in_(selector.cluster_ids))
+        if selector.namespaces:
+            query = query.where(Host.k8s_namespace.in_(selector.namespaces))
+        if selector.os_families:
+            query = query.where(Host.os_family.in_(selector.os_families))
+        if selector.host_types:
+            query = query.where(Host.host_type.in_(selector.host_types))
+        if self.session.get_bind().dialect.name == "postgresql":
+            if selector.tags:
+                query = query.where(cast(Host.tags, JSONB).contains(selector.tags))
+            if selector.labels:
+                query = query.where(cast(Host.k8s_labels, JSONB).contains(selector.labels))
+
+        result = await self.session.execute(query.order_by(Host.id))
+        return [host_id for host_id, tags, labels in result.all() if _json_matches(selector, tags, labels)]
+
+    async def create_campaign(self, data: CampaignCreate, user_id: int | None = None) -> ScanCampaign:
+        """Create a campaign and enqueue one queued scan per matched host.
+
+        Raises ValueError when the selector matches no host.
+        """
+        host_ids = await self.resolve_hosts(data.selector)
+        if not host_ids:
+            raise ValueError("Selector matches no active hosts")
+
+        campaign = ScanCampaign(
+            name=data.name,
+            user_id=user_id,
+            scanner=data.scanner,
+            profile=data.profile,
+            selector=data.selector.model_dump(),
+            rate_per_minute=(
+                data.rate_per_minute if data.rate_per_minute is not None else settings.campaign_default_rate
+            ),
+            max_concurrency=data.max_concurrency or settings.campaign_default_concurrency,
+            status="running",
+            total_hosts=len(host_ids),
+            dispatched=0,
+            started_at=datetime.now(UTC),
+        )
+        self.session.add(campaign)
+        await self.session.flush()
+
+        await self.session.execute(
+            insert(Scan),
+            [
+                {
+                    "host_id": host_id,
+                    "user_id": user_id,
+                    "campaign_id": campaign.id,
+                    "scanner": data.scanner,
+                    "profile": data.profile,
+                    "status": QUEUED,
+                }
+                for host_id in host_ids
+            ],
+        )
+        await self.session.refresh(campaign)
+        logger.info(f"Campaign {campaign.id} ({campaign.name}) queued {len(host_ids)} {data.scanner} scans")
+        return campaign
+
+    async def get_all_campaigns(
+        self, status: str | None = None, limit: int = 100, offset: int = 0
+    ) -> Sequence[ScanCampaign]:
+        query = select(ScanCampaign)
+        if status:
+            query = query.where(ScanCampaign.status == status)
+        query = query.order_by(ScanCampaign.id.desc()).limit(limit).offset(offset)
+        result = await self.session.execute(query)
+        return result.scalars().all()
+
+    async def get_campaign(self, campaign_id: int) -> ScanCampaign | None:
+        return await self.session.get(ScanCampaign, campaign_id)
+
+    async def status_counts(self, campaign_ids: Sequence[int]) -> dict[int, dict[str, int]]:
+        """Per-status scan counts for several campaigns in one grouped query."""
+        counts: dict[int, dict[str, int]] = {campaign_id: {} for campaign_id in campaign_ids}
+        if not campaign_ids:
+            return counts
+        result = await self.session.execute(
+            select(Scan.campaign_id, Scan.status, func.count())
+            .where(Scan.campaign_id.in_(campaign_ids))
+            .group_by(Scan.campaign_id, Scan.status)
+        )
+        for campaign_id, status, count in result.all():
+            counts[campaign_id][status] = count
+        return counts
+
+    async def get_progress(self, campaign: ScanCampaign) -> dict:
+        counts = await self.status_counts([campaign.id])
+        return compute_progress(campaign, counts[campaign.id])
+
+    async def cancel_campaign(self, campaign_id: int) -> ScanCampaign | None:
+        """Stop a running campaign: drop its queued scans and cancel running ones."""
+        from app.services.scan import ScanService
+
+        campaign = await self.get_campaign(campaign_id)
+        if not campaign or campaign.status != "running":
+            return None
+
+        now = datetime.now(UTC)
+        campaign.status = "cancelled"
+        campaign.completed_at = now
+        await self.session.execute(
+            update(Scan)
+            .where(Scan.campaign_id == campaign_id, Scan.status == QUEUED)
+            .values(status="cancelled", completed_at=now)
+        )
+        result = await self.session.execute(
+            select(Scan.id).where(Scan.campaign_id == campaign_id, Scan.status == "running")
+        )
+        scan_service = ScanService(self.session)
+        for scan_id in result.scalars().all():
+            await scan_service.cancel_scan(scan_id)
+        await self.session.flush()
+        return campaign
+
+    # ------------------------------------------------------------------
+    # Rollout
+    # ------------------------------------------------------------------
+
+    async def dispatch(self, campaign: ScanCampaign, limit: int | None = None) -> int:
+        """Start as many queued scans as the campaign's limits allow.
+
+        Concurrency caps the campaign's running scans; the rate is a budget
+        of ``rate_per_minute`` starts per minute since the campaign began;
+        ``limit`` caps the starts further (the scheduler's admission budget).
+        Marks the campaign completed once nothing is queued or running.
+        Returns the number of scans started.
+        """
+        from app.metrics import campaign_scans_dispatched_total
+        from app.services.scan import ScanService
+
+        counts = (await self.status_counts([campaign.id]))[campaign.id]
+        pending = counts.get(QUEUED, 0)
+        running = counts.get("running", 0)
+        now = datetime.now(UTC)
+        if not pending and not running:
+            campaign.status = "completed"
+            campaign.completed_at = now
+            await self.session.flush()
+            logger.info(f"Campaign {campaign.id} ({campaign.name}) completed")
+            return 0
+
+        slots = min(campaign.max_concurrency - running, pending)
+        if campaign.rate_per_minute > 0:
+            elapsed = (now - _aware(campaign.started_at or now)).total_seconds()
+            budget = 1 + int(elapsed * campaign.rate_per_minute / 60) - campaign.dispatched
+            slots = min(slots, budget)
+        if limit is not None:
+            slots = min(slots, limit)
+        if slots <= 0:
+            return 0
+
+        result = await self.session.execute(
+            select(Scan.id).where(Scan.campaign_id == campaign.id, Scan.status == QUEUED).order_by(Scan.id).limit(slots)
+        )
+        scan_service = ScanService(self.session)
+        started = 0
+        for scan_id in result.scalars().all():
+            if await scan_service.start_scan(scan_id) is not None:
+                started += 1
+
+        campaign.dispatched += started
+        await self.session.flush()
+        campaign_scans_dispatched_total.labels(scanner=campaign.scanner).inc(started)
+        return started
+
+    async def dispatch_all(self, limit: int | None = None) -> int:
+        """Advance every running campaign; used by the scheduler tick.
+
+        ``limit`` caps the scans started across all campaigns, oldest
+        campaign first.
+        """
+        result = await self.session.execute(
+            select(ScanCampaign).where(ScanCampaign.status == "running").order_by(ScanCampaign.id)
+        )
+        started = 0
+        for campaign in result.scalars().all():
+            started += await self.dispatch(campaign, None if limit is None else max(limit - started, 0))
+        return started
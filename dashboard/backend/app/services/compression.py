@@ -0,0 +1,40 @@
+"""gzip / zstd stream helpers shared by the scan archive and report store."""
+
+import gzip
+import logging
+from pathlib import Path
+from typing import BinaryIO
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def choose(wanted: str, setting: str) -> str:
+    """The configured compression, falling back to gzip when zstd is unavailable."""
+    if wanted == "zstd" and zstandard is None:
+        logger.warning(f"{setting}=zstd needs the zstandard package; writing gzip")
+        return "gzip"
+    return wanted if wanted in SUFFIXES else "gzip"
+
+
+def open_writer(path: Path, compression: str) -> tuple[BinaryIO, BinaryIO]:
+    """(raw file, compressing stream); close the stream first, then fsync/close the file."""
+    raw = open(path, "wb")  # noqa: SIM115 - returned to the caller
+    if compression == "zstd":
+        return raw, zstandard.ZstdCompressor(level=10).stream_writer(raw, closefd=False)
+    return raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+
+
+def open_reader(path: Path, compression: str) -> BinaryIO:
+    """Decompressing binary stream over ``path``."""
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError(f"{path.name} is zstd-compressed but zstandard is not installed")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"))  # noqa: SIM115
+    return gzip.open(path, "rb")
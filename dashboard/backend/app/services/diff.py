@@ -0,0 +1,144 @@
+"""Failing-finding diffs between consecutive scans of a host."""
+
+import logging
+from collections import Counter
+from collections.abc import Iterable
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Scan, ScanFindingChange
+from app.models.scan import ScanResult
+
+logger = logging.getLogger(__name__)
+
+FindingKey = tuple[int, str | None]
+
+
+def diff_findings(current: Iterable[FindingKey], previous: Iterable[FindingKey]) -> tuple[Counter, Counter, Counter]:
+    """Split failing-finding keys into (new, resolved, persisting) multisets.
+
+    A key is the catalog id plus the finding's own title override, so the
+    same CVE in two packages counts as two findings. Keys are counted, not
+    deduplicated: a check failing on ten pods with the same title is ten
+    findings, and going from ten to eight resolves two. Counter operations
+    keep this linear in the number of findings.
+    """
+    current, previous = Counter(current), Counter(previous)
+    return current - previous, previous - current, current & previous
+
+
+def diff_summary(scan: Scan) -> dict | None:
+    """The stored diff counts of a scan (None before it has been diffed)."""
+    if scan.findings_new is None:
+        return None
+    return {
+        "previous_scan_id": scan.previous_scan_id,
+        "new": scan.findings_new,
+        "resolved": scan.findings_resolved,
+        "persisting": scan.findings_persisting,
+    }
+
+
+class ScanDiffService:
+    """Computes a scan's diff once at ingest and serves it afterwards."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def previous_scan_id(self, scan: Scan) -> int | None:
+        """Latest completed scan that ran with the same host, scanner and profile."""
+        query = select(Scan.id).where(
+            Scan.host_id == scan.host_id,
+            Scan.scanner == scan.scanner,
+            Scan.status == "completed",
+            Scan.coalesced_into_id.is_(None),
+            Scan.id < scan.id,
+        )
+        if scan.profile is None:
+            query = query.where(Scan.profile.is_(None))
+        else:
+            query = query.where(Scan.profile == scan.profile)
+        return await self.session.scalar(query.order_by(Scan.id.desc()).limit(1))
+
+    async def _failing(self, scan_id: int) -> tuple[Counter, dict[FindingKey, tuple[str, str | None]]]:
+        """Failing-finding keys of a scan with their counts, and each key's (severity, category)."""
+        result = await self.session.execute(
+            select(ScanResult.catalog_id, ScanResult.detail, ScanResult.severity, ScanResult.category).where(
+                ScanResult.scan_id == scan_id, ScanResult.status == "fail"
+            )
+        )
+        keys: Counter = Counter()
+        attributes: dict[FindingKey, tuple[str, str | None]] = {}
+        for catalog_id, detail, severity, category in result.all():
+            keys[(catalog_id, detail)] += 1
+            attributes[(catalog_id, detail)] = (severity, category)
+        return keys, attributes
+
+    async def compute(self, scan: Scan) -> dict:
+        """Diff ``scan`` against its predecessor and store counts and rows.
+
+        The first scan of a host/scanner/profile has no predecessor, so all
+        of its failing findings are new. Persisting findings are not copied
+        into change rows; they are the scan's failing results minus the new
+        ones. Each counted occurrence gets its own change row, so the rows
+        always add up to the stored counts.
+        """
+        current, attributes = await self._failing(scan.id)
+        previous_id = await self.previous_scan_id(scan)
+        previous, previous_attributes = await self._failing(previous_id) if previous_id is not None else (Counter(), {})
+        new, resolved, persisting = diff_findings(current, previous)
+
+        scan.previous_scan_id = previous_id
+        scan.findings_new = new.total()
+        scan.findings_resolved = resolved.total()
+        scan.findings_persisting = persisting.total()
+
+        if new or resolved:
+            await self.session.execute(
+                insert(ScanFindingChange),
+                [
+                    {
+                        "scan_id": scan.id,
+                        "catalog_id": key[0],
+                        "detail": key[1],
+                        "severity": source[key][0],
+                        "category": source[key][1],
+                        "change": change,
+                    }
+                    for change, keys, source in (("new", new, attributes), ("resolved", resolved, previous_attributes))
+                    for key in sorted(keys.elements(), key=lambda key: (key[0], key[1] or ""))
+                ],
+            )
+        await self.session.flush()
+        logger.debug(
+            f"Scan {scan.id} diff vs {previous_id}: "
+            f"+{scan.findings_new} -{scan.findings_resolved} ={scan.findings_persisting}"
+        )
+        return diff_summary(scan)
+
+    async def get_changes(self, scan: Scan, include_persisting: bool = False) -> dict[str, list]:
+        """Finding rows of a diffed scan grouped by change."""
+        changes: dict[str, list] = {"new": [], "resolved": [], "persisting": []}
+        result = await self.session.execute(
+            select(ScanFindingChange).where(ScanFindingChange.scan_id == scan.id).order_by(ScanFindingChange.id)
+        )
+        for change in result.scalars().all():
+            changes[change.change].append(change)
+
+        if include_persisting and scan.findings_persisting:
+            # Skip one failing row per new occurrence of its key
+            new = Counter((c.catalog_id, c.detail) for c in changes["new"])
+            for row in await self._failing_rows(scan.id):
+                key = (row.catalog_id, row.detail)
+                if new[key] > 0:
+                    new[key] -= 1
+                else:
+                    changes["persisting"].append(row)
+        return changes
+
+    async def _failing_rows(self, scan_id: int) -> list[ScanResult]:
+        result = await self.session.execute(
+            select(ScanResult).where(ScanResult.scan_id == scan_id, ScanResult.status == "fail").order_by(ScanResult.id)
+        )
+        return list(result.scalars().all())
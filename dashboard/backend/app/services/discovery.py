@@ -146,7 +146,7 @@ def _test_k8s_connection(cluster: Cluster) -> dict:
             }
 
     @staticmethod
-    def _get_podman_client(cluster: Cluster):
+    def get_podman_client(cluster: Cluster):
         """Build a Podman client from cluster settings."""
         if cluster.podman_host:
             if cluster.podman_tls_verify and cluster.podman_cert_path:
@@ -167,7 +167,7 @@ def _get_podman_client(cluster: Cluster):
     def _test_podman_connection(cluster: Cluster) -> dict:
         """Test Podman connection (runs in thread)."""
         try:
-            client = DiscoveryService._get_podman_client(cluster)
+            client = DiscoveryService.get_podman_client(cluster)
 
             client.info()  # verify connection is alive
             containers = client.containers.list()
@@ -369,7 +369,7 @@ async def sync_podman_hosts(self, cluster: Cluster) -> dict:
     def _discover_podman_sync(cluster: Cluster) -> dict:
         """Synchronous Podman discovery."""
         try:
-            client = DiscoveryService._get_podman_client(cluster)
+            client = DiscoveryService.get_podman_client(cluster)
 
             containers_list = client.containers.list(all=True)
             version = client.version()
@@ -0,0 +1,223 @@
+"""Background discovery for clusters with auto_discover enabled."""
+
+import asyncio
+import logging
+import random
+import time
+
+from sqlalchemy import select
+
+from app.config import get_settings
+from app.database import get_session_context
+from app.metrics import (
+    discovery_duration_seconds,
+    discovery_interval_seconds,
+    discovery_objects,
+    discovery_runs_total,
+)
+from app.models import Cluster
+from app.services.discovery import DiscoveryService
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Churn (new hosts / hosts seen) above which a cluster is refreshed faster
+HIGH_CHURN = 0.05
+
+
+class ClusterDiscoveryState:
+    """Per-cluster scheduling state kept in memory."""
+
+    __slots__ = ("interval", "next_due", "last_run", "last_duration", "last_churn", "failures", "last_result")
+
+    def __init__(self, interval: float, next_due: float):
+        self.interval = interval
+        self.next_due = next_due
+        self.last_run: float | None = None
+        self.last_duration: float | None = None
+        self.last_churn: float | None = None
+        self.failures = 0
+        self.last_result: str | None = None
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "interval_seconds": round(self.interval, 1),
+            "next_run_in_seconds": round(max(self.next_due - now, 0), 1),
+            "last_run_seconds_ago": round(now - self.last_run, 1) if self.last_run else None,
+            "last_duration_seconds": round(self.last_duration, 2) if self.last_duration is not None else None,
+            "last_churn": self.last_churn,
+            "consecutive_failures": self.failures,
+            "last_result": self.last_result,
+        }
+
+
+class DiscoveryScheduler:
+    """Refreshes all auto-discover clusters concurrently.
+
+    A periodic tick (registered by SchedulerService) picks the clusters that
+    are due, runs them under a global concurrency cap with a per-cluster
+    timeout and reschedules each one with an interval adapted to how much
+    its host set changed, plus jitter so clusters do not fire together.
+    """
+
+    def __init__(self):
+        self._states: dict[int, ClusterDiscoveryState] = {}
+        self._running: set[int] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(max(settings.discovery_max_concurrency, 1))
+        return self._semaphore
+
+    async def tick(self) -> None:
+        """Start discovery for every cluster whose refresh is due."""
+        async with get_session_context() as session:
+            result = await session.execute(
+                select(Cluster.id, Cluster.name).where(
+                    Cluster.is_active == True,  # noqa: E712
+                    Cluster.auto_discover == True,  # noqa: E712
+                    Cluster.cluster_type.in_(("kubernetes", "podman")),
+                )
+            )
+            clusters = result.all()
+
+        now = time.monotonic()
+        active_ids = set()
+        for cluster_id, cluster_name in clusters:
+            active_ids.add(cluster_id)
+            state = self._states.get(cluster_id)
+            if state is None:
+                # Spread first runs over one minimum interval to avoid a stampede
+                state = self._states[cluster_id] = ClusterDiscoveryState(
+                    interval=settings.discovery_default_interval,
+                    next_due=now + random.uniform(0, settings.discovery_min_interval),  # noqa: S311
+                )
+                continue
+            if state.next_due <= now and cluster_id not in self._running:
+                self._running.add(cluster_id)
+                task = asyncio.create_task(self._run_cluster(cluster_id, cluster_name))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+        # Forget clusters that were removed or had auto_discover turned off
+        for cluster_id in set(self._states) - active_ids:
+            self._states.pop(cluster_id, None)
+
+    async def stop(self) -> None:
+        """Cancel in-flight discovery tasks."""
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._running.clear()
+
+    def get_status(self, cluster_id: int) -> dict | None:
+        state = self._states.get(cluster_id)
+        if state is None:
+            return None
+        return {"cluster_id": cluster_id, "running": cluster_id in self._running, **state.to_dict(time.monotonic())}
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    async def _run_cluster(self, cluster_id: int, cluster_name: str) -> None:
+        try:
+            async with self.semaphore:
+                started = time.monotonic()
+                outcome = "error"
+                churn = None
+                try:
+                    result = await asyncio.wait_for(self._discover(cluster_id), timeout=settings.discovery_timeout)
+                    if result is not None and not _is_failed(result):
+                        outcome = "success"
+                        churn = result["hosts_created"] / max(result["hosts_total"], 1)
+                        discovery_objects.labels(cluster=cluster_name, kind="total").set(result["hosts_total"])
+                        discovery_objects.labels(cluster=cluster_name, kind="created").set(result["hosts_created"])
+                        discovery_objects.labels(cluster=cluster_name, kind="updated").set(result["hosts_updated"])
+                except TimeoutError:
+                    # The worker thread cannot be interrupted; its session is discarded
+                    outcome = "timeout"
+                    logger.warning(
+                        "Discovery for cluster %s timed out after %ss", cluster_name, settings.discovery_timeout
+                    )
+                except Exception as e:
+                    logger.error("Discovery for cluster %s failed: %s", cluster_name, e)
+
+                duration = time.monotonic() - started
+                discovery_duration_seconds.labels(cluster=cluster_name).observe(duration)
+                discovery_runs_total.labels(cluster=cluster_name, result=outcome).inc()
+                self._reschedule(cluster_id, cluster_name, duration, outcome, churn)
+        finally:
+            self._running.discard(cluster_id)
+
+    async def _discover(self, cluster_id: int) -> dict | None:
+        async with get_session_context() as session:
+            svc = DiscoveryService(session)
+            cluster = await svc.get_cluster_by_id(cluster_id)
+            if not cluster or not cluster.is_active or not cluster.auto_discover:
+                return None
+            if cluster.cluster_type == "kubernetes":
+                return await svc.sync_k8s_hosts(cluster)
+            return await svc.sync_podman_hosts(cluster)
+
+    def _reschedule(
+        self, cluster_id: int, cluster_name: str, duration: float, outcome: str, churn: float | None
+    ) -> None:
+        state = self._states.get(cluster_id)
+        if state is None:
+            return
+        now = time.monotonic()
+        state.last_run = now
+        state.last_duration = duration
+        state.last_result = outcome
+        state.last_churn = round(churn, 4) if churn is not None else None
+        state.failures = 0 if outcome == "success" else state.failures + 1
+        state.interval = next_interval(state.interval, churn, state.failures)
+        state.next_due = now + jittered(state.interval)
+        discovery_interval_seconds.labels(cluster=cluster_name).set(state.interval)
+
+
+# ------------------------------------------------------------------
+# Module-level helpers
+# ------------------------------------------------------------------
+
+
+def next_interval(current: float, churn: float | None, failures: int) -> float:
+    """Adapt a cluster's refresh interval.
+
+    Busy clusters (churn above HIGH_CHURN) are refreshed twice as often,
+    quiet ones (no new hosts) back off by 1.5x, and failures back off
+    exponentially. The result is clamped to the configured bounds.
+    """
+    if failures:
+        interval = settings.discovery_default_interval * (2 ** min(failures, 6))
+    elif churn is None:
+        interval = current
+    elif churn > HIGH_CHURN:
+        interval = current / 2
+    elif churn == 0:
+        interval = current * 1.5
+    else:
+        interval = current
+    return float(min(max(interval, settings.discovery_min_interval), settings.discovery_max_interval))
+
+
+def jittered(interval: float) -> float:
+    """Randomize an interval by +/- discovery_jitter (fraction)."""
+    spread = interval * settings.discovery_jitter
+    return interval + random.uniform(-spread, spread)  # noqa: S311
+
+
+def _is_failed(result: dict) -> bool:
+    details = result.get("details") or []
+    return result["hosts_total"] == 0 and any("error" in d for d in details)
+
+
+# Singleton instance
+discovery_scheduler = DiscoveryScheduler()
@@ -0,0 +1,196 @@
+"""Event bus for scan events, optionally shared across application workers."""
+
+import asyncio
+import contextlib
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import make_url
+
+from app.config import get_settings
+from app.database import engine
+from app.metrics import ws_messages_dropped_total
+from app.models import EventPayload
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+NOTIFY_PAYLOAD_LIMIT = 7900
+# Key of the NOTIFY body that points at a spilled payload row
+SPILL_KEY = "__event_payload_id"
+# Seconds between listener connection health checks
+LISTENER_CHECK_INTERVAL = 15
+
+EventHandler = Callable[[dict[str, Any]], Awaitable[None]]
+
+
+class EventBus:
+    """In-process event bus; events only reach this worker's subscribers.
+
+    ``publish`` never blocks the producer: events go onto a bounded queue
+    that a single dispatcher task drains into the subscriber (the WebSocket
+    ConnectionManager). When the queue is full the event is dropped.
+    """
+
+    backend = "memory"
+
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._queue: asyncio.Queue[dict[str, Any]] | None = None
+        self._handler: EventHandler | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def queue(self) -> asyncio.Queue[dict[str, Any]]:
+        # Created lazily so it binds to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_size)
+        return self._queue
+
+    async def publish(self, message: dict[str, Any]) -> None:
+        """Publish an event to every subscriber."""
+        self._deliver(message)
+
+    async def start(self, handler: EventHandler) -> None:
+        """Start dispatching events to ``handler``."""
+        self._handler = handler
+        self._task = asyncio.create_task(self._dispatch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def _deliver(self, message: dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            ws_messages_dropped_total.labels(reason="ingress_full").inc()
+            logger.warning("Event queue full, dropping %s event", message.get("type"))
+
+    async def _resolve(self, message: dict[str, Any]) -> dict[str, Any] | None:
+        return message
+
+    async def _dispatch(self) -> None:
+        while True:
+            message = await self.queue.get()
+            try:
+                resolved = await self._resolve(message)
+                if resolved is not None and self._handler is not None:
+                    await self._handler(resolved)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Event dispatch error: %s", e)
+
+
+class PostgresEventBus(EventBus):
+    """Event bus over PostgreSQL LISTEN/NOTIFY.
+
+    Every worker LISTENs on one channel over a dedicated asyncpg connection
+    and publishes with ``pg_notify`` through the shared engine, so an event
+    raised in any worker reaches WebSocket clients on all of them. Payloads
+    too large for NOTIFY are written to ``event_payloads`` and only their id
+    is sent; listeners load the row before dispatching.
+    """
+
+    backend = "postgres"
+
+    def __init__(self, dsn: str, channel: str, max_size: int):
+        super().__init__(max_size)
+        self.dsn = dsn
+        self.channel = channel
+        self._listener_task: asyncio.Task | None = None
+
+    async def publish(self, message: dict[str, Any]) -> None:
+        payload = json.dumps(message, default=str)
+        try:
+            async with engine.begin() as conn:
+                if len(payload.encode("utf-8")) > NOTIFY_PAYLOAD_LIMIT:
+                    result = await conn.execute(insert(EventPayload).values(payload=payload).returning(EventPayload.id))
+                    cutoff = datetime.now(UTC) - timedelta(seconds=settings.event_spill_retention)
+                    await conn.execute(delete(EventPayload).where(EventPayload.created_at < cutoff))
+                    payload = json.dumps({SPILL_KEY: result.scalar_one()})
+                await conn.execute(select(func.pg_notify(self.channel, payload)))
+        except Exception as e:
+            # Keep local clients informed even when the database is unavailable
+            logger.warning("Event NOTIFY failed, delivering locally only: %s", e)
+            self._deliver(message)
+
+    async def start(self, handler: EventHandler) -> None:
+        await super().start(handler)
+        self._listener_task = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._listener_task
+            self._listener_task = None
+        await super().stop()
+
+    async def _listen(self) -> None:
+        import asyncpg
+
+        backoff = 1
+        while True:
+            try:
+                conn = await asyncpg.connect(self.dsn)
+                try:
+                    await conn.add_listener(self.channel, self._on_notify)
+                    logger.info("Event bus listening on channel %s", self.channel)
+                    backoff = 1
+                    while True:
+                        await asyncio.sleep(LISTENER_CHECK_INTERVAL)
+                        await conn.execute("SELECT 1")
+                finally:
+                    with contextlib.suppress(Exception):
+                        await conn.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Event bus listener lost (%s), reconnecting in %ss", e, backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+
+    def _on_notify(self, connection, pid: int, channel: str, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning("Ignoring malformed event on channel %s", channel)
+            return
+        self._deliver(message)
+
+    async def _resolve(self, message: dict[str, Any]) -> dict[str, Any] | None:
+        # Spilled payloads are loaded in the dispatcher so event order is kept
+        if SPILL_KEY not in message:
+            return message
+        async with engine.connect() as conn:
+            result = await conn.execute(select(EventPayload.payload).where(EventPayload.id == message[SPILL_KEY]))
+            payload = result.scalar_one_or_none()
+        if payload is None:
+            logger.warning("Spilled event %s no longer exists", message[SPILL_KEY])
+            return None
+        return json.loads(payload)
+
+
+def create_event_bus() -> EventBus:
+    """Pick the backend from EVENT_BUS_BACKEND ("auto" uses NOTIFY on PostgreSQL)."""
+    backend = settings.event_bus_backend
+    if backend == "auto":
+        backend = "postgres" if settings.database_url.startswith("postgresql") else "memory"
+    if backend == "postgres":
+        dsn = make_url(settings.database_url).set(drivername="postgresql").render_as_string(hide_password=False)
+        return PostgresEventBus(dsn, settings.event_bus_channel, settings.ws_message_queue_size)
+    return EventBus(settings.ws_message_queue_size)
+
+
+# Singleton instance
+event_bus = create_event_bus()
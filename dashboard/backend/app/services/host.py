@@ -17,7 +17,7 @@
 logger = logging.getLogger(__name__)
 
 
-def _get_podman_client():
+def get_podman_client():
     """Get Podman client using configured PODMAN_HOST."""
     podman_host = settings.podman_host
     if podman_host.startswith("tcp://"):
@@ -116,16 +116,7 @@ async def check_host_status(self, host: Host) -> str:
 
     async def _check_container_status(self, container_name: str) -> str:
         """Check Podman container status."""
-        try:
-            client = _get_podman_client()
-            container = client.containers.get(container_name)
-            if container.status == "running":
-                return "online"
-            return "offline"
-        except podman.errors.NotFound:
-            return "offline"
-        except Exception:
-            return "unknown"
+        return await asyncio.to_thread(_check_container_status_sync, container_name)
 
     async def _check_ssh_status(self, host: Host) -> str:
         """Check SSH host status via ping."""
@@ -162,7 +153,7 @@ async def _check_k8s_status(self, host: Host) -> str:
     async def sync_podman_containers(self) -> list[Host]:
         """Sync hosts from running Podman containers."""
         try:
-            client = _get_podman_client()
+            client = get_podman_client()
             containers = client.containers.list()
             created_hosts = []
             logger.info("Found %d containers, syncing target-* hosts", len(containers))
@@ -209,6 +200,20 @@ def _detect_os_family(image: str) -> str:
         return "unknown"
 
 
+def _check_container_status_sync(container_name: str) -> str:
+    """Blocking Podman container status check (runs in thread)."""
+    try:
+        client = get_podman_client()
+        container = client.containers.get(container_name)
+        if container.status == "running":
+            return "online"
+        return "offline"
+    except podman.errors.NotFound:
+        return "offline"
+    except Exception:
+        return "unknown"
+
+
 def _check_k8s_status_sync(cluster_obj, host_obj) -> str:
     """Synchronous K8s node/pod status check (runs in thread)."""
     from kubernetes import client as k8s_client
@@ -0,0 +1,226 @@
+"""Bulk host status refresh -- one list call per runtime endpoint."""
+
+import asyncio
+import logging
+import time
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.metrics import host_status_refresh_duration_seconds
+from app.models import Cluster, Host
+from app.services.discovery import DiscoveryService
+from app.services.host import get_podman_client
+from app.services.k8s_connector import K8sConnector, _paginate
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class HostStatusRefresher:
+    """Refreshes the status of every active host in one pass.
+
+    Hosts are grouped by where their status comes from:
+      - Podman containers: one ``containers(all=True)`` call per endpoint
+        (a Podman cluster, or the default PODMAN_HOST for standalone hosts)
+      - K8s pods/nodes: one pod list and one node list per cluster
+      - SSH hosts: concurrent TCP checks behind a semaphore
+
+    Changed statuses are written back in a single executemany UPDATE.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def refresh_all(self) -> dict:
+        started = time.monotonic()
+        result = await self.session.execute(
+            select(
+                Host.id,
+                Host.name,
+                Host.host_type,
+                Host.address,
+                Host.port,
+                Host.status,
+                Host.cluster_id,
+                Host.k8s_namespace,
+                Host.k8s_pod_name,
+                Host.k8s_node_name,
+            ).where(Host.is_active == True)  # noqa: E712
+        )
+        hosts = result.all()
+
+        podman_groups: dict[int | None, list] = {}
+        k8s_groups: dict[int, list] = {}
+        ssh_hosts = []
+        new_status: dict[int, str] = {}
+
+        for h in hosts:
+            if h.host_type == "container":
+                podman_groups.setdefault(h.cluster_id, []).append(h)
+            elif h.host_type in ("k8s_node", "k8s_pod") and h.cluster_id:
+                k8s_groups.setdefault(h.cluster_id, []).append(h)
+            elif h.host_type == "ssh":
+                ssh_hosts.append(h)
+            else:
+                new_status[h.id] = "unknown"
+
+        cluster_ids = {cid for cid in podman_groups if cid} | set(k8s_groups)
+        clusters: dict[int, Cluster] = {}
+        if cluster_ids:
+            rows = await self.session.execute(select(Cluster).where(Cluster.id.in_(cluster_ids)))
+            clusters = {c.id: c for c in rows.scalars().all()}
+
+        jobs = []
+        for cluster_id, group in podman_groups.items():
+            if cluster_id and cluster_id not in clusters:
+                new_status.update({h.id: "unknown" for h in group})
+                continue
+            jobs.append(self._refresh_podman(clusters.get(cluster_id), group, new_status))
+        for cluster_id, group in k8s_groups.items():
+            if cluster_id not in clusters:
+                new_status.update({h.id: "unknown" for h in group})
+                continue
+            jobs.append(self._refresh_k8s(clusters[cluster_id], group, new_status))
+        if ssh_hosts:
+            jobs.append(self._refresh_ssh(ssh_hosts, new_status))
+
+        await asyncio.gather(*jobs)
+
+        current = {h.id: h.status for h in hosts}
+        changes = [{"id": host_id, "status": s} for host_id, s in new_status.items() if current.get(host_id) != s]
+        if changes:
+            await self.session.execute(update(Host), changes)
+            await self.session.flush()
+
+        duration = time.monotonic() - started
+        host_status_refresh_duration_seconds.observe(duration)
+
+        counts: dict[str, int] = {}
+        for s in new_status.values():
+            counts[s] = counts.get(s, 0) + 1
+        logger.info("Host status refresh: %d hosts, %d changed in %.2fs", len(hosts), len(changes), duration)
+        return {
+            "hosts_checked": len(hosts),
+            "hosts_changed": len(changes),
+            "by_status": counts,
+            "duration_seconds": round(duration, 3),
+        }
+
+    # ------------------------------------------------------------------
+    # Per-runtime refreshers
+    # ------------------------------------------------------------------
+
+    async def _refresh_podman(self, cluster: Cluster | None, hosts: list, out: dict[int, str]) -> None:
+        """Map one container listing onto every host of the endpoint."""
+        try:
+            states = await asyncio.to_thread(_podman_states_sync, cluster)
+        except Exception as e:
+            logger.warning("Podman status listing failed for %s: %s", cluster.name if cluster else "default", e)
+            out.update({h.id: "unknown" for h in hosts})
+            return
+
+        for h in hosts:
+            # Discovered containers keep the container name in address; standalone ones use the host name
+            name = (h.address or h.name) if cluster else h.name
+            out[h.id] = "online" if states.get(name) == "running" else "offline"
+
+    async def _refresh_k8s(self, cluster: Cluster, hosts: list, out: dict[int, str]) -> None:
+        """Map one pod list and one node list onto every host of the cluster."""
+        need_pods = any(h.host_type == "k8s_pod" for h in hosts)
+        need_nodes = any(h.host_type == "k8s_node" for h in hosts)
+        try:
+            pods, nodes = await asyncio.to_thread(_k8s_states_sync, cluster, need_pods, need_nodes)
+        except Exception as e:
+            logger.warning("K8s status listing failed for cluster %s: %s", cluster.name, e)
+            out.update({h.id: "offline" for h in hosts})
+            return
+
+        for h in hosts:
+            if h.host_type == "k8s_pod":
+                phase = pods.get((h.k8s_namespace, h.k8s_pod_name))
+                out[h.id] = "online" if phase == "Running" else "offline"
+            elif h.k8s_node_name not in nodes:
+                out[h.id] = "offline"
+            elif nodes[h.k8s_node_name] is None:
+                # Node without a Ready condition
+                out[h.id] = "unknown"
+            else:
+                out[h.id] = "online" if nodes[h.k8s_node_name] else "offline"
+
+    async def _refresh_ssh(self, hosts: list, out: dict[int, str]) -> None:
+        semaphore = asyncio.Semaphore(max(settings.host_status_ssh_concurrency, 1))
+
+        async def check(h) -> None:
+            async with semaphore:
+                out[h.id] = await tcp_check(h.address, h.port or 22)
+
+        await asyncio.gather(*(check(h) for h in hosts))
+
+
+# ------------------------------------------------------------------
+# Module-level helpers
+# ------------------------------------------------------------------
+
+
+async def tcp_check(address: str | None, port: int, timeout: float = 5.0) -> str:
+    """TCP connect check used for SSH hosts."""
+    if not address:
+        return "unknown"
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), timeout=timeout)
+        writer.close()
+        await writer.wait_closed()
+        return "online"
+    except (TimeoutError, OSError):
+        return "offline"
+
+
+def _podman_states_sync(cluster: Cluster | None) -> dict[str, str]:
+    """Container name -> state from a single list call (no per-container inspect)."""
+    client = DiscoveryService.get_podman_client(cluster) if cluster else get_podman_client()
+    try:
+        states = {}
+        for c in client.api.containers(all=True):
+            for name in c.get("Names") or []:
+                states[name.lstrip("/")] = c.get("State", "")
+        return states
+    finally:
+        client.close()
+
+
+def _k8s_states_sync(cluster: Cluster, need_pods: bool, need_nodes: bool) -> tuple[dict, dict]:
+    """((namespace, pod) -> phase, node -> Ready) from one pod and one node listing."""
+    from kubernetes import client as k8s_client
+
+    connector = K8sConnector(
+        api_url=cluster.k8s_api_url,
+        token=cluster.k8s_token,
+        ca_cert=cluster.k8s_ca_cert,
+        client_cert=cluster.k8s_client_cert,
+        client_key=cluster.k8s_client_key,
+        kubeconfig_path=cluster.kubeconfig_path,
+        kubeconfig_context=cluster.kubeconfig_context,
+    )
+    try:
+        v1 = k8s_client.CoreV1Api(connector.connect())
+        pods: dict[tuple[str, str], str | None] = {}
+        nodes: dict[str, bool | None] = {}
+        if need_pods:
+            if cluster.k8s_namespace:
+                items = _paginate(v1.list_namespaced_pod, cluster.k8s_namespace)
+            else:
+                items = _paginate(v1.list_pod_for_all_namespaces)
+            for pod in items:
+                pods[(pod.metadata.namespace, pod.metadata.name)] = pod.status.phase if pod.status else None
+        if need_nodes:
+            for node in _paginate(v1.list_node):
+                ready = None
+                for condition in (node.status.conditions if node.status else None) or []:
+                    if condition.type == "Ready":
+                        ready = condition.status == "True"
+                nodes[node.metadata.name] = ready
+        return pods, nodes
+    finally:
+        connector.close()
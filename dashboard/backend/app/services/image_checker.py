@@ -2,6 +2,7 @@
 
 import logging
 import re
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +51,36 @@
     "wolfi",
 )
 
+# Known EOL versions: (base, eol_major, eol_minor, message); first match wins
+EOL_VERSIONS = (
+    ("python", 3, 8, "Python 3.8 is EOL"),
+    ("node", 16, None, "Node.js 16 is EOL"),
+    ("golang", 1, 19, "Go 1.19 is EOL"),
+    ("ruby", 2, 7, "Ruby 2.7 is EOL"),
+    ("php", 7, None, "PHP 7.x is EOL"),
+    ("ubuntu", 20, None, "Ubuntu 20.04 LTS nearing EOL"),
+    ("debian", 10, None, "Debian 10 (buster) is EOL"),
+    ("centos", 7, None, "CentOS 7 is EOL"),
+    ("alpine", 3, 15, "Alpine 3.15 is EOL"),
+)
+
+# Images known for security issues: (pattern, message); first match wins
+RISKY_BASES = (
+    ("phpmyadmin", "phpMyAdmin images are frequent attack targets."),
+    ("wordpress", "WordPress images require careful hardening."),
+    ("jenkins/jenkins", "Jenkins images often run as root with broad permissions."),
+    ("mongo:", "MongoDB images run without auth by default."),
+    ("redis:", "Redis images have no auth by default."),
+    ("elasticsearch", "Elasticsearch images run as root on older versions."),
+)
+
+LAYER_BLOAT_THRESHOLD = 30
+
+# Max distinct (image, user, layer_count) results kept in memory
+IMAGE_RESULT_CACHE_SIZE = 2048
+
+_VERSION_RE = re.compile(r"(\d+)(?:\.(\d+))?")
+
 
 class ImageFinding:
     """Single image check finding."""
@@ -75,6 +106,10 @@ class ImageChecker:
       - Base image age heuristic (tag version)
       - Known vulnerable base detection
       - Multi-stage / bloat detection (layer count)
+
+    Results are computed once per distinct (image, user, layer_count) and
+    shared through a module-level LRU cache, so a fleet running a handful
+    of images costs a handful of evaluations regardless of pod count.
     """
 
     def __init__(self):
@@ -95,23 +130,25 @@ def check_images(self, images: list[dict]) -> dict:
           - layer_count: int (optional)
         """
         self.findings = []
+        ruleset = _current_ruleset()
 
+        # Each distinct image is evaluated once; findings keep the input order
+        evaluated: dict[tuple, tuple] = {}
         for img in images:
-            ref = img.get("target", img.get("image", "unknown"))
             image = img.get("image", "")
             if not image:
                 continue
-
-            self._check_tag(ref, image)
-            self._check_digest_pinning(ref, image)
-            self._check_root_user(ref, image, img.get("user", ""))
-            self._check_distroless(ref, image)
-            self._check_base_age(ref, image)
-            self._check_known_risky_bases(ref, image)
-            if img.get("layer_count"):
-                self._check_layer_bloat(ref, image, img["layer_count"])
-
-        return self._build_result(images)
+            key = (image, img.get("user", ""), img.get("layer_count") or 0)
+            templates = evaluated.get(key)
+            if templates is None:
+                templates = evaluated[key] = _evaluate_image(*key, ruleset)
+            ref = img.get("target", image)
+            for template in templates:
+                self.findings.append(ImageFinding(target=ref, **template))
+
+        result = self._build_result(images)
+        result["unique_images"] = len(evaluated)
+        return result
 
     def check_from_hosts(self, hosts: list[dict]) -> dict:
         """Check images from Host records (as stored in DB).
@@ -120,7 +157,7 @@ def check_from_hosts(self, hosts: list[dict]) -> dict:
         """
         images = []
         for h in hosts:
-            sc = h.get("security_context", {})
+            sc = h.get("security_context") or {}
             images.append(
                 {
                     "image": h.get("container_image", ""),
@@ -131,219 +168,10 @@ def check_from_hosts(self, hosts: list[dict]) -> dict:
             )
         return self.check_images(images)
 
-    # ------------------------------------------------------------------
-    # Checks
-    # ------------------------------------------------------------------
-
-    def _check_tag(self, ref: str, image: str) -> None:
-        """IMG-001: Detect :latest or untagged images."""
-        tag = _extract_tag(image)
-
-        if tag is None or tag == "latest":
-            self._add(
-                rule_id="IMG-001",
-                severity=MEDIUM,
-                status="fail",
-                category="image-tag",
-                target=ref,
-                detail=f"Image '{image}' uses {'no tag' if tag is None else ':latest'}. "
-                "This makes builds non-reproducible and complicates rollback.",
-                remediation="Pin to a specific version tag (e.g., nginx:1.25.3-alpine).",
-            )
-        else:
-            self._add(
-                rule_id="IMG-001",
-                severity=MEDIUM,
-                status="pass",
-                category="image-tag",
-                target=ref,
-                detail=f"Image uses explicit tag: {tag}",
-            )
-
-    def _check_digest_pinning(self, ref: str, image: str) -> None:
-        """IMG-002: Check if image uses digest pinning (@sha256:...)."""
-        if "@sha256:" in image:
-            self._add(
-                rule_id="IMG-002",
-                severity=LOW,
-                status="pass",
-                category="image-pinning",
-                target=ref,
-                detail="Image is pinned by digest.",
-            )
-        else:
-            self._add(
-                rule_id="IMG-002",
-                severity=LOW,
-                status="fail",
-                category="image-pinning",
-                target=ref,
-                detail=f"Image '{image}' is not pinned by digest. Tags are mutable and can be overwritten.",
-                remediation="Use digest pinning: image@sha256:<digest>",
-            )
-
-    def _check_root_user(self, ref: str, image: str, user: str) -> None:
-        """IMG-003: Detect images running as root."""
-        runs_as_root = user in ("", "0", "root")
-
-        # Check if this is a known root-default image
-        img_lower = image.lower()
-        is_known_root = any(base in img_lower for base in ROOT_DEFAULT_IMAGES)
-
-        if runs_as_root:
-            severity = HIGH if is_known_root else MEDIUM
-            detail = f"Container runs as root (user='{user or 'unset (root)'}')."
-            if is_known_root:
-                detail += f" '{_image_base(image)}' runs as root by default."
-            self._add(
-                rule_id="IMG-003",
-                severity=severity,
-                status="fail",
-                category="image-user",
-                target=ref,
-                detail=detail,
-                remediation="Set USER in Containerfile or securityContext.runAsUser to non-root UID.",
-            )
-        else:
-            self._add(
-                rule_id="IMG-003",
-                severity=MEDIUM,
-                status="pass",
-                category="image-user",
-                target=ref,
-                detail=f"Container runs as non-root user: {user}",
-            )
-
-    def _check_distroless(self, ref: str, image: str) -> None:
-        """IMG-004: Classify image as distroless/minimal vs full OS."""
-        img_lower = image.lower()
-
-        is_distroless = any(p in img_lower for p in DISTROLESS_PATTERNS)
-        is_minimal = any(b in img_lower for b in MINIMAL_BASES)
-
-        if is_distroless:
-            self._add(
-                rule_id="IMG-004",
-                severity=INFO,
-                status="pass",
-                category="image-base",
-                target=ref,
-                detail=f"Image uses distroless/minimal base: {image}",
-            )
-        elif is_minimal:
-            self._add(
-                rule_id="IMG-004",
-                severity=LOW,
-                status="pass",
-                category="image-base",
-                target=ref,
-                detail="Image uses minimal base (alpine/busybox/scratch).",
-            )
-        else:
-            # Full OS image -- larger attack surface
-            self._add(
-                rule_id="IMG-004",
-                severity=LOW,
-                status="fail",
-                category="image-base",
-                target=ref,
-                detail=f"Image '{_image_base(image)}' appears to use a full OS base. "
-                "Full OS images have larger attack surface (shell, package managers, etc.).",
-                remediation="Consider migrating to distroless or alpine-based images.",
-            )
-
-    def _check_base_age(self, ref: str, image: str) -> None:
-        """IMG-005: Heuristic check for outdated base versions from tag."""
-        tag = _extract_tag(image)
-        if not tag or tag == "latest":
-            return
-
-        # Try to parse major version from tag
-        version_match = re.match(r"(\d+)(?:\.(\d+))?", tag)
-        if not version_match:
-            return
-
-        major = int(version_match.group(1))
-        img_lower = image.lower()
-
-        # Known EOL version checks
-        eol_checks = {
-            "python": (3, 8, "Python 3.8 is EOL"),
-            "node": (16, None, "Node.js 16 is EOL"),
-            "golang": (1, 19, "Go 1.19 is EOL"),
-            "ruby": (2, 7, "Ruby 2.7 is EOL"),
-            "php": (7, None, "PHP 7.x is EOL"),
-            "ubuntu": (20, None, "Ubuntu 20.04 LTS nearing EOL"),
-            "debian": (10, None, "Debian 10 (buster) is EOL"),
-            "centos": (7, None, "CentOS 7 is EOL"),
-            "alpine": (3, 15, "Alpine 3.15 is EOL"),
-        }
-
-        for base, (eol_major, eol_minor, msg) in eol_checks.items():
-            if base in img_lower:
-                minor = int(version_match.group(2)) if version_match.group(2) else None
-                is_old = False
-                if major < eol_major or major == eol_major and eol_minor and minor is not None and minor <= eol_minor:
-                    is_old = True
-
-                if is_old:
-                    self._add(
-                        rule_id="IMG-005",
-                        severity=MEDIUM,
-                        status="fail",
-                        category="image-age",
-                        target=ref,
-                        detail=f"{msg}. Image: {image}",
-                        remediation=f"Upgrade to a supported {base} version.",
-                    )
-                break
-
-    def _check_known_risky_bases(self, ref: str, image: str) -> None:
-        """IMG-006: Flag images known for security issues."""
-        img_lower = image.lower()
-
-        risky = {
-            "phpmyadmin": "phpMyAdmin images are frequent attack targets.",
-            "wordpress": "WordPress images require careful hardening.",
-            "jenkins/jenkins": "Jenkins images often run as root with broad permissions.",
-            "mongo:": "MongoDB images run without auth by default.",
-            "redis:": "Redis images have no auth by default.",
-            "elasticsearch": "Elasticsearch images run as root on older versions.",
-        }
-
-        for pattern, msg in risky.items():
-            if pattern in img_lower:
-                self._add(
-                    rule_id="IMG-006",
-                    severity=LOW,
-                    status="warning",
-                    category="image-risk",
-                    target=ref,
-                    detail=f"{msg} Image: {image}",
-                    remediation="Ensure proper network isolation and authentication configuration.",
-                )
-                break
-
-    def _check_layer_bloat(self, ref: str, image: str, layer_count: int) -> None:
-        """IMG-007: Detect bloated images (many layers)."""
-        if layer_count > 30:
-            self._add(
-                rule_id="IMG-007",
-                severity=LOW,
-                status="fail",
-                category="image-bloat",
-                target=ref,
-                detail=f"Image has {layer_count} layers, indicating possible bloat.",
-                remediation="Use multi-stage builds and minimize RUN instructions.",
-            )
-
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
 
-    def _add(self, **kwargs) -> None:
-        self.findings.append(ImageFinding(**kwargs))
-
     def _build_result(self, images: list[dict]) -> dict:
         findings = [f.to_dict() for f in self.findings]
         passed = sum(1 for f in findings if f["status"] == "pass")
@@ -360,6 +188,242 @@ def _build_result(self, images: list[dict]) -> dict:
         }
 
 
+# ------------------------------------------------------------------
+# Result cache
+# ------------------------------------------------------------------
+
+_cached_ruleset: tuple | None = None
+
+
+def _current_ruleset() -> tuple:
+    """Snapshot of the rule tables; a change drops every cached result."""
+    global _cached_ruleset
+    ruleset = (
+        DISTROLESS_PATTERNS,
+        ROOT_DEFAULT_IMAGES,
+        MINIMAL_BASES,
+        EOL_VERSIONS,
+        RISKY_BASES,
+        LAYER_BLOAT_THRESHOLD,
+    )
+    if ruleset != _cached_ruleset:
+        if _cached_ruleset is not None:
+            logger.info("Image rule set changed, clearing image result cache")
+        _evaluate_image.cache_clear()
+        _cached_ruleset = ruleset
+    return ruleset
+
+
+def clear_image_cache() -> None:
+    """Drop all cached image results."""
+    _evaluate_image.cache_clear()
+
+
+@lru_cache(maxsize=IMAGE_RESULT_CACHE_SIZE)
+def _evaluate_image(image: str, user: str, layer_count: int, ruleset: tuple) -> tuple[dict, ...]:
+    """Run every check for one image; returns target-less finding templates.
+
+    ``ruleset`` is part of the cache key only -- the checks read the
+    module-level tables directly.
+    """
+    out: list[dict] = []
+    img_lower = image.lower()
+    tag = _extract_tag(image)
+
+    _check_tag(out, image, tag)
+    _check_digest_pinning(out, image)
+    _check_root_user(out, image, img_lower, user)
+    _check_distroless(out, image, img_lower)
+    _check_base_age(out, image, img_lower, tag)
+    _check_known_risky_bases(out, image, img_lower)
+    if layer_count:
+        _check_layer_bloat(out, layer_count)
+    return tuple(out)
+
+
+# ------------------------------------------------------------------
+# Checks
+# ------------------------------------------------------------------
+
+
+def _finding(out: list[dict], **kwargs) -> None:
+    out.append(kwargs)
+
+
+def _check_tag(out: list[dict], image: str, tag: str | None) -> None:
+    """IMG-001: Detect :latest or untagged images."""
+    if tag is None or tag == "latest":
+        _finding(
+            out,
+            rule_id="IMG-001",
+            severity=MEDIUM,
+            status="fail",
+            category="image-tag",
+            detail=f"Image '{image}' uses {'no tag' if tag is None else ':latest'}. "
+            "This makes builds non-reproducible and complicates rollback.",
+            remediation="Pin to a specific version tag (e.g., nginx:1.25.3-alpine).",
+        )
+    else:
+        _finding(
+            out,
+            rule_id="IMG-001",
+            severity=MEDIUM,
+            status="pass",
+            category="image-tag",
+            detail=f"Image uses explicit tag: {tag}",
+        )
+
+
+def _check_digest_pinning(out: list[dict], image: str) -> None:
+    """IMG-002: Check if image uses digest pinning (@sha256:...)."""
+    if "@sha256:" in image:
+        _finding(
+            out,
+            rule_id="IMG-002",
+            severity=LOW,
+            status="pass",
+            category="image-pinning",
+            detail="Image is pinned by digest.",
+        )
+    else:
+        _finding(
+            out,
+            rule_id="IMG-002",
+            severity=LOW,
+            status="fail",
+            category="image-pinning",
+            detail=f"Image '{image}' is not pinned by digest. Tags are mutable and can be overwritten.",
+            remediation="Use digest pinning: image@sha256:<digest>",
+        )
+
+
+def _check_root_user(out: list[dict], image: str, img_lower: str, user: str) -> None:
+    """IMG-003: Detect images running as root."""
+    runs_as_root = user in ("", "0", "root")
+
+    # Check if this is a known root-default image
+    is_known_root = any(base in img_lower for base in ROOT_DEFAULT_IMAGES)
+
+    if runs_as_root:
+        severity = HIGH if is_known_root else MEDIUM
+        detail = f"Container runs as root (user='{user or 'unset (root)'}')."
+        if is_known_root:
+            detail += f" '{_image_base(image)}' runs as root by default."
+        _finding(
+            out,
+            rule_id="IMG-003",
+            severity=severity,
+            status="fail",
+            category="image-user",
+            detail=detail,
+            remediation="Set USER in Containerfile or securityContext.runAsUser to non-root UID.",
+        )
+    else:
+        _finding(
+            out,
+            rule_id="IMG-003",
+            severity=MEDIUM,
+            status="pass",
+            category="image-user",
+            detail=f"Container runs as non-root user: {user}",
+        )
+
+
+def _check_distroless(out: list[dict], image: str, img_lower: str) -> None:
+    """IMG-004: Classify image as distroless/minimal vs full OS."""
+    is_distroless = any(p in img_lower for p in DISTROLESS_PATTERNS)
+    is_minimal = any(b in img_lower for b in MINIMAL_BASES)
+
+    if is_distroless:
+        _finding(
+            out,
+            rule_id="IMG-004",
+            severity=INFO,
+            status="pass",
+            category="image-base",
+            detail=f"Image uses distroless/minimal base: {image}",
+        )
+    elif is_minimal:
+        _finding(
+            out,
+            rule_id="IMG-004",
+            severity=LOW,
+            status="pass",
+            category="image-base",
+            detail="Image uses minimal base (alpine/busybox/scratch).",
+        )
+    else:
+        # Full OS image -- larger attack surface
+        _finding(
+            out,
+            rule_id="IMG-004",
+            severity=LOW,
+            status="fail",
+            category="image-base",
+            detail=f"Image '{_image_base(image)}' appears to use a full OS base. "
+            "Full OS images have larger attack surface (shell, package managers, etc.).",
+            remediation="Consider migrating to distroless or alpine-based images.",
+        )
+
+
+def _check_base_age(out: list[dict], image: str, img_lower: str, tag: str | None) -> None:
+    """IMG-005: Heuristic check for outdated base versions from tag."""
+    if not tag or tag == "latest":
+        return
+
+    # Try to parse major version from tag
+    version_match = _VERSION_RE.match(tag)
+    if not version_match:
+        return
+
+    major = int(version_match.group(1))
+    minor = int(version_match.group(2)) if version_match.group(2) else None
+
+    for base, eol_major, eol_minor, msg in EOL_VERSIONS:
+        if base in img_lower:
+            if major < eol_major or major == eol_major and eol_minor and minor is not None and minor <= eol_minor:
+                _finding(
+                    out,
+                    rule_id="IMG-005",
+                    severity=MEDIUM,
+                    status="fail",
+                    category="image-age",
+                    detail=f"{msg}. Image: {image}",
+                    remediation=f"Upgrade to a supported {base} version.",
+                )
+            break
+
+
+def _check_known_risky_bases(out: list[dict], image: str, img_lower: str) -> None:
+    """IMG-006: Flag images known for security issues."""
+    for pattern, msg in RISKY_BASES:
+        if pattern in img_lower:
+            _finding(
+                out,
+                rule_id="IMG-006",
+                severity=LOW,
+                status="warning",
+                category="image-risk",
+                detail=f"{msg} Image: {image}",
+                remediation="Ensure proper network isolation and authentication configuration.",
+            )
+            break
+
+
+def _check_layer_bloat(out: list[dict], layer_count: int) -> None:
+    """IMG-007: Detect bloated images (many layers)."""
+    if layer_count > LAYER_BLOAT_THRESHOLD:
+        _finding(
+            out,
+            rule_id="IMG-007",
+            severity=LOW,
+            status="fail",
+            category="image-bloat",
+            detail=f"Image has {layer_count} layers, indicating possible bloat.",
+            remediation="Use multi-stage builds and minimize RUN instructions.",
+        )
+
+
 # ------------------------------------------------------------------
 # Module-level helpers
 # ------------------------------------------------------------------
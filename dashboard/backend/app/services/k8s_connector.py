@@ -306,30 +306,40 @@ def list_deployments(self, namespace: str | None = None) -> list[dict]:
     def list_cluster_role_bindings(self) -> list[dict]:
         """List ClusterRoleBindings for RBAC analysis."""
         rbac_v1 = k8s_client.RbacAuthorizationV1Api(self.connect())
-        bindings = rbac_v1.list_cluster_role_binding()
+        return [_binding_to_dict(b) for b in _paginate(rbac_v1.list_cluster_role_binding)]
+
+    def list_role_bindings(self, namespace: str | None = None) -> list[dict]:
+        """List RoleBindings (all namespaces unless one is given)."""
+        rbac_v1 = k8s_client.RbacAuthorizationV1Api(self.connect())
+        if namespace:
+            items = _paginate(rbac_v1.list_namespaced_role_binding, namespace)
+        else:
+            items = _paginate(rbac_v1.list_role_binding_for_all_namespaces)
+        return [_binding_to_dict(b) for b in items]
+
+    def list_cluster_roles(self) -> list[dict]:
+        """List ClusterRoles with their rules and aggregation selectors."""
+        rbac_v1 = k8s_client.RbacAuthorizationV1Api(self.connect())
         result = []
-        for b in bindings.items:
-            subjects = []
-            for s in b.subjects or []:
-                subjects.append(
-                    {
-                        "kind": s.kind,
-                        "name": s.name,
-                        "namespace": s.namespace,
-                    }
-                )
-            result.append(
-                {
-                    "name": b.metadata.name,
-                    "role_ref": {
-                        "kind": b.role_ref.kind,
-                        "name": b.role_ref.name,
-                    },
-                    "subjects": subjects,
-                }
-            )
+        for r in _paginate(rbac_v1.list_cluster_role):
+            role = _role_to_dict(r)
+            selectors = []
+            if r.aggregation_rule:
+                for sel in r.aggregation_rule.cluster_role_selectors or []:
+                    selectors.append(dict(sel.match_labels or {}))
+            role["aggregation_selectors"] = selectors
+            result.append(role)
         return result
 
+    def list_roles(self, namespace: str | None = None) -> list[dict]:
+        """List namespaced Roles (all namespaces unless one is given)."""
+        rbac_v1 = k8s_client.RbacAuthorizationV1Api(self.connect())
+        if namespace:
+            items = _paginate(rbac_v1.list_namespaced_role, namespace)
+        else:
+            items = _paginate(rbac_v1.list_role_for_all_namespaces)
+        return [_role_to_dict(r) for r in items]
+
     # ------------------------------------------------------------------
     # Discovery: NetworkPolicies
     # ------------------------------------------------------------------
@@ -358,9 +368,58 @@ def list_network_policies(self, namespace: str | None = None) -> list[dict]:
 
 
 # ------------------------------------------------------------------
-# Module-level helpers (used by K8sConnector._extract_security_context)
+# Module-level helpers
 # ------------------------------------------------------------------
 
+# Page size for list calls that can return tens of thousands of objects
+LIST_PAGE_SIZE = 500
+
+
+def _paginate(list_fn, *args, **kwargs):
+    """Yield items from a K8s list call, following ``continue`` tokens."""
+    token = None
+    while True:
+        if token:
+            page = list_fn(*args, limit=LIST_PAGE_SIZE, _continue=token, **kwargs)
+        else:
+            page = list_fn(*args, limit=LIST_PAGE_SIZE, **kwargs)
+        yield from page.items or []
+        token = page.metadata._continue if page.metadata else None
+        if not token:
+            break
+
+
+def _binding_to_dict(b) -> dict:
+    """Convert a (Cluster)RoleBinding object to a plain dict."""
+    return {
+        "name": b.metadata.name,
+        "namespace": b.metadata.namespace,
+        "role_ref": {
+            "kind": b.role_ref.kind,
+            "name": b.role_ref.name,
+        },
+        "subjects": [{"kind": s.kind, "name": s.name, "namespace": s.namespace} for s in (b.subjects or [])],
+    }
+
+
+def _role_to_dict(r) -> dict:
+    """Convert a (Cluster)Role object to a plain dict."""
+    return {
+        "name": r.metadata.name,
+        "namespace": r.metadata.namespace,
+        "labels": dict(r.metadata.labels or {}),
+        "rules": [
+            {
+                "verbs": list(rule.verbs or []),
+                "api_groups": list(rule.api_groups or []),
+                "resources": list(rule.resources or []),
+                "resource_names": list(rule.resource_names or []),
+                "non_resource_urls": list(rule.non_resource_urls or []),
+            }
+            for rule in (r.rules or [])
+        ],
+    }
+
 
 def _extract_sc_user_fields(sc) -> dict:
     """Extract user/group fields from a K8s SecurityContext object."""
@@ -3,6 +3,7 @@
 import logging
 
 from app.services.k8s_connector import K8sConnector
+from app.services.rbac_graph import RbacGraph
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,12 @@ def run_all_checks(self, namespace: str | None = None) -> dict:
         network_policies = self.connector.list_network_policies(namespace=namespace)
         namespaces = self.connector.list_namespaces()
         rbac_bindings = self.connector.list_cluster_role_bindings()
+        rbac_graph = RbacGraph(
+            roles=self.connector.list_roles(),
+            cluster_roles=self.connector.list_cluster_roles(),
+            role_bindings=self.connector.list_role_bindings(),
+            cluster_role_bindings=rbac_bindings,
+        )
 
         # Pod security checks
         for pod in pods:
@@ -44,6 +51,7 @@ def run_all_checks(self, namespace: str | None = None) -> dict:
 
         # RBAC checks
         self._check_rbac(rbac_bindings)
+        self._check_rbac_privileges(rbac_graph)
 
         # Calculate score
         total = len(self.findings)
@@ -66,6 +74,7 @@ def run_all_checks(self, namespace: str | None = None) -> dict:
                 "namespaces": len(namespaces),
                 "network_policies": len(network_policies),
                 "rbac_bindings": len(rbac_bindings),
+                "rbac_bindings_total": rbac_graph.binding_count,
             },
         }
 
@@ -612,6 +621,49 @@ def _check_rbac(self, bindings: list[dict]) -> None:
                             remediation="Remove this binding. Use specific user/group bindings.",
                         )
 
+    def _check_rbac_privileges(self, graph: RbacGraph) -> None:
+        """Check effective permissions for escalation paths and wildcard roles.
+
+        cluster-admin itself is covered by K8S-RBAC-001/002; built-in
+        ``system:`` subjects and kube-system ServiceAccounts are skipped.
+        A subject reported for wildcard permissions gets no K8S-RBAC-003
+        findings, since '*' already includes escalate, bind and impersonate.
+        """
+        wildcard_subjects: set[str] = set()
+        # Wildcard entries first, so they are seen before the verbs they cover
+        for entry in sorted(graph.privileged_subjects(), key=lambda e: e["reason"] != "wildcard"):
+            if entry["name"].startswith("system:") or entry["namespace"] == "kube-system":
+                continue
+            via = [v for v in entry["via"] if v["role"] != "cluster-admin"]
+            if not via:
+                continue
+            subject = f"{entry['kind'].lower()}/{entry['namespace'] + '/' if entry['namespace'] else ''}{entry['name']}"
+            bindings = ", ".join(sorted({f"{v['binding']} ({v['role']}, {v['scope']})" for v in via}))
+
+            if entry["reason"] == "wildcard":
+                wildcard_subjects.add(subject)
+                self._add_finding(
+                    rule_id="K8S-RBAC-004",
+                    title="Subject has wildcard permissions on all resources",
+                    severity=CRITICAL,
+                    status="fail",
+                    category="rbac",
+                    target=subject,
+                    detail=f"'*' verbs on '*' resources in all API groups via: {bindings}.",
+                    remediation="Replace wildcard rules with explicit verbs and resources.",
+                )
+            elif subject not in wildcard_subjects:
+                self._add_finding(
+                    rule_id="K8S-RBAC-003",
+                    title=f"Subject can {entry['reason']} {entry['resource']}",
+                    severity=HIGH,
+                    status="fail",
+                    category="rbac",
+                    target=subject,
+                    detail=f"'{entry['reason']}' on {entry['resource']} allows privilege escalation. Granted via: {bindings}.",
+                    remediation=f"Remove the '{entry['reason']}' verb unless the subject manages RBAC.",
+                )
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
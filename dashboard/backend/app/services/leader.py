@@ -0,0 +1,241 @@
+"""Database-backed leader election so one replica runs the scheduler."""
+
+import asyncio
+import logging
+import os
+import secrets
+import socket
+import zlib
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import case, or_, select, text, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.config import get_settings
+from app.database import engine, get_session_context
+from app.metrics import leader_transitions_total, scheduler_is_leader
+from app.models import LeaderLease
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+Callback = Callable[[], Awaitable[None]]
+
+
+class LeaderElector:
+    """Elects one replica per role and runs callbacks on gaining/losing it.
+
+    PostgreSQL: a session-level advisory lock held on a dedicated
+    connection decides; it is released the moment the holder's connection
+    dies, so a standby takes over within one renew interval. Other
+    databases: the ``leader_leases`` row is claimed with a conditional
+    UPDATE and must be renewed before LEADER_LEASE_TTL runs out.
+
+    In both cases the lease row names the current holder for the status
+    endpoint, and a leader that cannot reach the database steps down.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.identity = f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(4)}"
+        self.is_leader = False
+        self.leader_since: datetime | None = None
+        self._on_elected: Callback | None = None
+        self._on_demoted: Callback | None = None
+        self._task: asyncio.Task | None = None
+        self._lock_conn: AsyncConnection | None = None
+
+    @property
+    def backend(self) -> str:
+        return "advisory_lock" if engine.dialect.name == "postgresql" else "lease"
+
+    @property
+    def lock_key(self) -> int:
+        return zlib.crc32(f"leader:{self.name}".encode())
+
+    async def start(self, on_elected: Callback, on_demoted: Callback) -> None:
+        """Run one election round now, then keep renewing in the background."""
+        self._on_elected = on_elected
+        self._on_demoted = on_demoted
+        await self._round()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop campaigning and hand leadership over immediately."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self.is_leader:
+            await self._demote()
+            try:
+                await self._release()
+            except Exception as e:
+                logger.warning(f"Failed to release {self.name} leadership: {e}")
+
+    def status(self) -> dict:
+        return {
+            "role": self.name,
+            "identity": self.identity,
+            "backend": self.backend,
+            "is_leader": self.is_leader,
+            "leader_since": self.leader_since.isoformat() if self.leader_since else None,
+        }
+
+    async def describe(self) -> dict:
+        """This replica's status plus the current holder of the lease row."""
+        async with get_session_context() as session:
+            lease = await session.get(LeaderLease, self.name)
+        info = {**self.status(), "leader": None, "lease_renewed_at": None, "lease_expires_at": None}
+        if lease is not None:
+            expires_at = lease.expires_at if lease.expires_at.tzinfo else lease.expires_at.replace(tzinfo=UTC)
+            info["leader"] = lease.holder if expires_at > datetime.now(UTC) else None
+            info["lease_renewed_at"] = lease.renewed_at.isoformat()
+            info["lease_expires_at"] = expires_at.isoformat()
+        return info
+
+    # ------------------------------------------------------------------
+    # Election rounds
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(settings.leader_renew_interval)
+            await self._round()
+
+    async def _round(self) -> None:
+        try:
+            if self.backend == "advisory_lock":
+                held = await self._hold_advisory_lock()
+                if held:
+                    await self._claim_lease(force=True)
+            else:
+                held = await self._claim_lease(force=False)
+        except Exception as e:
+            logger.error(f"{self.name} leader election round failed: {e}")
+            await self._drop_lock_conn()
+            held = False
+
+        if held and not self.is_leader:
+            await self._promote()
+        elif not held and self.is_leader:
+            await self._demote()
+
+    async def _promote(self) -> None:
+        self.is_leader = True
+        self.leader_since = datetime.now(UTC)
+        scheduler_is_leader.set(1)
+        leader_transitions_total.labels(event="elected").inc()
+        logger.info(f"{self.identity} elected {self.name} leader ({self.backend})")
+        if self._on_elected is not None:
+            try:
+                await self._on_elected()
+            except Exception as e:
+                logger.error(f"{self.name} leader start-up failed: {e}")
+
+    async def _demote(self) -> None:
+        self.is_leader = False
+        self.leader_since = None
+        scheduler_is_leader.set(0)
+        leader_transitions_total.labels(event="demoted").inc()
+        logger.warning(f"{self.identity} is no longer {self.name} leader")
+        if self._on_demoted is not None:
+            try:
+                await self._on_demoted()
+            except Exception as e:
+                logger.error(f"{self.name} leader shutdown failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Backends
+    # ------------------------------------------------------------------
+
+    async def _hold_advisory_lock(self) -> bool:
+        """Take (or confirm we still hold) the PostgreSQL advisory lock."""
+        if self._lock_conn is not None:
+            await self._lock_conn.execute(text("SELECT 1"))
+            await self._lock_conn.commit()
+            return True
+
+        conn = await engine.connect()
+        try:
+            result = await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": self.lock_key})
+            acquired = bool(result.scalar())
+            # The lock is session-level; do not sit idle in a transaction
+            await conn.commit()
+        except Exception:
+            await conn.invalidate()
+            await conn.close()
+            raise
+        if not acquired:
+            await conn.close()
+            return False
+        self._lock_conn = conn
+        return True
+
+    async def _drop_lock_conn(self) -> None:
+        # Never return a connection that may still hold the lock to the pool
+        if self._lock_conn is None:
+            return
+        conn, self._lock_conn = self._lock_conn, None
+        try:
+            await conn.invalidate()
+            await conn.close()
+        except Exception as e:
+            logger.debug(f"Discarding {self.name} lock connection: {e}")
+
+    async def _claim_lease(self, force: bool) -> bool:
+        """Claim or renew the lease row; ``force`` when the advisory lock is held."""
+        now = datetime.now(UTC)
+        expires = now + timedelta(seconds=settings.leader_lease_ttl)
+        condition = LeaderLease.name == self.name
+        if not force:
+            condition = condition & or_(LeaderLease.holder == self.identity, LeaderLease.expires_at < now)
+
+        async with get_session_context() as session:
+            result = await session.execute(
+                update(LeaderLease)
+                .where(condition)
+                .values(
+                    acquired_at=case((LeaderLease.holder == self.identity, LeaderLease.acquired_at), else_=now),
+                    holder=self.identity,
+                    renewed_at=now,
+                    expires_at=expires,
+                )
+            )
+            if result.rowcount:
+                return True
+            if await session.scalar(select(LeaderLease.name).where(LeaderLease.name == self.name)):
+                return False
+            session.add(
+                LeaderLease(name=self.name, holder=self.identity, acquired_at=now, renewed_at=now, expires_at=expires)
+            )
+            try:
+                await session.flush()
+            except IntegrityError:
+                # Another replica inserted the row first
+                await session.rollback()
+                return False
+            return True
+
+    async def _release(self) -> None:
+        async with get_session_context() as session:
+            await session.execute(
+                update(LeaderLease)
+                .where(LeaderLease.name == self.name, LeaderLease.holder == self.identity)
+                .values(expires_at=datetime.now(UTC))
+            )
+        if self._lock_conn is not None:
+            conn, self._lock_conn = self._lock_conn, None
+            try:
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": self.lock_key})
+                await conn.commit()
+                await conn.close()
+            except Exception:
+                self._lock_conn = conn
+                await self._drop_lock_conn()
+
+
+# Singleton instance
+scheduler_leader = LeaderElector("scheduler")
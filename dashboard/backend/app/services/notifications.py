@@ -1,79 +1,332 @@
 """Email notification service for scan events."""
 
+import asyncio
+import contextlib
 import logging
 import smtplib
+import threading
+import time
+from datetime import UTC, datetime
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from html import escape
 
 from app.config import get_settings
+from app.metrics import notifications_pending, notifications_sent_total
+from app.models import ScanSchedule
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# notification_channels entry for the default recipient; "email:<address>" adds others
+EMAIL_CHANNEL = "email"
 
-def send_scan_notification(
-    host_name: str,
-    scanner: str,
-    status: str,
-    score: int | None = None,
-    passed: int = 0,
-    failed: int = 0,
-    error_message: str | None = None,
-) -> bool:
-    """Send email notification about scan completion or failure."""
-    to_email = settings.notification_email
-    if not to_email or not settings.smtp_user or not settings.smtp_password:
-        logger.warning("Email notification skipped: SMTP not configured")
-        return False
+_CELL = "padding:4px 12px;"
+_LABEL = "padding:4px 12px;font-weight:bold;"
+
+
+class ScanEvent:
+    """A finished scan, as reported in a notification."""
+
+    __slots__ = ("host_name", "scanner", "status", "score", "passed", "failed", "error_message", "finished_at")
+
+    def __init__(
+        self,
+        host_name: str,
+        scanner: str,
+        status: str,
+        score: int | None = None,
+        passed: int = 0,
+        failed: int = 0,
+        error_message: str | None = None,
+    ):
+        self.host_name = host_name
+        self.scanner = scanner
+        self.status = status
+        self.score = score
+        self.passed = passed
+        self.failed = failed
+        self.error_message = error_message
+        self.finished_at = datetime.now(UTC)
 
-    subject = f"[Test-Hard] Scan {status}: {scanner} on {host_name}"
 
-    if status == "completed":
+def smtp_configured() -> bool:
+    return bool(settings.smtp_user and settings.smtp_password)
+
+
+def recipients_for(event: ScanEvent, schedule: ScanSchedule | None = None) -> list[str]:
+    """Addresses to notify about ``event``.
+
+    Manual scans notify ``notification_email``. Scheduled scans follow the
+    schedule: ``notify_on_completion``/``notify_on_failure`` select the
+    outcomes and ``notification_channels`` the recipients, where "email"
+    is ``notification_email``, "email:<address>" is another address and an
+    empty list means "email".
+    """
+    channels = [EMAIL_CHANNEL]
+    if schedule is not None:
+        wanted = schedule.notify_on_completion if event.status == "completed" else schedule.notify_on_failure
+        if not wanted:
+            return []
+        channels = schedule.notification_channels or channels
+
+    recipients = []
+    for channel in channels:
+        kind, _, address = channel.partition(":")
+        if kind != EMAIL_CHANNEL:
+            continue  # other channels have no sender yet
+        address = address.strip() or settings.notification_email
+        if address and address not in recipients:
+            recipients.append(address)
+    return recipients
+
+
+def _scan_message(event: ScanEvent) -> tuple[str, str, str]:
+    """Subject, text and HTML bodies for one scan."""
+    subject = f"[Test-Hard] Scan {event.status}: {event.scanner} on {event.host_name}"
+    if event.status == "completed":
         body = (
             f"Scan completed successfully.\n\n"
-            f"Host: {host_name}\n"
-            f"Scanner: {scanner}\n"
-            f"Score: {score}\n"
-            f"Passed: {passed}\n"
-            f"Failed: {failed}\n"
+            f"Host: {event.host_name}\n"
+            f"Scanner: {event.scanner}\n"
+            f"Score: {event.score}\n"
+            f"Passed: {event.passed}\n"
+            f"Failed: {event.failed}\n"
         )
         html = (
             f"<h2>Scan Completed</h2>"
             f"<table style='border-collapse:collapse;'>"
-            f"<tr><td style='padding:4px 12px;font-weight:bold;'>Host</td><td style='padding:4px 12px;'>{host_name}</td></tr>"
-            f"<tr><td style='padding:4px 12px;font-weight:bold;'>Scanner</td><td style='padding:4px 12px;'>{scanner}</td></tr>"
-            f"<tr><td style='padding:4px 12px;font-weight:bold;'>Score</td><td style='padding:4px 12px;'>{score}</td></tr>"
-            f"<tr><td style='padding:4px 12px;font-weight:bold;'>Passed</td><td style='padding:4px 12px;color:green;'>{passed}</td></tr>"
-            f"<tr><td style='padding:4px 12px;font-weight:bold;'>Failed</td><td style='padding:4px 12px;color:red;'>{failed}</td></tr>"
+            f"<tr><td style='{_LABEL}'>Host</td><td style='{_CELL}'>{escape(event.host_name)}</td></tr>"
+            f"<tr><td style='{_LABEL}'>Scanner</td><td style='{_CELL}'>{escape(event.scanner)}</td></tr>"
+            f"<tr><td style='{_LABEL}'>Score</td><td style='{_CELL}'>{event.score}</td></tr>"
+            f"<tr><td style='{_LABEL}'>Passed</td><td style='{_CELL}color:green;'>{event.passed}</td></tr>"
+            f"<tr><td style='{_LABEL}'>Failed</td><td style='{_CELL}color:red;'>{event.failed}</td></tr>"
             f"</table>"
         )
     else:
-        body = f"Scan failed.\n\nHost: {host_name}\nScanner: {scanner}\nError: {error_message or 'Unknown error'}\n"
+        error = event.error_message or "Unknown error"
+        body = f"Scan failed.\n\nHost: {event.host_name}\nScanner: {event.scanner}\nError: {error}\n"
         html = (
             f"<h2 style='color:red;'>Scan Failed</h2>"
             f"<table style='border-collapse:collapse;'>"
-            f"<tr><td style='padding:4px 12px;font-weight:bold;'>Host</td><td style='padding:4px 12px;'>{host_name}</td></tr>"
-            f"<tr><td style='padding:4px 12px;font-weight:bold;'>Scanner</td><td style='padding:4px 12px;'>{scanner}</td></tr>"
-            f"<tr><td style='padding:4px 12px;font-weight:bold;'>Error</td><td style='padding:4px 12px;color:red;'>{error_message or 'Unknown error'}</td></tr>"
+            f"<tr><td style='{_LABEL}'>Host</td><td style='{_CELL}'>{escape(event.host_name)}</td></tr>"
+            f"<tr><td style='{_LABEL}'>Scanner</td><td style='{_CELL}'>{escape(event.scanner)}</td></tr>"
+            f"<tr><td style='{_LABEL}'>Error</td><td style='{_CELL}color:red;'>{escape(error)}</td></tr>"
             f"</table>"
         )
+    return subject, body, html
 
-    try:
-        msg = MIMEMultipart("alternative")
-        msg["Subject"] = subject
-        msg["From"] = settings.smtp_from or settings.smtp_user
-        msg["To"] = to_email
 
-        msg.attach(MIMEText(body, "plain"))
-        msg.attach(MIMEText(html, "html"))
+def _digest_message(events: list[ScanEvent]) -> tuple[str, str, str]:
+    """Subject, text and HTML bodies summarizing several scans."""
+    if len(events) == 1:
+        return _scan_message(events[0])
+    failed = sum(1 for e in events if e.status != "completed")
+    subject = f"[Test-Hard] {len(events)} scans finished ({failed} failed)"
+
+    lines = [f"{len(events)} scans finished, {failed} failed.", ""]
+    rows = []
+    for e in events:
+        outcome = f"score {e.score}, {e.passed} passed, {e.failed} failed" if e.status == "completed" else "FAILED"
+        if e.status != "completed":
+            outcome += f": {e.error_message or 'Unknown error'}"
+        lines.append(f"{e.finished_at:%H:%M:%S}  {e.host_name}  {e.scanner}  {outcome}")
+        color = "" if e.status == "completed" else "color:red;"
+        rows.append(
+            f"<tr><td style='{_CELL}'>{e.finished_at:%H:%M:%S}</td>"
+            f"<td style='{_CELL}'>{escape(e.host_name)}</td><td style='{_CELL}'>{escape(e.scanner)}</td>"
+            f"<td style='{_CELL}{color}'>{escape(outcome)}</td></tr>"
+        )
+    html = (
+        f"<h2>{len(events)} Scans Finished</h2>"
+        f"<table style='border-collapse:collapse;'>"
+        f"<tr><th style='{_LABEL}'>Time (UTC)</th><th style='{_LABEL}'>Host</th>"
+        f"<th style='{_LABEL}'>Scanner</th><th style='{_LABEL}'>Result</th></tr>"
+        f"{''.join(rows)}</table>"
+    )
+    return subject, "\n".join(lines) + "\n", html
+
+
+def _build_email(subject: str, body: str, html: str, to_email: str) -> MIMEMultipart:
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg["From"] = settings.smtp_from or settings.smtp_user
+    msg["To"] = to_email
+    msg.attach(MIMEText(body, "plain"))
+    msg.attach(MIMEText(html, "html"))
+    return msg
+
+
+class SMTPConnection:
+    """One SMTP session (STARTTLS and login done once) reused across messages.
+
+    Sends are serialized. The session is reopened when the server has
+    dropped it or it sat idle longer than ``idle_timeout`` seconds.
+    """
+
+    def __init__(self, idle_timeout: float):
+        self.idle_timeout = idle_timeout
+        self.connects = 0
+        self._server: smtplib.SMTP | None = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    def send(self, msg: MIMEMultipart, recipients: list[str]) -> None:
+        with self._lock:
+            if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+                self._close()
+            try:
+                self._session().sendmail(msg["From"], recipients, msg.as_string())
+            except (smtplib.SMTPServerDisconnected, ConnectionError):
+                # Stale session: reconnect once
+                self._close()
+                self._session().sendmail(msg["From"], recipients, msg.as_string())
+            self._last_used = time.monotonic()
 
-        with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-            server.starttls()
-            server.login(settings.smtp_user, settings.smtp_password)
-            server.sendmail(msg["From"], [to_email], msg.as_string())
+    def close(self) -> None:
+        with self._lock:
+            self._close()
 
-        logger.info(f"Notification email sent to {to_email} for {scanner} scan on {host_name}")
-        return True
+    def _session(self) -> smtplib.SMTP:
+        if self._server is None:
+            server = smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=settings.smtp_timeout)
+            try:
+                if settings.smtp_starttls:
+                    server.starttls()
+                server.login(settings.smtp_user, settings.smtp_password)
+            except Exception:
+                server.close()
+                raise
+            self._server = server
+            self.connects += 1
+        return self._server
+
+    def _close(self) -> None:
+        if self._server is not None:
+            with contextlib.suppress(Exception):
+                self._server.quit()
+            self._server.close()
+            self._server = None
+
+
+def send_scan_notification(
+    host_name: str,
+    scanner: str,
+    status: str,
+    score: int | None = None,
+    passed: int = 0,
+    failed: int = 0,
+    error_message: str | None = None,
+) -> bool:
+    """Send email notification about scan completion or failure."""
+    to_email = settings.notification_email
+    if not to_email or not smtp_configured():
+        logger.warning("Email notification skipped: SMTP not configured")
+        return False
+    event = ScanEvent(host_name, scanner, status, score, passed, failed, error_message)
+    return _send([event], to_email)
+
+
+def _send(events: list[ScanEvent], to_email: str) -> bool:
+    try:
+        smtp_connection.send(_build_email(*_digest_message(events), to_email), [to_email])
     except Exception as e:
-        logger.error(f"Failed to send notification email: {e}")
+        notifications_sent_total.labels(result="failed").inc()
+        logger.error(f"Failed to send notification email to {to_email}: {e}")
         return False
+    notifications_sent_total.labels(result="sent").inc()
+    logger.info(f"Notification email sent to {to_email} for {len(events)} scan(s)")
+    return True
+
+
+class NotificationDispatcher:
+    """Sends scan notifications from a background task, as per-recipient digests.
+
+    The first event for a recipient opens a window of ``digest_window``
+    seconds; everything that arrives for that recipient meanwhile goes out
+    as one email when it closes (a single scan keeps the one-scan format).
+    Mail is sent through the shared ``smtp_connection`` on a worker thread,
+    so finishing a scan never waits on SMTP.
+    """
+
+    def __init__(self, digest_window: float, max_size: int):
+        self.digest_window = digest_window
+        self._max_size = max_size
+        self._queue: asyncio.Queue[tuple[str, ScanEvent]] | None = None
+        self._task: asyncio.Task | None = None
+        self._pending: dict[str, list[ScanEvent]] = {}
+        self._due: dict[str, float] = {}
+
+    @property
+    def queue(self) -> asyncio.Queue[tuple[str, ScanEvent]]:
+        # Created lazily so it binds to the running event loop
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self._max_size)
+        return self._queue
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def notify(self, event: ScanEvent, schedule: ScanSchedule | None = None) -> None:
+        """Queue ``event`` for everyone who should hear about it."""
+        if not smtp_configured():
+            return
+        for recipient in recipients_for(event, schedule):
+            if self.running:
+                try:
+                    self.queue.put_nowait((recipient, event))
+                    continue
+                except asyncio.QueueFull:
+                    logger.warning("Notification queue full, sending to %s directly", recipient)
+            await asyncio.to_thread(_send, [event], recipient)
+
+    async def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task and send every open digest now."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        while not self.queue.empty():
+            self._add(*self.queue.get_nowait())
+        await self._send_due(force=True)
+        await asyncio.to_thread(smtp_connection.close)
+
+    def _add(self, recipient: str, event: ScanEvent) -> None:
+        if recipient not in self._pending:
+            self._pending[recipient] = []
+            self._due[recipient] = time.monotonic() + self.digest_window
+        self._pending[recipient].append(event)
+
+    async def _run(self) -> None:
+        while True:
+            timeout = min(self._due.values(), default=None)
+            try:
+                if timeout is None:
+                    self._add(*await self.queue.get())
+                else:
+                    async with asyncio.timeout(max(timeout - time.monotonic(), 0)):
+                        self._add(*await self.queue.get())
+                while not self.queue.empty():
+                    self._add(*self.queue.get_nowait())
+            except TimeoutError:
+                pass
+            notifications_pending.set(sum(len(events) for events in self._pending.values()))
+            await self._send_due()
+
+    async def _send_due(self, force: bool = False) -> None:
+        now = time.monotonic()
+        for recipient in [r for r, due in self._due.items() if force or due <= now]:
+            events = self._pending.pop(recipient)
+            del self._due[recipient]
+            await asyncio.to_thread(_send, events, recipient)
+        notifications_pending.set(sum(len(events) for events in self._pending.values()))
+
+
+# Singleton instances
+smtp_connection = SMTPConnection(settings.smtp_idle_timeout)
+notification_dispatcher = NotificationDispatcher(settings.notification_digest_window, settings.notification_queue_size)
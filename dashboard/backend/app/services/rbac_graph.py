@@ -0,0 +1,325 @@
+"""RBAC graph -- effective-permission analysis over Roles and bindings."""
+
+import logging
+import threading
+import time
+
+from app.config import get_settings
+from app.models import Cluster
+from app.services.k8s_connector import K8sConnector
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+WILDCARD = "*"
+
+# (reason, api_group, resources) checked by RbacGraph.privileged_subjects
+PRIVILEGE_CHECKS = (
+    ("wildcard", WILDCARD, (WILDCARD,)),
+    ("escalate", "rbac.authorization.k8s.io", ("roles", "clusterroles")),
+    ("bind", "rbac.authorization.k8s.io", ("roles", "clusterroles")),
+    ("impersonate", "", ("users", "groups", "serviceaccounts")),
+)
+
+# Groups every subject of a given kind implicitly belongs to
+AUTHENTICATED_GROUP = "system:authenticated"
+SERVICE_ACCOUNTS_GROUP = "system:serviceaccounts"
+
+# Max memoized query results kept per graph
+QUERY_CACHE_SIZE = 4096
+
+
+class RbacGraph:
+    """Indexed subject -> role -> verb/resource graph for one cluster.
+
+    Roles are compiled once into a ``(verb, resource) -> grants`` index and
+    bindings are indexed by role and scope, so "who can X in namespace Y"
+    only touches the roles that can grant X and the bindings of those roles
+    in Y (plus cluster-wide ones) instead of walking every binding.
+
+    Namespaced grants use ``""`` as the cluster-wide scope.
+    """
+
+    def __init__(
+        self,
+        roles: list[dict],
+        cluster_roles: list[dict],
+        role_bindings: list[dict],
+        cluster_role_bindings: list[dict],
+    ):
+        self._roles: dict[tuple[str, str, str], dict] = {}
+        for r in cluster_roles:
+            self._roles[("ClusterRole", "", r["name"])] = r
+        for r in roles:
+            self._roles[("Role", r.get("namespace") or "", r["name"])] = r
+
+        self._resolved_rules: dict[tuple[str, str, str], list[dict]] = {}
+
+        # (verb, resource) -> [(role_key, api_groups, resource_names)]
+        self._grant_index: dict[tuple[str, str], list[tuple[tuple[str, str, str], frozenset, frozenset]]] = {}
+        for role_key in self._roles:
+            self._index_role(role_key)
+
+        # role_key -> scope -> [(subject_key, binding_name)]
+        self._role_bindings: dict[tuple[str, str, str], dict[str, list[tuple[tuple[str, str, str], str]]]] = {}
+        # subject_key -> [(role_key, scope, binding_name)]
+        self._subject_bindings: dict[tuple[str, str, str], list[tuple[tuple[str, str, str], str, str]]] = {}
+        for b in cluster_role_bindings:
+            self._add_binding(b, scope="")
+        for b in role_bindings:
+            self._add_binding(b, scope=b.get("namespace") or "")
+
+        self._who_can_cache: dict[tuple, list[dict]] = {}
+        self._effective_cache: dict[tuple[str, str, str], list[dict]] = {}
+
+        self.binding_count = len(cluster_role_bindings) + len(role_bindings)
+
+    @classmethod
+    def from_connector(cls, connector: K8sConnector) -> "RbacGraph":
+        """Load all RBAC objects through the (paginated) connector calls."""
+        return cls(
+            roles=connector.list_roles(),
+            cluster_roles=connector.list_cluster_roles(),
+            role_bindings=connector.list_role_bindings(),
+            cluster_role_bindings=connector.list_cluster_role_bindings(),
+        )
+
+    # ------------------------------------------------------------------
+    # Graph construction
+    # ------------------------------------------------------------------
+
+    def _rules_for(self, role_key: tuple[str, str, str], _visiting: frozenset = frozenset()) -> list[dict]:
+        """Rules of a role, including rules of ClusterRoles it aggregates."""
+        if role_key in self._resolved_rules:
+            return self._resolved_rules[role_key]
+
+        role = self._roles.get(role_key)
+        if role is None:
+            return []
+
+        rules = list(role.get("rules", []))
+        selectors = role.get("aggregation_selectors") or []
+        if selectors:
+            visiting = _visiting | {role_key}
+            for other_key, other in self._roles.items():
+                if other_key[0] != "ClusterRole" or other_key in visiting:
+                    continue
+                labels = other.get("labels") or {}
+                if any(sel and all(labels.get(k) == v for k, v in sel.items()) for sel in selectors):
+                    rules.extend(self._rules_for(other_key, visiting))
+
+        self._resolved_rules[role_key] = rules
+        return rules
+
+    def _index_role(self, role_key: tuple[str, str, str]) -> None:
+        for rule in self._rules_for(role_key):
+            api_groups = frozenset(rule.get("api_groups") or [""])
+            resource_names = frozenset(rule.get("resource_names") or [])
+            for verb in rule.get("verbs") or []:
+                for resource in rule.get("resources") or []:
+                    self._grant_index.setdefault((verb, resource), []).append((role_key, api_groups, resource_names))
+
+    def _add_binding(self, binding: dict, scope: str) -> None:
+        ref = binding.get("role_ref") or {}
+        if ref.get("kind") == "ClusterRole":
+            role_key = ("ClusterRole", "", ref.get("name", ""))
+        else:
+            role_key = ("Role", scope, ref.get("name", ""))
+
+        by_scope = self._role_bindings.setdefault(role_key, {})
+        for subject in binding.get("subjects") or []:
+            subject_key = _subject_key(subject)
+            by_scope.setdefault(scope, []).append((subject_key, binding["name"]))
+            self._subject_bindings.setdefault(subject_key, []).append((role_key, scope, binding["name"]))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def who_can(
+        self,
+        verb: str,
+        resource: str,
+        namespace: str | None = None,
+        api_group: str = "",
+        resource_name: str | None = None,
+    ) -> list[dict]:
+        """Subjects allowed to ``verb`` ``resource`` in ``namespace``.
+
+        ``namespace=None`` asks about cluster-wide access, i.e. only
+        ClusterRoleBindings count.
+        """
+        cache_key = (verb, resource, namespace, api_group, resource_name)
+        cached = self._who_can_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        scopes = ("",) if not namespace else ("", namespace)
+        matches: dict[tuple[str, str, str], dict] = {}
+
+        for key in _lookup_keys(verb, resource):
+            for role_key, api_groups, resource_names in self._grant_index.get(key, ()):
+                if WILDCARD not in api_groups and api_group not in api_groups:
+                    continue
+                if resource_names and resource_name not in resource_names:
+                    continue
+                # A Role only applies inside its own namespace
+                if role_key[0] == "Role" and role_key[1] not in scopes:
+                    continue
+                by_scope = self._role_bindings.get(role_key, {})
+                for scope in scopes:
+                    for subject_key, binding_name in by_scope.get(scope, ()):
+                        entry = matches.get(subject_key)
+                        if entry is None:
+                            entry = matches[subject_key] = {**_subject_dict(subject_key), "via": []}
+                        via = {"binding": binding_name, "role": role_key[2], "scope": scope or "cluster"}
+                        if via not in entry["via"]:
+                            entry["via"].append(via)
+
+        result = sorted(matches.values(), key=lambda e: (e["kind"], e["namespace"] or "", e["name"]))
+        if len(self._who_can_cache) >= QUERY_CACHE_SIZE:
+            self._who_can_cache.clear()
+        self._who_can_cache[cache_key] = result
+        return result
+
+    def effective_permissions(self, kind: str, name: str, namespace: str | None = None) -> list[dict]:
+        """All rules reachable by a subject, including through implicit groups."""
+        subject_key = _subject_key({"kind": kind, "name": name, "namespace": namespace})
+        cached = self._effective_cache.get(subject_key)
+        if cached is not None:
+            return cached
+
+        result = []
+        for member_key in _membership(subject_key):
+            for role_key, scope, binding_name in self._subject_bindings.get(member_key, ()):
+                if role_key[0] == "Role" and role_key[1] != scope:
+                    continue
+                for rule in self._rules_for(role_key):
+                    if not rule.get("resources") and not rule.get("non_resource_urls"):
+                        continue
+                    result.append(
+                        {
+                            "scope": scope or "cluster",
+                            "role": role_key[2],
+                            "binding": binding_name,
+                            "via_group": member_key[2] if member_key != subject_key else None,
+                            "verbs": rule.get("verbs", []),
+                            "api_groups": rule.get("api_groups", []),
+                            "resources": rule.get("resources", []),
+                            "resource_names": rule.get("resource_names", []),
+                            "non_resource_urls": rule.get("non_resource_urls", []),
+                        }
+                    )
+
+        self._effective_cache[subject_key] = result
+        return result
+
+    def privileged_subjects(self) -> list[dict]:
+        """Subjects holding wildcard or privilege-escalation permissions.
+
+        Each entry carries a ``reason``: ``wildcard`` (``*`` verbs on ``*``
+        resources in all API groups), ``escalate``, ``bind`` or ``impersonate``.
+        """
+        found: dict[tuple, dict] = {}
+        for reason, api_group, resources in PRIVILEGE_CHECKS:
+            verb = WILDCARD if reason == "wildcard" else reason
+            for resource in resources:
+                for namespace in self._scopes():
+                    for entry in self.who_can(verb, resource, namespace=namespace, api_group=api_group):
+                        key = (reason, entry["kind"], entry["namespace"], entry["name"])
+                        if key not in found:
+                            found[key] = {**entry, "reason": reason, "resource": resource}
+        return list(found.values())
+
+    def _scopes(self) -> list[str | None]:
+        """Cluster scope plus every namespace that has RoleBindings."""
+        namespaces = {scope for by_scope in self._role_bindings.values() for scope in by_scope if scope}
+        return [None, *sorted(namespaces)]
+
+
+# ------------------------------------------------------------------
+# Module-level helpers
+# ------------------------------------------------------------------
+
+
+def _lookup_keys(verb: str, resource: str) -> list[tuple[str, str]]:
+    """Index keys that can grant ``verb`` on ``resource``."""
+    keys = [(verb, resource), (verb, WILDCARD), (WILDCARD, resource), (WILDCARD, WILDCARD)]
+    if "/" in resource:
+        # "pods/*" grants every subresource of pods
+        parent = resource.split("/", 1)[0] + "/*"
+        keys += [(verb, parent), (WILDCARD, parent)]
+    return list(dict.fromkeys(keys))
+
+
+def _subject_key(subject: dict) -> tuple[str, str, str]:
+    kind = subject.get("kind", "")
+    namespace = subject.get("namespace") or "" if kind == "ServiceAccount" else ""
+    return (kind, namespace, subject.get("name", ""))
+
+
+def _subject_dict(subject_key: tuple[str, str, str]) -> dict:
+    kind, namespace, name = subject_key
+    return {"kind": kind, "namespace": namespace or None, "name": name}
+
+
+def _membership(subject_key: tuple[str, str, str]) -> list[tuple[str, str, str]]:
+    """The subject itself plus the built-in groups it is implicitly part of."""
+    kind, namespace, _ = subject_key
+    members = [subject_key]
+    if kind == "ServiceAccount":
+        members.append(("Group", "", SERVICE_ACCOUNTS_GROUP))
+        members.append(("Group", "", f"{SERVICE_ACCOUNTS_GROUP}:{namespace}"))
+    if kind in ("ServiceAccount", "User"):
+        members.append(("Group", "", AUTHENTICATED_GROUP))
+    return members
+
+
+# ------------------------------------------------------------------
+# Per-cluster graph cache
+# ------------------------------------------------------------------
+
+_graph_cache: dict[int, tuple[float, RbacGraph]] = {}
+_graph_lock = threading.Lock()
+
+
+def get_cluster_graph(cluster: Cluster, refresh: bool = False) -> RbacGraph:
+    """Return a cached RBAC graph for a cluster, rebuilding it after the TTL.
+
+    Blocking -- call from a worker thread.
+    """
+    now = time.monotonic()
+    with _graph_lock:
+        cached = _graph_cache.get(cluster.id)
+    if cached and not refresh and now - cached[0] < settings.rbac_graph_ttl:
+        return cached[1]
+
+    connector = K8sConnector(
+        api_url=cluster.k8s_api_url,
+        token=cluster.k8s_token,
+        ca_cert=cluster.k8s_ca_cert,
+        client_cert=cluster.k8s_client_cert,
+        client_key=cluster.k8s_client_key,
+        kubeconfig_path=cluster.kubeconfig_path,
+        kubeconfig_context=cluster.kubeconfig_context,
+    )
+    try:
+        started = time.monotonic()
+        graph = RbacGraph.from_connector(connector)
+        logger.info(
+            "Built RBAC graph for cluster %s: %d bindings in %.2fs",
+            cluster.name,
+            graph.binding_count,
+            time.monotonic() - started,
+        )
+    finally:
+        connector.close()
+
+    with _graph_lock:
+        _graph_cache[cluster.id] = (time.monotonic(), graph)
+    return graph
+
+
+def invalidate_cluster_graph(cluster_id: int) -> None:
+    with _graph_lock:
+        _graph_cache.pop(cluster_id, None)
@@ -0,0 +1,321 @@
+"""Content-addressed, compressed store for raw scanner reports."""
+
+import asyncio
+import hashlib
+import logging
+import os
+import secrets
+import time
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models import ReportObject
+from app.services import compression
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Media types by scanner report kind
+MEDIA_TYPES = {"log": "text/plain", "xml": "application/xml", "json": "application/json"}
+EXTENSIONS = {media_type: ext for ext, media_type in MEDIA_TYPES.items()}
+
+# Bytes per read when streaming a report to a client
+CHUNK_SIZE = 64 * 1024
+
+# Suffix of an object file claimed for deletion
+_DELETING = ".deleting"
+# Digests per report_objects lookup in the orphan sweep
+_SWEEP_CHUNK = 500
+
+
+class StoredReport:
+    """Result of writing a report: where it lives and what it is."""
+
+    __slots__ = ("digest", "encoding", "media_type", "size", "stored_size", "path")
+
+    def __init__(self, digest: str, encoding: str, media_type: str, size: int, stored_size: int, path: Path):
+        self.digest = digest
+        self.encoding = encoding
+        self.media_type = media_type
+        self.size = size
+        self.stored_size = stored_size
+        self.path = path
+
+
+class ReportWriter:
+    """Streams one report through SHA-256 and the compressor into a temp file.
+
+    ``commit()`` moves it to its content address, or drops it when an
+    identical payload is already stored. Used from scanner threads; the
+    caller must then reference the report (``ReportStore.retain``) promptly.
+    Until it does, the file is protected only by its fresh mtime (see
+    ``ReportStore.delete_files``).
+    """
+
+    __slots__ = ("store", "media_type", "encoding", "_hash", "_size", "_tmp", "_raw", "_stream", "_done")
+
+    def __init__(self, store: "ReportStore", media_type: str):
+        self.store = store
+        self.media_type = media_type
+        self.encoding = compression.choose(settings.report_store_compression, "REPORT_STORE_COMPRESSION")
+        self._hash = hashlib.sha256()
+        self._size = 0
+        tmp_dir = store.directory / "tmp"
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        self._tmp = tmp_dir / secrets.token_hex(8)
+        self._raw, self._stream = compression.open_writer(self._tmp, self.encoding)
+        self._done = False
+
+    def write(self, data: str | bytes) -> None:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._hash.update(data)
+        self._size += len(data)
+        self._stream.write(data)
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def commit(self) -> StoredReport:
+        self._stream.close()
+        self._raw.flush()
+        os.fsync(self._raw.fileno())
+        self._raw.close()
+        self._done = True
+
+        digest = self._hash.hexdigest()
+        existing = self.store.find(digest)
+        if existing is not None:
+            try:
+                # Identical payload already stored (possibly with the other
+                # codec); a fresh mtime keeps retention from deleting it
+                # before this report is referenced
+                os.utime(existing[0])
+            except FileNotFoundError:
+                existing = None  # deleted meanwhile: store this copy instead
+        if existing is not None:
+            self._tmp.unlink(missing_ok=True)
+            path, encoding = existing
+        else:
+            encoding = self.encoding
+            path = self.store.path_for(digest, encoding)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(self._tmp, path)
+        return StoredReport(digest, encoding, self.media_type, self._size, path.stat().st_size, path)
+
+    def discard(self) -> None:
+        if not self._done:
+            for handle in (self._stream, self._raw):
+                try:
+                    handle.close()
+                except Exception as e:
+                    logger.debug(f"Closing discarded report: {e}")
+            self._done = True
+        self._tmp.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ReportWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Without commit() the partial report is dropped
+        if not self._done or exc_type is not None:
+            self.discard()
+
+
+class ReportStore:
+    """Reports stored once per distinct content under REPORTS_DIR/objects.
+
+    Objects live at ``objects/<2 hex>/<sha256><.gz|.zst>``; the
+    ``report_objects`` table counts the scans referencing each one so
+    retention can delete payloads no scan needs any more. Files written
+    but never referenced (a scan timed out or was cancelled after its
+    scanner stored the report) are removed by ``sweep`` once older than
+    REPORT_STORE_GRACE.
+    """
+
+    def __init__(self, directory: Path | None = None):
+        self._directory = directory
+
+    @property
+    def directory(self) -> Path:
+        return self._directory or Path(settings.reports_dir) / "objects"
+
+    def path_for(self, digest: str, encoding: str) -> Path:
+        return self.directory / digest[:2] / f"{digest}{compression.SUFFIXES[encoding]}"
+
+    def find(self, digest: str) -> tuple[Path, str] | None:
+        for encoding in compression.SUFFIXES:
+            path = self.path_for(digest, encoding)
+            if path.exists():
+                return path, encoding
+        return None
+
+    def writer(self, media_type: str) -> ReportWriter:
+        return ReportWriter(self, media_type)
+
+    def put(self, data: str | bytes, media_type: str) -> StoredReport:
+        with self.writer(media_type) as writer:
+            writer.write(data)
+            return writer.commit()
+
+    def open(self, digest: str, encoding: str) -> BinaryIO:
+        """Decompressed stream of a stored report."""
+        return compression.open_reader(self.path_for(digest, encoding), encoding)
+
+    async def stream(
+        self, obj: ReportObject, decompress: bool = True, start: int = 0, end: int | None = None
+    ) -> AsyncIterator[bytes]:
+        """Chunks of a stored report, decompressed or as stored on disk.
+
+        ``start``/``end`` select a byte range of that representation (a
+        forward seek decompresses and discards the skipped part). Reads
+        run in a worker thread so large reports never block the event loop.
+        """
+        if decompress:
+            handle = await asyncio.to_thread(self.open, obj.digest, obj.encoding)
+        else:
+            handle = await asyncio.to_thread(open, self.path_for(obj.digest, obj.encoding), "rb")
+        try:
+            if start:
+                await asyncio.to_thread(handle.seek, start)
+            remaining = (end - start) if end is not None else None
+            while remaining is None or remaining > 0:
+                size = CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
+                chunk = await asyncio.to_thread(handle.read, size)
+                if not chunk:
+                    break
+                if remaining is not None:
+                    remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(handle.close)
+
+    # ------------------------------------------------------------------
+    # Reference counts
+    # ------------------------------------------------------------------
+
+    async def get(self, session: AsyncSession, digest: str) -> ReportObject | None:
+        return await session.scalar(select(ReportObject).where(ReportObject.digest == digest))
+
+    async def retain(self, session: AsyncSession, report: StoredReport, count: int = 1) -> None:
+        """Record ``count`` more scans referencing ``report``."""
+        values = {
+            "digest": report.digest,
+            "encoding": report.encoding,
+            "media_type": report.media_type,
+            "size": report.size,
+            "stored_size": report.stored_size,
+            "refcount": count,
+        }
+        dialect = postgresql if session.get_bind().dialect.name == "postgresql" else sqlite
+        statement = dialect.insert(ReportObject).values(**values)
+        statement = statement.on_conflict_do_update(
+            index_elements=["digest"], set_={"refcount": ReportObject.refcount + count}
+        )
+        await session.execute(statement)
+
+    async def release(self, session: AsyncSession, counts: dict[str, int]) -> list[Path]:
+        """Drop references; returns files of objects no scan uses any more.
+
+        The rows go with the caller's transaction; pass the returned files
+        to ``delete_files`` only after it commits.
+        """
+        if not counts:
+            return []
+        for digest, count in counts.items():
+            await session.execute(
+                update(ReportObject).where(ReportObject.digest == digest).values(refcount=ReportObject.refcount - count)
+            )
+        result = await session.execute(
+            delete(ReportObject)
+            .where(ReportObject.digest.in_(list(counts)), ReportObject.refcount <= 0)
+            .returning(ReportObject.digest, ReportObject.encoding)
+        )
+        return [self.path_for(digest, encoding) for digest, encoding in result.all()]
+
+    # ------------------------------------------------------------------
+    # File cleanup
+    # ------------------------------------------------------------------
+
+    def delete_files(self, paths: list[Path]) -> int:
+        """Delete released object files, sparing ones a writer just reused.
+
+        Each file is first renamed aside, which atomically takes it away
+        from a concurrent ``ReportWriter.commit``: a writer that touched it
+        before the rename left a fresh mtime and the file is put back (the
+        writer is about to reference it again); one that comes after finds
+        no file and stores its own copy. Returns the files deleted.
+        """
+        grace = settings.report_store_grace
+        deleted = 0
+        for path in paths:
+            claimed = path.with_name(path.name + _DELETING)
+            try:
+                os.rename(path, claimed)
+            except FileNotFoundError:
+                continue
+            if time.time() - claimed.stat().st_mtime < grace:
+                os.replace(claimed, path)
+            else:
+                claimed.unlink(missing_ok=True)
+                deleted += 1
+        return deleted
+
+    async def sweep(self, session_factory) -> int:
+        """Delete object files no ``report_objects`` row references.
+
+        Only files older than REPORT_STORE_GRACE are considered, so reports
+        between ``commit`` and ``retain`` are left alone. Also clears
+        temp files of writers that died. Returns the files deleted.
+        """
+        candidates, leftovers = await asyncio.to_thread(self._stale_files)
+        deleted = 0
+        for i in range(0, len(candidates), _SWEEP_CHUNK):
+            chunk = candidates[i : i + _SWEEP_CHUNK]
+            async with session_factory() as session:
+                result = await session.execute(
+                    select(ReportObject.digest, ReportObject.encoding).where(
+                        ReportObject.digest.in_([digest for digest, _ in chunk])
+                    )
+                )
+                referenced = {self.path_for(digest, encoding) for digest, encoding in result.all()}
+            orphans = [path for _, path in chunk if path not in referenced]
+            deleted += await asyncio.to_thread(self.delete_files, orphans)
+        for path in leftovers:
+            path.unlink(missing_ok=True)
+        if deleted:
+            logger.info(f"Report store: removed {deleted} unreferenced report(s)")
+        return deleted
+
+    def _stale_files(self) -> tuple[list[tuple[str, Path]], list[Path]]:
+        """(digest, path) of object files older than the grace period, and stale temp files."""
+        cutoff = time.time() - settings.report_store_grace
+        objects: list[tuple[str, Path]] = []
+        leftovers: list[Path] = []
+        if not self.directory.is_dir():
+            return objects, leftovers
+        for prefix in self.directory.iterdir():
+            if not prefix.is_dir():
+                continue
+            for path in prefix.iterdir():
+                try:
+                    if path.stat().st_mtime >= cutoff:
+                        continue
+                except FileNotFoundError:
+                    continue
+                if prefix.name == "tmp" or path.name.endswith(_DELETING):
+                    leftovers.append(path)
+                else:
+                    objects.append((path.name.split(".", 1)[0], path))
+        return objects, leftovers
+
+
+# Singleton instance
+report_store = ReportStore()
@@ -0,0 +1,310 @@
+"""Chunked scan retention with per-scanner / per-host policies."""
+
+import asyncio
+import logging
+import re
+from collections import Counter, defaultdict
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy import ColumnElement, and_, delete, exists, func, not_, or_, select, text, true
+
+from app.config import get_settings
+from app.database import get_session_context
+from app.metrics import retention_deleted_total
+from app.models import Host, Scan, ScanFindingChange
+from app.models.scan import ScanResult
+from app.services.archive import scan_archive
+from app.services.report_store import report_store
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Scans still in flight (or queued by a campaign) are never expired
+ACTIVE_STATUSES = ("queued", "pending", "running")
+
+_BOUND_RE = re.compile(r"FROM \('?(\d+)'?\) TO \('?(\d+)'?\)")
+
+
+class RetentionRule:
+    """One retention policy resolved to a SQL condition on ``scans``."""
+
+    __slots__ = ("label", "days", "condition")
+
+    def __init__(self, label: str, days: int, condition: ColumnElement[bool]):
+        self.label = label
+        self.days = days
+        self.condition = condition
+
+
+def build_rules(host_days: dict[int, int], now: datetime | None = None) -> list[RetentionRule]:
+    """Resolve the retention settings into non-overlapping rules.
+
+    Host policies (SCAN_RETENTION_HOSTS) win over scanner policies
+    (SCAN_RETENTION_SCANNERS), which win over SCAN_RETENTION_DAYS. A policy
+    of 0 days keeps the matching scans forever.
+    """
+    now = now or datetime.now(UTC)
+    inactive = Scan.status.not_in(ACTIVE_STATUSES)
+    rules: list[RetentionRule] = []
+
+    hosts_by_days: dict[int, list[int]] = defaultdict(list)
+    for host_id, days in host_days.items():
+        hosts_by_days[days].append(host_id)
+    for days, host_ids in sorted(hosts_by_days.items()):
+        if days > 0:
+            cutoff = now - timedelta(days=days)
+            rules.append(
+                RetentionRule(
+                    f"hosts:{days}d", days, and_(Scan.host_id.in_(host_ids), Scan.created_at < cutoff, inactive)
+                )
+            )
+
+    other_hosts = Scan.host_id.not_in(list(host_days)) if host_days else true()
+    scanners = settings.scan_retention_scanners
+    for scanner, days in sorted(scanners.items()):
+        if days > 0:
+            cutoff = now - timedelta(days=days)
+            rules.append(
+                RetentionRule(
+                    f"scanner:{scanner}",
+                    days,
+                    and_(other_hosts, Scan.scanner == scanner, Scan.created_at < cutoff, inactive),
+                )
+            )
+
+    if settings.scan_retention_days > 0:
+        cutoff = now - timedelta(days=settings.scan_retention_days)
+        other_scanners = Scan.scanner.not_in(list(scanners)) if scanners else true()
+        rules.append(
+            RetentionRule(
+                "default",
+                settings.scan_retention_days,
+                and_(other_hosts, other_scanners, Scan.created_at < cutoff, inactive),
+            )
+        )
+    return rules
+
+
+class RetentionService:
+    """Deletes expired scans and their findings in bounded batches.
+
+    Each batch is its own short transaction (at most RETENTION_BATCH_SIZE
+    scans, findings removed RETENTION_RESULTS_BATCH rows per statement)
+    with RETENTION_BATCH_PAUSE between batches, so retention never holds
+    long locks or builds huge IN lists. With SCAN_ARCHIVE_ENABLED each
+    batch is written to the cold archive before it is deleted. On
+    PostgreSQL with a partitioned ``scan_results`` (see migration 007),
+    partitions whose scans have all expired are dropped whole first.
+    Stored reports lose one reference per deleted scan and their files are
+    removed once the batch that dropped the last reference has committed;
+    report files no scan ever referenced are swept on every run.
+    """
+
+    def __init__(self, session_factory=None):
+        self._session = session_factory or get_session_context
+
+    async def run(self) -> dict[str, int]:
+        """Apply every retention policy; returns rows removed per kind."""
+        totals = {"scans": 0, "results": 0, "partitions": 0, "reports": 0}
+        async with self._session() as session:
+            rules = build_rules(await self._host_policies(session))
+            partitioned = await _results_partitioned(session)
+        totals["reports"] = await report_store.sweep(self._session)
+        if not rules:
+            logger.info("Scan retention: every policy keeps scans forever")
+            self._count(totals)
+            return totals
+
+        if partitioned:
+            dropped, scans = await self._drop_expired_partitions(rules)
+            totals["partitions"] += dropped
+            totals["scans"] += scans
+
+        for rule in rules:
+            scans, results = await self._purge(rule)
+            totals["scans"] += scans
+            totals["results"] += results
+            if scans:
+                logger.info(f"Scan retention {rule.label}: removed {scans} scans, {results} findings")
+
+        self._count(totals)
+        return totals
+
+    @staticmethod
+    def _count(totals: dict[str, int]) -> None:
+        for kind, count in totals.items():
+            if count:
+                retention_deleted_total.labels(kind=kind).inc(count)
+
+    async def _host_policies(self, session) -> dict[int, int]:
+        names = settings.scan_retention_hosts
+        if not names:
+            return {}
+        result = await session.execute(select(Host.id, Host.name).where(Host.name.in_(list(names))))
+        return {host_id: names[name] for host_id, name in result.all()}
+
+    # ------------------------------------------------------------------
+    # Batched deletes
+    # ------------------------------------------------------------------
+
+    async def _purge(self, rule: RetentionRule, archive: bool = True) -> tuple[int, int]:
+        archive = archive and settings.scan_archive_enabled
+        scans = results = 0
+        batch_size = max(settings.retention_batch_size, 1)
+        while True:
+            async with self._session() as session:
+                ids = (
+                    (await session.execute(select(Scan.id).where(rule.condition).order_by(Scan.id).limit(batch_size)))
+                    .scalars()
+                    .all()
+                )
+                if not ids:
+                    break
+                if archive:
+                    await scan_archive.archive_scans(session, ids)
+                results += await self._delete_results(session, ids)
+                orphaned = await self._release_reports(session, ids)
+                await session.execute(delete(ScanFindingChange).where(ScanFindingChange.scan_id.in_(ids)))
+                await session.execute(delete(Scan).where(Scan.id.in_(ids)))
+            await asyncio.to_thread(report_store.delete_files, orphaned)
+            scans += len(ids)
+            if len(ids) < batch_size:
+                break
+            await asyncio.sleep(settings.retention_batch_pause)
+        return scans, results
+
+    async def _delete_results(self, session, scan_ids: list[int]) -> int:
+        """Delete findings of ``scan_ids`` a bounded number of rows per statement.
+
+        Nothing is committed here: a batch's findings, reports and scans go
+        in one transaction, so a crash never leaves a scan with part of its
+        findings (which the next run would archive a second time).
+        """
+        chunk = max(settings.retention_results_batch, 1)
+        deleted = 0
+        while True:
+            victims = select(ScanResult.id).where(ScanResult.scan_id.in_(scan_ids)).limit(chunk).scalar_subquery()
+            result = await session.execute(delete(ScanResult).where(ScanResult.id.in_(victims)))
+            deleted += result.rowcount
+            if result.rowcount < chunk:
+                return deleted
+
+    async def _release_reports(self, session, scan_ids: list[int]) -> list:
+        digests = Counter(
+            (
+                await session.execute(
+                    select(Scan.report_digest).where(Scan.id.in_(scan_ids), Scan.report_digest.is_not(None))
+                )
+            )
+            .scalars()
+            .all()
+        )
+        return await report_store.release(session, digests)
+
+    # ------------------------------------------------------------------
+    # PostgreSQL partitions
+    # ------------------------------------------------------------------
+
+    async def _drop_expired_partitions(self, rules: list[RetentionRule]) -> tuple[int, int]:
+        """Drop ``scan_results`` partitions whose scan-id range has fully expired."""
+        expired = or_(*(rule.condition for rule in rules))
+        dropped = scans = 0
+        async with self._session() as session:
+            partitions = await _result_partitions(session)
+            newest = await session.scalar(select(func.max(Scan.id))) or 0
+
+        for name, low, high in partitions:
+            if high > newest:
+                continue  # still receiving findings
+            async with self._session() as session:
+                keep = await session.scalar(select(exists().where(Scan.id >= low, Scan.id < high, not_(expired))))
+                if keep:
+                    continue
+                if settings.scan_archive_enabled:
+                    await self._archive_range(session, low, high)
+                await session.execute(text(f'ALTER TABLE scan_results DETACH PARTITION "{name}"'))
+                await session.execute(text(f'DROP TABLE "{name}"'))
+            dropped += 1
+            logger.info(f"Scan retention: dropped partition {name} (scan ids {low}-{high - 1})")
+
+            # Findings are gone with the partition; remove the scans in batches
+            rule = RetentionRule(name, 0, and_(Scan.id >= low, Scan.id < high))
+            scans += (await self._purge(rule, archive=False))[0]
+        return dropped, scans
+
+    async def _archive_range(self, session, low: int, high: int) -> None:
+        last = low - 1
+        while True:
+            ids = (
+                (
+                    await session.execute(
+                        select(Scan.id)
+                        .where(Scan.id > last, Scan.id < high)
+                        .order_by(Scan.id)
+                        .limit(max(settings.retention_batch_size, 1))
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            if not ids:
+                return
+            await scan_archive.archive_scans(session, ids)
+            last = ids[-1]
+
+    async def ensure_partitions(self) -> int:
+        """Create the current and next ``scan_results`` partitions ahead of inserts."""
+        async with self._session() as session:
+            if not await _results_partitioned(session):
+                return 0
+            existing = {low for _, low, _ in await _result_partitions(session)}
+            newest = await session.scalar(select(func.max(Scan.id))) or 0
+
+        span = max(settings.scan_results_partition_span, 1)
+        current = newest // span * span
+        created = 0
+        for low in (current, current + span):
+            if low in existing:
+                continue
+            try:
+                async with self._session() as session:
+                    await session.execute(
+                        text(
+                            f"CREATE TABLE scan_results_p{low} PARTITION OF scan_results "
+                            f"FOR VALUES FROM ({low}) TO ({low + span})"
+                        )
+                    )
+                created += 1
+            except Exception as e:
+                # Rows for this range already landed in the default partition
+                logger.warning(f"Could not create partition scan_results_p{low}: {e}")
+        return created
+
+
+async def _results_partitioned(session) -> bool:
+    if session.get_bind().dialect.name != "postgresql":
+        return False
+    result = await session.execute(
+        text(
+            "SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid "
+            "WHERE c.relname = 'scan_results'"
+        )
+    )
+    return result.scalar() is not None
+
+
+async def _result_partitions(session) -> list[tuple[str, int, int]]:
+    """(name, low, high) of the range partitions of ``scan_results``, oldest first."""
+    result = await session.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent "
+            "WHERE p.relname = 'scan_results'"
+        )
+    )
+    partitions = []
+    for name, bound in result.all():
+        match = _BOUND_RE.search(bound or "")
+        if match:  # skips the DEFAULT partition
+            partitions.append((name, int(match.group(1)), int(match.group(2))))
+    return sorted(partitions, key=lambda p: p[1])
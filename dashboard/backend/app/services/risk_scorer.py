@@ -2,6 +2,8 @@
 
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -508,3 +510,234 @@ def _hardening_rule_to_risk(rule_id: str) -> str | None:
         "K8S-RBAC-001": "cluster_admin_binding",
     }
     return mapping.get(rule_id)
+
+
+# ------------------------------------------------------------------
+# Fleet (columnar) scoring
+# ------------------------------------------------------------------
+
+# Column order of the factor matrix; weights/severities are aligned with it
+FACTOR_IDS: tuple[str, ...] = tuple(RISK_WEIGHTS)
+_FACTOR_INDEX = {factor_id: i for i, factor_id in enumerate(FACTOR_IDS)}
+_FACTOR_WEIGHTS = np.array([RISK_WEIGHTS[f]["weight"] for f in FACTOR_IDS], dtype=np.int64)
+_FACTOR_SEVERITY_RANK = np.array([_SEVERITY_ORDER[RISK_WEIGHTS[f]["severity"]] for f in FACTOR_IDS], dtype=np.int8)
+
+_SEVERITY_NAMES = ("info", "low", "medium", "high", "critical")
+_LEVEL_THRESHOLDS = np.array([5, 20, 40, 80])  # boundaries used by _score_to_level
+_LEVEL_NAMES = ("info", "low", "medium", "high", "critical")
+
+_MINIMAL_IMAGE_MARKERS = ("alpine", "distroless", "scratch", "busybox", "chainguard", "wolfi", "static", "ubi-micro")
+
+# Boolean feature columns extracted from each security_context
+_FLAG_COLUMNS = (
+    "privileged",
+    "host_network",
+    "host_pid",
+    "host_ipc",
+    "drop_all",
+    "user_root",
+    "escalation_not_disabled",
+    "container_escalation_disabled",
+    "read_only_rootfs",
+    "has_image",
+    "image_unpinned",
+    "image_minimal",
+)
+_FLAG = {name: i for i, name in enumerate(_FLAG_COLUMNS)}
+
+
+class FleetFeatures:
+    """Columnar encoding of host security contexts.
+
+    ``flags`` holds one boolean column per entry in ``_FLAG_COLUMNS``;
+    ``counts`` holds per-factor occurrence counts for multi-valued inputs
+    (added capabilities, mounts, container-level overrides).
+    """
+
+    def __init__(self, flags: np.ndarray, counts: np.ndarray):
+        self.flags = flags
+        self.counts = counts
+
+    def __len__(self) -> int:
+        return int(self.flags.shape[0])
+
+    def column(self, name: str) -> np.ndarray:
+        return self.flags[:, _FLAG[name]]
+
+
+def encode_security_contexts(hosts: list[dict]) -> FleetFeatures:
+    """Encode host dicts (same keys as ``RiskScorer.score_host``) into columns."""
+    flag_rows: list[tuple[bool, ...]] = []
+    count_rows: list[int] = []
+    count_cols: list[int] = []
+
+    for row, host in enumerate(hosts):
+        sc = host.get("security_context") or {}
+        image = host.get("container_image") or ""
+
+        def bump(factor_id: str, _row: int = row) -> None:
+            count_rows.append(_row)
+            count_cols.append(_FACTOR_INDEX[factor_id])
+
+        container_escalation_disabled = False
+        for key, val in sc.items():
+            if key.endswith(".privileged"):
+                if val:
+                    bump("privileged")
+            elif key.endswith(".capabilities_add"):
+                if isinstance(val, list):
+                    for cap in val:
+                        if cap in CAP_RISK_MAP:
+                            bump(CAP_RISK_MAP[cap])
+            elif key.endswith(".capabilities_drop"):
+                if isinstance(val, list) and "ALL" not in val:
+                    bump("no_cap_drop_all")
+            elif key.endswith(".allow_privilege_escalation") and val is False:
+                container_escalation_disabled = True
+
+        for cap in sc.get("cap_add") or []:
+            if cap in CAP_RISK_MAP:
+                bump(CAP_RISK_MAP[cap])
+
+        for m in sc.get("mounts") or []:
+            src = m.get("source", "") if isinstance(m, dict) else str(m)
+            risk_factor = SENSITIVE_MOUNT_PATHS.get(src)
+            if risk_factor:
+                bump(risk_factor)
+            elif src.startswith("/") and src != "/dev/termination-log":
+                bump("mount_host_sensitive")
+
+        tag = _extract_tag(image) if image else None
+        img_lower = image.lower()
+        flag_rows.append(
+            (
+                bool(sc.get("privileged")),
+                bool(sc.get("host_network")),
+                bool(sc.get("host_pid")),
+                bool(sc.get("host_ipc")),
+                "ALL" in (sc.get("cap_drop") or []),
+                sc.get("user", "") in ("", "0", "root") or sc.get("run_as_user") == 0,
+                sc.get("allow_privilege_escalation") is not False,
+                container_escalation_disabled,
+                bool(sc.get("read_only_rootfs") or sc.get("read_only_root_filesystem")),
+                bool(image),
+                tag is None or tag == "latest",
+                any(marker in img_lower for marker in _MINIMAL_IMAGE_MARKERS),
+            )
+        )
+
+    flags = np.array(flag_rows, dtype=bool).reshape(len(hosts), len(_FLAG_COLUMNS))
+    counts = np.zeros((len(hosts), len(FACTOR_IDS)), dtype=np.int32)
+    if count_rows:
+        np.add.at(counts, (np.array(count_rows), np.array(count_cols)), 1)
+    return FleetFeatures(flags, counts)
+
+
+def compute_factor_matrix(features: FleetFeatures) -> np.ndarray:
+    """Derive the (hosts x factors) occurrence matrix from encoded features."""
+    matrix = features.counts.copy()
+    col = features.column
+    has_image = col("has_image")
+
+    matrix[:, _FACTOR_INDEX["privileged"]] += col("privileged")
+    matrix[:, _FACTOR_INDEX["host_network"]] += col("host_network")
+    matrix[:, _FACTOR_INDEX["host_pid"]] += col("host_pid")
+    matrix[:, _FACTOR_INDEX["host_ipc"]] += col("host_ipc")
+    matrix[:, _FACTOR_INDEX["no_cap_drop_all"]] += ~col("drop_all")
+    matrix[:, _FACTOR_INDEX["run_as_root"]] += col("user_root")
+    matrix[:, _FACTOR_INDEX["allow_privilege_escalation"]] += col("escalation_not_disabled") & ~col(
+        "container_escalation_disabled"
+    )
+    matrix[:, _FACTOR_INDEX["writable_rootfs"]] += ~col("read_only_rootfs")
+    matrix[:, _FACTOR_INDEX["image_latest"]] += has_image & col("image_unpinned")
+    matrix[:, _FACTOR_INDEX["image_full_os"]] += has_image & ~col("image_minimal")
+    return matrix
+
+
+class FleetRiskScores:
+    """Risk scores for a whole fleet, computed from the factor matrix."""
+
+    def __init__(self, targets: list[str], host_ids: list[int | None], factor_matrix: np.ndarray):
+        self.targets = targets
+        self.host_ids = host_ids
+        self.factor_matrix = factor_matrix
+        self.scores = factor_matrix @ _FACTOR_WEIGHTS
+        self.factor_counts = factor_matrix.sum(axis=1)
+        self.level_index = np.digitize(self.scores, _LEVEL_THRESHOLDS)
+        if factor_matrix.shape[0]:
+            self.severity_index = np.where(factor_matrix > 0, _FACTOR_SEVERITY_RANK, 0).max(axis=1)
+        else:
+            self.severity_index = np.zeros(0, dtype=np.int8)
+        # Highest risk first; stable so ties keep input order (matches score_hosts)
+        self.order = np.argsort(-self.scores, kind="stable")
+
+    def __len__(self) -> int:
+        return len(self.targets)
+
+    def summary(self) -> dict:
+        """Aggregate counters in the shape returned by ``RiskScorer.score_hosts``."""
+        level_counts = np.bincount(self.level_index, minlength=len(_LEVEL_NAMES))
+        total_risk = int(self.scores.sum())
+        return {
+            "hosts_scored": len(self),
+            "total_risk": total_risk,
+            "average_risk": round(total_risk / len(self), 1) if len(self) else 0,
+            "by_level": {
+                name: int(level_counts[_LEVEL_NAMES.index(name)]) for name in ("critical", "high", "medium", "low")
+            },
+        }
+
+    def factor_counts_for(self, row: int) -> dict[str, int]:
+        """Non-zero factor occurrences for a single host."""
+        present = np.flatnonzero(self.factor_matrix[row])
+        return {FACTOR_IDS[i]: int(self.factor_matrix[row, i]) for i in present}
+
+    def rows(self) -> list[dict]:
+        """Per-host rows in descending risk order, ready for bulk insert."""
+        return [
+            {
+                "host_id": self.host_ids[i],
+                "target": self.targets[i],
+                "risk_score": int(self.scores[i]),
+                "risk_level": _LEVEL_NAMES[self.level_index[i]],
+                "max_severity": _SEVERITY_NAMES[self.severity_index[i]],
+                "factor_count": int(self.factor_counts[i]),
+                "factor_counts": self.factor_counts_for(i),
+            }
+            for i in self.order.tolist()
+        ]
+
+
+def expand_factor_counts(factor_counts: dict[str, int]) -> list[dict]:
+    """Turn a stored ``{factor_id: count}`` map into factor dicts, heaviest first."""
+    factors = []
+    for factor_id, count in factor_counts.items():
+        w = RISK_WEIGHTS.get(factor_id)
+        if not w:
+            continue
+        factors.append(
+            {
+                "factor_id": factor_id,
+                "weight": w["weight"],
+                "count": count,
+                "category": w["category"],
+                "severity": w["severity"],
+                "description": w["description"],
+                "remediation": w["remediation"],
+            }
+        )
+    factors.sort(key=lambda f: -f["weight"])
+    return factors
+
+
+def score_fleet(hosts: list[dict]) -> FleetRiskScores:
+    """Score every host in one pass of columnar operations.
+
+    Produces the same per-host ``risk_score`` as ``RiskScorer.score_host``
+    without building per-factor dicts for each host.
+    """
+    features = encode_security_contexts(hosts)
+    matrix = compute_factor_matrix(features)
+    targets = [h.get("name", "unknown") for h in hosts]
+    host_ids = [h.get("id") for h in hosts]
+    return FleetRiskScores(targets, host_ids, matrix)
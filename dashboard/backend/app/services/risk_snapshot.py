@@ -0,0 +1,166 @@
+"""Risk snapshot service -- persist fleet risk scores and query them."""
+
+import logging
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.models import Host, RiskSnapshot, RiskSnapshotEntry
+from app.services.risk_scorer import FleetRiskScores, expand_factor_counts, score_fleet
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class RiskSnapshotService:
+    """Scores a cluster's hosts in one pass and serves the stored results."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    # ------------------------------------------------------------------
+    # Write path
+    # ------------------------------------------------------------------
+
+    async def create_snapshot(self, cluster_id: int) -> tuple[RiskSnapshot, FleetRiskScores]:
+        """Score every host of a cluster and persist the result as a snapshot."""
+        # Only the columns the scorer reads -- avoids hydrating full Host rows
+        result = await self.session.execute(
+            select(Host.id, Host.name, Host.container_image, Host.security_context).where(Host.cluster_id == cluster_id)
+        )
+        host_data = [
+            {
+                "id": row.id,
+                "name": row.name,
+                "container_image": row.container_image or "",
+                "security_context": row.security_context or {},
+            }
+            for row in result
+        ]
+
+        fleet = score_fleet(host_data)
+        summary = fleet.summary()
+
+        snapshot = RiskSnapshot(cluster_id=cluster_id, **summary)
+        self.session.add(snapshot)
+        await self.session.flush()
+
+        rows = fleet.rows()
+        if rows:
+            for row in rows:
+                row["snapshot_id"] = snapshot.id
+            await self.session.execute(insert(RiskSnapshotEntry), rows)
+
+        await self._prune(cluster_id)
+        await self.session.flush()
+        await self.session.refresh(snapshot)
+
+        logger.info(
+            "Risk snapshot %s for cluster %s: %d hosts, total risk %d",
+            snapshot.id,
+            cluster_id,
+            summary["hosts_scored"],
+            summary["total_risk"],
+        )
+        return snapshot, fleet
+
+    async def _prune(self, cluster_id: int) -> None:
+        """Drop snapshots beyond the configured retention for a cluster."""
+        keep = max(settings.risk_snapshot_retention, 1)
+        result = await self.session.execute(
+            select(RiskSnapshot.id)
+            .where(RiskSnapshot.cluster_id == cluster_id)
+            .order_by(RiskSnapshot.id.desc())
+            .offset(keep)
+        )
+        stale_ids = [row[0] for row in result]
+        if not stale_ids:
+            return
+        await self.session.execute(delete(RiskSnapshotEntry).where(RiskSnapshotEntry.snapshot_id.in_(stale_ids)))
+        await self.session.execute(delete(RiskSnapshot).where(RiskSnapshot.id.in_(stale_ids)))
+
+    # ------------------------------------------------------------------
+    # Read path
+    # ------------------------------------------------------------------
+
+    async def get_snapshot(self, cluster_id: int, snapshot_id: int) -> RiskSnapshot | None:
+        result = await self.session.execute(
+            select(RiskSnapshot).where(RiskSnapshot.id == snapshot_id, RiskSnapshot.cluster_id == cluster_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def get_latest_snapshot(self, cluster_id: int) -> RiskSnapshot | None:
+        result = await self.session.execute(
+            select(RiskSnapshot).where(RiskSnapshot.cluster_id == cluster_id).order_by(RiskSnapshot.id.desc()).limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def list_snapshots(self, cluster_id: int, limit: int = 20) -> list[RiskSnapshot]:
+        result = await self.session.execute(
+            select(RiskSnapshot)
+            .where(RiskSnapshot.cluster_id == cluster_id)
+            .order_by(RiskSnapshot.id.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def get_entries(
+        self,
+        snapshot_id: int,
+        *,
+        level: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[int, list[RiskSnapshotEntry]]:
+        """Return (total, page) of entries ordered by descending risk score."""
+        filters = [RiskSnapshotEntry.snapshot_id == snapshot_id]
+        if level:
+            filters.append(RiskSnapshotEntry.risk_level == level)
+
+        total = await self.session.scalar(select(func.count()).select_from(RiskSnapshotEntry).where(*filters))
+        result = await self.session.execute(
+            select(RiskSnapshotEntry)
+            .where(*filters)
+            .order_by(RiskSnapshotEntry.risk_score.desc(), RiskSnapshotEntry.id)
+            .offset(offset)
+            .limit(limit)
+        )
+        return total or 0, list(result.scalars().all())
+
+    async def get_entries_page(
+        self, snapshot_id: int, *, level: str | None = None, limit: int = 50, offset: int = 0
+    ) -> dict:
+        """Paginated entries of a snapshot, serialized for the API."""
+        total, entries = await self.get_entries(snapshot_id, level=level, limit=limit, offset=offset)
+        return {
+            "level": level,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+            "entries": [entry_to_dict(e) for e in entries],
+        }
+
+
+def snapshot_to_dict(snapshot: RiskSnapshot) -> dict:
+    return {
+        "snapshot_id": snapshot.id,
+        "cluster_id": snapshot.cluster_id,
+        "created_at": snapshot.created_at.isoformat() if snapshot.created_at else None,
+        "hosts_scored": snapshot.hosts_scored,
+        "total_risk": snapshot.total_risk,
+        "average_risk": snapshot.average_risk,
+        "by_level": snapshot.by_level,
+    }
+
+
+def entry_to_dict(entry: RiskSnapshotEntry) -> dict:
+    return {
+        "host_id": entry.host_id,
+        "target": entry.target,
+        "risk_score": entry.risk_score,
+        "risk_level": entry.risk_level,
+        "max_severity": entry.max_severity,
+        "factor_count": entry.factor_count,
+        "factors": expand_factor_counts(entry.factor_counts or {}),
+    }
@@ -0,0 +1,113 @@
+"""Rule catalog: bulk get-or-create of rule text during result ingest."""
+
+import logging
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Rule
+from app.models.scan import ScanResult
+
+logger = logging.getLogger(__name__)
+
+# Rule ids per IN (...) lookup / insert statement
+_CHUNK = 500
+
+
+def normalize_finding(finding: dict) -> dict:
+    """Apply the defaults and column limits every ingest path used to inline."""
+    return {
+        "rule_id": str(finding.get("rule_id") or "UNKNOWN")[:200],
+        "title": str(finding.get("title") or "Unknown finding")[:500],
+        "severity": finding.get("severity") or "medium",
+        "status": finding.get("status") or "fail",
+        "category": finding.get("category"),
+        "description": finding.get("description"),
+        "remediation": finding.get("remediation"),
+        "references": finding.get("references") or [],
+    }
+
+
+class RuleCatalog:
+    """Maps (scanner, rule_id) to catalog rows, creating missing ones in bulk."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def resolve(self, scanner: str, findings: list[dict]) -> dict[str, tuple[int, str]]:
+        """Catalog ``(id, title)`` per rule_id of normalized ``findings``.
+
+        Known rules cost one indexed lookup per chunk; unknown ones are
+        inserted with the text of their first finding. Concurrent ingests
+        racing on the same new rule both end up with the same row.
+        """
+        first: dict[str, dict] = {}
+        for finding in findings:
+            first.setdefault(finding["rule_id"], finding)
+
+        catalog = await self._lookup(scanner, list(first))
+        missing = [first[rule_id] for rule_id in first if rule_id not in catalog]
+        if missing:
+            await self._insert(scanner, missing)
+            catalog.update(await self._lookup(scanner, [f["rule_id"] for f in missing]))
+            logger.debug(f"Rule catalog: added {len(missing)} {scanner} rules")
+        return catalog
+
+    async def add_findings(self, scan_id: int, scanner: str, findings: list[dict]) -> int:
+        """Store a scan's findings against the catalog; returns rows inserted."""
+        if not findings:
+            return 0
+        findings = [normalize_finding(f) for f in findings]
+        catalog = await self.resolve(scanner, findings)
+        rows = []
+        for finding in findings:
+            catalog_id, title = catalog[finding["rule_id"]]
+            rows.append(
+                {
+                    "scan_id": scan_id,
+                    "catalog_id": catalog_id,
+                    "severity": finding["severity"],
+                    "status": finding["status"],
+                    "category": finding["category"],
+                    "detail": finding["title"] if finding["title"] != title else None,
+                }
+            )
+        await self.session.execute(insert(ScanResult), rows)
+        return len(rows)
+
+    async def _lookup(self, scanner: str, rule_ids: list[str]) -> dict[str, tuple[int, str]]:
+        catalog: dict[str, tuple[int, str]] = {}
+        for i in range(0, len(rule_ids), _CHUNK):
+            result = await self.session.execute(
+                select(Rule.rule_id, Rule.id, Rule.title).where(
+                    Rule.scanner == scanner, Rule.rule_id.in_(rule_ids[i : i + _CHUNK])
+                )
+            )
+            for rule_id, catalog_id, title in result.all():
+                catalog[rule_id] = (catalog_id, title)
+        return catalog
+
+    async def _insert(self, scanner: str, findings: list[dict]) -> None:
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            statement = postgresql.insert(Rule).on_conflict_do_nothing(index_elements=["scanner", "rule_id"])
+        elif dialect == "sqlite":
+            statement = sqlite.insert(Rule).on_conflict_do_nothing(index_elements=["scanner", "rule_id"])
+        else:
+            statement = insert(Rule)
+        for i in range(0, len(findings), _CHUNK):
+            await self.session.execute(
+                statement,
+                [
+                    {
+                        "scanner": scanner,
+                        "rule_id": f["rule_id"],
+                        "title": f["title"],
+                        "description": f["description"],
+                        "remediation": f["remediation"],
+                        "references": f["references"],
+                    }
+                    for f in findings[i : i + _CHUNK]
+                ],
+            )
@@ -1,24 +1,40 @@
 """Scan execution service."""
 
 import asyncio
+import functools
 import logging
-from collections.abc import Sequence
-from datetime import UTC, datetime
-from pathlib import Path
+import time
+import zlib
+from collections.abc import Coroutine, Sequence
+from datetime import UTC, datetime, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.config import get_settings
-from app.models import Host, Scan
-from app.models.scan import ScanResult
+from app.models import Host, Scan, ScanSchedule
 from app.schemas import ScanCreate
-from app.services.notifications import send_scan_notification
+from app.services.diff import ScanDiffService
+from app.services.notifications import ScanEvent, notification_dispatcher
+from app.services.report_store import MEDIA_TYPES, report_store
+from app.services.rules import RuleCatalog
+from app.services.scan_stream import (
+    LynisStreamParser,
+    OscapStreamParser,
+    ScanCancelled,
+    ScanCancelToken,
+    ScanStreamSink,
+    exec_stream,
+    scan_tails,
+)
 
 settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Seconds between checks for a cancellation requested through another worker
+CANCEL_POLL_SECONDS = 5
+
 # Install commands per OS family for each tool
 _INSTALL_CMDS = {
     "lynis": {
@@ -90,6 +106,12 @@ def _ensure_tool_installed(container, tool: str, os_family: str | None) -> str |
     return None
 
 
+@functools.lru_cache(maxsize=4096)
+def _openscap_title(rule_id: str) -> str:
+    """Readable title derived from an XCCDF rule id (same rules recur every scan)."""
+    return rule_id.replace("xccdf_org.ssgproject.content_rule_", "").replace("_", " ").title()
+
+
 # Store background task references to prevent garbage collection
 _background_tasks: set[asyncio.Task] = set()
 
@@ -105,6 +127,126 @@ def _task_done_callback(task: asyncio.Task) -> None:
         logger.info("Scan task completed successfully")
 
 
+# Cancel tokens of scans executing in this process
+_scan_tokens: dict[int, ScanCancelToken] = {}
+
+
+def scan_timeout_for(scanner: str) -> int:
+    """Timeout for one scanner run (SCAN_TIMEOUTS override, else SCAN_TIMEOUT)."""
+    return settings.scan_timeouts.get(scanner, settings.scan_timeout)
+
+
+async def _await_scanner(scan_id: int, runner: Coroutine, token: ScanCancelToken, timeout: float) -> dict:
+    """Await a scanner coroutine until it finishes, times out or is cancelled.
+
+    On timeout/cancellation the awaiting task is released immediately and
+    the in-container processes are killed in the background, which also
+    unblocks the scanner thread. Raises ScanCancelled with the reason.
+    """
+    task = asyncio.ensure_future(runner)
+    cancel_wait = asyncio.ensure_future(token.wait())
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                token.request("timeout")
+                break
+            done, _ = await asyncio.wait(
+                {task, cancel_wait},
+                timeout=min(remaining, CANCEL_POLL_SECONDS),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if task in done:
+                return task.result()
+            if cancel_wait in done:
+                break
+            if await _cancel_requested(scan_id):
+                token.request("cancelled")
+                break
+    finally:
+        cancel_wait.cancel()
+
+    task.cancel()
+    kill = asyncio.create_task(asyncio.to_thread(token.kill_execs))
+    _background_tasks.add(kill)
+    kill.add_done_callback(_background_tasks.discard)
+    raise ScanCancelled(token.reason or "cancelled")
+
+
+async def _cancel_requested(scan_id: int) -> bool:
+    from app.database import get_session_context
+
+    async with get_session_context() as session:
+        result = await session.execute(select(Scan.status).where(Scan.id == scan_id))
+        return result.scalar_one_or_none() == "cancelled"
+
+
+# Statuses of a scan that a duplicate request can still attach to
+ACTIVE_STATUSES = ("pending", "running")
+
+# Campaign scans waiting for their rollout slot; never attached to, since
+# they may wait long (or be cancelled with the campaign)
+QUEUED = "queued"
+
+# Seconds past its scanner timeout after which an active scan is presumed
+# orphaned (its worker died) and no longer absorbs equivalent requests
+ORPHAN_MARGIN_SECONDS = 300
+
+# Columns copied from a scan onto the requests coalesced into it
+_OUTCOME_FIELDS = (
+    "status",
+    "score",
+    "passed",
+    "failed",
+    "warnings",
+    "errors",
+    "report_path",
+    "html_report_path",
+    "error_message",
+    "completed_at",
+    "duration_seconds",
+    "previous_scan_id",
+    "findings_new",
+    "findings_resolved",
+    "findings_persisting",
+)
+
+
+def _orphan_cutoff(scanner: str) -> datetime:
+    """Scans of ``scanner`` active since before this can no longer be running."""
+    return datetime.now(UTC) - timedelta(seconds=scan_timeout_for(scanner) + ORPHAN_MARGIN_SECONDS)
+
+
+def _active_since(cutoff: datetime):
+    """Condition: the scan started (or, if never started, was created) after ``cutoff``."""
+    return or_(Scan.started_at >= cutoff, and_(Scan.started_at.is_(None), Scan.created_at >= cutoff))
+
+
+def _outcome_values(scan: Scan) -> dict:
+    return {field: getattr(scan, field) for field in _OUTCOME_FIELDS}
+
+
+async def _resolve_linked_scans(session: AsyncSession, scan: Scan) -> None:
+    """Give requests coalesced into ``scan`` its final outcome."""
+    if scan.status in ACTIVE_STATUSES:
+        return
+    await session.execute(
+        update(Scan)
+        .where(Scan.coalesced_into_id == scan.id, Scan.status.in_(ACTIVE_STATUSES))
+        .values(**_outcome_values(scan))
+    )
+
+
+def _stream_sink(host: Host, scan: Scan) -> ScanStreamSink:
+    """Progress/output sink for a scanner thread started from the running loop."""
+    return ScanStreamSink(
+        scan.id,
+        asyncio.get_running_loop(),
+        {"scanner": scan.scanner, "host_id": host.id, "host_name": host.name, "cluster_id": host.cluster_id},
+    )
+
+
 class ScanService:
     """Service for scan operations."""
 
@@ -141,8 +283,76 @@ async def get_scan_by_id(self, scan_id: int, include_results: bool = False) -> S
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
-    async def create_scan(self, scan_data: ScanCreate, user_id: int | None = None) -> Scan:
-        """Create a new scan job."""
+    async def find_equivalent_scan(
+        self,
+        host_id: int,
+        scanner: str,
+        profile: str | None,
+        exclude_id: int | None = None,
+        statuses: Sequence[str] = ACTIVE_STATUSES,
+    ) -> tuple[Scan | None, str | None]:
+        """Find a scan that can serve a host/scanner/profile request.
+
+        Returns ``(scan, "active")`` for a scan in one of ``statuses``, ``(scan,
+        "fresh")`` for one completed within SCAN_REUSE_WINDOW, else
+        ``(None, None)``. Scans that were themselves coalesced never match,
+        nor do active scans older than the scanner timeout (orphaned by a
+        crash or restart; see ``fail_orphaned_scans``).
+        """
+        if not settings.scan_coalesce_enabled:
+            return None, None
+
+        await self._lock_scan_key(host_id, scanner, profile)
+        query = select(Scan).where(
+            Scan.host_id == host_id,
+            Scan.scanner == scanner,
+            Scan.profile.is_(None) if profile is None else Scan.profile == profile,
+            Scan.coalesced_into_id.is_(None),
+        )
+        if exclude_id is not None:
+            query = query.where(Scan.id != exclude_id)
+
+        result = await self.session.execute(
+            query.where(Scan.status.in_(statuses), _active_since(_orphan_cutoff(scanner))).order_by(Scan.id).limit(1)
+        )
+        scan = result.scalar_one_or_none()
+        if scan is not None:
+            return scan, "active"
+
+        if settings.scan_reuse_window > 0:
+            cutoff = datetime.now(UTC) - timedelta(seconds=settings.scan_reuse_window)
+            result = await self.session.execute(
+                query.where(Scan.status == "completed", Scan.completed_at >= cutoff)
+                .order_by(Scan.completed_at.desc())
+                .limit(1)
+            )
+            scan = result.scalar_one_or_none()
+            if scan is not None:
+                return scan, "fresh"
+        return None, None
+
+    async def _lock_scan_key(self, host_id: int, scanner: str, profile: str | None) -> None:
+        """Serialize lookups for one scan key until the transaction ends (PostgreSQL only)."""
+        if self.session.get_bind().dialect.name != "postgresql":
+            return
+        key = zlib.crc32(f"scan:{host_id}:{scanner}:{profile or ''}".encode())
+        await self.session.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": key})
+
+    async def get_or_create_scan(self, scan_data: ScanCreate, user_id: int | None = None) -> tuple[Scan, str | None]:
+        """Return an equivalent scan to attach to, or create a new pending one.
+
+        The second element is ``"attached"`` (active scan), ``"reused"``
+        (recent completed scan) or ``None`` when a new scan was created.
+        """
+        from app.metrics import scans_coalesced_total
+
+        existing, kind = await self.find_equivalent_scan(scan_data.host_id, scan_data.scanner, scan_data.profile)
+        if existing is not None:
+            mode = "attached" if kind == "active" else "reused"
+            scans_coalesced_total.labels(scanner=scan_data.scanner, mode=mode).inc()
+            logger.info(f"Scan request for host {scan_data.host_id} ({scan_data.scanner}) {mode} to scan {existing.id}")
+            return existing, mode
+
         scan = Scan(
             host_id=scan_data.host_id,
             user_id=user_id,
@@ -153,18 +363,44 @@ async def create_scan(self, scan_data: ScanCreate, user_id: int | None = None) -
         self.session.add(scan)
         await self.session.flush()
         await self.session.refresh(scan)
+        return scan, None
+
+    async def create_scan(self, scan_data: ScanCreate, user_id: int | None = None) -> Scan:
+        """Create a new scan job, or return the equivalent scan it coalesces into."""
+        scan, _ = await self.get_or_create_scan(scan_data, user_id)
         return scan
 
     async def start_scan(self, scan_id: int) -> Scan | None:
-        """Start a pending scan."""
-        from app.metrics import scans_in_progress
+        """Start a pending (or queued campaign) scan.
+
+        A scan whose host/scanner/profile is already being scanned is linked
+        to that scan instead of running again; one with a fresh completed
+        equivalent takes over its outcome immediately.
+        """
+        from app.metrics import scans_coalesced_total, scans_in_progress
 
         scan = await self.get_scan_by_id(scan_id)
-        if not scan or scan.status != "pending":
+        if not scan or scan.status not in ("pending", QUEUED):
             return None
 
         scan.status = "running"
         scan.started_at = datetime.now(UTC)
+
+        # Only a running scan is sure to finish; pending ones may never be started
+        existing, kind = await self.find_equivalent_scan(
+            scan.host_id, scan.scanner, scan.profile, exclude_id=scan.id, statuses=("running",)
+        )
+        if existing is not None:
+            scan.coalesced_into_id = existing.id
+            if kind == "fresh":
+                for field, value in _outcome_values(existing).items():
+                    setattr(scan, field, value)
+            mode = "linked" if kind == "active" else "reused"
+            scans_coalesced_total.labels(scanner=scan.scanner, mode=mode).inc()
+            logger.info(f"Scan {scan.id} {mode} to equivalent scan {existing.id}")
+            await self.session.flush()
+            return scan
+
         await self.session.flush()
 
         scans_in_progress.labels(scanner=scan.scanner).inc()
@@ -178,19 +414,64 @@ async def start_scan(self, scan_id: int) -> Scan | None:
     async def cancel_scan(self, scan_id: int) -> Scan | None:
         """Cancel a running scan."""
         scan = await self.get_scan_by_id(scan_id)
-        if not scan or scan.status not in ("pending", "running"):
+        if not scan or scan.status not in (QUEUED, *ACTIVE_STATUSES):
             return None
 
+        was_pending = scan.status != "running"
         scan.status = "cancelled"
         scan.completed_at = datetime.now(UTC)
         await self.session.flush()
+
+        # A pending scan has no executor to hand its outcome to linked requests
+        if was_pending:
+            await _resolve_linked_scans(self.session, scan)
+
+        # Stop the scanner if it runs in this process; other workers notice via polling
+        token = _scan_tokens.get(scan_id)
+        if token is not None:
+            token.request("cancelled")
         return scan
 
+    async def fail_orphaned_scans(self) -> int:
+        """Fail pending/running scans left behind by a crashed or restarted worker.
+
+        A scan counts as orphaned once it has been active for longer than
+        its scanner timeout plus ORPHAN_MARGIN_SECONDS; no live worker
+        keeps a scan that long. Requests coalesced into it get the same
+        outcome. Returns the scans failed.
+        """
+        result = await self.session.execute(
+            select(Scan).where(Scan.status.in_(ACTIVE_STATUSES), Scan.coalesced_into_id.is_(None))
+        )
+        now = datetime.now(UTC)
+        orphaned = []
+        for scan in result.scalars().all():
+            since = scan.started_at or scan.created_at
+            if since is not None and since.tzinfo is None:
+                since = since.replace(tzinfo=UTC)
+            if since is not None and since < _orphan_cutoff(scan.scanner):
+                scan.status = "failed"
+                scan.error_message = "Scan interrupted: its worker stopped before it finished"
+                scan.completed_at = now
+                orphaned.append(scan)
+        await self.session.flush()
+        for scan in orphaned:
+            await _resolve_linked_scans(self.session, scan)
+        if orphaned:
+            logger.warning(f"Marked {len(orphaned)} orphaned scan(s) failed: {[s.id for s in orphaned]}")
+        return len(orphaned)
+
     async def _execute_scan(self, scan_id: int) -> None:
         """Execute scan in background."""
         from app.database import get_session_context
-        from app.metrics import scans_duration_seconds, scans_in_progress, scans_total
-        from app.services.ws_manager import message_queue
+        from app.metrics import (
+            scans_cancelled_total,
+            scans_duration_seconds,
+            scans_in_progress,
+            scans_timed_out_total,
+            scans_total,
+        )
+        from app.services.event_bus import event_bus
 
         logger.info(f"Background scan task started for scan_id={scan_id}")
 
@@ -209,6 +490,8 @@ async def _execute_scan(self, scan_id: int) -> None:
                 logger.error(f"Host not found for scan {scan_id}")
                 return
 
+            token = _scan_tokens[scan_id] = ScanCancelToken()
+            timeout = scan_timeout_for(scan.scanner)
             try:
                 # Update host status
                 host.status = "scanning"
@@ -216,29 +499,45 @@ async def _execute_scan(self, scan_id: int) -> None:
 
                 logger.info(f"Executing {scan.scanner} scan on {host.name} (scan_id={scan_id})")
 
+                scan_tails.open(scan_id)
+
                 # Notify WS clients about scan start
-                await message_queue.put(
+                await event_bus.publish(
                     {
                         "type": "scan_started",
                         "scan_id": scan_id,
                         "scanner": scan.scanner,
+                        "host_id": host.id,
                         "host_name": host.name,
+                        "cluster_id": host.cluster_id,
                     }
                 )
 
                 # Execute scanner
                 if scan.scanner == "lynis":
-                    result = await self._run_lynis_scan(host, scan)
+                    runner = self._run_lynis_scan(host, scan, token)
                 elif scan.scanner == "openscap":
-                    result = await self._run_openscap_scan(host, scan)
+                    runner = self._run_openscap_scan(host, scan, token)
                 elif scan.scanner == "trivy":
-                    result = await self._run_trivy_scan(host, scan)
+                    runner = self._run_trivy_scan(host, scan)
                 elif scan.scanner == "atomic":
-                    result = await self._run_atomic_scan(host, scan)
+                    runner = self._run_atomic_scan(host, scan)
                 elif scan.scanner == "k8s_hardening":
-                    result = await self._run_k8s_hardening_scan(host, scan, session)
+                    runner = self._run_k8s_hardening_scan(host, scan, session)
                 else:
+                    runner = None
+
+                if runner is None:
                     result = {"success": False, "error": f"Unknown scanner: {scan.scanner}"}
+                else:
+                    result = await _await_scanner(scan_id, runner, token, timeout)
+
+                if (report := result.get("report")) is not None:
+                    # Reference the stored report right away, whatever the
+                    # outcome: the scan row owns it and retention releases it
+                    await report_store.retain(session, report)
+                    scan.report_digest = report.digest
+                    await session.commit()
 
                 # Update scan with results
                 now = datetime.now(UTC)
@@ -259,45 +558,34 @@ async def _execute_scan(self, scan_id: int) -> None:
                     scan.report_path = result.get("report_path")
                     scan.html_report_path = result.get("html_report_path")
 
-                    # Save individual findings as ScanResult entries
-                    findings = result.get("findings", [])
-                    for f in findings:
-                        sr = ScanResult(
-                            scan_id=scan.id,
-                            rule_id=f.get("rule_id", "UNKNOWN"),
-                            title=f.get("title", "Unknown finding"),
-                            severity=f.get("severity", "medium"),
-                            status=f.get("status", "fail"),
-                            category=f.get("category"),
-                        )
-                        session.add(sr)
+                    # Save individual findings against the rule catalog
+                    await RuleCatalog(session).add_findings(scan.id, scan.scanner, result.get("findings", []))
+                    diff = await ScanDiffService(session).compute(scan)
 
                     # Update host last scan info
                     host.last_scan_id = scan.id
                     host.last_scan_score = scan.score
 
                     # Send success notification
-                    await asyncio.to_thread(
-                        send_scan_notification,
-                        host.name,
-                        scan.scanner,
-                        "completed",
-                        scan.score,
-                        scan.passed,
-                        scan.failed,
+                    await notification_dispatcher.notify(
+                        ScanEvent(host.name, scan.scanner, "completed", scan.score, scan.passed, scan.failed),
+                        await session.get(ScanSchedule, scan.schedule_id) if scan.schedule_id else None,
                     )
 
                     # Notify WS clients
-                    await message_queue.put(
+                    await event_bus.publish(
                         {
                             "type": "scan_completed",
                             "scan_id": scan_id,
                             "scanner": scan.scanner,
+                            "host_id": host.id,
                             "host_name": host.name,
+                            "cluster_id": host.cluster_id,
                             "score": scan.score,
                             "passed": scan.passed,
                             "failed": scan.failed,
                             "duration_seconds": scan.duration_seconds,
+                            "diff": diff,
                         }
                     )
                 else:
@@ -306,21 +594,20 @@ async def _execute_scan(self, scan_id: int) -> None:
                     scan.error_message = result.get("error", "Unknown error")
 
                     # Send failure notification
-                    await asyncio.to_thread(
-                        send_scan_notification,
-                        host.name,
-                        scan.scanner,
-                        "failed",
-                        error_message=scan.error_message,
+                    await notification_dispatcher.notify(
+                        ScanEvent(host.name, scan.scanner, "failed", error_message=scan.error_message),
+                        await session.get(ScanSchedule, scan.schedule_id) if scan.schedule_id else None,
                     )
 
                     # Notify WS clients
-                    await message_queue.put(
+                    await event_bus.publish(
                         {
                             "type": "scan_failed",
                             "scan_id": scan_id,
                             "scanner": scan.scanner,
+                            "host_id": host.id,
                             "host_name": host.name,
+                            "cluster_id": host.cluster_id,
                             "error": scan.error_message,
                         }
                     )
@@ -333,6 +620,51 @@ async def _execute_scan(self, scan_id: int) -> None:
                 if scan.duration_seconds:
                     scans_duration_seconds.labels(scanner=scan.scanner).observe(scan.duration_seconds)
 
+            except ScanCancelled as e:
+                # The runner may have been interrupted mid-query on this session
+                await session.rollback()
+                await session.refresh(scan)
+                await session.refresh(host)
+
+                scans_in_progress.labels(scanner=scan.scanner).dec()
+                if e.reason == "timeout":
+                    scans_timed_out_total.labels(scanner=scan.scanner).inc()
+                    scans_total.labels(scanner=scan.scanner, status="timeout").inc()
+                    scan.status = "failed"
+                    scan.error_message = f"Scan timed out after {timeout}s"
+                    event_type = "scan_failed"
+                else:
+                    scans_cancelled_total.labels(scanner=scan.scanner).inc()
+                    scans_total.labels(scanner=scan.scanner, status="cancelled").inc()
+                    scan.status = "cancelled"
+                    event_type = "scan_cancelled"
+                scan.completed_at = scan.completed_at or datetime.now(UTC)
+                host.status = "online"
+                await session.commit()
+                logger.warning(f"Scan {scan_id} stopped: {e.reason}")
+
+                await event_bus.publish(
+                    {
+                        "type": event_type,
+                        "scan_id": scan_id,
+                        "scanner": scan.scanner,
+                        "host_id": host.id,
+                        "host_name": host.name,
+                        "cluster_id": host.cluster_id,
+                        "error": scan.error_message if e.reason == "timeout" else None,
+                    }
+                )
+
+            except asyncio.CancelledError:
+                # Shutdown: record a final status instead of leaving the row running
+                scans_in_progress.labels(scanner=scan.scanner).dec()
+                await session.rollback()
+                scan.status = "failed"
+                scan.error_message = "Scan interrupted by a dashboard shutdown"
+                scan.completed_at = datetime.now(UTC)
+                host.status = "online"
+                await session.commit()
+                raise
             except Exception as e:
                 scans_total.labels(scanner=scan.scanner, status="error").inc()
                 scans_in_progress.labels(scanner=scan.scanner).dec()
@@ -341,17 +673,33 @@ async def _execute_scan(self, scan_id: int) -> None:
                 scan.completed_at = datetime.now(UTC)
                 host.status = "online"
                 await session.commit()
+            finally:
+                _scan_tokens.pop(scan_id, None)
+                scan_tails.close(scan_id, scan.status)
+                try:
+                    await _resolve_linked_scans(session, scan)
+                    await session.commit()
+                except Exception:
+                    logger.exception(f"Failed to resolve scans coalesced into scan {scan_id}")
 
-    async def _run_lynis_scan(self, host: Host, scan: Scan) -> dict:
+    async def _run_lynis_scan(self, host: Host, scan: Scan, token: ScanCancelToken | None = None) -> dict:
         """Run Lynis scan on host via Podman Python SDK (non-blocking)."""
         if host.host_type != "container":
             return {"success": False, "error": "Only container scans are supported"}
 
         # Run the blocking Podman SDK call in a thread
-        return await asyncio.to_thread(self._run_lynis_scan_sync, host.name, host.os_family, scan.id)
+        return await asyncio.to_thread(
+            self._run_lynis_scan_sync, host.name, host.os_family, scan.id, _stream_sink(host, scan), token
+        )
 
     @staticmethod
-    def _run_lynis_scan_sync(host_name: str, os_family: str | None, scan_id: int) -> dict:
+    def _run_lynis_scan_sync(
+        host_name: str,
+        os_family: str | None,
+        scan_id: int,
+        sink: ScanStreamSink | None = None,
+        token: ScanCancelToken | None = None,
+    ) -> dict:
         """Synchronous Lynis scan execution via Podman SDK (runs in thread)."""
         import logging
 
@@ -359,11 +707,8 @@ def _run_lynis_scan_sync(host_name: str, os_family: str | None, scan_id: int) ->
         import docker as podman_lib
 
         logger = logging.getLogger(__name__)
-        reports_dir = Path(settings.reports_dir) / "lynis"
-        reports_dir.mkdir(parents=True, exist_ok=True)
-
-        report_path = reports_dir / f"{host_name}_{scan_id}.log"
 
+        client = None
         try:
             podman_host = settings.podman_host
             if podman_host.startswith("tcp://"):
@@ -380,20 +725,29 @@ def _run_lynis_scan_sync(host_name: str, os_family: str | None, scan_id: int) ->
                 return {"success": False, "error": install_err}
 
             logger.info(f"Starting Lynis scan on {host_name}")
-            exec_result = container.exec_run(
-                cmd=["lynis", "audit", "system", "--no-colors", "--quick"],
-                demux=True,
-            )
+            parser = LynisStreamParser()
+            line_count = 0
+
+            # Stream output to the compressed report and parser instead of buffering the whole run
+            with report_store.writer(MEDIA_TYPES["log"]) as report:
 
-            stdout_data = exec_result.output[0] or b""
-            output = stdout_data.decode("utf-8", errors="replace")
+                def on_line(line: str) -> None:
+                    nonlocal line_count
+                    line_count += 1
+                    report.write(line + "\n")
+                    parser.feed(line)
+                    if sink:
+                        sink.line(line)
+                        sink.progress(parser.progress())
 
-            report_path.write_text(output, encoding="utf-8")
-            logger.info(f"Lynis scan on {host_name} completed, output_len={len(output)}")
+                exec_stream(container, ["lynis", "audit", "system", "--no-colors", "--quick"], on_line, token)
+                stored = report.commit()
+
+            logger.info(f"Lynis scan on {host_name} completed, lines={line_count}")
 
             client.close()
 
-            score, warnings, suggestions, findings = ScanService._parse_lynis_output(output)
+            score, warnings, suggestions, findings = parser.result()
             passed = max(0, suggestions + warnings)
             failed = warnings + suggestions
 
@@ -403,31 +757,49 @@ def _run_lynis_scan_sync(host_name: str, os_family: str | None, scan_id: int) ->
                 "passed": passed,
                 "failed": failed,
                 "warnings": warnings,
-                "report_path": str(report_path),
+                "report": stored,
                 "findings": findings,
             }
+        except ScanCancelled as e:
+            logger.info(f"Lynis scan on {host_name} stopped: {e.reason}")
+            return {"success": False, "error": e.reason}
         except Exception as e:
             logger.error(f"Lynis scan failed on {host_name}: {e}")
             return {"success": False, "error": str(e)}
+        finally:
+            if client is not None:
+                client.close()
 
-    async def _run_openscap_scan(self, host: Host, scan: Scan) -> dict:
+    async def _run_openscap_scan(self, host: Host, scan: Scan, token: ScanCancelToken | None = None) -> dict:
         """Run OpenSCAP scan on host via Podman Python SDK."""
         if host.host_type != "container":
             return {"success": False, "error": "Only container scans are supported"}
-        return await asyncio.to_thread(self._run_openscap_scan_sync, host.name, host.os_family, scan.id, scan.profile)
+        return await asyncio.to_thread(
+            self._run_openscap_scan_sync,
+            host.name,
+            host.os_family,
+            scan.id,
+            scan.profile,
+            _stream_sink(host, scan),
+            token,
+        )
 
     @staticmethod
-    def _run_openscap_scan_sync(host_name: str, os_family: str | None, scan_id: int, profile: str | None) -> dict:
+    def _run_openscap_scan_sync(
+        host_name: str,
+        os_family: str | None,
+        scan_id: int,
+        profile: str | None,
+        sink: ScanStreamSink | None = None,
+        token: ScanCancelToken | None = None,
+    ) -> dict:
         """Synchronous OpenSCAP scan via Podman SDK."""
         import xml.etree.ElementTree as ET
 
         # NOTE: 'docker' is the Python SDK package name (API-compatible with Podman)
         import docker as podman_lib
 
-        reports_dir = Path(settings.reports_dir) / "openscap"
-        reports_dir.mkdir(parents=True, exist_ok=True)
-        report_path = reports_dir / f"{host_name}_{scan_id}.xml"
-
+        client = None
         try:
             podman_host = settings.podman_host
             if podman_host.startswith("tcp://"):
@@ -485,8 +857,17 @@ def _run_openscap_scan_sync(host_name: str, os_family: str | None, scan_id: int,
             )
 
             logger.info(f"Starting OpenSCAP scan on {host_name} with profile {oscap_profile}")
-            exec_result = container.exec_run(
-                cmd=[
+            stdout_parser = OscapStreamParser()
+
+            def on_stdout(line: str) -> None:
+                stdout_parser.feed(line)
+                if sink:
+                    sink.line(line)
+                    sink.progress(stdout_parser.progress())
+
+            exec_stream(
+                container,
+                [
                     "oscap",
                     "xccdf",
                     "eval",
@@ -496,17 +877,23 @@ def _run_openscap_scan_sync(host_name: str, os_family: str | None, scan_id: int,
                     "/tmp/oscap-results.xml",  # nosec B108
                     datastream,
                 ],
-                demux=True,
+                on_stdout,
+                token,
             )
 
-            stdout_data = (exec_result.output[0] or b"").decode("utf-8", errors="replace")
+            # Stream the XML results straight into the compressed report
+            has_xml = False
+            stored = None
+            with report_store.writer(MEDIA_TYPES["xml"]) as report:
 
-            # Get XML results
-            xml_result = container.exec_run(cmd=["cat", "/tmp/oscap-results.xml"], demux=True)  # nosec B108
-            xml_data = (xml_result.output[0] or b"").decode("utf-8", errors="replace")
+                def on_xml(line: str) -> None:
+                    nonlocal has_xml
+                    has_xml = has_xml or bool(line.strip())
+                    report.write(line + "\n")
 
-            if xml_data.strip():
-                report_path.write_text(xml_data, encoding="utf-8")
+                exec_stream(container, ["cat", "/tmp/oscap-results.xml"], on_xml, token)  # nosec B108
+                if has_xml:
+                    stored = report.commit()
 
             client.close()
 
@@ -518,48 +905,47 @@ def _run_openscap_scan_sync(host_name: str, os_family: str | None, scan_id: int,
             not_selected = 0
             other_count = 0
 
-            if xml_data.strip():
+            if stored is not None:
                 try:
-                    root = ET.fromstring(xml_data)  # nosec B314
                     ns = {"xccdf": "http://checklists.nist.gov/xccdf/1.2"}
-                    for rule_result in root.findall(".//xccdf:rule-result", ns):
-                        result_el = rule_result.find("xccdf:result", ns)
-                        status_text = result_el.text if result_el is not None else "error"
-                        rule_id = rule_result.get("idref", "unknown")
-                        severity = rule_result.get("severity", "medium")
-
-                        if status_text == "pass":
-                            passed += 1
-                        elif status_text == "fail":
-                            failed += 1
-                            title = rule_id.replace("xccdf_org.ssgproject.content_rule_", "").replace("_", " ").title()
-                            findings.append(
-                                {
-                                    "rule_id": rule_id[:200],
-                                    "title": title[:500],
-                                    "severity": severity,
-                                    "status": "fail",
-                                    "category": "compliance",
-                                }
-                            )
-                        elif status_text == "notapplicable":
-                            not_applicable += 1
-                        elif status_text == "notselected":
-                            not_selected += 1
-                        else:
-                            other_count += 1
+                    rule_result_tag = f"{{{ns['xccdf']}}}rule-result"
+                    with report_store.open(stored.digest, stored.encoding) as xml_stream:
+                        for _, rule_result in ET.iterparse(xml_stream, events=("end",)):  # nosec B314
+                            if rule_result.tag != rule_result_tag:
+                                continue
+                            result_el = rule_result.find("xccdf:result", ns)
+                            status_text = result_el.text if result_el is not None else "error"
+                            rule_id = rule_result.get("idref", "unknown")
+                            severity = rule_result.get("severity", "medium")
+                            rule_result.clear()
+
+                            if status_text == "pass":
+                                passed += 1
+                            elif status_text == "fail":
+                                failed += 1
+                                findings.append(
+                                    {
+                                        "rule_id": rule_id[:200],
+                                        "title": _openscap_title(rule_id)[:500],
+                                        "severity": severity,
+                                        "status": "fail",
+                                        "category": "compliance",
+                                    }
+                                )
+                            elif status_text == "notapplicable":
+                                not_applicable += 1
+                            elif status_text == "notselected":
+                                not_selected += 1
+                            else:
+                                other_count += 1
                 except ET.ParseError:
                     logger.warning(f"Failed to parse OpenSCAP XML for {host_name}")
 
-            # Also parse stdout for pass/fail counts as fallback
+            # Also use stdout pass/fail counts as fallback
             if passed == 0 and failed == 0 and not_applicable == 0:
-                for line in stdout_data.splitlines():
-                    if "Result" in line and "pass" in line.lower():
-                        passed += 1
-                    elif "Result" in line and "fail" in line.lower():
-                        failed += 1
-                    elif "Result" in line and "notapplicable" in line.lower():
-                        not_applicable += 1
+                passed = stdout_parser.passed
+                failed = stdout_parser.failed
+                not_applicable = stdout_parser.not_applicable
 
             # Score: based on evaluated rules (pass + fail); notapplicable counted separately
             evaluated = passed + failed
@@ -577,12 +963,18 @@ def _run_openscap_scan_sync(host_name: str, os_family: str | None, scan_id: int,
                 "passed": passed,
                 "failed": failed,
                 "warnings": not_applicable,
-                "report_path": str(report_path),
+                "report": stored,
                 "findings": findings,
             }
+        except ScanCancelled as e:
+            logger.info(f"OpenSCAP scan on {host_name} stopped: {e.reason}")
+            return {"success": False, "error": e.reason}
         except Exception as e:
             logger.error(f"OpenSCAP scan failed on {host_name}: {e}")
             return {"success": False, "error": str(e)}
+        finally:
+            if client is not None:
+                client.close()
 
     async def _run_trivy_scan(self, host: Host, scan: Scan) -> dict:
         """Run Trivy vulnerability scan on container image via Podman SDK."""
@@ -598,10 +990,6 @@ def _run_trivy_scan_sync(host_name: str, scan_id: int) -> dict:
         # NOTE: 'docker' is the Python SDK package name (API-compatible with Podman)
         import docker as podman_lib
 
-        reports_dir = Path(settings.reports_dir) / "trivy"
-        reports_dir.mkdir(parents=True, exist_ok=True)
-        report_path = reports_dir / f"{host_name}_{scan_id}.json"
-
         try:
             podman_host = settings.podman_host
             if podman_host.startswith("tcp://"):
@@ -630,7 +1018,7 @@ def _run_trivy_scan_sync(host_name: str, scan_id: int) -> dict:
             output = (
                 trivy_output.decode("utf-8", errors="replace") if isinstance(trivy_output, bytes) else str(trivy_output)
             )
-            report_path.write_text(output, encoding="utf-8")
+            stored = report_store.put(output, MEDIA_TYPES["json"])
 
             client.close()
 
@@ -687,7 +1075,7 @@ def _run_trivy_scan_sync(host_name: str, scan_id: int) -> dict:
                 "passed": passed_count,
                 "failed": failed_count,
                 "warnings": medium + low,
-                "report_path": str(report_path),
+                "report": stored,
                 "findings": findings,
             }
         except Exception as e:
@@ -706,10 +1094,6 @@ def _run_atomic_scan_sync(host_name: str, scan_id: int) -> dict:
         # NOTE: 'docker' is the Python SDK package name (API-compatible with Podman)
         import docker as podman_lib
 
-        reports_dir = Path(settings.reports_dir) / "atomic"
-        reports_dir.mkdir(parents=True, exist_ok=True)
-        report_path = reports_dir / f"{host_name}_{scan_id}.log"
-
         # Security test definitions (MITRE ATT&CK inspired)
         tests = [
             {
@@ -918,7 +1302,7 @@ def _run_atomic_scan_sync(host_name: str, scan_id: int) -> dict:
             client.close()
 
             report_content = "\n".join(report_lines)
-            report_path.write_text(report_content, encoding="utf-8")
+            stored = report_store.put(report_content, MEDIA_TYPES["log"])
 
             total = passed + failed
             score = int((passed / total) * 100) if total > 0 else 0
@@ -933,7 +1317,7 @@ def _run_atomic_scan_sync(host_name: str, scan_id: int) -> dict:
                 "passed": passed,
                 "failed": failed,
                 "warnings": 0,
-                "report_path": str(report_path),
+                "report": stored,
                 "findings": findings,
             }
         except Exception as e:
@@ -983,101 +1367,7 @@ def _run_k8s_hardening_scan_sync(cluster, host) -> dict:
     @staticmethod
     def _parse_lynis_output(output: str) -> tuple[int, int, int, list[dict]]:
         """Parse Lynis stdout output and extract score, warnings, suggestions, and findings."""
-        import re
-
-        score = 0
-        warnings = 0
-        suggestions = 0
-        findings: list[dict] = []
-
-        lines = output.splitlines()
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-
-            # Extract hardening index score
-            if "hardening index" in line.lower() or "hardening_index" in line.lower():
-                match = re.search(r"(\d+)", line)
-                if match:
-                    score = int(match.group(1))
-
-            # Parse warnings
-            elif line.strip().startswith("! ") or "warning" in line.lower() and "[" in line:
-                warnings += 1
-                # Try to extract finding details
-                title = line.strip().lstrip("! ").strip()
-                if title:
-                    findings.append(
-                        {
-                            "rule_id": f"LYNIS-WARN-{warnings:04d}",
-                            "title": title[:500],
-                            "severity": "high",
-                            "status": "fail",
-                            "category": "hardening",
-                        }
-                    )
-
-            # Parse suggestions
-            elif (
-                line.strip().startswith("- ")
-                and i > 0
-                and (
-                    "suggestion" in lines[max(0, i - 5) : i + 1].__repr__().lower()
-                    or any(
-                        c in line
-                        for c in ["Consider", "Enable", "Disable", "Configure", "Install", "Set ", "Add ", "Remove"]
-                    )
-                )
-            ):
-                suggestions += 1
-                title = line.strip().lstrip("- ").strip()
-                if title and len(title) > 10:
-                    # Determine severity from context
-                    sev = "medium"
-                    title_lower = title.lower()
-                    if any(w in title_lower for w in ["password", "auth", "root", "permission", "firewall", "encrypt"]):
-                        sev = "high"
-                    elif any(w in title_lower for w in ["log", "banner", "update", "version"]):
-                        sev = "low"
-
-                    findings.append(
-                        {
-                            "rule_id": f"LYNIS-SUGG-{suggestions:04d}",
-                            "title": title[:500],
-                            "severity": sev,
-                            "status": "fail",
-                            "category": "hardening",
-                        }
-                    )
-
-            # Parse test results like [WARNING], [OK], [FOUND], etc.
-            if "[WARNING]" in line:
-                warnings += 1
-                title = re.sub(r"\[WARNING\]", "", line).strip().strip("-").strip()
-                if title and len(title) > 5 and not any(f["title"] == title[:500] for f in findings):
-                    findings.append(
-                        {
-                            "rule_id": f"LYNIS-W-{warnings:04d}",
-                            "title": title[:500],
-                            "severity": "high",
-                            "status": "fail",
-                            "category": "security",
-                        }
-                    )
-
-            i += 1
-
-        # If score is still 0 but we have output, try harder
-        if score == 0 and output:
-            match = re.search(r"Hardening index\s*:\s*(\d+)", output, re.IGNORECASE)
-            if match:
-                score = int(match.group(1))
-            else:
-                # Try to find any number near "index" or "score"
-                match = re.search(
-                    r"(\d{1,3})\s*$", output[output.lower().rfind("harden") :] if "harden" in output.lower() else ""
-                )
-                if match:
-                    score = int(match.group(1))
-
-        return score, warnings, suggestions, findings
+        parser = LynisStreamParser()
+        for line in output.splitlines():
+            parser.feed(line)
+        return parser.result()
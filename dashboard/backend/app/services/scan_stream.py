@@ -0,0 +1,425 @@
+"""Streaming scanner output: incremental parsers, progress events and live tails."""
+
+import asyncio
+import codecs
+import contextlib
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from app.config import get_settings
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Approximate number of "[+] <section>" headers in a quick Lynis audit, used for percent
+LYNIS_EXPECTED_SECTIONS = 40
+# Pending SSE items per subscriber before new ones are dropped
+TAIL_SUBSCRIBER_QUEUE = 1000
+# Seconds between SIGTERM and SIGKILL when a scanner process is cancelled
+KILL_GRACE_SECONDS = 5
+
+_SUGGESTION_VERBS = ("Consider", "Enable", "Disable", "Configure", "Install", "Set ", "Add ", "Remove")
+_HARDENING_INDEX_RE = re.compile(r"Hardening index\s*:\s*(\d+)", re.IGNORECASE)
+_TRAILING_NUMBER_RE = re.compile(r"(\d{1,3})\s*$")
+
+
+class ScanCancelled(Exception):
+    """Raised in a scanner thread once its scan was cancelled or timed out."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class ScanCancelToken:
+    """Cancellation handle shared by a scan task and its scanner thread.
+
+    The event loop side calls ``request``; the scanner thread registers each
+    running exec so ``kill_execs`` can stop the in-container process and
+    close its output stream, which unblocks the thread right away.
+    """
+
+    __slots__ = ("reason", "_flag", "_event", "_lock", "_execs")
+
+    def __init__(self):
+        self.reason: str | None = None
+        self._flag = threading.Event()
+        self._event = asyncio.Event()
+        self._lock = threading.Lock()
+        # exec_id -> (container, pidfile, stream)
+        self._execs: dict[str, tuple] = {}
+
+    @property
+    def cancelled(self) -> bool:
+        return self._flag.is_set()
+
+    def request(self, reason: str) -> None:
+        """Mark the scan cancelled (event loop side); the first reason wins."""
+        if self._flag.is_set():
+            return
+        self.reason = reason
+        self._flag.set()
+        self._event.set()
+
+    async def wait(self) -> str | None:
+        await self._event.wait()
+        return self.reason
+
+    def check(self) -> None:
+        if self._flag.is_set():
+            raise ScanCancelled(self.reason or "cancelled")
+
+    def register(self, exec_id: str, container, pidfile: str, stream) -> None:
+        with self._lock:
+            self._execs[exec_id] = (container, pidfile, stream)
+
+    def unregister(self, exec_id: str) -> None:
+        with self._lock:
+            self._execs.pop(exec_id, None)
+
+    def kill_execs(self) -> None:
+        """Kill every registered in-container process and close its stream (blocking)."""
+        with self._lock:
+            execs = list(self._execs.values())
+        for container, pidfile, stream in execs:
+            _kill_exec(container, pidfile, stream)
+
+
+class LynisStreamParser:
+    """Line-by-line Lynis parser; same results as parsing the whole output at once."""
+
+    __slots__ = (
+        "score",
+        "warnings",
+        "suggestions",
+        "findings",
+        "sections",
+        "section",
+        "_window",
+        "_titles",
+        "_index_match",
+        "_harden_tail",
+        "_has_output",
+    )
+
+    def __init__(self):
+        self.score = 0
+        self.warnings = 0
+        self.suggestions = 0
+        self.findings: list[dict] = []
+        self.sections = 0
+        self.section: str | None = None
+        # Current line plus the five before it (suggestion context)
+        self._window: deque[str] = deque(maxlen=6)
+        self._titles: set[str] = set()
+        self._index_match: int | None = None
+        # Last non-blank text after the most recent "harden" (score fallback)
+        self._harden_tail: str | None = None
+        self._has_output = False
+
+    def feed(self, line: str) -> None:
+        self._has_output = True
+        self._window.append(line)
+        stripped = line.strip()
+        lower = line.lower()
+
+        if stripped.startswith("[+] "):
+            self.sections += 1
+            self.section = stripped[4:].strip()
+
+        if self._index_match is None:
+            match = _HARDENING_INDEX_RE.search(line)
+            if match:
+                self._index_match = int(match.group(1))
+        if "harden" in lower:
+            self._harden_tail = line[lower.rfind("harden") :]
+        elif stripped and self._harden_tail is not None:
+            self._harden_tail = line
+
+        # Extract hardening index score
+        if "hardening index" in lower or "hardening_index" in lower:
+            match = re.search(r"(\d+)", line)
+            if match:
+                self.score = int(match.group(1))
+
+        # Parse warnings
+        elif stripped.startswith("! ") or "warning" in lower and "[" in line:
+            self.warnings += 1
+            title = stripped.lstrip("! ").strip()
+            if title:
+                self._add_finding(f"LYNIS-WARN-{self.warnings:04d}", title, "high", "hardening")
+
+        # Parse suggestions
+        elif (
+            stripped.startswith("- ")
+            and len(self._window) > 1
+            and ("suggestion" in repr(list(self._window)).lower() or any(c in line for c in _SUGGESTION_VERBS))
+        ):
+            self.suggestions += 1
+            title = stripped.lstrip("- ").strip()
+            if title and len(title) > 10:
+                sev = "medium"
+                title_lower = title.lower()
+                if any(w in title_lower for w in ["password", "auth", "root", "permission", "firewall", "encrypt"]):
+                    sev = "high"
+                elif any(w in title_lower for w in ["log", "banner", "update", "version"]):
+                    sev = "low"
+                self._add_finding(f"LYNIS-SUGG-{self.suggestions:04d}", title, sev, "hardening")
+
+        # Parse test results like [WARNING], [OK], [FOUND], etc.
+        if "[WARNING]" in line:
+            self.warnings += 1
+            title = re.sub(r"\[WARNING\]", "", line).strip().strip("-").strip()
+            if title and len(title) > 5 and title[:500] not in self._titles:
+                self._add_finding(f"LYNIS-W-{self.warnings:04d}", title, "high", "security")
+
+    def result(self) -> tuple[int, int, int, list[dict]]:
+        score = self.score
+        # If score is still 0 but we have output, try harder
+        if score == 0 and self._has_output:
+            if self._index_match is not None:
+                score = self._index_match
+            elif self._harden_tail is not None:
+                match = _TRAILING_NUMBER_RE.search(self._harden_tail)
+                if match:
+                    score = int(match.group(1))
+        return score, self.warnings, self.suggestions, self.findings
+
+    def progress(self) -> dict[str, Any]:
+        return {
+            "percent": min(99, self.sections * 100 // LYNIS_EXPECTED_SECTIONS),
+            "section": self.section,
+            "sections_done": self.sections,
+            "findings": len(self.findings),
+        }
+
+    def _add_finding(self, rule_id: str, title: str, severity: str, category: str) -> None:
+        self._titles.add(title[:500])
+        self.findings.append(
+            {
+                "rule_id": rule_id,
+                "title": title[:500],
+                "severity": severity,
+                "status": "fail",
+                "category": category,
+            }
+        )
+
+
+class OscapStreamParser:
+    """Counts rule results from ``oscap xccdf eval`` stdout as they are printed."""
+
+    __slots__ = ("rules_done", "passed", "failed", "not_applicable")
+
+    def __init__(self):
+        self.rules_done = 0
+        self.passed = 0
+        self.failed = 0
+        self.not_applicable = 0
+
+    def feed(self, line: str) -> None:
+        if "Result" not in line:
+            return
+        self.rules_done += 1
+        lower = line.lower()
+        if "pass" in lower:
+            self.passed += 1
+        elif "fail" in lower:
+            self.failed += 1
+        elif "notapplicable" in lower:
+            self.not_applicable += 1
+
+    def progress(self) -> dict[str, Any]:
+        return {"rules_done": self.rules_done, "passed": self.passed, "failed": self.failed}
+
+
+class ScanTail:
+    """Recent output and latest progress of one running scan."""
+
+    __slots__ = ("lines", "progress", "subscribers")
+
+    def __init__(self, backlog: int):
+        self.lines: deque[str] = deque(maxlen=backlog)
+        self.progress: dict[str, Any] | None = None
+        self.subscribers: set[asyncio.Queue] = set()
+
+
+class ScanTailRegistry:
+    """Live output of scans running in this process, for SSE tailing.
+
+    All methods run on the event loop; worker threads reach it through
+    ScanStreamSink.
+    """
+
+    def __init__(self):
+        self._tails: dict[int, ScanTail] = {}
+
+    def open(self, scan_id: int) -> None:
+        self._tails[scan_id] = ScanTail(settings.scan_tail_backlog)
+
+    def is_open(self, scan_id: int) -> bool:
+        return scan_id in self._tails
+
+    def push_line(self, scan_id: int, line: str) -> None:
+        tail = self._tails.get(scan_id)
+        if tail is None:
+            return
+        tail.lines.append(line)
+        self._notify(tail, "line", {"line": line})
+
+    def push_progress(self, scan_id: int, progress: dict[str, Any]) -> None:
+        tail = self._tails.get(scan_id)
+        if tail is None:
+            return
+        tail.progress = progress
+        self._notify(tail, "progress", progress)
+
+    def close(self, scan_id: int, status: str) -> None:
+        tail = self._tails.pop(scan_id, None)
+        if tail is not None:
+            self._notify(tail, "done", {"scan_id": scan_id, "status": status})
+
+    def subscribe(self, scan_id: int) -> tuple[list[str], dict[str, Any] | None, asyncio.Queue] | None:
+        """Return (backlog lines, latest progress, live queue), or None when the scan is not running here."""
+        tail = self._tails.get(scan_id)
+        if tail is None:
+            return None
+        queue: asyncio.Queue = asyncio.Queue(maxsize=TAIL_SUBSCRIBER_QUEUE)
+        tail.subscribers.add(queue)
+        return list(tail.lines), tail.progress, queue
+
+    def unsubscribe(self, scan_id: int, queue: asyncio.Queue) -> None:
+        tail = self._tails.get(scan_id)
+        if tail is not None:
+            tail.subscribers.discard(queue)
+
+    @staticmethod
+    def _notify(tail: ScanTail, event: str, data: dict[str, Any]) -> None:
+        for queue in tail.subscribers:
+            with contextlib.suppress(asyncio.QueueFull):
+                queue.put_nowait((event, data))
+
+
+class ScanStreamSink:
+    """Thread-safe bridge from a scanner worker thread to the event loop.
+
+    Output lines go to the scan's live tail; progress is throttled to one
+    update per ``scan_progress_interval`` and published as a
+    ``scan_progress`` event on the event bus.
+    """
+
+    __slots__ = ("scan_id", "loop", "base", "_last_progress")
+
+    def __init__(self, scan_id: int, loop: asyncio.AbstractEventLoop, base: dict[str, Any]):
+        self.scan_id = scan_id
+        self.loop = loop
+        self.base = base
+        self._last_progress = 0.0
+
+    def line(self, text: str) -> None:
+        self.loop.call_soon_threadsafe(scan_tails.push_line, self.scan_id, text)
+
+    def progress(self, data: dict[str, Any], force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_progress < settings.scan_progress_interval:
+            return
+        self._last_progress = now
+        message = {"type": "scan_progress", "scan_id": self.scan_id, **self.base, **data}
+        asyncio.run_coroutine_threadsafe(self._publish(message), self.loop)
+
+    async def _publish(self, message: dict[str, Any]) -> None:
+        from app.services.event_bus import event_bus
+
+        scan_tails.push_progress(self.scan_id, message)
+        await event_bus.publish(message)
+
+
+# ------------------------------------------------------------------
+# Module-level helpers
+# ------------------------------------------------------------------
+
+
+def exec_stream(
+    container, cmd: list[str], on_line: Callable[[str], None], token: ScanCancelToken | None = None
+) -> int | None:
+    """Run ``cmd`` in a container and hand stdout to ``on_line`` as lines arrive.
+
+    Uses the low-level exec API so nothing is buffered beyond a partial
+    line. Returns the exit code. With a cancel token the command runs under
+    a small shell wrapper that records its PID, so a cancelled or timed-out
+    scan can kill it; ScanCancelled is raised in that case.
+    """
+    api = container.client.api
+    pidfile = None
+    if token is not None:
+        token.check()
+        pidfile = f"/tmp/.test-hard-exec-{uuid.uuid4().hex}.pid"  # nosec B108
+        wrapper = f'"$@" & p=$!; echo $p > {pidfile}; wait $p; rc=$?; rm -f {pidfile}; exit $rc'
+        cmd = ["sh", "-c", wrapper, "sh", *cmd]
+
+    exec_id = api.exec_create(container.id, cmd, stdout=True, stderr=True)["Id"]
+    stream = api.exec_start(exec_id, stream=True, demux=True)
+    if token is not None:
+        token.register(exec_id, container, pidfile, stream)
+        if token.cancelled:
+            # Cancelled while the exec was being created
+            _kill_exec(container, pidfile, stream)
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    try:
+        for stdout, _stderr in stream:
+            if token is not None and token.cancelled:
+                break
+            if not stdout:
+                continue
+            pending += decoder.decode(stdout)
+            *lines, pending = pending.split("\n")
+            for line in lines:
+                on_line(line.rstrip("\r"))
+    except Exception:
+        # A stream closed by kill_execs surfaces as a socket error
+        if token is not None and token.cancelled:
+            raise ScanCancelled(token.reason or "cancelled") from None
+        raise
+    finally:
+        if token is not None:
+            token.unregister(exec_id)
+
+    if token is not None:
+        token.check()
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        on_line(pending.rstrip("\r"))
+    return api.exec_inspect(exec_id).get("ExitCode")
+
+
+def _kill_exec(container, pidfile: str | None, stream) -> None:
+    """SIGTERM (then SIGKILL) the process recorded in ``pidfile`` and close the exec stream."""
+    if pidfile:
+        script = (
+            f"p=$(cat {pidfile} 2>/dev/null) || exit 0; kill -TERM $p 2>/dev/null; "
+            f"sleep {KILL_GRACE_SECONDS}; kill -KILL $p 2>/dev/null; rm -f {pidfile}"
+        )
+        try:
+            container.exec_run(["sh", "-c", script], detach=True)
+        except Exception as e:
+            logger.warning("Failed to kill scanner process in %s: %s", getattr(container, "name", "?"), e)
+    with contextlib.suppress(Exception):
+        stream.close()
+
+
+def format_sse(event: str, data: dict[str, Any]) -> str:
+    """Encode one Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+# Singleton instance
+scan_tails = ScanTailRegistry()
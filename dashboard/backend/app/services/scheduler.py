@@ -1,17 +1,20 @@
 """Scheduled scanning service using APScheduler."""
 
+import asyncio
 import logging
+import zlib
 from datetime import UTC, datetime, timedelta
 from typing import TYPE_CHECKING
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from sqlalchemy import delete, select
+from apscheduler.triggers.interval import IntervalTrigger
+from sqlalchemy import func, select
 
 from app.config import get_settings
-from app.database import get_session_context
+from app.database import engine, get_session_context
+from app.metrics import schedule_lateness_seconds, scheduler_admission_backlog
 from app.models import Scan, ScanSchedule
-from app.models.scan import ScanResult
 
 if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession  # noqa: F401
@@ -20,6 +23,26 @@
 logger = logging.getLogger(__name__)
 
 
+class CronGroup:
+    """Schedules sharing one cron expression/timezone, fired by one job."""
+
+    __slots__ = ("key", "cron_expression", "window", "schedule_ids", "next_fire")
+
+    def __init__(self, key: str, cron_expression: str, window: float):
+        self.key = key
+        self.cron_expression = cron_expression
+        self.window = window
+        self.schedule_ids: set[int] = set()
+        self.next_fire: datetime | None = None
+
+    @property
+    def job_id(self) -> str:
+        return f"scan_cron_{zlib.crc32(self.key.encode()):08x}"
+
+    def job_name(self) -> str:
+        return f"Scan schedules {self.cron_expression!r} ({len(self.schedule_ids)})"
+
+
 class SchedulerService:
     """Service for managing scheduled scans."""
 
@@ -34,6 +57,12 @@ def __new__(cls) -> "SchedulerService":
     def __init__(self):
         if self._scheduler is None:
             self._scheduler = AsyncIOScheduler(timezone=settings.scheduler_timezone)
+        if not hasattr(self, "_groups"):
+            self._groups: dict[str, CronGroup] = {}
+            self._schedule_groups: dict[int, str] = {}
+            # Schedules fired but not yet admitted, and the tasks pacing them
+            self._waiting: set[int] = set()
+            self._tasks: set[asyncio.Task] = set()
 
     @property
     def scheduler(self) -> AsyncIOScheduler:
@@ -52,19 +81,88 @@ async def start(self) -> None:
             logger.warning("Scheduler is already running")
             return
 
-        # Load existing schedules from database
-        await self._load_schedules()
-
-        # Add daily cleanup job for scan retention (30 days)
+        # Daily scan retention (policies in SCAN_RETENTION_*)
         self.scheduler.add_job(
             self._cleanup_old_scans,
             CronTrigger(hour=3, minute=0),
             id="scan_retention_cleanup",
-            name="Scan retention cleanup (30 days)",
+            name="Scan retention",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+
+        if engine.dialect.name == "postgresql":
+            self.scheduler.add_job(
+                self._ensure_result_partitions,
+                IntervalTrigger(hours=1),
+                id="scan_results_partitions",
+                name="Scan result partitions",
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+            )
+
+        if settings.discovery_enabled:
+            from app.services.discovery_scheduler import discovery_scheduler
+
+            self.scheduler.add_job(
+                discovery_scheduler.tick,
+                IntervalTrigger(seconds=settings.discovery_tick_seconds),
+                id="cluster_discovery_tick",
+                name="Cluster auto-discovery",
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+            )
+
+        if settings.host_status_refresh_interval > 0:
+            self.scheduler.add_job(
+                self._refresh_host_statuses,
+                IntervalTrigger(seconds=settings.host_status_refresh_interval),
+                id="host_status_refresh",
+                name="Host status refresh",
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+            )
+
+        # Fail scans orphaned by a crashed replica (first run right away)
+        self.scheduler.add_job(
+            self._fail_orphaned_scans,
+            IntervalTrigger(minutes=10),
+            id="orphaned_scan_cleanup",
+            name="Orphaned scan cleanup",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            next_run_time=datetime.now(UTC),
+        )
+
+        self.scheduler.add_job(
+            self._dispatch_campaigns,
+            IntervalTrigger(seconds=settings.campaign_tick_seconds),
+            id="campaign_dispatch",
+            name="Scan campaign rollout",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+
+        self.scheduler.add_job(
+            self._sync_schedules,
+            IntervalTrigger(seconds=settings.scheduler_sync_interval),
+            id="schedule_sync",
+            name="Schedule sync",
             replace_existing=True,
+            max_instances=1,
+            coalesce=True,
         )
 
         self.scheduler.start()
+
+        # Load existing schedules from database
+        await self._load_schedules()
         logger.info("Scheduler started")
 
     async def stop(self) -> None:
@@ -72,6 +170,21 @@ async def stop(self) -> None:
         if self.scheduler.running:
             self.scheduler.shutdown(wait=False)
             logger.info("Scheduler stopped")
+        # A stopped AsyncIOScheduler is not restarted; a new leadership term gets a fresh one
+        self._scheduler = None
+        self._groups.clear()
+        self._schedule_groups.clear()
+        self._waiting.clear()
+
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+
+        from app.services.discovery_scheduler import discovery_scheduler
+
+        await discovery_scheduler.stop()
 
     async def _load_schedules(self) -> None:
         """Load all active schedules from database."""
@@ -83,13 +196,31 @@ async def _load_schedules(self) -> None:
                 self.add_schedule(schedule)
                 logger.info(f"Loaded schedule: {schedule.name} (ID: {schedule.id})")
 
+    async def _sync_schedules(self) -> None:
+        """Reconcile jobs with schedules created or edited on other replicas."""
+        async with get_session_context() as session:
+            result = await session.execute(select(ScanSchedule).where(ScanSchedule.is_active == True))  # noqa: E712
+            schedules = result.scalars().all()
+
+        active_ids = {schedule.id for schedule in schedules}
+        for schedule_id in set(self._schedule_groups) - active_ids:
+            self.remove_schedule(schedule_id)
+        for schedule in schedules:
+            if self._schedule_groups.get(schedule.id) != cron_group_key(schedule.cron_expression, schedule.timezone):
+                self.add_schedule(schedule)
+
     def add_schedule(self, schedule: ScanSchedule) -> None:
-        """Add a scan schedule to the scheduler."""
-        job_id = f"scan_schedule_{schedule.id}"
+        """Add a scan schedule to the job of its cron group.
+
+        Schedules sharing a cron expression and timezone fire from one
+        APScheduler job; each is then started at its own jittered offset.
+        """
+        if not self.scheduler.running:
+            # Not the leader (or scheduler disabled): the leader picks it up in _sync_schedules
+            return
 
-        # Remove existing job if any
-        if self.scheduler.get_job(job_id):
-            self.scheduler.remove_job(job_id)
+        # Leave the previous group (cron expression may have changed)
+        self.remove_schedule(schedule.id)
 
         # Parse cron expression
         try:
@@ -101,24 +232,42 @@ def add_schedule(self, schedule: ScanSchedule) -> None:
             logger.error(f"Invalid cron expression for schedule {schedule.id}: {e}")
             return
 
-        # Add job
-        self.scheduler.add_job(
-            self._execute_scheduled_scan,
-            trigger=trigger,
-            id=job_id,
-            args=[schedule.id],
-            name=schedule.name,
-            replace_existing=True,
-        )
+        key = cron_group_key(schedule.cron_expression, schedule.timezone)
+        group = self._groups.get(key)
+        if group is None:
+            group = self._groups[key] = CronGroup(key, schedule.cron_expression, _jitter_window(trigger))
+            self.scheduler.add_job(
+                self._execute_schedule_group,
+                trigger=trigger,
+                id=group.job_id,
+                args=[key],
+                name=group.job_name(),
+                replace_existing=True,
+                max_instances=1,
+                coalesce=True,
+            )
+            group.next_fire = trigger.get_next_fire_time(None, datetime.now(UTC))
+
+        group.schedule_ids.add(schedule.id)
+        self._schedule_groups[schedule.id] = key
+        self._rename_group_job(group)
 
-        logger.info(f"Added schedule job: {schedule.name} ({schedule.cron_expression})")
+        logger.info(f"Added schedule {schedule.name} to cron group {schedule.cron_expression!r}")
 
     def remove_schedule(self, schedule_id: int) -> None:
         """Remove a scan schedule from the scheduler."""
-        job_id = f"scan_schedule_{schedule_id}"
-        if self.scheduler.get_job(job_id):
-            self.scheduler.remove_job(job_id)
-            logger.info(f"Removed schedule job: {job_id}")
+        key = self._schedule_groups.pop(schedule_id, None)
+        group = self._groups.get(key) if key else None
+        if group is None:
+            return
+        group.schedule_ids.discard(schedule_id)
+        if group.schedule_ids:
+            self._rename_group_job(group)
+        else:
+            del self._groups[key]
+            if self.scheduler.get_job(group.job_id):
+                self.scheduler.remove_job(group.job_id)
+            logger.info(f"Removed cron group job: {group.job_id}")
 
     def update_schedule(self, schedule: ScanSchedule) -> None:
         """Update an existing schedule."""
@@ -127,82 +276,213 @@ def update_schedule(self, schedule: ScanSchedule) -> None:
         else:
             self.remove_schedule(schedule.id)
 
-    async def _execute_scheduled_scan(self, schedule_id: int) -> None:
-        """Execute a scheduled scan."""
-        logger.info(f"Executing scheduled scan: {schedule_id}")
+    def _rename_group_job(self, group: "CronGroup") -> None:
+        job = self.scheduler.get_job(group.job_id)
+        if job:
+            job.modify(name=group.job_name())
+
+    # ------------------------------------------------------------------
+    # Batched, jittered execution
+    # ------------------------------------------------------------------
+
+    async def _execute_schedule_group(self, group_key: str) -> None:
+        """Fire every schedule of a cron group.
+
+        Returns immediately: each schedule is started by a background task at
+        the group's fire time plus its deterministic jitter, once the
+        admission check allows. Schedules still waiting from the previous
+        fire are not queued twice.
+        """
+        group = self._groups.get(group_key)
+        if group is None:
+            return
 
-        async with get_session_context() as session:
-            # Get schedule
-            schedule = await session.get(ScanSchedule, schedule_id)
-            if not schedule or not schedule.is_active:
-                logger.warning(f"Schedule {schedule_id} not found or inactive")
-                return
-
-            # Create scan
-            scan = Scan(
-                host_id=schedule.host_id,
-                user_id=schedule.user_id,
-                schedule_id=schedule.id,
-                scanner=schedule.scanner,
-                profile=schedule.profile,
-                status="pending",
+        now = datetime.now(UTC)
+        fired_at = group.next_fire if group.next_fire is not None and group.next_fire <= now else now
+        job = self.scheduler.get_job(group.job_id)
+        group.next_fire = getattr(job, "next_run_time", None)
+
+        ids = group.schedule_ids - self._waiting
+        if len(ids) < len(group.schedule_ids):
+            logger.warning(
+                f"Cron group {group.cron_expression!r}: {len(group.schedule_ids) - len(ids)} "
+                "schedule(s) still waiting from the previous run, not queued again"
             )
-            session.add(scan)
+        if not ids:
+            return
 
-            # Update schedule tracking
-            schedule.last_run_at = datetime.now(UTC)
-            schedule.run_count += 1
+        plan = sorted((fired_at + timedelta(seconds=schedule_jitter(sid, group.window)), sid) for sid in ids)
+        self._waiting.update(ids)
+        scheduler_admission_backlog.set(len(self._waiting))
+        logger.info(f"Cron group {group.cron_expression!r} fired: {len(plan)} schedule(s) over {group.window:.0f}s")
 
-            # Calculate next run
-            job = self.scheduler.get_job(f"scan_schedule_{schedule_id}")
-            if job and job.next_run_time:
-                schedule.next_run_at = job.next_run_time
+        task = asyncio.create_task(self._run_group_plan(plan, group.next_fire))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
 
-            await session.commit()
-            await session.refresh(scan)
+    async def _run_group_plan(self, plan: list[tuple[datetime, int]], next_run_at: datetime | None) -> None:
+        index = 0
+        try:
+            while index < len(plan):
+                delay = (plan[index][0] - datetime.now(UTC)).total_seconds()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                slots = await self._wait_for_capacity()
+
+                now = datetime.now(UTC)
+                batch = []
+                while index < len(plan) and plan[index][0] <= now and len(batch) < slots:
+                    batch.append(plan[index])
+                    index += 1
+                try:
+                    await self._start_scheduled_scans(batch, next_run_at)
+                except Exception as e:
+                    logger.error(f"Failed to start scheduled scans {[sid for _, sid in batch]}: {e}")
+                finally:
+                    self._waiting.difference_update(sid for _, sid in batch)
+                    scheduler_admission_backlog.set(len(self._waiting))
+        finally:
+            self._waiting.difference_update(sid for _, sid in plan[index:])
+            scheduler_admission_backlog.set(len(self._waiting))
+
+    async def _wait_for_capacity(self) -> int:
+        """Block until the engine can take more scans; returns how many."""
+        while True:
+            slots = await self._admission_slots()
+            if slots > 0:
+                return slots
+            await asyncio.sleep(settings.scheduler_admission_poll)
+
+    async def _admission_slots(self) -> int:
+        """Scans that may start now given running scans and DB pool pressure."""
+        async with get_session_context() as session:
+            result = await session.execute(
+                select(func.count(Scan.id)).where(Scan.status == "running", Scan.coalesced_into_id.is_(None))
+            )
+            running = result.scalar_one()
+        slots = settings.scheduler_max_running_scans - running
+        if _pool_saturated():
+            # Every pooled connection is busy: trickle rather than pile on
+            slots = min(slots, 1)
+        return slots
+
+    async def _start_scheduled_scans(self, batch: list[tuple[datetime, int]], next_run_at: datetime | None) -> None:
+        """Create and start the scans of a batch of due schedules in one session."""
+        from app.services.scan import ScanService
+
+        if not batch:
+            return
+        due_by_id = {sid: due for due, sid in batch}
 
-            logger.info(f"Created scan {scan.id} from schedule {schedule_id}")
+        async with get_session_context() as session:
+            result = await session.execute(
+                select(ScanSchedule).where(
+                    ScanSchedule.id.in_(due_by_id),
+                    ScanSchedule.is_active == True,  # noqa: E712
+                )
+            )
+            now = datetime.now(UTC)
+            scans = []
+            for schedule in result.scalars().all():
+                scan = Scan(
+                    host_id=schedule.host_id,
+                    user_id=schedule.user_id,
+                    schedule_id=schedule.id,
+                    scanner=schedule.scanner,
+                    profile=schedule.profile,
+                    status="pending",
+                )
+                session.add(scan)
+                scans.append(scan)
+
+                # Update schedule tracking
+                schedule.last_run_at = now
+                schedule.run_count += 1
+                if next_run_at:
+                    schedule.next_run_at = next_run_at
+                schedule_lateness_seconds.observe(max((now - due_by_id[schedule.id]).total_seconds(), 0))
 
-            # Start scan execution
-            from app.services.scan import ScanService
+            await session.commit()
+            logger.info(f"Created {len(scans)} scheduled scan(s): {[s.id for s in scans]}")
 
             scan_service = ScanService(session)
-            await scan_service.start_scan(scan.id)
+            for scan in scans:
+                await scan_service.start_scan(scan.id)
+
+    async def _refresh_host_statuses(self) -> None:
+        """Refresh the status of all active hosts in bulk."""
+        from app.services.host_status import HostStatusRefresher
+
+        try:
+            async with get_session_context() as session:
+                await HostStatusRefresher(session).refresh_all()
+        except Exception as e:
+            logger.error(f"Host status refresh failed: {e}")
+
+    async def _fail_orphaned_scans(self) -> None:
+        """Give scans whose worker died a final status."""
+        from app.services.scan import ScanService
+
+        try:
+            async with get_session_context() as session:
+                await ScanService(session).fail_orphaned_scans()
+        except Exception as e:
+            logger.error(f"Orphaned scan cleanup failed: {e}")
+
+    async def _dispatch_campaigns(self) -> None:
+        """Start the next batch of queued scans for every running campaign.
+
+        Campaign starts share the admission budget of scheduled scans, so
+        several campaigns cannot push past SCHEDULER_MAX_RUNNING_SCANS.
+        """
+        from app.services.campaign import CampaignService
+
+        try:
+            slots = max(await self._admission_slots(), 0)
+            async with get_session_context() as session:
+                await CampaignService(session).dispatch_all(limit=slots)
+        except Exception as e:
+            logger.error(f"Campaign dispatch failed: {e}")
 
     async def _cleanup_old_scans(self) -> None:
-        """Remove scans older than 30 days to enforce retention policy."""
-        cutoff = datetime.now(UTC) - timedelta(days=30)
-        logger.info(f"Running scan retention cleanup, removing scans before {cutoff}")
+        """Apply the scan retention policies in small batches."""
+        from app.services.retention import RetentionService
 
-        async with get_session_context() as session:
-            # Find old scan IDs
-            result = await session.execute(select(Scan.id).where(Scan.created_at < cutoff))
-            old_ids = [row[0] for row in result.all()]
-
-            if old_ids:
-                # Delete results first (cascade should handle it, but be explicit)
-                await session.execute(delete(ScanResult).where(ScanResult.scan_id.in_(old_ids)))
-                # Delete scans
-                await session.execute(delete(Scan).where(Scan.id.in_(old_ids)))
-                await session.commit()
-                logger.info(f"Cleaned up {len(old_ids)} scans older than 30 days")
-            else:
-                logger.info("No old scans to clean up")
+        try:
+            totals = await RetentionService().run()
+            logger.info(
+                f"Scan retention removed {totals['scans']} scans, {totals['results']} findings, "
+                f"{totals['partitions']} partitions"
+            )
+        except Exception as e:
+            logger.error(f"Scan retention failed: {e}")
+
+    async def _ensure_result_partitions(self) -> None:
+        """Keep a scan_results partition ready ahead of new scan ids."""
+        from app.services.retention import RetentionService
+
+        try:
+            await RetentionService().ensure_partitions()
+        except Exception as e:
+            logger.error(f"Scan result partition maintenance failed: {e}")
 
     async def get_schedule_status(self, schedule_id: int) -> dict | None:
         """Get status of a scheduled job."""
-        job_id = f"scan_schedule_{schedule_id}"
-        job = self.scheduler.get_job(job_id)
+        group = self._groups.get(self._schedule_groups.get(schedule_id, ""))
+        job = self.scheduler.get_job(group.job_id) if group else None
 
         if not job:
             return None
 
         return {
             "id": schedule_id,
-            "job_id": job_id,
+            "job_id": job.id,
             "name": job.name,
             "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
             "pending": job.pending,
+            "jitter_seconds": round(schedule_jitter(schedule_id, group.window), 1),
+            "group_size": len(group.schedule_ids),
+            "waiting": schedule_id in self._waiting,
         }
 
     def get_all_jobs(self) -> list[dict]:
@@ -220,5 +500,45 @@ def get_all_jobs(self) -> list[dict]:
         return jobs
 
 
+# ------------------------------------------------------------------
+# Module-level helpers
+# ------------------------------------------------------------------
+
+
+def cron_group_key(cron_expression: str, timezone: str) -> str:
+    """Key shared by schedules that fire at the same instants."""
+    return f"{timezone}|{' '.join(cron_expression.split())}"
+
+
+def schedule_jitter(schedule_id: int, window: float) -> float:
+    """Deterministic offset in ``[0, window)`` seconds for a schedule.
+
+    Derived from the schedule id so a schedule keeps its slot across runs
+    and restarts, while a group's schedules spread evenly over the window.
+    """
+    if window <= 0:
+        return 0.0
+    return zlib.crc32(f"schedule:{schedule_id}".encode()) / 2**32 * window
+
+
+def _jitter_window(trigger: CronTrigger) -> float:
+    """SCHEDULER_JITTER_WINDOW, capped at half the cron period."""
+    window = float(settings.scheduler_jitter_window)
+    now = datetime.now(UTC)
+    first = trigger.get_next_fire_time(None, now)
+    second = trigger.get_next_fire_time(first, first + timedelta(seconds=1)) if first else None
+    if first and second:
+        window = min(window, (second - first).total_seconds() / 2)
+    return max(window, 0.0)
+
+
+def _pool_saturated() -> bool:
+    pool = engine.pool
+    size = getattr(pool, "size", None)
+    if size is None:
+        return False
+    return pool.checkedout() >= size()
+
+
 # Singleton instance
 scheduler_service = SchedulerService()
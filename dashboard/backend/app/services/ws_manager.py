@@ -1,41 +1,236 @@
 """WebSocket connection manager for real-time notifications."""
 
 import asyncio
+import contextlib
+import json
 import logging
+import time
+from collections import deque
 from typing import Any
 
 from fastapi import WebSocket
 
+from app.config import get_settings
+from app.metrics import ws_connections, ws_delivery_latency_seconds, ws_messages_dropped_total, ws_queue_depth
+from app.services.event_bus import event_bus
+
+settings = get_settings()
 logger = logging.getLogger(__name__)
 
+# Event types where only the latest pending message per scan matters
+COALESCE_TYPES = frozenset({"scan_progress"})
+
+
+class Subscription:
+    """Client-side filters for the events a connection receives.
+
+    Each filter is a set of accepted values, or None to accept everything.
+    Hosts match on either ``host_id`` or ``host_name``.
+    """
+
+    __slots__ = ("types", "scanners", "hosts", "clusters")
+
+    def __init__(
+        self,
+        types: set[str] | None = None,
+        scanners: set[str] | None = None,
+        hosts: set[int | str] | None = None,
+        clusters: set[int] | None = None,
+    ):
+        self.types = types
+        self.scanners = scanners
+        self.hosts = hosts
+        self.clusters = clusters
+
+    @classmethod
+    def from_message(cls, data: dict[str, Any]) -> "Subscription":
+        """Build filters from a client ``subscribe`` message; missing or empty lists mean 'any'.
+
+        Types and scanners must be strings, clusters integers (numeric
+        strings are accepted) and hosts an id or a name. Raises ValueError
+        naming the first invalid filter.
+        """
+
+        def _values(key: str) -> set | None:
+            value = data.get(key)
+            if value is None:
+                return None
+            if not isinstance(value, list):
+                value = [value]
+            return {_filter_value(key, item) for item in value} or None
+
+        return cls(
+            types=_values("types"),
+            scanners=_values("scanners"),
+            hosts=_values("hosts"),
+            clusters=_values("clusters"),
+        )
+
+    def matches(self, message: dict[str, Any]) -> bool:
+        if self.types is not None and message.get("type") not in self.types:
+            return False
+        if self.scanners is not None and message.get("scanner") not in self.scanners:
+            return False
+        if self.clusters is not None and message.get("cluster_id") not in self.clusters:
+            return False
+        if self.hosts is not None:
+            return message.get("host_id") in self.hosts or message.get("host_name") in self.hosts
+        return True
+
+    def to_dict(self) -> dict[str, list | None]:
+        return {
+            "types": sorted(self.types) if self.types is not None else None,
+            "scanners": sorted(self.scanners) if self.scanners is not None else None,
+            "hosts": sorted(self.hosts, key=str) if self.hosts is not None else None,
+            "clusters": sorted(self.clusters) if self.clusters is not None else None,
+        }
+
+
+def _filter_value(key: str, item: Any) -> int | str:
+    """Validate one subscribe filter value, coercing cluster ids to int."""
+    # bool is an int subclass; it is never a valid id
+    is_int = isinstance(item, int) and not isinstance(item, bool)
+    if key == "clusters":
+        if is_int:
+            return item
+        if isinstance(item, str) and item.strip().isdigit():
+            return int(item)
+        raise ValueError(f"'clusters' values must be integer ids, got {item!r}")
+    if key == "hosts":
+        if is_int or isinstance(item, str):
+            return item
+        raise ValueError(f"'hosts' values must be host ids or names, got {item!r}")
+    if isinstance(item, str):
+        return item
+    raise ValueError(f"'{key}' values must be strings, got {item!r}")
+
+
+class ClientConnection:
+    """One WebSocket client with its own bounded outbound queue.
+
+    Producers never await the socket: they enqueue a pre-serialized payload
+    and a per-connection writer task drains the queue. When the queue is
+    full the oldest pending message is dropped; messages with a coalesce key
+    replace a pending message with the same key instead of queueing behind it.
+    """
+
+    __slots__ = ("websocket", "subscription", "max_size", "_pending", "_by_key", "_wakeup", "task")
+
+    def __init__(self, websocket: WebSocket, max_size: int):
+        self.websocket = websocket
+        self.subscription = Subscription()
+        self.max_size = max(max_size, 1)
+        # Entries are [key, payload, enqueued_at]; lists so coalescing can update in place
+        self._pending: deque[list] = deque()
+        self._by_key: dict[Any, list] = {}
+        self._wakeup = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def enqueue(self, payload: str, key: Any = None, enqueued_at: float | None = None) -> None:
+        enqueued_at = time.monotonic() if enqueued_at is None else enqueued_at
+        if key is not None:
+            entry = self._by_key.get(key)
+            if entry is not None:
+                entry[1] = payload
+                entry[2] = enqueued_at
+                ws_messages_dropped_total.labels(reason="coalesced").inc()
+                return
+
+        if len(self._pending) >= self.max_size:
+            self._pop()
+            ws_messages_dropped_total.labels(reason="queue_full").inc()
+
+        entry = [key, payload, enqueued_at]
+        self._pending.append(entry)
+        if key is not None:
+            self._by_key[key] = entry
+        ws_queue_depth.inc()
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """Drain the queue to the socket until the client goes away or is too slow."""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._pending:
+                _, payload, enqueued_at = self._pop()
+                await asyncio.wait_for(self.websocket.send_text(payload), timeout=settings.ws_send_timeout)
+                ws_delivery_latency_seconds.observe(time.monotonic() - enqueued_at)
+
+    def discard_pending(self) -> None:
+        ws_queue_depth.dec(len(self._pending))
+        self._pending.clear()
+        self._by_key.clear()
+
+    def _pop(self) -> list:
+        entry = self._pending.popleft()
+        if entry[0] is not None:
+            self._by_key.pop(entry[0], None)
+        ws_queue_depth.dec()
+        return entry
+
 
 class ConnectionManager:
     """Manages active WebSocket connections for scan notifications."""
 
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
+        self.active_connections: dict[WebSocket, ClientConnection] = {}
 
     async def connect(self, websocket: WebSocket):
         """Accept and register a new WebSocket connection."""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        conn = ClientConnection(websocket, settings.ws_client_queue_size)
+        self.active_connections[websocket] = conn
+        conn.task = asyncio.create_task(self._write_loop(conn))
+        ws_connections.set(len(self.active_connections))
         logger.info("WebSocket connected, total: %d", len(self.active_connections))
 
     def disconnect(self, websocket: WebSocket):
-        """Remove a WebSocket connection."""
-        self.active_connections.remove(websocket)
+        """Remove a WebSocket connection and stop its writer."""
+        conn = self.active_connections.pop(websocket, None)
+        if conn is None:
+            return
+        if conn.task is not None and conn.task is not asyncio.current_task():
+            conn.task.cancel()
+        conn.discard_pending()
+        ws_connections.set(len(self.active_connections))
         logger.info("WebSocket disconnected, total: %d", len(self.active_connections))
 
+    def subscribe(self, websocket: WebSocket, data: dict[str, Any]) -> Subscription | None:
+        """Replace the connection's filters from a client ``subscribe`` message.
+
+        Raises ValueError for invalid filters; the current ones are kept.
+        """
+        conn = self.active_connections.get(websocket)
+        if conn is None:
+            return None
+        conn.subscription = Subscription.from_message(data)
+        return conn.subscription
+
+    def send_to(self, websocket: WebSocket, message: dict[str, Any]) -> None:
+        """Queue a message for a single client (e.g. a subscription ack)."""
+        conn = self.active_connections.get(websocket)
+        if conn is not None:
+            conn.enqueue(json.dumps(message, default=str))
+
     async def broadcast(self, message: dict[str, Any]):
-        """Send a JSON message to all connected clients."""
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.append(connection)
-        for conn in disconnected:
-            self.active_connections.remove(conn)
+        """Queue a JSON message for every client whose filters match.
+
+        The payload is serialized once and shared by all recipients; this
+        never waits on a socket, so a slow client cannot delay the others.
+        """
+        targets = [c for c in self.active_connections.values() if c.subscription.matches(message)]
+        if not targets:
+            return
+        payload = json.dumps(message, default=str)
+        key = _coalesce_key(message)
+        now = time.monotonic()
+        for conn in targets:
+            conn.enqueue(payload, key, now)
 
     async def send_scan_event(self, event_type: str, scan_id: int, **kwargs):
         """Broadcast a scan lifecycle event."""
@@ -44,11 +239,28 @@ async def send_scan_event(self, event_type: str, scan_id: int, **kwargs):
             "scan_id": scan_id,
             **kwargs,
         }
-        await message_queue.put(message)
+        await event_bus.publish(message)
+
+    async def _write_loop(self, conn: ClientConnection) -> None:
+        try:
+            await conn.run()
+        except asyncio.CancelledError:
+            raise
+        except TimeoutError:
+            logger.warning("WebSocket client too slow, disconnecting")
+            ws_messages_dropped_total.labels(reason="slow_client").inc(conn.depth)
+            with contextlib.suppress(Exception):
+                await conn.websocket.close(code=1013)
+        except Exception as e:
+            logger.debug("WebSocket send failed: %s", e)
+        self.disconnect(conn.websocket)
+
+
+def _coalesce_key(message: dict[str, Any]) -> tuple | None:
+    if message.get("type") in COALESCE_TYPES:
+        return (message["type"], message.get("scan_id"))
+    return None
 
 
 # Singleton instance
 ws_manager = ConnectionManager()
-
-# Async queue for cross-task communication (scan tasks -> WS broadcast)
-message_queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
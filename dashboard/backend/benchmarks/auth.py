@@ -0,0 +1,158 @@
+"""Authenticated request throughput and event-loop stalls during logins.
+
+Drives ``GET /api/v1/auth/me`` in-process (httpx ASGI transport, SQLite
+file database) with the token and user caches disabled and enabled, then
+measures ``/me`` latency while logins run, with bcrypt on the event loop
+and on the bcrypt pool.
+
+Usage (from dashboard/backend)::
+
+    python -m benchmarks.auth [--requests 2000] [--concurrency 20] [--logins 8]
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api import api_router
+from app.api.auth import limiter
+from app.database import get_session
+from app.models import Base, User
+from app.services import auth as auth_module
+from app.services.auth import AuthService, invalidate_user
+
+PASSWORD = "benchmark-password"  # noqa: S105 - throwaway database
+
+
+async def build_app(database: Path) -> tuple[FastAPI, str]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with maker() as session:
+        user = User(
+            username="bench",
+            email="bench@example.com",
+            hashed_password=AuthService.get_password_hash(PASSWORD),
+            role="admin",
+        )
+        session.add(user)
+        await session.commit()
+        token = AuthService.create_access_token({"sub": user.username, "user_id": user.id, "role": user.role})
+
+    async def session_override():
+        async with maker() as session:
+            yield session
+            await session.commit()
+
+    limiter.enabled = False  # login is rate limited per client address
+    app = FastAPI()
+    app.include_router(api_router, prefix="/api/v1")
+    app.dependency_overrides[get_session] = session_override
+    return app, token
+
+
+async def timed_get(client: httpx.AsyncClient, token: str) -> float:
+    start = time.perf_counter()
+    response = await client.get("/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"})
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def throughput(client: httpx.AsyncClient, token: str, requests: int, concurrency: int) -> float:
+    """Requests per second with ``concurrency`` clients."""
+    per_client = requests // concurrency
+
+    async def worker():
+        for _ in range(per_client):
+            await timed_get(client, token)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return per_client * concurrency / (time.perf_counter() - start)
+
+
+async def latency_during_logins(client: httpx.AsyncClient, token: str, logins: int) -> tuple[float, float]:
+    """Median and worst ``/me`` latency (ms) while ``logins`` logins run.
+
+    Latency counts from when the probe was due, so time the event loop
+    spent blocked before sending it is included.
+    """
+    latencies: list[float] = []
+    done = asyncio.Event()
+    interval = 0.005
+
+    async def prober():
+        while not done.is_set():
+            due = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            await timed_get(client, token)
+            latencies.append(time.perf_counter() - due)
+
+    async def login():
+        response = await client.post("/api/v1/auth/login", json={"username": "bench", "password": PASSWORD})
+        response.raise_for_status()
+
+    probe = asyncio.create_task(prober())
+    await asyncio.sleep(0.05)
+    await asyncio.gather(*(login() for _ in range(logins)))
+    done.set()
+    await probe
+    return statistics.median(latencies) * 1000, max(latencies) * 1000
+
+
+async def inline_check_password(plain_password: str, hashed_password: str) -> bool:
+    """The pre-pool behaviour: bcrypt on the event loop."""
+    return AuthService.verify_password(plain_password, hashed_password)
+
+
+async def run(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        app, token = await build_app(Path(tmp) / "bench.db")
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            cached_decode = auth_module._decode_claims
+            cache_ttl = auth_module.settings.user_cache_ttl
+
+            auth_module._decode_claims = cached_decode.__wrapped__
+            auth_module.settings.user_cache_ttl = 0
+            before = await throughput(client, token, args.requests, args.concurrency)
+
+            auth_module._decode_claims = cached_decode
+            auth_module.settings.user_cache_ttl = cache_ttl or 30.0
+            invalidate_user()
+            after = await throughput(client, token, args.requests, args.concurrency)
+            auth_module.settings.user_cache_ttl = cache_ttl
+
+            print(f"{'GET /auth/me':<28}{'req/s':>10}")
+            print(f"{'  no caches':<28}{before:>10.0f}")
+            print(f"{'  token + user cache':<28}{after:>10.0f}{after / before:>9.1f}x")
+
+            check_password = AuthService.__dict__["check_password"]
+            AuthService.check_password = staticmethod(inline_check_password)
+            inline = await latency_during_logins(client, token, args.logins)
+            AuthService.check_password = check_password
+            pooled = await latency_during_logins(client, token, args.logins)
+
+            print(f"\n{f'/me during {args.logins} logins':<28}{'p50 ms':>10}{'max ms':>10}")
+            print(f"{'  bcrypt on event loop':<28}{inline[0]:>10.1f}{inline[1]:>10.1f}")
+            print(f"{'  bcrypt pool':<28}{pooled[0]:>10.1f}{pooled[1]:>10.1f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--logins", type=int, default=8)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
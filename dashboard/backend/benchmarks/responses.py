@@ -0,0 +1,170 @@
+"""Serialization time and bytes on the wire for large API responses.
+
+Compares the JSON paths a route can take and the size after each
+compression the middleware can apply, for synthetic payloads shaped like
+``/dashboard/stats``, the cluster risk score, hardening scan findings and
+the cluster host listing.
+
+Usage (from dashboard/backend)::
+
+    python -m benchmarks.responses [--scale 1.0] [--repeat 20]
+"""
+
+import argparse
+import gzip
+import json
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.config import get_settings
+from app.middleware import brotli
+from app.responses import dumps
+
+settings = get_settings()
+
+SEVERITIES = ("critical", "high", "medium", "low", "info")
+
+
+def dashboard_stats(hosts: int) -> dict:
+    now = datetime.now(UTC)
+    return {
+        "hostname": "dashboard",
+        "summary": {"total_hosts": hosts, "avg_score": 71.4, "total_scans": hosts * 12},
+        "score_trend": [{"date": (now - timedelta(days=d)).date(), "avg_score": 70.0 + d % 7} for d in range(90)],
+        "top_failing_rules": [
+            {"rule_id": f"xccdf_org.ssgproject.content_rule_{i}", "title": f"Rule {i} title", "count": i}
+            for i in range(50)
+        ],
+        "host_scores": [
+            {"id": i, "name": f"node-{i}", "score": i % 100, "status": "online", "last_scan_at": now}
+            for i in range(hosts)
+        ],
+        "recent_scans": [
+            {
+                "id": i,
+                "host_name": f"node-{i}",
+                "scanner": "lynis",
+                "score": 64,
+                "created_at": now,
+                "status": "completed",
+            }
+            for i in range(hosts // 2)
+        ],
+        "scan_activity": [{"hour": now - timedelta(hours=h), "count": h % 9} for h in range(24 * 30)],
+    }
+
+
+def risk_scores(hosts: int) -> dict:
+    return {
+        "success": True,
+        "snapshot_id": 1,
+        "hosts_scored": hosts,
+        "by_level": dict.fromkeys(SEVERITIES, hosts // 5),
+        "top_risks": [
+            {
+                "host_id": i,
+                "target": f"pod/ns-{i % 40}/app-{i}",
+                "risk_score": 87.5 - i % 50,
+                "risk_level": SEVERITIES[i % 5],
+                "factors": [{"type": "vulnerability", "severity": SEVERITIES[j % 5], "count": j} for j in range(8)],
+            }
+            for i in range(hosts)
+        ],
+    }
+
+
+def hardening_findings(pods: int) -> dict:
+    findings = [
+        {
+            "rule_id": f"K8S-POD-{j:03d}",
+            "title": "Container runs as root",
+            "severity": SEVERITIES[j % 5],
+            "status": "fail" if j % 3 else "pass",
+            "category": "pod-security",
+            "target": f"ns-{i % 40}/app-{i}/container-{j}",
+            "detail": "securityContext.runAsNonRoot is not set",
+            "remediation": "Set securityContext.runAsNonRoot: true",
+        }
+        for i in range(pods)
+        for j in range(6)
+    ]
+    return {"success": True, "score": 61, "total_checks": len(findings), "findings": findings}
+
+
+def cluster_hosts(hosts: int) -> list[dict]:
+    return [
+        {
+            "id": i,
+            "name": f"app-{i}",
+            "host_type": "k8s_pod",
+            "status": "online",
+            "k8s_namespace": f"ns-{i % 40}",
+            "container_image": f"registry.local/app:{i % 17}",
+            "security_context": {"runAsNonRoot": bool(i % 2), "capabilities": {"drop": ["ALL"]}},
+            "last_scan_score": i % 100,
+        }
+        for i in range(hosts)
+    ]
+
+
+def stdlib_json(payload) -> bytes:
+    """FastAPI without a response model: jsonable_encoder, then json.dumps."""
+    return json.dumps(jsonable_encoder(payload)).encode()
+
+
+_ANY = TypeAdapter(dict | list)
+
+
+def pydantic_json(payload) -> bytes:
+    """FastAPI with ``response_model=dict``: validate, then Pydantic writes JSON."""
+    return _ANY.dump_json(_ANY.validate_python(payload))
+
+
+SERIALIZERS: dict[str, Callable] = {"json.dumps": stdlib_json, "pydantic": pydantic_json, "orjson": dumps}
+
+
+def timed(fn: Callable, payload, repeat: int) -> tuple[float, bytes]:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        body = fn(payload)
+    return (time.perf_counter() - start) / repeat * 1000, body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply payload sizes")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    n = max(int(2000 * args.scale), 1)
+    payloads = {
+        "/dashboard/stats": dashboard_stats(n),
+        "risk-score": risk_scores(n),
+        "hardening-scan": hardening_findings(n),
+        "cluster hosts": cluster_hosts(n),
+    }
+
+    print(f"{'payload':<18}" + "".join(f"{name + ' ms':>14}" for name in SERIALIZERS), end="")
+    print(f"{'raw KiB':>10}{'gzip KiB':>10}{'br KiB':>10}{'gzip ms':>10}{'br ms':>10}")
+    for label, payload in payloads.items():
+        row = f"{label:<18}"
+        for fn in SERIALIZERS.values():
+            elapsed, body = timed(fn, payload, args.repeat)
+            row += f"{elapsed:>14.2f}"
+
+        elapsed_gzip, gz = timed(lambda b: gzip.compress(b, settings.response_gzip_level), body, args.repeat)
+        row += f"{len(body) / 1024:>10.1f}{len(gz) / 1024:>10.1f}"
+        if brotli is not None:
+            elapsed_br, br = timed(lambda b: brotli.compress(b, quality=settings.response_brotli_quality), body, 5)
+            row += f"{len(br) / 1024:>10.1f}{elapsed_gzip:>10.2f}{elapsed_br:>10.2f}"
+        else:
+            row += f"{'-':>10}{elapsed_gzip:>10.2f}{'-':>10}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,8 @@
 from app.config import get_settings
 from app.database import get_session_context
 from app.models import Host, Scan
-from app.models.scan import ScanResult
+from app.services.rules import RuleCatalog
+from app.services.scan import ScanService
 
 settings = get_settings()
 
@@ -151,6 +152,11 @@ async def main():
                 print(f"Skipping {host.name} (os={host.os_family}) - no lynis")
                 continue
 
+            existing, kind = await ScanService(session).find_equivalent_scan(host.id, "lynis", None)
+            if existing is not None:
+                print(f"Skipping {host.name} - {kind} lynis scan {existing.id}")
+                continue
+
             print(f"\n=== Scanning {host.name} (os={host.os_family}) ===")
 
             # Create scan record
@@ -179,17 +185,8 @@ async def main():
                 scan.failed = parsed["failed"]
                 scan.warnings = parsed["warnings"]
 
-                # Save findings
-                for f in parsed["findings"]:
-                    sr = ScanResult(
-                        scan_id=scan_id,
-                        rule_id=f["rule_id"],
-                        title=f["title"],
-                        severity=f["severity"],
-                        status=f["status"],
-                        category=f.get("category"),
-                    )
-                    session.add(sr)
+                # Save findings against the rule catalog
+                await RuleCatalog(session).add_findings(scan_id, "lynis", parsed["findings"])
 
                 # Update host score
                 host.last_scan_id = scan_id
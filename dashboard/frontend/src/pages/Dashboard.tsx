@@ -120,6 +120,7 @@ const STATUS_COLORS: Record<string, string> = {
   failed: '#ef4444',
   running: '#f59e0b',
   pending: '#6b7280',
+  queued: '#6b7280',
   cancelled: '#9ca3af',
 }
 
@@ -62,7 +62,8 @@ export default function Scans() {
       case 'completed': return <CheckCircle className="h-5 w-5 text-success-500" />
       case 'failed': return <XCircle className="h-5 w-5 text-danger-500" />
       case 'running': return <Clock className="h-5 w-5 text-warning-500 animate-spin" />
-      case 'pending': return <Clock className="h-5 w-5 text-gray-400" />
+      case 'pending':
+      case 'queued': return <Clock className="h-5 w-5 text-gray-400" />
       default: return <AlertTriangle className="h-5 w-5 text-gray-400" />
     }
   }
@@ -158,7 +159,7 @@ export default function Scans() {
                           <Download className="h-3 w-3" />
                         </a>
                       )}
-                      {(scan.status === 'running' || scan.status === 'pending') && (
+                      {['running', 'pending', 'queued'].includes(scan.status) && (
                         <button onClick={() => cancelMutation.mutate(scan.id)} className="btn btn-danger text-sm py-1 px-2">
                           <XCircle className="h-3 w-3" />
                         </button>
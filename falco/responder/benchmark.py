@@ -0,0 +1,149 @@
+"""Ingestion throughput of the responder against a local Falcosidekick stand-in.
+
+Starts the responder (dry run, bundled response_actions.yaml) under
+uvicorn in a child process. A stand-in for Falcosidekick then POSTs
+synthetic Falco events to it: one event per request, as sidekick's
+webhook output does, and in batches. For each mode it reports the rate at
+which events were acknowledged and the rate at which they were fully
+processed or dropped as duplicates. The "inline" row parses the config
+and runs the actions inside the request, as the Flask version did.
+
+Usage (from falco/responder)::
+
+    python benchmark.py [--events 20000] [--concurrency 32] [--batch 50]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import random
+import socket
+import time
+from pathlib import Path
+
+os.environ.setdefault("DRY_RUN", "true")
+os.environ.setdefault("RESPONSE_CONFIG", str(Path(__file__).with_name("response_actions.yaml")))
+
+import httpx
+import responder
+import uvicorn
+
+# Per-event INFO/WARNING logs would measure the terminal, not the responder
+logging.getLogger("falco-responder").setLevel(logging.ERROR)
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+@responder.app.post("/respond-inline")
+def respond_inline(event: dict) -> dict:
+    """The previous request path: parse the config, then act, per event."""
+    responder.load_config()
+    return responder.process_event(event)
+
+
+def falco_event(rules: list[str]) -> dict:
+    return {
+        "rule": random.choice(rules),  # noqa: S311 - synthetic load
+        "priority": "Critical",
+        "output": "synthetic event",
+        "time": "2026-10-19T12:00:00.000000000Z",
+        "tags": ["benchmark"],
+        "output_fields": {
+            "container.name": f"app-{random.randrange(500)}",  # noqa: S311
+            "container.id": "0123456789ab",
+            "proc.name": "nc",
+            "proc.pid": 4242,
+            "user.name": "root",
+        },
+    }
+
+
+def serve(port: int) -> None:
+    uvicorn.run(responder.app, port=port, log_level="error", access_log=False)
+
+
+def start_server() -> tuple[multiprocessing.Process, str]:
+    """Run the responder in its own process, so the stand-in does not share its GIL."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = multiprocessing.Process(target=serve, args=(port,), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        with contextlib.suppress(httpx.TransportError):
+            httpx.get(f"{base_url}/health").raise_for_status()
+            break
+        time.sleep(0.1)
+    return server, base_url
+
+
+async def handled(client: httpx.AsyncClient) -> int:
+    """Events processed or dropped as duplicates so far."""
+    events = (await client.get("/health")).json()["events"]
+    return events["processed"] + events["duplicates"]
+
+
+async def sidekick(base_url: str, path: str, events: list[dict], concurrency: int, batch: int) -> tuple[float, float]:
+    """POST ``events``; returns (acknowledged/s, processed/s)."""
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        before = await handled(client)
+        bodies = events if batch == 1 else [events[i : i + batch] for i in range(0, len(events), batch)]
+        pending = iter(bodies)
+
+        async def post_all():
+            for body in pending:
+                while (await client.post(path, json=body)).status_code == 503:
+                    await asyncio.sleep(0.05)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(post_all() for _ in range(concurrency)))
+        acknowledged = time.perf_counter() - start
+        if path == "/respond":
+            while await handled(client) - before < len(events):
+                await asyncio.sleep(0.01)
+        processed = time.perf_counter() - start
+    return len(events) / acknowledged, len(events) / processed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch", type=int, default=50)
+    args = parser.parse_args()
+
+    rules = [*responder.get_config().get("rules", {}), "Unconfigured Rule"]
+    events = [falco_event(rules) for _ in range(args.events)]
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        responder.load_config()
+    parse_us = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    for _ in range(1000):
+        responder.get_config()
+    cached_us = (time.perf_counter() - start) * 1000
+    print(f"config per event: parse {parse_us:.1f} us, cached {cached_us:.2f} us\n")
+
+    server, base_url = start_server()
+    try:
+        print(f"{'mode':<28}{'ack events/s':>14}{'done events/s':>15}")
+        modes = [
+            ("inline (previous)", "/respond-inline", 1),
+            ("queued, 1 event/request", "/respond", 1),
+            (f"queued, {args.batch} events/request", "/respond", args.batch),
+        ]
+        for label, path, batch in modes:
+            acked, done = asyncio.run(sidekick(base_url, path, events, args.concurrency, batch))
+            print(f"{label:<28}{acked:>14.0f}{done:>15.0f}")
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
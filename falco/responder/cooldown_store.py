@@ -0,0 +1,128 @@
+"""
+Expiring key store for response cooldowns and event dedup.
+
+Keys expire after a per-key TTL and the store holds at most
+``max_entries`` keys, evicting the ones closest to expiry first. A dict
+gives O(1) lookups; a min-heap of (expires_at, key) finds expired and
+evictable keys without scanning, with stale heap entries skipped lazily,
+so each operation is amortized O(log n) at worst.
+
+With ``path`` set, entries are written through to SQLite and loaded on
+start, so cooldowns survive a restart. Times are wall-clock for that
+reason.
+"""
+
+import heapq
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Callable
+
+logger = logging.getLogger("falco-responder")
+
+# Seconds between purges of expired rows from the SQLite file
+PURGE_INTERVAL = 60
+
+
+class CooldownStore:
+    """Bounded map of key -> (started_at, expires_at) with expiry."""
+
+    def __init__(self, max_entries: int, path: str | None = None, clock: Callable[[], float] = time.time):
+        self.max_entries = max(max_entries, 1)
+        self.clock = clock
+        self._entries: dict[str, tuple[float, float]] = {}
+        self._heap: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self._db: sqlite3.Connection | None = None
+        self._purged_at = 0.0
+        if path:
+            self._open(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def acquire(self, key: str, ttl: float) -> float:
+        """Start ``key``'s TTL unless it is already running.
+
+        Returns 0 when the key was free (and is now held for ``ttl``
+        seconds), else the seconds left on the running TTL.
+        """
+        with self._lock:
+            now = self.clock()
+            self._expire(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry[1] - now
+            if ttl <= 0:
+                return 0
+            self._entries[key] = (now, now + ttl)
+            heapq.heappush(self._heap, (now + ttl, key))
+            while len(self._entries) > self.max_entries:
+                self._evict()
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO cooldowns VALUES (?, ?, ?)", (key, now, now + ttl))
+                self._db.commit()
+            return 0
+
+    def release(self, key: str) -> None:
+        """End ``key``'s TTL early; a no-op for keys not held."""
+        with self._lock:
+            if self._entries.pop(key, None) is not None and self._db is not None:
+                self._db.execute("DELETE FROM cooldowns WHERE key = ?", (key,))
+                self._db.commit()
+
+    def active(self) -> dict[str, tuple[float, float]]:
+        """Live entries as key -> (started_at, expires_at)."""
+        with self._lock:
+            self._expire(self.clock())
+            return dict(self._entries)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _expire(self, now: float) -> None:
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == expires_at:
+                del self._entries[key]
+        if self._db is not None and now - self._purged_at >= PURGE_INTERVAL:
+            self._db.execute("DELETE FROM cooldowns WHERE expires_at <= ?", (now,))
+            self._db.commit()
+            self._purged_at = now
+
+    def _evict(self) -> None:
+        """Drop the live key closest to expiry."""
+        while self._heap:
+            expires_at, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == expires_at:
+                del self._entries[key]
+                if self._db is not None:
+                    self._db.execute("DELETE FROM cooldowns WHERE key = ?", (key,))
+                return
+
+    def _open(self, path: str) -> None:
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS cooldowns (key TEXT PRIMARY KEY, started_at REAL, expires_at REAL)"
+        )
+        now = self.clock()
+        rows = self._db.execute(
+            "SELECT key, started_at, expires_at FROM cooldowns WHERE expires_at > ? ORDER BY expires_at DESC LIMIT ?",
+            (now, self.max_entries),
+        ).fetchall()
+        for key, started_at, expires_at in rows:
+            self._entries[key] = (started_at, expires_at)
+            self._heap.append((expires_at, key))
+        heapq.heapify(self._heap)
+        self._db.execute("DELETE FROM cooldowns WHERE expires_at <= ?", (now,))
+        self._db.commit()
+        self._purged_at = now
+        if rows:
+            logger.info("Restored %d cooldown(s) from %s", len(rows), path)
@@ -2,21 +2,28 @@
 Falco Automated Response Service
 Receives Falco events from Falcosidekick and executes response actions.
 
+Events are acknowledged with 202 as soon as they are queued; a bounded
+pool of workers runs the response actions in the background.
+
 Part of test-hard security hardening platform.
 """
 
+import asyncio
+import contextlib
 import logging
 import os
+import threading
 import time
+from contextlib import asynccontextmanager
 from datetime import UTC, datetime
 from pathlib import Path
 
 # NOTE: 'docker' is the Python SDK package name (API-compatible with Podman)
 import docker as podman
 import yaml
-from flask import Flask, jsonify, request
-
-app = Flask(__name__)
+from cooldown_store import CooldownStore
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 
 # Logging
 logging.basicConfig(
@@ -30,9 +37,32 @@
 CONFIG_PATH = os.environ.get("RESPONSE_CONFIG", "/app/response_actions.yaml")
 DRY_RUN = os.environ.get("DRY_RUN", "false").lower() == "true"
 PODMAN_HOST = os.environ.get("PODMAN_HOST", "unix:///run/podman/podman.sock")
-
-# Cooldown tracking: rule_name+container -> last_action_time
-_cooldowns: dict[str, float] = {}
+# Seconds between checks of the config file's mtime
+CONFIG_CHECK_INTERVAL = float(os.environ.get("CONFIG_CHECK_INTERVAL", "1"))
+# Events processed concurrently, and queued before /respond answers 503
+WORKERS = int(os.environ.get("WORKERS", "4"))
+QUEUE_SIZE = int(os.environ.get("QUEUE_SIZE", "10000"))
+# Seconds queued events may take to drain on shutdown
+SHUTDOWN_TIMEOUT = 10
+
+# Cooldown and dedup keys kept at most; the ones closest to expiry are dropped first
+COOLDOWN_MAX_ENTRIES = int(os.environ.get("COOLDOWN_MAX_ENTRIES", "100000"))
+DEDUP_MAX_ENTRIES = int(os.environ.get("DEDUP_MAX_ENTRIES", "100000"))
+# SQLite file keeping cooldowns across restarts (empty: memory only)
+COOLDOWN_DB = os.environ.get("COOLDOWN_DB", "")
+
+# Cooldown tracking: rule_name:container -> (action time, cooldown end)
+cooldowns = CooldownStore(COOLDOWN_MAX_ENTRIES, COOLDOWN_DB or None)
+# Fingerprints of recently seen events
+recent_events = CooldownStore(DEDUP_MAX_ENTRIES)
+
+# Parsed config and the mtime it was read at
+_config: dict | None = None
+_config_mtime: int | None = None
+_config_checked = 0.0
+_config_lock = threading.Lock()
+
+_podman_client: podman.DockerClient | None = None
 
 
 def load_config() -> dict:
@@ -42,30 +72,87 @@ def load_config() -> dict:
         logger.warning("Config file %s not found, using empty config", CONFIG_PATH)
         return {"defaults": {"dry_run": True, "log_all": True, "cooldown_seconds": 60}, "rules": {}}
     with open(config_path) as f:
-        return yaml.safe_load(f)
+        return yaml.safe_load(f) or {}
+
+
+def get_config() -> dict:
+    """Return the response config, re-parsed only when the file changes.
+
+    The file's mtime is checked at most every CONFIG_CHECK_INTERVAL
+    seconds. If a changed file fails to parse, the previous config stays
+    in effect.
+    """
+    global _config, _config_mtime, _config_checked
+    if _config is not None and time.monotonic() - _config_checked < CONFIG_CHECK_INTERVAL:
+        return _config
+    with _config_lock:
+        _config_checked = time.monotonic()
+        try:
+            mtime = os.stat(CONFIG_PATH).st_mtime_ns
+        except OSError:
+            mtime = None
+        if _config is None or mtime != _config_mtime:
+            try:
+                config = load_config()
+            except (OSError, yaml.YAMLError) as e:
+                if _config is None:
+                    raise
+                logger.error("Failed to reload %s, keeping previous config: %s", CONFIG_PATH, e)
+            else:
+                if _config is not None:
+                    logger.info("Reloaded response config from %s", CONFIG_PATH)
+                _config = config
+            _config_mtime = mtime
+        return _config
 
 
 def get_podman_client() -> podman.DockerClient:
-    """Create Podman client."""
-    try:
-        return podman.DockerClient(base_url=PODMAN_HOST)
-    except Exception as e:
-        logger.error("Failed to connect to Podman: %s", e)
-        raise
+    """Return the shared Podman client, connecting on first use."""
+    global _podman_client
+    if _podman_client is None:
+        try:
+            _podman_client = podman.DockerClient(base_url=PODMAN_HOST)
+        except Exception as e:
+            logger.error("Failed to connect to Podman: %s", e)
+            raise
+    return _podman_client
 
 
-def is_cooled_down(rule_name: str, container_name: str, cooldown_seconds: int) -> bool:
-    """Check if the cooldown period has passed for this rule+container."""
+def is_cooled_down(rule_name: str, container_name: str, cooldown_seconds: float) -> bool:
+    """Check if the cooldown period has passed for this rule+container, and start a new one."""
     key = f"{rule_name}:{container_name}"
-    last_time = _cooldowns.get(key, 0)
-    now = time.time()
-    if now - last_time < cooldown_seconds:
-        logger.info("Cooldown active for %s (%.0fs remaining)", key, cooldown_seconds - (now - last_time))
+    remaining = cooldowns.acquire(key, cooldown_seconds)
+    if remaining > 0:
+        logger.info("Cooldown active for %s (%.0fs remaining)", key, remaining)
         return False
-    _cooldowns[key] = now
     return True
 
 
+def _fingerprint(event: dict) -> str:
+    output_fields = event.get("output_fields") or {}
+    return "\x1f".join(
+        str(value)
+        for value in (
+            event.get("rule", "unknown"),
+            output_fields.get("container.name", ""),
+            output_fields.get("proc.name", ""),
+            output_fields.get("fd.name", ""),
+        )
+    )
+
+
+def is_duplicate(event: dict, window: float) -> bool:
+    """True when an event with the same rule, container, process and file was seen within ``window`` seconds."""
+    if window <= 0:
+        return False
+    return recent_events.acquire(_fingerprint(event), window) > 0
+
+
+def forget_event(event: dict) -> None:
+    """Undo ``is_duplicate`` for an event that was not queued, so its retry is not dropped."""
+    recent_events.release(_fingerprint(event))
+
+
 def extract_event_fields(event: dict) -> dict:
     """Extract relevant fields from Falco event."""
     output_fields = event.get("output_fields", {})
@@ -220,11 +307,10 @@ def action_alert(fields: dict, action_config: dict) -> dict:
 
 def process_event(event: dict) -> dict:
     """Process a Falco event and execute configured response actions."""
-    config = load_config()
+    config = get_config()
     defaults = config.get("defaults", {})
     rules_config = config.get("rules", {})
     global_dry_run = DRY_RUN or defaults.get("dry_run", False)
-    cooldown_seconds = defaults.get("cooldown_seconds", 60)
 
     fields = extract_event_fields(event)
     rule_name = fields["rule"]
@@ -249,7 +335,8 @@ def process_event(event: dict) -> dict:
     if not rule_config.get("enabled", True):
         return {"status": "disabled", "rule": rule_name}
 
-    # Check cooldown
+    # Check cooldown (rules may override the default)
+    cooldown_seconds = rule_config.get("cooldown_seconds", defaults.get("cooldown_seconds", 60))
     if not is_cooled_down(rule_name, container_name, cooldown_seconds):
         return {"status": "cooldown", "rule": rule_name, "container": container_name}
 
@@ -282,61 +369,132 @@ def process_event(event: dict) -> dict:
     }
 
 
-# ---- Flask Routes ----
+# ---- Ingestion ----
+
+# Counters reported by /health
+_stats = {"received": 0, "duplicates": 0, "processed": 0, "failed": 0, "rejected": 0}
+_queue: asyncio.Queue | None = None
+
+
+async def _worker() -> None:
+    """Run response actions for queued events."""
+    while True:
+        event = await _queue.get()
+        try:
+            await asyncio.to_thread(process_event, event)
+            _stats["processed"] += 1
+        except Exception as e:
+            _stats["failed"] += 1
+            logger.error("Error processing event: %s", e)
+        finally:
+            _queue.task_done()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _queue
+    get_config()
+    _queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    workers = [asyncio.create_task(_worker()) for _ in range(WORKERS)]
+    logger.info("Falco Responder ready (dry_run=%s, workers=%d, queue=%d)", DRY_RUN, WORKERS, QUEUE_SIZE)
+    yield
+    # Give queued events a chance to finish
+    with contextlib.suppress(TimeoutError):
+        async with asyncio.timeout(SHUTDOWN_TIMEOUT):
+            await _queue.join()
+    for worker in workers:
+        worker.cancel()
+    await asyncio.gather(*workers, return_exceptions=True)
+    cooldowns.close()
+
+
+app = FastAPI(title="Falco Responder", lifespan=lifespan)
+
 
+# ---- Routes ----
 
-@app.route("/respond", methods=["POST"])
-def respond():
-    """Handle incoming Falco events from Falcosidekick."""
+
+@app.post("/respond", status_code=202)
+async def respond(request: Request) -> JSONResponse:
+    """Queue a Falco event, or a JSON array of events, for response.
+
+    Answers 202 once the events are queued, and 503 with Retry-After
+    for the events that did not fit in the queue.
+    """
     try:
-        event = request.get_json(force=True)
-        result = process_event(event)
-        return jsonify(result), 200
-    except Exception as e:
-        logger.error("Error processing event: %s", e)
-        return jsonify({"error": str(e)}), 500
+        payload = await request.json()
+    except ValueError as e:
+        return JSONResponse({"error": f"invalid JSON: {e}"}, status_code=400)
+    events = payload if isinstance(payload, list) else [payload]
+    if not all(isinstance(event, dict) for event in events):
+        return JSONResponse({"error": "expected an event object or an array of event objects"}, status_code=400)
+
+    window = get_config().get("defaults", {}).get("dedup_window_seconds", 0)
+    unique = [event for event in events if not is_duplicate(event, window)]
+    _stats["duplicates"] += len(events) - len(unique)
+    events = unique
+
+    accepted = 0
+    for event in events:
+        try:
+            _queue.put_nowait(event)
+        except asyncio.QueueFull:
+            break
+        accepted += 1
+    _stats["received"] += accepted
+
+    rejected = len(events) - accepted
+    for event in events[accepted:]:
+        forget_event(event)
+    if rejected:
+        _stats["rejected"] += rejected
+        logger.warning("Event queue full, rejected %d event(s)", rejected)
+        return JSONResponse(
+            {"status": "overloaded", "accepted": accepted, "rejected": rejected},
+            status_code=503,
+            headers={"Retry-After": "1"},
+        )
+    return JSONResponse({"status": "accepted", "accepted": accepted, "queued": _queue.qsize()}, status_code=202)
 
 
-@app.route("/health", methods=["GET"])
-def health():
+@app.get("/health")
+async def health() -> dict:
     """Health check endpoint."""
-    return (
-        jsonify(
-            {
-                "status": "healthy",
-                "service": "falco-responder",
-                "dry_run": DRY_RUN,
-                "timestamp": datetime.now(UTC).isoformat(),
-            }
-        ),
-        200,
-    )
+    return {
+        "status": "healthy",
+        "service": "falco-responder",
+        "dry_run": DRY_RUN,
+        "workers": WORKERS,
+        "queue": {"depth": _queue.qsize() if _queue else 0, "capacity": QUEUE_SIZE},
+        "events": dict(_stats),
+        "timestamp": datetime.now(UTC).isoformat(),
+    }
 
 
-@app.route("/config", methods=["GET"])
-def get_config():
+@app.get("/config")
+async def get_current_config() -> dict:
     """Return current response configuration."""
-    config = load_config()
-    return jsonify(config), 200
+    return get_config()
 
 
-@app.route("/events", methods=["GET"])
-def get_recent_events():
+@app.get("/events")
+async def get_recent_events() -> dict:
     """Return cooldown state (active rules)."""
     now = time.time()
-    config = load_config()
-    cooldown_seconds = config.get("defaults", {}).get("cooldown_seconds", 60)
     active = {
         key: {
-            "last_action": datetime.fromtimestamp(ts, tz=UTC).isoformat(),
-            "cooldown_remaining": max(0, cooldown_seconds - (now - ts)),
+            "last_action": datetime.fromtimestamp(started_at, tz=UTC).isoformat(),
+            "cooldown_remaining": max(0, expires_at - now),
         }
-        for key, ts in _cooldowns.items()
+        for key, (started_at, expires_at) in cooldowns.active().items()
     }
-    return jsonify({"active_cooldowns": active}), 200
+    return {"active_cooldowns": active}
 
 
 if __name__ == "__main__":
+    import uvicorn
+
     port = int(os.environ.get("PORT", 5080))
     logger.info("Starting Falco Responder on port %d (dry_run=%s)", port, DRY_RUN)
-    app.run(host="0.0.0.0", port=port)
+    # Per-request access logs would dominate CPU during event bursts
+    uvicorn.run(app, host="0.0.0.0", port=port, access_log=False)
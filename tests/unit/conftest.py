@@ -0,0 +1,53 @@
+"""Shared fixtures for the dashboard backend unit tests."""
+
+import os
+import sys
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+import pytest_asyncio
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Base
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def db_engine():
+    """In-memory SQLite engine with every table created."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def session_factory(db_engine):
+    """Stand-in for ``get_session_context`` on ``db_engine``: commits on exit, rolls back on error."""
+    maker = async_sessionmaker(db_engine, expire_on_commit=False)
+
+    @asynccontextmanager
+    async def session_context():
+        async with maker() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception:
+                await session.rollback()
+                raise
+
+    return session_context
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def db_session(db_engine):
+    """One session on ``db_engine``; nothing is committed unless a test does."""
+    async with async_sessionmaker(db_engine, expire_on_commit=False)() as session:
+        yield session
@@ -0,0 +1,117 @@
+"""Unit tests for the cold scan archive."""
+
+import gzip
+import json
+import os
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from sqlalchemy import func, select
+
+from app.models import Host, Scan
+from app.services import retention as retention_module
+from app.services.archive import ScanArchive
+from app.services.retention import RetentionService
+from app.services.rules import RuleCatalog
+
+NOW = datetime.now(UTC)
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def factory(session_factory):
+    async with session_factory() as session:
+        hosts = [Host(name="web"), Host(name="db")]
+        session.add_all(hosts)
+        await session.flush()
+        for age in (90, 60, 45, 5):
+            for host in hosts:
+                scan = Scan(
+                    host_id=host.id,
+                    scanner="trivy" if age == 45 else "lynis",
+                    status="completed",
+                    score=age,
+                    created_at=NOW - timedelta(days=age),
+                )
+                session.add(scan)
+                await session.flush()
+                await RuleCatalog(session).add_findings(
+                    scan.id,
+                    scan.scanner,
+                    [{"rule_id": f"R{i}", "title": f"{host.name} t", "severity": "high"} for i in range(3)],
+                )
+    return session_factory
+
+
+@pytest.fixture
+def archive(monkeypatch, tmp_path):
+    archive = ScanArchive(tmp_path / "archive")
+    monkeypatch.setattr(retention_module, "scan_archive", archive)
+    monkeypatch.setattr(retention_module.settings, "scan_retention_days", 30)
+    monkeypatch.setattr(retention_module.settings, "scan_retention_scanners", {})
+    monkeypatch.setattr(retention_module.settings, "scan_retention_hosts", {})
+    monkeypatch.setattr(retention_module.settings, "scan_archive_enabled", True)
+    monkeypatch.setattr(retention_module.settings, "retention_batch_size", 4)
+    monkeypatch.setattr(retention_module.settings, "retention_batch_pause", 0)
+    return archive
+
+
+class TestArchive:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_retention_archives_before_deleting(self, factory, archive):
+        totals = await RetentionService(factory).run()
+        assert totals["scans"] == 6
+
+        segments = archive.segments()
+        assert [s["scans"] for s in segments] == [2, 4]  # newest data first
+        assert sum(s["results"] for s in segments) == 18
+        assert sorted(segments[0]["hosts"]) == ["db", "web"]
+
+        path = archive.directory / segments[0]["segment"]
+        with gzip.open(path, "rt") as stream:
+            lines = [json.loads(line) for line in stream]
+        assert {line["scanner"] for line in lines} == {"trivy"}
+        assert len(lines[0]["results"]) == 3
+        assert {r["title"] for line in lines for r in line["results"]} == {"web t", "db t"}
+        assert lines[0]["results"][0]["severity"] == "high"
+        assert not list(archive.directory.glob(".*"))  # no temp files left behind
+
+        async with factory() as session:
+            assert await session.scalar(select(func.count()).select_from(Scan)) == 2
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_query_by_host_and_time(self, factory, archive):
+        await RetentionService(factory).run()
+
+        web = await archive.query(host_name="web")
+        assert [r["score"] for r in web] == [45, 60, 90]
+        assert all(r["results"] == [] for r in web)
+
+        window = await archive.query(since=NOW - timedelta(days=70), until=NOW - timedelta(days=50))
+        assert [r["score"] for r in window] == [60, 60]
+        assert await archive.query(scanner="trivy", limit=1, include_results=True) != []
+        assert len((await archive.query(limit=1, include_results=True))[0]["results"]) == 3
+
+        scan = await archive.get_scan(web[-1]["id"])
+        assert scan["host_name"] == "web" and len(scan["results"]) == 3
+        assert await archive.get_scan(10_000) is None
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_failed_write_keeps_rows(self, factory, archive, monkeypatch):
+        async def broken(session, scan_ids):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(archive, "archive_scans", broken)
+        with pytest.raises(OSError):
+            await RetentionService(factory).run()
+        async with factory() as session:
+            assert await session.scalar(select(func.count()).select_from(Scan)) == 8
@@ -0,0 +1,113 @@
+"""Unit tests for the batched audit log writer."""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import AuditLog, Base
+from app.services import audit as audit_module
+from app.services.audit import AuditWriter, log_action
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def engine(monkeypatch, tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'audit.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    monkeypatch.setattr(audit_module, "engine", engine)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def writer(engine, monkeypatch):
+    writer = AuditWriter(batch_size=3, flush_interval=0.05, max_size=5)
+    monkeypatch.setattr(audit_module, "audit_writer", writer)
+    await writer.start()
+    yield writer
+    await writer.stop()
+
+
+async def _count(engine) -> int:
+    async with engine.connect() as conn:
+        return (await conn.execute(select(func.count(AuditLog.id)))).scalar_one()
+
+
+class TestAuditWriter:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_batches_by_size_with_multi_row_inserts(self, engine, writer):
+        inserts: list[str] = []
+
+        @event.listens_for(engine.sync_engine, "before_cursor_execute")
+        def record(conn, cursor, statement, *args):
+            if statement.startswith("INSERT"):
+                inserts.append(statement)
+
+        maker = async_sessionmaker(engine)
+        async with maker() as session:
+            for i in range(3):
+                assert await log_action(session, "scan_started", user_id=1, resource_id=str(i)) is None
+
+        for _ in range(50):
+            if await _count(engine) == 3:
+                break
+            await asyncio.sleep(0.01)
+        assert await _count(engine) == 3
+        assert len(inserts) == 1
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_partial_batch_flushed_after_interval_and_on_stop(self, engine, writer):
+        maker = async_sessionmaker(engine)
+        async with maker() as session:
+            await log_action(session, "campaign_created", user_id=1)
+        await asyncio.sleep(0.2)
+        assert await _count(engine) == 1
+
+        async with maker() as session:
+            await log_action(session, "campaign_created", user_id=1)
+            await log_action(session, "scan_started", user_id=1)
+        await writer.stop()
+        assert await _count(engine) == 3
+
+        async with engine.connect() as conn:
+            actions = (await conn.execute(select(AuditLog.action).order_by(AuditLog.timestamp))).scalars().all()
+        assert actions == ["campaign_created", "campaign_created", "scan_started"]
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_durable_actions_written_in_session(self, engine, writer):
+        maker = async_sessionmaker(engine)
+        async with maker() as session:
+            entry = await log_action(session, "password_changed", user_id=1)
+            assert entry is not None and entry.id is not None
+            forced = await log_action(session, "scan_started", user_id=1, durable=True)
+            assert forced is not None
+            await session.rollback()
+        assert await _count(engine) == 0
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_sync_when_stopped_or_full(self, engine, writer):
+        await writer.stop()
+        maker = async_sessionmaker(engine)
+        async with maker() as session:
+            assert await log_action(session, "scan_started") is not None
+
+        full = AuditWriter(batch_size=100, flush_interval=10, max_size=1)
+        await full.start()
+        try:
+            full.queue.put_nowait({"action": "placeholder"})
+            assert not full.submit({"action": "scan_started"})
+        finally:
+            full._task.cancel()
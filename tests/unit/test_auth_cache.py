@@ -0,0 +1,187 @@
+"""Unit tests for the token and user caches and the bcrypt pool."""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models import User
+from app.services import auth as auth_module
+from app.services.auth import AuthService, invalidate_user
+
+
+@pytest.fixture(autouse=True)
+def clean_caches():
+    auth_module._decode_claims.cache_clear()
+    invalidate_user()
+    yield
+    invalidate_user()
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def engine(db_engine, session_factory):
+    async with session_factory() as session:
+        session.add(User(id=1, username="alice", email="alice@example.com", hashed_password="x", role="viewer"))
+    return db_engine
+
+
+def _count_selects(engine) -> list[str]:
+    statements: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, *args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    return statements
+
+
+class TestTokenCache:
+    def test_repeated_decode_hits_cache(self):
+        token = AuthService.create_access_token({"sub": "alice", "user_id": 1, "role": "viewer"})
+        first = AuthService.decode_token(token)
+        second = AuthService.decode_token(token)
+        assert first == second
+        assert first.user_id == 1
+        assert auth_module._decode_claims.cache_info().hits == 1
+
+    def test_cached_token_still_expires(self, monkeypatch):
+        token = AuthService.create_access_token({"sub": "alice", "user_id": 1}, expires_delta=timedelta(seconds=60))
+        assert AuthService.decode_token(token) is not None
+        now = time.time()
+        monkeypatch.setattr(auth_module.time, "time", lambda: now + 120)
+        assert AuthService.decode_token(token) is None
+
+    def test_wrong_type_and_bad_signature(self):
+        refresh = AuthService.create_refresh_token({"sub": "alice", "user_id": 1})
+        assert AuthService.decode_token(refresh) is None
+        assert AuthService.decode_token(refresh, expected_type="refresh") is not None
+        assert AuthService.decode_token(refresh[:-2] + "xx", expected_type="refresh") is None
+
+
+class TestUserCache:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_hit_skips_select_and_changes_still_flush(self, engine):
+        selects = _count_selects(engine)
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        async with maker() as session:
+            assert (await AuthService(session).get_current_user(1)).username == "alice"
+        assert len(selects) == 1
+
+        async with maker() as session:
+            user = await AuthService(session).get_current_user(1)
+            assert user.role == "viewer"
+            user.email = "alice@corp.example"
+            await session.commit()
+        assert len(selects) == 1
+
+        invalidate_user(1)
+        async with maker() as session:
+            assert (await AuthService(session).get_current_user(1)).email == "alice@corp.example"
+        assert len(selects) == 2
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_stale_until_invalidated(self, engine):
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        async with maker() as session:
+            await AuthService(session).get_current_user(1)
+            user = await session.get(User, 1)
+            user.is_active = False
+            await session.commit()
+
+        async with maker() as session:
+            assert (await AuthService(session).get_current_user(1)).is_active  # stale until invalidated
+        invalidate_user(1)
+        async with maker() as session:
+            assert not (await AuthService(session).get_current_user(1)).is_active
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_invalidated_again_after_commit(self, engine):
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        async with maker() as session:
+            await AuthService(session).get_current_user(1)
+        stale = auth_module._user_cache[1]
+
+        async with maker() as admin:
+            user = await admin.get(User, 1)
+            user.role = "admin"
+            await admin.flush()
+            invalidate_user(1, admin)
+            # A request between flush and commit still reads (and caches) the old row
+            auth_module._user_cache[1] = stale
+            await admin.commit()
+
+        assert 1 not in auth_module._user_cache
+        async with maker() as session:
+            assert (await AuthService(session).get_current_user(1)).role == "admin"
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_lookup_racing_invalidation_not_cached(self, engine, monkeypatch):
+        get_user_by_id = AuthService.get_user_by_id
+
+        async def racing(self, user_id):
+            user = await get_user_by_id(self, user_id)
+            invalidate_user(user_id)
+            return user
+
+        monkeypatch.setattr(AuthService, "get_user_by_id", racing)
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        async with maker() as session:
+            assert (await AuthService(session).get_current_user(1)).username == "alice"
+        assert not auth_module._user_cache
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_disabled(self, engine, monkeypatch):
+        monkeypatch.setattr(auth_module.settings, "user_cache_ttl", 0)
+        selects = _count_selects(engine)
+        maker = async_sessionmaker(engine, expire_on_commit=False)
+        for _ in range(2):
+            async with maker() as session:
+                assert (await AuthService(session).get_current_user(1)).username == "alice"
+        assert len(selects) == 2
+        assert not auth_module._user_cache
+
+
+class TestBcryptPool:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_hashing_runs_off_the_event_loop(self, monkeypatch):
+        threads: set[str] = set()
+        original = AuthService.get_password_hash
+
+        def recording_hash(password: str) -> str:
+            threads.add(threading.current_thread().name)
+            return original(password)
+
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.001)
+                ticks += 1
+
+        monkeypatch.setattr(AuthService, "get_password_hash", staticmethod(recording_hash))
+        task = asyncio.create_task(ticker())
+        try:
+            hashed = await AuthService.hash_password("s3cret-pass")
+        finally:
+            task.cancel()
+        assert threads and all(name.startswith("bcrypt") for name in threads)
+        assert ticks > 0
+        assert await AuthService.check_password("s3cret-pass", hashed)
+        assert not await AuthService.check_password("wrong", hashed)
@@ -0,0 +1,153 @@
+"""Unit tests for selector-based scan campaigns."""
+
+import os
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from sqlalchemy import func, select
+
+from app.models import Host, Scan, ScanCampaign
+from app.schemas import CampaignCreate, CampaignSelector, ScanCreate
+from app.services.campaign import CampaignService, compute_progress
+from app.services.scan import ScanService
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def session(db_session):
+    for i in range(6):
+        db_session.add(
+            Host(
+                name=f"pod-{i}",
+                host_type="k8s_pod",
+                k8s_namespace="prod" if i < 4 else "dev",
+                k8s_labels={"app": "web" if i % 2 == 0 else "db"},
+                tags=["pci"] if i < 2 else [],
+                os_family="debian",
+            )
+        )
+    db_session.add(Host(name="inactive", host_type="k8s_pod", k8s_namespace="prod", is_active=False))
+    await db_session.flush()
+    return db_session
+
+
+@pytest.fixture(autouse=True)
+def _no_background_scans(monkeypatch):
+    async def fake_execute(self, scan_id):
+        return None
+
+    monkeypatch.setattr(ScanService, "_execute_scan", fake_execute)
+
+
+class TestResolveHosts:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_filters_combine(self, session):
+        service = CampaignService(session)
+        assert len(await service.resolve_hosts(CampaignSelector())) == 6
+        assert len(await service.resolve_hosts(CampaignSelector(namespaces=["prod"]))) == 4
+        assert len(await service.resolve_hosts(CampaignSelector(namespaces=["prod"], labels={"app": "web"}))) == 2
+        assert len(await service.resolve_hosts(CampaignSelector(tags=["pci"], labels={"app": "db"}))) == 1
+        assert await service.resolve_hosts(CampaignSelector(os_families=["fedora"])) == []
+
+
+class TestCampaignRollout:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_create_enqueues_and_dispatch_respects_limits(self, session):
+        service = CampaignService(session)
+        campaign = await service.create_campaign(
+            CampaignCreate(
+                name="prod", selector=CampaignSelector(namespaces=["prod"]), rate_per_minute=0, max_concurrency=2
+            )
+        )
+        assert campaign.total_hosts == 4
+        result = await session.execute(select(Scan.status).where(Scan.campaign_id == campaign.id))
+        assert result.scalars().all() == ["queued"] * 4
+
+        assert await service.dispatch(campaign) == 2
+        assert await service.dispatch(campaign) == 0  # concurrency cap reached
+
+        progress = await service.get_progress(campaign)
+        assert (progress["running"], progress["pending"]) == (2, 2)
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_rate_budget(self, session):
+        service = CampaignService(session)
+        campaign = await service.create_campaign(CampaignCreate(name="all", rate_per_minute=2, max_concurrency=10))
+        assert await service.dispatch(campaign) == 1
+
+        campaign.started_at = datetime.now(UTC) - timedelta(seconds=60)
+        assert await service.dispatch(campaign) == 2
+        assert campaign.dispatched == 3
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_dispatch_all_shares_admission_budget(self, session):
+        service = CampaignService(session)
+        for name in ("prod", "dev"):
+            await service.create_campaign(CampaignCreate(name=name, rate_per_minute=0, max_concurrency=2))
+
+        assert await service.dispatch_all(limit=0) == 0
+        assert await service.dispatch_all(limit=3) == 3
+        result = await session.execute(select(func.count()).where(Scan.status == "running"))
+        assert result.scalar_one() == 3
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_completes_and_cancel(self, session):
+        service = CampaignService(session)
+        campaign = await service.create_campaign(
+            CampaignCreate(name="dev", selector=CampaignSelector(namespaces=["dev"]), rate_per_minute=0)
+        )
+        await service.dispatch(campaign)
+        result = await session.execute(select(Scan).where(Scan.campaign_id == campaign.id))
+        for scan in result.scalars().all():
+            scan.status = "completed"
+        await service.dispatch(campaign)
+        assert campaign.status == "completed"
+
+        other = await service.create_campaign(
+            CampaignCreate(name="prod", selector=CampaignSelector(namespaces=["prod"]))
+        )
+        await service.dispatch(other)
+        await service.cancel_campaign(other.id)
+        progress = await service.get_progress(other)
+        assert progress["cancelled"] == 4
+        assert other.status == "cancelled"
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_api_request_does_not_attach_to_queued_campaign_scan(self, session, monkeypatch):
+        from app.services import scan as scan_module
+
+        monkeypatch.setattr(scan_module.settings, "scan_coalesce_enabled", True)
+        campaign = await CampaignService(session).create_campaign(
+            CampaignCreate(name="prod", selector=CampaignSelector(namespaces=["prod"]), rate_per_minute=0)
+        )
+        queued = (await session.execute(select(Scan).where(Scan.campaign_id == campaign.id))).scalars().first()
+
+        scan, mode = await ScanService(session).get_or_create_scan(ScanCreate(host_id=queued.host_id, scanner="lynis"))
+        assert mode is None
+        assert scan.campaign_id is None
+
+        await CampaignService(session).cancel_campaign(campaign.id)
+        await session.refresh(scan)
+        assert scan.status == "pending"
+
+
+def test_progress_eta():
+    campaign = ScanCampaign(
+        total_hosts=100, status="running", rate_per_minute=0, started_at=datetime.now(UTC) - timedelta(minutes=10)
+    )
+    progress = compute_progress(campaign, {"completed": 15, "failed": 5, "running": 5, "queued": 75})
+    assert progress["percent"] == 20.0
+    assert progress["scans_per_minute"] == pytest.approx(2.0, rel=0.01)
+    assert progress["eta_seconds"] == pytest.approx(2400, rel=0.01)
+
+    campaign.rate_per_minute = 1  # 75 queued scans at one per minute
+    assert compute_progress(campaign, {"completed": 20, "queued": 75})["eta_seconds"] == pytest.approx(4500, rel=0.01)
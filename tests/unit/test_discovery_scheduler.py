@@ -0,0 +1,98 @@
+"""Unit tests for the background discovery scheduler."""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from app.services import discovery_scheduler as ds
+from app.services.discovery_scheduler import ClusterDiscoveryState, DiscoveryScheduler, jittered, next_interval
+
+
+class TestNextInterval:
+    def test_high_churn_halves(self):
+        assert next_interval(600, 0.5, 0) == 300
+
+    def test_quiet_cluster_backs_off(self):
+        assert next_interval(600, 0.0, 0) == 900
+
+    def test_moderate_churn_keeps_interval(self):
+        assert next_interval(600, 0.01, 0) == 600
+
+    def test_clamped_to_bounds(self):
+        assert next_interval(130, 1.0, 0) == ds.settings.discovery_min_interval
+        assert next_interval(3500, 0.0, 0) == ds.settings.discovery_max_interval
+
+    def test_failures_back_off_exponentially(self):
+        assert next_interval(120, None, 1) < next_interval(120, None, 2) <= ds.settings.discovery_max_interval
+
+
+class TestJitter:
+    def test_within_bounds(self):
+        spread = 600 * ds.settings.discovery_jitter
+        for _ in range(200):
+            assert 600 - spread <= jittered(600) <= 600 + spread
+
+
+class TestRunCluster:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_success_reschedules_with_churn(self, monkeypatch):
+        scheduler = DiscoveryScheduler()
+        scheduler._states[1] = ClusterDiscoveryState(interval=600, next_due=0)
+        scheduler._running.add(1)
+
+        async def fake_discover(cluster_id):
+            return {"hosts_created": 10, "hosts_updated": 10, "hosts_total": 20, "details": []}
+
+        monkeypatch.setattr(scheduler, "_discover", fake_discover)
+        await scheduler._run_cluster(1, "c1")
+
+        status = scheduler.get_status(1)
+        assert status["last_result"] == "success"
+        assert status["interval_seconds"] == 300
+        assert status["running"] is False
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_timeout_counts_as_failure(self, monkeypatch):
+        scheduler = DiscoveryScheduler()
+        scheduler._states[2] = ClusterDiscoveryState(interval=600, next_due=0)
+        monkeypatch.setattr(ds.settings, "discovery_timeout", 0.01)
+
+        async def slow_discover(cluster_id):
+            await asyncio.sleep(1)
+
+        monkeypatch.setattr(scheduler, "_discover", slow_discover)
+        await scheduler._run_cluster(2, "c2")
+
+        status = scheduler.get_status(2)
+        assert status["last_result"] == "timeout"
+        assert status["consecutive_failures"] == 1
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_concurrency_capped(self, monkeypatch):
+        scheduler = DiscoveryScheduler()
+        monkeypatch.setattr(ds.settings, "discovery_max_concurrency", 2)
+        active = 0
+        peak = 0
+
+        async def fake_discover(cluster_id):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {"hosts_created": 0, "hosts_updated": 1, "hosts_total": 1, "details": []}
+
+        monkeypatch.setattr(scheduler, "_discover", fake_discover)
+        for i in range(6):
+            scheduler._states[i] = ClusterDiscoveryState(interval=600, next_due=0)
+        await asyncio.gather(*(scheduler._run_cluster(i, f"c{i}") for i in range(6)))
+        assert peak == 2
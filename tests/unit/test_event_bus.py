@@ -0,0 +1,96 @@
+"""Unit tests for the scan event bus."""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from app.models import EventPayload
+from app.services import event_bus as event_bus_module
+from app.services.event_bus import SPILL_KEY, EventBus, PostgresEventBus
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def sqlite_engine(monkeypatch, db_engine):
+    monkeypatch.setattr(event_bus_module, "engine", db_engine)
+    return db_engine
+
+
+async def _collect(bus: EventBus, count: int) -> tuple[list[dict], asyncio.Event]:
+    received: list[dict] = []
+    done = asyncio.Event()
+
+    async def handler(message):
+        received.append(message)
+        if len(received) == count:
+            done.set()
+
+    await bus.start(handler)
+    return received, done
+
+
+class TestInProcessBus:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_delivers_in_order(self):
+        bus = EventBus(max_size=10)
+        received, done = await _collect(bus, 3)
+        for i in range(3):
+            await bus.publish({"type": "scan_started", "scan_id": i})
+        await asyncio.wait_for(done.wait(), timeout=1)
+        await bus.stop()
+
+        assert [m["scan_id"] for m in received] == [0, 1, 2]
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_full_queue_drops_instead_of_blocking(self):
+        bus = EventBus(max_size=2)
+        for i in range(5):
+            await asyncio.wait_for(bus.publish({"type": "scan_started", "scan_id": i}), timeout=0.1)
+        assert bus.queue.qsize() == 2
+
+
+class TestPostgresBus:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_spilled_payload_is_loaded(self, sqlite_engine):
+        big = {"type": "scan_completed", "scan_id": 1, "blob": "x" * 10000}
+        async with sqlite_engine.begin() as conn:
+            result = await conn.execute(
+                EventPayload.__table__.insert().values(payload=json.dumps(big)).returning(EventPayload.id)
+            )
+            ref = result.scalar_one()
+
+        bus = PostgresEventBus("postgresql://unused", "scan_events", max_size=10)
+        received, done = await _collect(bus, 2)
+        bus._on_notify(None, 0, "scan_events", json.dumps({SPILL_KEY: ref}))
+        bus._on_notify(None, 0, "scan_events", json.dumps({"type": "scan_started", "scan_id": 2}))
+        await asyncio.wait_for(done.wait(), timeout=1)
+        await bus.stop()
+
+        assert received[0] == big
+        assert received[1]["scan_id"] == 2
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_notify_failure_falls_back_to_local(self, sqlite_engine):
+        # SQLite has no pg_notify, so publish must still reach local subscribers
+        bus = PostgresEventBus("postgresql://unused", "scan_events", max_size=10)
+        await bus.publish({"type": "scan_failed", "scan_id": 3})
+        assert bus.queue.get_nowait()["scan_id"] == 3
+
+    def test_backend_selection(self, monkeypatch):
+        monkeypatch.setattr(event_bus_module.settings, "event_bus_backend", "auto")
+        assert type(event_bus_module.create_event_bus()) is EventBus
+
+        monkeypatch.setattr(event_bus_module.settings, "database_url", "postgresql+asyncpg://u:p@db:5432/dash")
+        bus = event_bus_module.create_event_bus()
+        assert isinstance(bus, PostgresEventBus)
+        assert bus.dsn == "postgresql://u:p@db:5432/dash"
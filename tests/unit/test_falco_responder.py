@@ -0,0 +1,198 @@
+"""Unit tests for the Falco responder's config reload and queued ingestion."""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+RESPONDER_ROOT = Path(__file__).parent.parent.parent / "falco" / "responder"
+sys.path.insert(0, str(RESPONDER_ROOT))
+
+os.environ.setdefault("DRY_RUN", "true")
+
+import responder
+from cooldown_store import CooldownStore
+from fastapi.testclient import TestClient
+
+CONFIG = """
+defaults:
+  dry_run: true
+  log_all: false
+  cooldown_seconds: 60
+  dedup_window_seconds: 10
+rules:
+  "Terminal shell in container":
+    actions:
+      - type: log
+  "Write below etc":
+    cooldown_seconds: 300
+    actions:
+      - type: log
+"""
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    path = tmp_path / "response_actions.yaml"
+    path.write_text(CONFIG)
+    monkeypatch.setattr(responder, "CONFIG_PATH", str(path))
+    monkeypatch.setattr(responder, "CONFIG_CHECK_INTERVAL", 0)
+    monkeypatch.setattr(responder, "_config", None)
+    monkeypatch.setattr(responder, "cooldowns", CooldownStore(100))
+    monkeypatch.setattr(responder, "recent_events", CooldownStore(100))
+    return path
+
+
+def _touch(path: Path, text: str) -> None:
+    path.write_text(text)
+    later = time.time() + 5
+    os.utime(path, (later, later))
+
+
+def _event(rule: str = "Terminal shell in container", container: str = "web", process: str = "bash") -> dict:
+    return {"rule": rule, "priority": "Notice", "output_fields": {"container.name": container, "proc.name": process}}
+
+
+async def _take_one() -> None:
+    responder._queue.get_nowait()
+    responder._queue.task_done()
+
+
+class TestCooldownStore:
+    def test_acquire_and_expire(self):
+        clock = Clock()
+        store = CooldownStore(10, clock=clock)
+        assert store.acquire("a", 60) == 0
+        assert store.acquire("a", 60) == 60
+        clock.now += 59
+        assert store.acquire("a", 60) == 1
+        clock.now += 1
+        assert store.acquire("a", 60) == 0
+        assert store.active() == {"a": (clock.now, clock.now + 60)}
+
+    def test_cap_evicts_soonest_expiring(self):
+        clock = Clock()
+        store = CooldownStore(3, clock=clock)
+        store.acquire("short", 10)
+        store.acquire("long", 600)
+        store.acquire("mid", 60)
+        store.acquire("new", 60)
+        assert set(store.active()) == {"long", "mid", "new"}
+        clock.now += 61
+        assert set(store.active()) == {"long"}
+        assert len(store) == 1
+
+    def test_sqlite_persistence(self, tmp_path):
+        clock = Clock()
+        path = str(tmp_path / "cooldowns.db")
+        store = CooldownStore(10, path, clock=clock)
+        store.acquire("kept", 600)
+        store.acquire("expired", 30)
+        store.close()
+
+        clock.now += 60
+        restored = CooldownStore(10, path, clock=clock)
+        assert set(restored.active()) == {"kept"}
+        assert restored.acquire("kept", 600) == 540
+        restored.close()
+
+
+class TestCooldowns:
+    def test_rule_override_and_dedup(self, config_file):
+        assert responder.process_event(_event(container="a"))["status"] == "processed"
+        assert responder.process_event(_event(container="a"))["status"] == "cooldown"
+        assert responder.process_event(_event("Write below etc", container="a"))["status"] == "processed"
+        active = responder.cooldowns.active()
+        started, expires = active["Write below etc:a"]
+        assert expires - started == 300
+
+        assert not responder.is_duplicate(_event(process="sh"), 10)
+        assert responder.is_duplicate(_event(process="sh"), 10)
+        assert not responder.is_duplicate(_event(process="cat"), 10)
+        assert not responder.is_duplicate(_event(process="sh"), 0)
+        responder.forget_event(_event(process="sh"))
+        assert not responder.is_duplicate(_event(process="sh"), 10)
+
+
+class TestConfig:
+    def test_parsed_once_and_reloaded_on_change(self, config_file, monkeypatch):
+        loads = []
+        load_config = responder.load_config
+        monkeypatch.setattr(responder, "load_config", lambda: loads.append(1) or load_config())
+
+        first = responder.get_config()
+        assert responder.get_config() is first
+        assert len(loads) == 1
+
+        _touch(config_file, CONFIG.replace("cooldown_seconds: 60", "cooldown_seconds: 5"))
+        assert responder.get_config()["defaults"]["cooldown_seconds"] == 5
+        assert len(loads) == 2
+
+    def test_broken_file_keeps_previous_config(self, config_file):
+        first = responder.get_config()
+        _touch(config_file, "rules: [unclosed")
+        assert responder.get_config() is first
+
+
+class TestIngestion:
+    def test_batch_accepted_and_processed(self, config_file):
+        with TestClient(responder.app) as client:
+            response = client.post(
+                "/respond", json=[_event(container=f"app-{i}") for i in range(3)] + [_event("x")] * 2
+            )
+            assert response.status_code == 202
+            assert response.json()["accepted"] == 4
+
+            assert client.post("/respond", json=_event(container="app-9")).status_code == 202
+            for _ in range(100):
+                if client.get("/health").json()["events"]["processed"] >= 5:
+                    break
+                time.sleep(0.01)
+            events = client.get("/health").json()["events"]
+            assert events["processed"] == 5
+            assert events["duplicates"] == 1
+            assert set(client.get("/events").json()["active_cooldowns"]) == {
+                f"Terminal shell in container:app-{i}" for i in (0, 1, 2, 9)
+            }
+
+    def test_invalid_payloads(self, config_file):
+        with TestClient(responder.app) as client:
+            assert client.post("/respond", content=b"{not json").status_code == 400
+            assert client.post("/respond", json=[_event(), "x"]).status_code == 400
+
+    def test_full_queue_answers_503(self, config_file, monkeypatch):
+        monkeypatch.setattr(responder, "WORKERS", 0)
+        monkeypatch.setattr(responder, "QUEUE_SIZE", 2)
+        with TestClient(responder.app) as client:
+            response = client.post("/respond", json=[_event(container=name) for name in "abc"])
+            assert response.status_code == 503
+            assert response.headers["retry-after"] == "1"
+            assert response.json() == {"status": "overloaded", "accepted": 2, "rejected": 1}
+            monkeypatch.setattr(responder, "SHUTDOWN_TIMEOUT", 0)
+
+    def test_rejected_event_accepted_on_retry(self, config_file, monkeypatch):
+        monkeypatch.setattr(responder, "QUEUE_SIZE", 1)
+        monkeypatch.setattr(responder, "WORKERS", 0)
+        with TestClient(responder.app) as client:
+            duplicates = client.get("/health").json()["events"]["duplicates"]
+            assert client.post("/respond", json=_event(container="a")).status_code == 202
+            rejected = client.post("/respond", json=_event(container="b"))
+            assert rejected.status_code == 503
+            assert rejected.headers["retry-after"] == "1"
+
+            client.portal.call(_take_one)  # a worker frees a slot
+            retry = client.post("/respond", json=_event(container="b"))
+            assert retry.status_code == 202
+            assert retry.json()["accepted"] == 1
+            assert client.get("/health").json()["events"]["duplicates"] == duplicates
+            monkeypatch.setattr(responder, "SHUTDOWN_TIMEOUT", 0)
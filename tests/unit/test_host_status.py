@@ -0,0 +1,105 @@
+"""Unit tests for the bulk host status refresher."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from sqlalchemy import event, select
+
+from app.models import Cluster, Host
+from app.services import host_status
+from app.services.host_status import HostStatusRefresher
+
+
+class TestHostStatusRefresher:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_refresh_all(self, db_session, monkeypatch):
+        podman = Cluster(name="pm", cluster_type="podman")
+        k8s = Cluster(name="k8s", cluster_type="kubernetes")
+        db_session.add_all([podman, k8s])
+        await db_session.flush()
+        db_session.add_all(
+            [
+                Host(name="target-a", host_type="container", status="offline"),
+                Host(name="pm/container/web", address="web", host_type="container", cluster_id=podman.id),
+                Host(name="pm/container/db", address="db", host_type="container", cluster_id=podman.id),
+                Host(
+                    name="k8s/pod/ns/p1", host_type="k8s_pod", cluster_id=k8s.id, k8s_namespace="ns", k8s_pod_name="p1"
+                ),
+                Host(name="k8s/node/n1", host_type="k8s_node", cluster_id=k8s.id, k8s_node_name="n1", status="online"),
+                Host(name="ssh-1", host_type="ssh", address="10.0.0.1"),
+                Host(name="ssh-2", host_type="ssh", address="10.0.0.2"),
+            ]
+        )
+        await db_session.flush()
+
+        listings = []
+
+        def fake_podman(cluster):
+            listings.append(cluster.name if cluster else None)
+            if cluster is None:
+                return {"target-a": "running"}
+            return {"web": "running", "db": "exited"}
+
+        def fake_k8s(cluster, need_pods, need_nodes):
+            listings.append(cluster.name)
+            assert need_pods and need_nodes
+            return {("ns", "p1"): "Running"}, {"n1": False}
+
+        async def fake_tcp(address, port):
+            return "online" if address == "10.0.0.1" else "offline"
+
+        monkeypatch.setattr(host_status, "_podman_states_sync", fake_podman)
+        monkeypatch.setattr(host_status, "_k8s_states_sync", fake_k8s)
+        monkeypatch.setattr(host_status, "tcp_check", fake_tcp)
+
+        updates = []
+        sync_engine = db_session.bind.sync_engine
+
+        def count_updates(conn, cursor, statement, parameters, context, executemany):
+            if statement.startswith("UPDATE hosts"):
+                updates.append(statement)
+
+        event.listen(sync_engine, "before_cursor_execute", count_updates)
+        try:
+            result = await HostStatusRefresher(db_session).refresh_all()
+        finally:
+            event.remove(sync_engine, "before_cursor_execute", count_updates)
+
+        assert sorted(listings, key=str) == sorted([None, "pm", "k8s"], key=str)
+        assert result["hosts_checked"] == 7
+        assert len(updates) == 1
+
+        rows = await db_session.execute(select(Host.name, Host.status))
+        statuses = dict(rows.all())
+        assert statuses == {
+            "target-a": "online",
+            "pm/container/web": "online",
+            "pm/container/db": "offline",
+            "k8s/pod/ns/p1": "online",
+            "k8s/node/n1": "offline",
+            "ssh-1": "online",
+            "ssh-2": "offline",
+        }
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_listing_failure_marks_endpoint_unknown(self, db_session, monkeypatch):
+        db_session.add(Host(name="target-b", host_type="container", status="online"))
+        await db_session.flush()
+
+        def broken(cluster):
+            raise ConnectionError("socket missing")
+
+        monkeypatch.setattr(host_status, "_podman_states_sync", broken)
+        result = await HostStatusRefresher(db_session).refresh_all()
+
+        assert result["by_status"] == {"unknown": 1}
+        assert (await db_session.execute(select(Host.status))).scalar_one() == "unknown"
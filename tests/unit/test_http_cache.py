@@ -0,0 +1,176 @@
+"""Unit tests for ETags, conditional GET and Range on reports, exports and stats."""
+
+import gzip
+import os
+import sys
+from datetime import UTC, datetime
+from pathlib import Path
+
+import orjson
+import pytest
+import pytest_asyncio
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api import dashboard as dashboard_api
+from app.api import scans as scans_api
+from app.http_cache import IMMUTABLE, byte_range, etag_matches
+from app.models import Host, Scan
+from app.services.report_store import MEDIA_TYPES, ReportStore
+from app.services.rules import RuleCatalog
+
+REPORT = "".join(f"line {i:04d}\n" for i in range(1000))
+
+
+def _request(**headers) -> Request:
+    raw = [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "query_string": b"", "headers": raw})
+
+
+async def _body(response) -> bytes:
+    return b"".join([chunk async for chunk in response.body_iterator])
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def session(monkeypatch, tmp_path, db_session):
+    store = ReportStore(tmp_path / "objects")
+    monkeypatch.setattr(scans_api, "report_store", store)
+    host = Host(name="web")
+    db_session.add(host)
+    await db_session.flush()
+    stored = store.put(REPORT, MEDIA_TYPES["log"])
+    await store.retain(db_session, stored)
+    db_session.add(
+        Scan(
+            id=1,
+            host_id=host.id,
+            scanner="lynis",
+            status="completed",
+            report_digest=stored.digest,
+            completed_at=datetime(2026, 10, 1, tzinfo=UTC),
+        )
+    )
+    db_session.add(Scan(id=2, host_id=host.id, scanner="lynis", status="running"))
+    await db_session.commit()
+    return db_session
+
+
+class TestValidators:
+    def test_etag_matches(self):
+        assert etag_matches('"a", W/"b"', '"b"')
+        assert etag_matches("*", '"x"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"b"')
+
+    def test_byte_range(self):
+        assert byte_range(_request(), '"e"', 100) is None
+        assert byte_range(_request(range="bytes=10-19"), '"e"', 100) == (10, 20)
+        assert byte_range(_request(range="bytes=90-"), '"e"', 100) == (90, 100)
+        assert byte_range(_request(range="bytes=-5"), '"e"', 100) == (95, 100)
+        assert byte_range(_request(range="bytes=0-1,5-6"), '"e"', 100) is None
+        assert byte_range(_request(range="bytes=0-9", if_range='"old"'), '"e"', 100) is None
+        with pytest.raises(HTTPException) as exc:
+            byte_range(_request(range="bytes=100-"), '"e"', 100)
+        assert exc.value.status_code == 416
+
+
+class TestReport:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_etag_and_not_modified(self, session):
+        response = await scans_api.get_scan_report(1, session, None, _request(accept_encoding="identity"), "raw")
+        assert response.status_code == 200
+        assert response.headers["cache-control"] == IMMUTABLE
+        assert (await _body(response)).decode() == REPORT
+
+        etag = response.headers["etag"]
+        again = await scans_api.get_scan_report(1, session, None, _request(if_none_match=etag), "raw")
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_range_of_plain_report(self, session):
+        response = await scans_api.get_scan_report(1, session, None, _request(range="bytes=100-149"), "raw")
+        assert response.status_code == 206
+        assert response.headers["content-range"] == f"bytes 100-149/{len(REPORT)}"
+        assert await _body(response) == REPORT.encode()[100:150]
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_range_of_compressed_report(self, session):
+        full = await scans_api.get_scan_report(1, session, None, _request(accept_encoding="gzip"), "raw")
+        assert full.headers["content-encoding"] == "gzip"
+        encoded = await _body(full)
+        assert gzip.decompress(encoded).decode() == REPORT
+
+        tail = await scans_api.get_scan_report(
+            1, session, None, _request(accept_encoding="gzip", range="bytes=20-", if_range=full.headers["etag"]), "raw"
+        )
+        assert tail.status_code == 206
+        assert await _body(tail) == encoded[20:]
+
+
+class TestExport:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_not_modified_and_revalidated_while_running(self, session):
+        response = await scans_api.export_scan_results(1, session, None, _request(), "json")
+        assert response.headers["cache-control"] == IMMUTABLE
+        etag = response.headers["etag"]
+        assert (
+            await scans_api.export_scan_results(1, session, None, _request(if_none_match=etag), "json")
+        ).status_code == 304
+        assert (
+            await scans_api.export_scan_results(1, session, None, _request(if_none_match=etag), "csv")
+        ).status_code == 200
+
+        running = await scans_api.export_scan_results(2, session, None, _request(), "csv")
+        assert running.headers["cache-control"] == "private, no-cache"
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_coalesced_request_exports_parent_findings(self, session):
+        await RuleCatalog(session).add_findings(
+            1, "lynis", [{"rule_id": "AUTH-9286", "title": "Password aging", "severity": "high", "status": "fail"}]
+        )
+        session.add(
+            Scan(
+                id=3,
+                host_id=1,
+                scanner="lynis",
+                status="completed",
+                coalesced_into_id=1,
+                completed_at=datetime(2026, 10, 1, tzinfo=UTC),
+            )
+        )
+        await session.commit()
+
+        parent = await scans_api.export_scan_results(1, session, None, _request(), "json")
+        linked = await scans_api.export_scan_results(3, session, None, _request(), "json")
+        results = orjson.loads(await _body(linked))["results"]
+        assert [r["rule_id"] for r in results] == ["AUTH-9286"]
+        assert results == orjson.loads(await _body(parent))["results"]
+        assert linked.headers["etag"] != parent.headers["etag"]
+
+
+class TestDashboard:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_stats_etag_follows_rollup_version(self, session, monkeypatch):
+        monkeypatch.setattr(dashboard_api.settings, "dashboard_etag_seconds", 3600)
+        first = await dashboard_api._stats_etag(session, 30, None)
+        assert first.startswith('W/"')
+        assert await dashboard_api._stats_etag(session, 30, None) == first
+        assert await dashboard_api._stats_etag(session, 7, None) != first
+
+        session.add(Host(name="db"))
+        await session.commit()
+        assert await dashboard_api._stats_etag(session, 30, None) != first
+
+        response = await dashboard_api.get_dashboard_stats(session, None, _request(if_none_match=first), 30, None)
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        response = await dashboard_api.get_dashboard_stats(session, None, _request(if_none_match=etag), 30, None)
+        assert response.status_code == 304
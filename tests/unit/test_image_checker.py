@@ -0,0 +1,82 @@
+"""Unit tests for the memoized image checker."""
+
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.services import image_checker
+from app.services.image_checker import ImageChecker, clear_image_cache
+
+
+def _rules(result: dict, target: str) -> dict[str, str]:
+    return {f["rule_id"]: f["status"] for f in result["findings"] if f["target"] == target}
+
+
+class TestImageChecks:
+    def test_latest_root_image(self):
+        result = ImageChecker().check_images([{"image": "nginx:latest", "user": "", "target": "pod/web"}])
+        rules = _rules(result, "pod/web")
+        assert rules["IMG-001"] == "fail"
+        assert rules["IMG-002"] == "fail"
+        assert rules["IMG-003"] == "fail"
+        assert rules["IMG-004"] == "fail"
+
+    def test_pinned_distroless_nonroot(self):
+        image = "gcr.io/distroless/python3:3.11@sha256:abc"
+        result = ImageChecker().check_images([{"image": image, "user": "1000", "target": "api"}])
+        assert set(_rules(result, "api").values()) == {"pass"}
+
+    def test_eol_and_risky_base(self):
+        result = ImageChecker().check_images(
+            [
+                {"image": "python:3.7-slim", "user": "app", "target": "old"},
+                {"image": "redis:7.2", "user": "", "target": "cache"},
+            ]
+        )
+        assert _rules(result, "old")["IMG-005"] == "fail"
+        assert _rules(result, "cache")["IMG-006"] == "warning"
+
+    def test_layer_bloat(self):
+        result = ImageChecker().check_images([{"image": "app:1.0", "target": "t", "layer_count": 31}])
+        assert _rules(result, "t")["IMG-007"] == "fail"
+
+
+class TestImageResultCache:
+    def setup_method(self):
+        clear_image_cache()
+
+    def test_shared_image_evaluated_once(self):
+        hosts = [{"name": f"pod-{i}", "container_image": "nginx:1.25", "security_context": {}} for i in range(50)]
+        result = ImageChecker().check_from_hosts(hosts)
+
+        info = image_checker._evaluate_image.cache_info()
+        assert info.misses == 1
+        assert result["unique_images"] == 1
+        assert result["images_checked"] == 50
+        assert {f["target"] for f in result["findings"]} == {h["name"] for h in hosts}
+        assert result["total_checks"] == 50 * len(_rules(result, "pod-0"))
+
+    def test_findings_keep_input_order(self):
+        images = [
+            {"image": "nginx:1.25", "target": "a"},
+            {"image": "redis:7.2", "target": "b"},
+            {"image": "nginx:1.25", "target": "c"},
+        ]
+        result = ImageChecker().check_images(images)
+        targets = [f["target"] for f in result["findings"]]
+        assert list(dict.fromkeys(targets)) == ["a", "b", "c"]
+        assert result["unique_images"] == 2
+
+    def test_cache_shared_across_checkers(self):
+        ImageChecker().check_images([{"image": "nginx:1.25", "target": "a"}])
+        ImageChecker().check_images([{"image": "nginx:1.25", "target": "b"}])
+        assert image_checker._evaluate_image.cache_info().hits == 1
+
+    def test_ruleset_change_invalidates(self, monkeypatch):
+        ImageChecker().check_images([{"image": "myorg/tool:2.0", "target": "t"}])
+        monkeypatch.setattr(image_checker, "RISKY_BASES", (("myorg/tool", "Internal tool is risky."),))
+
+        result = ImageChecker().check_images([{"image": "myorg/tool:2.0", "target": "t"}])
+        assert _rules(result, "t")["IMG-006"] == "warning"
@@ -0,0 +1,104 @@
+"""Unit tests for scheduler leader election."""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from app.services import leader as leader_module
+from app.services.leader import LeaderElector
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def lease_db(monkeypatch, db_engine, session_factory):
+    monkeypatch.setattr(leader_module, "engine", db_engine)
+    monkeypatch.setattr(leader_module, "get_session_context", session_factory)
+    monkeypatch.setattr(leader_module.settings, "leader_renew_interval", 3600)
+    return db_engine
+
+
+class Replica:
+    def __init__(self):
+        self.elector = LeaderElector("scheduler")
+        self.events: list[str] = []
+
+    async def start(self):
+        await self.elector.start(self._elected, self._demoted)
+
+    async def _elected(self):
+        self.events.append("elected")
+
+    async def _demoted(self):
+        self.events.append("demoted")
+
+
+class TestLeaseElection:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_single_leader_and_handover(self, lease_db):
+        a, b = Replica(), Replica()
+        await a.start()
+        await b.start()
+        assert a.elector.backend == "lease"
+        assert (a.elector.is_leader, b.elector.is_leader) == (True, False)
+        assert (await b.elector.describe())["leader"] == a.elector.identity
+
+        # Graceful shutdown expires the lease so the standby takes over at once
+        await a.elector.stop()
+        assert a.events == ["elected", "demoted"]
+        await b.elector._round()
+        assert b.elector.is_leader
+        assert (await a.elector.describe())["leader"] == b.elector.identity
+        await b.elector.stop()
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_failover_after_lease_expiry(self, lease_db, monkeypatch):
+        monkeypatch.setattr(leader_module.settings, "leader_lease_ttl", 0.05)
+        a, b = Replica(), Replica()
+        await a.start()
+        await b.start()
+        assert not b.elector.is_leader
+
+        # Leader stops renewing (hung or partitioned); its lease runs out
+        await asyncio.sleep(0.1)
+        await b.elector._round()
+        assert b.elector.is_leader
+
+        # The old leader notices on its next round and steps down
+        await a.elector._round()
+        assert not a.elector.is_leader
+        assert a.events == ["elected", "demoted"]
+        for replica in (a, b):
+            await replica.elector.stop()
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_renewal_keeps_leadership(self, lease_db):
+        a = Replica()
+        await a.start()
+        first = (await a.elector.describe())["lease_expires_at"]
+        await a.elector._round()
+        assert a.elector.is_leader
+        assert a.events == ["elected"]
+        assert (await a.elector.describe())["lease_expires_at"] >= first
+        await a.elector.stop()
+
+
+def test_lock_key_is_stable():
+    assert LeaderElector("scheduler").lock_key == LeaderElector("scheduler").lock_key
+    assert LeaderElector("scheduler").lock_key != LeaderElector("other").lock_key
+
+
+@pytest.mark.parametrize("backend", ["postgresql", "sqlite"])
+def test_backend_follows_dialect(monkeypatch, backend):
+    fake_engine = type("Engine", (), {"dialect": type("Dialect", (), {"name": backend})()})()
+    monkeypatch.setattr(leader_module, "engine", fake_engine)
+    expected = "advisory_lock" if backend == "postgresql" else "lease"
+    assert LeaderElector("scheduler").backend == expected
@@ -0,0 +1,176 @@
+"""Unit tests for pooled SMTP notifications and digests, against a local SMTP stand-in."""
+
+import asyncio
+import email
+import os
+import socketserver
+import sys
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from app.services import notifications as notifications_module
+from app.services.notifications import (
+    NotificationDispatcher,
+    ScanEvent,
+    SMTPConnection,
+    recipients_for,
+    send_scan_notification,
+)
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: EHLO, AUTH PLAIN, MAIL, RCPT, DATA, QUIT."""
+
+    def reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        self.reply("220 stand-in ESMTP")
+        recipients: list[str] = []
+        while line := self.rfile.readline().decode().rstrip("\r\n"):
+            verb = line.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-stand-in")
+                self.reply("250 AUTH PLAIN")
+            elif verb == "AUTH":
+                self.reply("235 2.7.0 Authenticated")
+            elif verb == "RCPT":
+                recipients.append(line.split(":", 1)[1].strip("<> "))
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while (chunk := self.rfile.readline().decode()) != ".\r\n":
+                    data.append(chunk)
+                server.messages.append((recipients, email.message_from_string("".join(data))))
+                recipients = []
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+@pytest.fixture
+def smtp_server(monkeypatch):
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), _SMTPHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.messages = []
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    settings = notifications_module.settings
+    monkeypatch.setattr(settings, "smtp_host", "127.0.0.1")
+    monkeypatch.setattr(settings, "smtp_port", server.server_address[1])
+    monkeypatch.setattr(settings, "smtp_user", "dashboard")
+    monkeypatch.setattr(settings, "smtp_password", "secret")
+    monkeypatch.setattr(settings, "smtp_starttls", False)
+    monkeypatch.setattr(settings, "notification_email", "ops@example.com")
+    connection = SMTPConnection(idle_timeout=60)
+    monkeypatch.setattr(notifications_module, "smtp_connection", connection)
+    yield server
+    connection.close()
+    server.shutdown()
+    server.server_close()
+
+
+def _schedule(**overrides) -> SimpleNamespace:
+    values = {"notify_on_completion": True, "notify_on_failure": True, "notification_channels": []}
+    return SimpleNamespace(**(values | overrides))
+
+
+class TestRecipients:
+    def test_manual_and_scheduled_scans(self, monkeypatch):
+        monkeypatch.setattr(notifications_module.settings, "notification_email", "ops@example.com")
+        done = ScanEvent("web", "lynis", "completed", 80)
+        failed = ScanEvent("web", "lynis", "failed", error_message="boom")
+
+        assert recipients_for(done) == ["ops@example.com"]
+        assert recipients_for(done, _schedule()) == ["ops@example.com"]
+        assert recipients_for(done, _schedule(notify_on_completion=False)) == []
+        assert recipients_for(failed, _schedule(notify_on_completion=False)) == ["ops@example.com"]
+        assert recipients_for(failed, _schedule(notify_on_failure=False)) == []
+        assert recipients_for(done, _schedule(notification_channels=["slack"])) == []
+        assert recipients_for(done, _schedule(notification_channels=["email:sec@example.com", "email"])) == [
+            "sec@example.com",
+            "ops@example.com",
+        ]
+
+
+class TestSMTPConnection:
+    def test_one_session_for_many_messages(self, smtp_server):
+        for i in range(3):
+            assert send_scan_notification(f"host-{i}", "lynis", "completed", 70, 10, 2)
+        assert smtp_server.connections == 1
+        assert [msg["Subject"] for _, msg in smtp_server.messages] == [
+            f"[Test-Hard] Scan completed: lynis on host-{i}" for i in range(3)
+        ]
+
+    def test_reopens_idle_session(self, smtp_server):
+        notifications_module.smtp_connection.idle_timeout = 0
+        assert send_scan_notification("a", "lynis", "completed", 70)
+        assert send_scan_notification("b", "lynis", "completed", 70)
+        assert smtp_server.connections == 2
+
+    def test_unreachable_server_reports_failure(self, smtp_server, monkeypatch):
+        monkeypatch.setattr(notifications_module.settings, "smtp_port", 1)
+        assert not send_scan_notification("a", "lynis", "failed", error_message="boom")
+
+
+class TestDispatcher:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_digest_per_recipient(self, smtp_server):
+        dispatcher = NotificationDispatcher(digest_window=0.2, max_size=100)
+        await dispatcher.start()
+        try:
+            for i in range(3):
+                await dispatcher.notify(ScanEvent(f"node-{i}", "lynis", "completed", 60 + i, 10, i))
+            await dispatcher.notify(
+                ScanEvent("node-9", "trivy", "failed", error_message="image pull failed"),
+                _schedule(notification_channels=["email:sec@example.com"]),
+            )
+            await dispatcher.notify(
+                ScanEvent("node-8", "lynis", "completed", 90), _schedule(notify_on_completion=False)
+            )
+            assert smtp_server.messages == []
+
+            for _ in range(100):
+                if len(smtp_server.messages) == 2:
+                    break
+                await asyncio.sleep(0.02)
+        finally:
+            await dispatcher.stop()
+
+        by_recipient = {tuple(rcpts): msg for rcpts, msg in smtp_server.messages}
+        assert set(by_recipient) == {("ops@example.com",), ("sec@example.com",)}
+        digest = by_recipient[("ops@example.com",)]
+        assert digest["Subject"] == "[Test-Hard] 3 scans finished (0 failed)"
+        text = digest.get_payload()[0].get_payload()
+        assert all(f"node-{i}" in text for i in range(3))
+        assert by_recipient[("sec@example.com",)]["Subject"] == "[Test-Hard] Scan failed: trivy on node-9"
+        assert smtp_server.connections == 1
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_stop_sends_open_digests(self, smtp_server):
+        dispatcher = NotificationDispatcher(digest_window=3600, max_size=100)
+        await dispatcher.start()
+        await dispatcher.notify(ScanEvent("web", "lynis", "completed", 75))
+        await dispatcher.notify(ScanEvent("db", "lynis", "completed", 65))
+        await asyncio.sleep(0.05)
+        assert smtp_server.messages == []
+        await dispatcher.stop()
+        assert len(smtp_server.messages) == 1
+        assert smtp_server.messages[0][1]["Subject"] == "[Test-Hard] 2 scans finished (0 failed)"
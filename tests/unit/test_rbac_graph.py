@@ -0,0 +1,163 @@
+"""Unit tests for the RBAC effective-permission graph."""
+
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from app.services.k8s_connector import _paginate
+from app.services.k8s_hardening import K8sHardeningScanner
+from app.services.rbac_graph import RbacGraph
+
+
+def _rule(verbs, resources, api_groups=("",), resource_names=()):
+    return {
+        "verbs": list(verbs),
+        "resources": list(resources),
+        "api_groups": list(api_groups),
+        "resource_names": list(resource_names),
+        "non_resource_urls": [],
+    }
+
+
+def _binding(name, role_kind, role_name, subjects, namespace=None):
+    return {
+        "name": name,
+        "namespace": namespace,
+        "role_ref": {"kind": role_kind, "name": role_name},
+        "subjects": [{"kind": k, "name": n, "namespace": ns} for k, n, ns in subjects],
+    }
+
+
+CLUSTER_ROLES = [
+    {"name": "cluster-admin", "labels": {}, "rules": [_rule(["*"], ["*"], ["*"])]},
+    {"name": "pod-reader", "labels": {"agg": "view"}, "rules": [_rule(["get", "list"], ["pods"])]},
+    {"name": "secret-reader", "labels": {"agg": "view"}, "rules": [_rule(["get"], ["secrets"])]},
+    {
+        "name": "aggregated-view",
+        "labels": {},
+        "rules": [],
+        "aggregation_selectors": [{"agg": "view"}],
+    },
+    {
+        "name": "rbac-manager",
+        "labels": {},
+        "rules": [_rule(["bind", "escalate"], ["roles"], ["rbac.authorization.k8s.io"])],
+    },
+    {"name": "named-cm", "labels": {}, "rules": [_rule(["update"], ["configmaps"], resource_names=["app-config"])]},
+]
+ROLES = [{"name": "exec", "namespace": "team-a", "labels": {}, "rules": [_rule(["create"], ["pods/exec"])]}]
+CLUSTER_ROLE_BINDINGS = [
+    _binding("admins", "ClusterRole", "cluster-admin", [("Group", "platform-admins", None)]),
+    _binding("rbac", "ClusterRole", "rbac-manager", [("ServiceAccount", "operator", "ops")]),
+]
+ROLE_BINDINGS = [
+    _binding("viewers", "ClusterRole", "aggregated-view", [("User", "alice", None)], namespace="team-a"),
+    _binding("exec", "Role", "exec", [("Group", "system:serviceaccounts:team-a", None)], namespace="team-a"),
+    _binding("cm", "ClusterRole", "named-cm", [("User", "bob", None)], namespace="team-a"),
+]
+
+
+def _graph() -> RbacGraph:
+    return RbacGraph(ROLES, CLUSTER_ROLES, ROLE_BINDINGS, CLUSTER_ROLE_BINDINGS)
+
+
+def _names(entries) -> set[str]:
+    return {e["name"] for e in entries}
+
+
+class TestWhoCan:
+    def test_wildcard_cluster_role_matches_everything(self):
+        assert _names(_graph().who_can("delete", "nodes")) == {"platform-admins"}
+
+    def test_aggregated_role_scoped_to_binding_namespace(self):
+        graph = _graph()
+        assert _names(graph.who_can("get", "secrets", namespace="team-a")) == {"platform-admins", "alice"}
+        assert _names(graph.who_can("get", "secrets", namespace="team-b")) == {"platform-admins"}
+        assert "alice" not in _names(graph.who_can("get", "secrets"))
+
+    def test_role_only_applies_in_own_namespace(self):
+        graph = _graph()
+        assert "system:serviceaccounts:team-a" in _names(graph.who_can("create", "pods/exec", namespace="team-a"))
+        assert "system:serviceaccounts:team-a" not in _names(graph.who_can("create", "pods/exec", namespace="x"))
+
+    def test_resource_names_restrict_grant(self):
+        graph = _graph()
+        assert "bob" in _names(graph.who_can("update", "configmaps", "team-a", resource_name="app-config"))
+        assert "bob" not in _names(graph.who_can("update", "configmaps", "team-a", resource_name="other"))
+
+    def test_api_group_must_match(self):
+        graph = _graph()
+        assert "operator" in _names(graph.who_can("bind", "roles", api_group="rbac.authorization.k8s.io"))
+        assert "operator" not in _names(graph.who_can("bind", "roles", api_group=""))
+
+    def test_results_are_memoized(self):
+        graph = _graph()
+        assert graph.who_can("get", "pods", "team-a") is graph.who_can("get", "pods", "team-a")
+
+
+class TestEffectivePermissions:
+    def test_service_account_inherits_group_bindings(self):
+        rules = _graph().effective_permissions("ServiceAccount", "builder", namespace="team-a")
+        assert [(r["role"], r["via_group"]) for r in rules] == [("exec", "system:serviceaccounts:team-a")]
+
+    def test_aggregated_rules_expanded(self):
+        rules = _graph().effective_permissions("User", "alice")
+        assert {tuple(r["resources"]) for r in rules} == {("pods",), ("secrets",)}
+
+
+class TestPrivilegedSubjects:
+    def test_reasons(self):
+        found = {(e["name"], e["reason"]) for e in _graph().privileged_subjects()}
+        assert ("platform-admins", "wildcard") in found
+        assert ("operator", "bind") in found
+        assert ("operator", "escalate") in found
+        assert not any(name == "alice" for name, _ in found)
+
+
+class TestHardeningFindings:
+    def test_wildcard_subject_has_no_escalation_findings(self):
+        cluster_roles = [*CLUSTER_ROLES, {"name": "god-mode", "labels": {}, "rules": [_rule(["*"], ["*"], ["*"])]}]
+        bindings = [*CLUSTER_ROLE_BINDINGS, _binding("ci", "ClusterRole", "god-mode", [("User", "ci-bot", None)])]
+        scanner = K8sHardeningScanner(connector=None)
+        scanner._check_rbac_privileges(RbacGraph(ROLES, cluster_roles, ROLE_BINDINGS, bindings))
+
+        by_target: dict[str, set[str]] = {}
+        for finding in scanner.findings:
+            by_target.setdefault(finding["target"], set()).add(finding["rule_id"])
+        assert by_target["user/ci-bot"] == {"K8S-RBAC-004"}
+        assert by_target["serviceaccount/ops/operator"] == {"K8S-RBAC-003"}
+        assert "group/platform-admins" not in by_target
+
+
+class TestScale:
+    def test_many_bindings(self):
+        bindings = [
+            _binding(f"rb-{i}", "ClusterRole", "pod-reader", [("User", f"user-{i}", None)], namespace=f"ns-{i % 500}")
+            for i in range(20000)
+        ]
+        graph = RbacGraph([], CLUSTER_ROLES, bindings, CLUSTER_ROLE_BINDINGS)
+        result = graph.who_can("list", "pods", namespace="ns-7")
+        assert len(result) == 40 + 1  # 40 users in ns-7 plus platform-admins
+
+
+class TestPaginate:
+    def test_follows_continue_tokens(self):
+        pages = {
+            None: SimpleNamespace(items=[1, 2], metadata=SimpleNamespace(_continue="t1")),
+            "t1": SimpleNamespace(items=[3], metadata=SimpleNamespace(_continue=None)),
+        }
+        calls = []
+
+        def list_fn(limit, _continue=None):
+            calls.append(_continue)
+            return pages[_continue]
+
+        assert list(_paginate(list_fn)) == [1, 2, 3]
+        assert calls == [None, "t1"]
@@ -0,0 +1,168 @@
+"""Unit tests for the content-addressed scanner report store."""
+
+import gzip
+import os
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from sqlalchemy import select
+
+from app.api.scans import _accepts_encoding
+from app.models import Host, ReportObject, Scan
+from app.services import retention as retention_module
+from app.services.report_store import MEDIA_TYPES, ReportStore
+from app.services.retention import RetentionService
+
+NOW = datetime.now(UTC)
+REPORT = "".join(f"[+] check {i}: OK\n" for i in range(2000))
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    store = ReportStore(tmp_path / "objects")
+    monkeypatch.setattr(retention_module, "report_store", store)
+    return store
+
+
+class TestWrite:
+    def test_streamed_report_is_compressed_under_its_digest(self, store):
+        with store.writer(MEDIA_TYPES["log"]) as writer:
+            for line in REPORT.splitlines(keepends=True):
+                writer.write(line)
+            stored = writer.commit()
+
+        assert stored.path == store.path_for(stored.digest, "gzip")
+        assert stored.size == len(REPORT)
+        assert stored.stored_size < stored.size // 5
+        assert gzip.decompress(stored.path.read_bytes()).decode() == REPORT
+        with store.open(stored.digest, stored.encoding) as stream:
+            assert stream.read().decode() == REPORT
+        assert not list((store.directory / "tmp").iterdir())
+
+    def test_identical_reports_are_stored_once(self, store):
+        first = store.put(REPORT, MEDIA_TYPES["log"])
+        second = store.put(REPORT.encode(), MEDIA_TYPES["log"])
+        other = store.put(REPORT + "done\n", MEDIA_TYPES["log"])
+
+        assert first.digest == second.digest != other.digest
+        assert len(list(store.directory.glob("*/*.gz"))) == 2
+
+    def test_writer_without_commit_leaves_nothing(self, store):
+        with store.writer(MEDIA_TYPES["xml"]) as writer:
+            writer.write("<partial")
+        assert not list(store.directory.glob("*/*.gz"))
+        assert not list((store.directory / "tmp").iterdir())
+
+    def test_reuse_refreshes_mtime_or_stores_again(self, store):
+        first = store.put(REPORT, MEDIA_TYPES["log"])
+        os.utime(first.path, (0, 0))
+        assert store.put(REPORT, MEDIA_TYPES["log"]).path == first.path
+        assert first.path.stat().st_mtime > 0
+
+        first.path.unlink()
+        again = store.put(REPORT, MEDIA_TYPES["log"])
+        assert again.path == first.path
+        assert gzip.decompress(again.path.read_bytes()).decode() == REPORT
+
+    def test_delete_spares_files_reused_within_grace(self, store, monkeypatch):
+        monkeypatch.setattr(retention_module.settings, "report_store_grace", 60)
+        reused = store.put(REPORT, MEDIA_TYPES["log"])
+        stale = store.put("old report\n", MEDIA_TYPES["log"])
+        os.utime(stale.path, (0, 0))
+
+        assert store.delete_files([reused.path, stale.path, stale.path]) == 1
+        assert reused.path.exists()
+        assert not stale.path.exists()
+        assert not list(store.directory.glob("*/*.deleting"))
+
+    def test_accept_encoding(self):
+        assert _accepts_encoding("gzip, deflate, br", "gzip")
+        assert _accepts_encoding("br;q=1.0, *;q=0.5", "zstd")
+        assert not _accepts_encoding("gzip;q=0, identity", "gzip")
+        assert not _accepts_encoding("", "gzip")
+
+
+class TestReferences:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_retention_releases_and_deletes_unused_reports(self, session_factory, store, monkeypatch):
+        monkeypatch.setattr(retention_module.settings, "scan_retention_days", 30)
+        monkeypatch.setattr(retention_module.settings, "scan_retention_scanners", {})
+        monkeypatch.setattr(retention_module.settings, "scan_retention_hosts", {})
+        monkeypatch.setattr(retention_module.settings, "scan_archive_enabled", False)
+        monkeypatch.setattr(retention_module.settings, "retention_batch_pause", 0)
+        monkeypatch.setattr(retention_module.settings, "report_store_grace", 0)
+
+        shared = store.put(REPORT, MEDIA_TYPES["log"])
+        expiring = store.put("old report\n", MEDIA_TYPES["log"])
+        async with session_factory() as session:
+            host = Host(name="web")
+            session.add(host)
+            await session.flush()
+            for age, report in ((90, shared), (60, expiring), (5, shared)):
+                await store.retain(session, report)
+                session.add(
+                    Scan(
+                        host_id=host.id,
+                        scanner="lynis",
+                        status="completed",
+                        report_digest=report.digest,
+                        created_at=NOW - timedelta(days=age),
+                    )
+                )
+
+        async with session_factory() as session:
+            objects = {o.digest: o for o in (await session.execute(select(ReportObject))).scalars()}
+            assert objects[shared.digest].refcount == 2
+            assert objects[shared.digest].size == len(REPORT)
+
+        totals = await RetentionService(session_factory).run()
+        assert totals["scans"] == 2
+
+        async with session_factory() as session:
+            objects = {o.digest: o for o in (await session.execute(select(ReportObject))).scalars()}
+        assert list(objects) == [shared.digest]
+        assert objects[shared.digest].refcount == 1
+        assert shared.path.exists()
+        assert not expiring.path.exists()
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_stream_serves_stored_or_decompressed_bytes(self, session_factory, store):
+        stored = store.put(REPORT, MEDIA_TYPES["log"])
+        async with session_factory() as session:
+            await store.retain(session, stored)
+        async with session_factory() as session:
+            obj = await store.get(session, stored.digest)
+
+        plain = b"".join([chunk async for chunk in store.stream(obj)])
+        raw = b"".join([chunk async for chunk in store.stream(obj, decompress=False)])
+        assert plain.decode() == REPORT
+        assert raw == stored.path.read_bytes()
+        assert len(raw) == obj.stored_size
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_sweep_deletes_unreferenced_reports(self, session_factory, store, monkeypatch):
+        monkeypatch.setattr(retention_module.settings, "report_store_grace", 60)
+        kept = store.put(REPORT, MEDIA_TYPES["log"])
+        orphan = store.put("timed out\n", MEDIA_TYPES["log"])
+        pending = store.put("still running\n", MEDIA_TYPES["log"])
+        leftover = store.directory / "tmp" / "dead-writer"
+        leftover.write_bytes(b"partial")
+        for path in (kept.path, orphan.path, leftover):
+            os.utime(path, (0, 0))
+        async with session_factory() as session:
+            await store.retain(session, kept)
+
+        assert await store.sweep(session_factory) == 1
+        assert kept.path.exists()
+        assert pending.path.exists()
+        assert not orphan.path.exists()
+        assert not leftover.exists()
@@ -0,0 +1,114 @@
+"""Unit tests for orjson responses and response compression."""
+
+import gzip
+import os
+import sys
+from datetime import UTC, datetime
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import orjson
+import pytest
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware import CompressionMiddleware, _accepted
+from app.responses import ORJSONResponse
+
+BIG = {"rows": [{"id": i, "name": f"host-{i}"} for i in range(500)]}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/big", response_class=ORJSONResponse)
+    async def big() -> ORJSONResponse:
+        return ORJSONResponse(BIG)
+
+    @app.get("/small")
+    async def small() -> dict:
+        return {"ok": True}
+
+    @app.get("/stored")
+    async def stored() -> Response:
+        body = gzip.compress(b"x" * 4096)
+        return Response(body, media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        return StreamingResponse(iter([b"line\n" * 300] * 4), media_type="text/plain")
+
+    @app.get("/events")
+    async def events() -> StreamingResponse:
+        return StreamingResponse(iter([b"data: x\n\n" * 300]), media_type="text/event-stream")
+
+    @app.get("/range")
+    async def partial() -> Response:
+        return Response(b"x" * 4096, status_code=206, media_type="text/plain")
+
+    return TestClient(app)
+
+
+class TestORJSONResponse:
+    def test_renders_types_json_dumps_rejects(self):
+        created = datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)
+        body = ORJSONResponse(
+            {"at": created, "score": np.float64(7.5), "count": np.int64(3), "cost": Decimal("1.5"), 1: {"a"}}
+        ).body
+        assert orjson.loads(body) == {
+            "at": "2026-01-02T03:04:05+00:00",
+            "score": 7.5,
+            "count": 3,
+            "cost": 1.5,
+            "1": ["a"],
+        }
+
+    def test_unknown_type_raises(self):
+        with pytest.raises(TypeError):
+            ORJSONResponse({"value": object()})
+
+
+class TestCompression:
+    def test_gzip_above_threshold(self, client):
+        response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert int(response.headers["content-length"]) < len(orjson.dumps(BIG)) // 3
+        assert response.json() == BIG
+
+    def test_small_and_unaccepted_pass_through(self, client):
+        assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+        response = client.get("/big", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+        assert response.json() == BIG
+
+    def test_existing_encoding_untouched(self, client):
+        response = client.get("/stored", headers={"Accept-Encoding": "gzip, br"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text == "x" * 4096
+
+    def test_streamed_body_compressed(self, client):
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.text == "line\n" * 1200
+
+    def test_event_stream_and_partial_content_untouched(self, client):
+        for path in ("/events", "/range"):
+            response = client.get(path, headers={"Accept-Encoding": "gzip"})
+            assert "content-encoding" not in response.headers
+            assert len(response.content) > 1024
+
+    def test_accept_encoding_qvalues(self):
+        assert _accepted("gzip;q=0.8, br, deflate;q=0") == {"gzip", "br"}
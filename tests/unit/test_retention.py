@@ -0,0 +1,133 @@
+"""Unit tests for chunked scan retention."""
+
+import os
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from sqlalchemy import func, select
+
+from app.models import Host, Scan
+from app.models.scan import ScanResult
+from app.services import retention as retention_module
+from app.services.retention import RetentionService
+from app.services.rules import RuleCatalog
+
+
+@pytest.fixture(autouse=True)
+def _policies(monkeypatch):
+    monkeypatch.setattr(retention_module.settings, "scan_retention_days", 30)
+    monkeypatch.setattr(retention_module.settings, "scan_retention_scanners", {})
+    monkeypatch.setattr(retention_module.settings, "scan_retention_hosts", {})
+    monkeypatch.setattr(retention_module.settings, "retention_batch_pause", 0)
+    monkeypatch.setattr(retention_module.settings, "scan_archive_enabled", False)
+
+
+async def _seed(session_factory, rows: list[tuple[str, str, int, str]]) -> None:
+    """rows: (host name, scanner, age in days, status); two findings per scan."""
+    now = datetime.now(UTC)
+    async with session_factory() as session:
+        hosts = {}
+        for name, scanner, age, status in rows:
+            if name not in hosts:
+                hosts[name] = Host(name=name)
+                session.add(hosts[name])
+                await session.flush()
+            scan = Scan(
+                host_id=hosts[name].id,
+                scanner=scanner,
+                profile="default",
+                status=status,
+                created_at=now - timedelta(days=age),
+            )
+            session.add(scan)
+            await session.flush()
+            await RuleCatalog(session).add_findings(
+                scan.id, scanner, [{"rule_id": f"r{i}", "title": "t", "severity": "low"} for i in range(2)]
+            )
+
+
+async def _remaining(session_factory) -> list[tuple[str, int]]:
+    async with session_factory() as session:
+        result = await session.execute(select(Scan.scanner, func.count()).group_by(Scan.scanner).order_by(Scan.scanner))
+        return [tuple(row) for row in result.all()]
+
+
+class TestRetention:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_default_policy_keeps_active_scans(self, session_factory):
+        await _seed(
+            session_factory,
+            [("a", "openscap", 40, "completed"), ("a", "openscap", 40, "running"), ("a", "openscap", 5, "completed")],
+        )
+        totals = await RetentionService(session_factory).run()
+        assert (totals["scans"], totals["results"]) == (1, 2)
+        assert await _remaining(session_factory) == [("openscap", 2)]
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_scanner_and_host_policies(self, session_factory, monkeypatch):
+        monkeypatch.setattr(retention_module.settings, "scan_retention_scanners", {"trivy": 7, "kube-bench": 0})
+        monkeypatch.setattr(retention_module.settings, "scan_retention_hosts", {"keep": 365})
+        await _seed(
+            session_factory,
+            [
+                ("a", "trivy", 10, "completed"),  # expired by the trivy policy
+                ("a", "kube-bench", 400, "completed"),  # kube-bench kept forever
+                ("a", "openscap", 20, "failed"),  # within the default 30 days
+                ("keep", "trivy", 100, "completed"),  # host policy wins over scanner
+                ("keep", "openscap", 400, "completed"),
+            ],
+        )
+        totals = await RetentionService(session_factory).run()
+        assert totals["scans"] == 2
+        assert await _remaining(session_factory) == [("kube-bench", 1), ("openscap", 1), ("trivy", 1)]
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_deletes_in_batches(self, session_factory, monkeypatch):
+        monkeypatch.setattr(retention_module.settings, "retention_batch_size", 3)
+        monkeypatch.setattr(retention_module.settings, "retention_results_batch", 4)
+        await _seed(session_factory, [("a", "openscap", 60, "completed")] * 8)
+
+        statements = []
+        original = RetentionService._delete_results
+
+        async def counting(self, session, scan_ids):
+            statements.append(len(scan_ids))
+            return await original(self, session, scan_ids)
+
+        monkeypatch.setattr(RetentionService, "_delete_results", counting)
+        totals = await RetentionService(session_factory).run()
+        assert (totals["scans"], totals["results"]) == (8, 16)
+        assert statements == [3, 3, 2]
+        async with session_factory() as session:
+            assert await session.scalar(select(func.count()).select_from(ScanResult)) == 0
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_failed_batch_keeps_all_findings(self, session_factory, monkeypatch):
+        monkeypatch.setattr(retention_module.settings, "retention_results_batch", 1)
+        await _seed(session_factory, [("a", "openscap", 60, "completed")] * 2)
+
+        async def crash(self, session, scan_ids):
+            raise RuntimeError("crashed mid-batch")
+
+        monkeypatch.setattr(RetentionService, "_release_reports", crash)
+        with pytest.raises(RuntimeError):
+            await RetentionService(session_factory).run()
+        async with session_factory() as session:
+            assert await session.scalar(select(func.count()).select_from(ScanResult)) == 4
+        assert await _remaining(session_factory) == [("openscap", 2)]
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_keep_forever(self, session_factory, monkeypatch):
+        monkeypatch.setattr(retention_module.settings, "scan_retention_days", 0)
+        await _seed(session_factory, [("a", "openscap", 400, "completed")])
+        assert (await RetentionService(session_factory).run())["scans"] == 0
+        assert await RetentionService(session_factory).ensure_partitions() == 0  # not PostgreSQL
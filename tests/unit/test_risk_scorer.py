@@ -0,0 +1,102 @@
+"""Unit tests for the columnar fleet risk scorer."""
+
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+from app.services.risk_scorer import RiskScorer, expand_factor_counts, score_fleet
+
+HOSTS = [
+    {
+        "id": 1,
+        "name": "web-1",
+        "container_image": "nginx:latest",
+        "security_context": {
+            "privileged": True,
+            "host_network": True,
+            "cap_add": ["SYS_ADMIN", "NET_RAW", "CHOWN"],
+            "mounts": [{"source": "/var/run/docker.sock"}, {"source": "/data"}, "/etc"],
+            "user": "root",
+        },
+    },
+    {
+        "id": 2,
+        "name": "api-1",
+        "container_image": "gcr.io/distroless/python3:3.11",
+        "security_context": {
+            "cap_drop": ["ALL"],
+            "user": "1000",
+            "allow_privilege_escalation": False,
+            "read_only_rootfs": True,
+        },
+    },
+    {
+        "id": 3,
+        "name": "pod/app",
+        "container_image": "",
+        "security_context": {
+            "cap_drop": ["ALL"],
+            "run_as_user": 0,
+            "container.app.privileged": True,
+            "container.app.capabilities_add": ["NET_ADMIN", "SYS_PTRACE"],
+            "container.app.capabilities_drop": ["NET_RAW"],
+            "container.side.privileged": True,
+            "container.app.allow_privilege_escalation": False,
+        },
+    },
+    {"id": 4, "name": "bare", "container_image": "ubuntu", "security_context": {}},
+]
+
+
+class TestScoreFleet:
+    """The fleet path must agree with per-host scoring."""
+
+    def test_parity_with_score_host(self):
+        fleet = score_fleet(HOSTS)
+        expected = {h["name"]: RiskScorer().score_host(h).to_dict() for h in HOSTS}
+
+        for row in fleet.rows():
+            ref = expected[row["target"]]
+            assert row["risk_score"] == ref["risk_score"]
+            assert row["risk_level"] == ref["risk_level"]
+            assert row["max_severity"] == ref["max_severity"]
+            assert row["factor_count"] == ref["factor_count"]
+            ref_counts: dict[str, int] = {}
+            for f in ref["factors"]:
+                ref_counts[f["factor_id"]] = ref_counts.get(f["factor_id"], 0) + 1
+            assert row["factor_counts"] == ref_counts
+
+    def test_summary_matches_score_hosts(self):
+        ref = RiskScorer().score_hosts(HOSTS)
+        summary = score_fleet(HOSTS).summary()
+        for key in ("hosts_scored", "total_risk", "average_risk", "by_level"):
+            assert summary[key] == ref[key]
+
+    def test_rows_sorted_by_risk(self):
+        rows = score_fleet(HOSTS).rows()
+        scores = [r["risk_score"] for r in rows]
+        assert scores == sorted(scores, reverse=True)
+        assert [r["target"] for r in rows] == [r["target"] for r in RiskScorer().score_hosts(HOSTS)["all_scores"]]
+
+    def test_host_ids_carried_through(self):
+        rows = score_fleet(HOSTS).rows()
+        assert {r["target"]: r["host_id"] for r in rows} == {h["name"]: h["id"] for h in HOSTS}
+
+    def test_empty_fleet(self):
+        fleet = score_fleet([])
+        assert fleet.rows() == []
+        assert fleet.summary() == {
+            "hosts_scored": 0,
+            "total_risk": 0,
+            "average_risk": 0,
+            "by_level": {"critical": 0, "high": 0, "medium": 0, "low": 0},
+        }
+
+
+class TestExpandFactorCounts:
+    def test_sorted_by_weight_and_unknown_dropped(self):
+        factors = expand_factor_counts({"writable_rootfs": 1, "privileged": 2, "bogus": 1})
+        assert [f["factor_id"] for f in factors] == ["privileged", "writable_rootfs"]
+        assert factors[0]["count"] == 2
@@ -0,0 +1,127 @@
+"""Unit tests for the normalized rule catalog."""
+
+import os
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from sqlalchemy import func, select
+
+from app.api.dashboard import _get_severity_breakdown, _get_top_failing_rules
+from app.models import Host, Rule, Scan
+from app.models.scan import ScanResult
+from app.schemas import ScanResultResponse
+from app.services.rules import RuleCatalog
+from app.services.scan import ScanService
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def session(db_session):
+    db_session.add(Host(name="web"))
+    await db_session.flush()
+    return db_session
+
+
+async def _scan(session, scanner: str = "trivy") -> Scan:
+    scan = Scan(host_id=1, scanner=scanner, status="completed")
+    session.add(scan)
+    await session.flush()
+    return scan
+
+
+class TestRuleCatalog:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_rules_stored_once(self, session):
+        catalog = RuleCatalog(session)
+        findings = [
+            {"rule_id": "CVE-1", "title": "openssl 1.0 - overflow", "severity": "high", "category": "vulnerability"},
+            {"rule_id": "CVE-1", "title": "openssl 1.1 - overflow", "severity": "high", "category": "vulnerability"},
+            {"rule_id": "CVE-2", "title": "zlib - leak", "severity": "low"},
+        ]
+        for _ in range(3):
+            assert await catalog.add_findings((await _scan(session)).id, "trivy", findings) == 3
+        await catalog.add_findings((await _scan(session, "lynis")).id, "lynis", [{"rule_id": "CVE-1", "title": "x"}])
+
+        assert await session.scalar(select(func.count()).select_from(Rule)) == 3  # scanner is part of the key
+        assert await session.scalar(select(func.count()).select_from(ScanResult)) == 10
+        details = (await session.execute(select(ScanResult.detail).where(ScanResult.detail.is_not(None)))).scalars()
+        assert set(details) == {"openssl 1.1 - overflow"}
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_api_view_unchanged(self, session):
+        scan = await _scan(session)
+        await RuleCatalog(session).add_findings(
+            scan.id,
+            "trivy",
+            [
+                {"rule_id": "CVE-1", "title": "a - overflow", "severity": "high", "category": "vulnerability"},
+                {"rule_id": "CVE-1", "title": "b - overflow", "status": "pass"},
+                {"title": "no id"},
+            ],
+        )
+        session.expunge_all()
+
+        loaded = await ScanService(session).get_scan_by_id(scan.id, include_results=True)
+        results = [ScanResultResponse.model_validate(r).model_dump() for r in loaded.results]
+        assert [(r["rule_id"], r["title"], r["severity"], r["status"]) for r in results] == [
+            ("CVE-1", "a - overflow", "high", "fail"),
+            ("CVE-1", "b - overflow", "medium", "pass"),
+            ("UNKNOWN", "no id", "medium", "fail"),
+        ]
+        assert results[0]["category"] == "vulnerability" and results[0]["references"] == []
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_severity_kept_per_finding(self, session):
+        catalog = RuleCatalog(session)
+        # Lynis ids are positional: the same id names different suggestions
+        first, second = await _scan(session, "lynis"), await _scan(session, "lynis")
+        await catalog.add_findings(
+            first.id,
+            "lynis",
+            [{"rule_id": "LYNIS-SUGG-0001", "title": "Set a root password", "severity": "high", "category": "auth"}],
+        )
+        await catalog.add_findings(
+            second.id,
+            "lynis",
+            [{"rule_id": "LYNIS-SUGG-0001", "title": "Add a legal banner", "severity": "low", "category": "hardening"}],
+        )
+        session.expunge_all()
+
+        loaded = await ScanService(session).get_scan_by_id(second.id, include_results=True)
+        assert [(r.title, r.severity, r.category) for r in loaded.results] == [
+            ("Add a legal banner", "low", "hardening")
+        ]
+
+
+class TestDashboardAggregates:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_top_failing_rules_and_severity(self, session):
+        catalog = RuleCatalog(session)
+        for i in range(3):
+            findings = [{"rule_id": "CVE-1", "title": f"pkg{i} - overflow", "severity": "critical"}]
+            if i:
+                findings.append({"rule_id": "CVE-2", "title": "zlib", "severity": "low"})
+            findings.append({"rule_id": "CVE-3", "title": "ok", "severity": "low", "status": "pass"})
+            await catalog.add_findings((await _scan(session)).id, "trivy", findings)
+
+        since = datetime.now(UTC) - timedelta(days=1)
+        top = await _get_top_failing_rules(session, since)
+        assert [(r["rule_id"], r["title"], r["count"]) for r in top[:1]] == [("CVE-2", "zlib", 2)]
+        # Per-package titles of one CVE stay separate rows, as before the catalog
+        assert sorted((r["rule_id"], r["title"], r["count"]) for r in top[1:]) == [
+            ("CVE-1", f"pkg{i} - overflow", 1) for i in range(3)
+        ]
+        assert {r["severity"] for r in top[1:]} == {"critical"} and top[0]["scanner"] == "trivy"
+
+        by_severity, by_status = await _get_severity_breakdown(session, since)
+        assert (by_severity["critical"], by_severity["low"]) == (3, 5)
+        assert (by_status["fail"], by_status["pass"]) == (5, 3)
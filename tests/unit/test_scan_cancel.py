@@ -0,0 +1,144 @@
+"""Unit tests for scan timeouts and cancellation."""
+
+import asyncio
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from app.services import scan as scan_module
+from app.services.scan_stream import ScanCancelled, ScanCancelToken, exec_stream
+
+
+class BlockingStream:
+    """Exec output stream that yields one chunk, then blocks until closed."""
+
+    def __init__(self):
+        self.closed = threading.Event()
+
+    def __iter__(self):
+        yield b"started\n", None
+        self.closed.wait(timeout=5)
+        raise OSError("socket closed")
+
+    def close(self):
+        self.closed.set()
+
+
+class FakeApi:
+    def __init__(self, stream):
+        self.stream = stream
+        self.created_cmd = None
+
+    def exec_create(self, container_id, cmd, **kwargs):
+        self.created_cmd = cmd
+        return {"Id": "exec-1"}
+
+    def exec_start(self, exec_id, stream=False, demux=False):
+        return self.stream
+
+    def exec_inspect(self, exec_id):
+        return {"ExitCode": 0}
+
+
+class FakeContainer:
+    id = "c1"
+    name = "web"
+
+    def __init__(self, api):
+        self.client = type("Client", (), {"api": api})()
+        self.exec_runs: list = []
+
+    def exec_run(self, cmd, detach=False, **kwargs):
+        self.exec_runs.append(cmd)
+
+
+class TestCancelToken:
+    def test_first_reason_wins(self):
+        token = ScanCancelToken()
+        token.request("timeout")
+        token.request("cancelled")
+        assert token.reason == "timeout"
+        with pytest.raises(ScanCancelled):
+            token.check()
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_kill_unblocks_streaming_thread(self):
+        stream = BlockingStream()
+        api = FakeApi(stream)
+        container = FakeContainer(api)
+        token = ScanCancelToken()
+        lines: list[str] = []
+
+        worker = asyncio.ensure_future(asyncio.to_thread(exec_stream, container, ["lynis"], lines.append, token))
+        while not lines:
+            await asyncio.sleep(0.01)
+
+        token.request("cancelled")
+        await asyncio.to_thread(token.kill_execs)
+
+        with pytest.raises(ScanCancelled):
+            await asyncio.wait_for(worker, timeout=1)
+        # Command ran under the PID-recording wrapper and was killed through it
+        assert api.created_cmd[:2] == ["sh", "-c"]
+        assert api.created_cmd[-1] == "lynis"
+        pidfile = api.created_cmd[2].split("> ")[1].split(";")[0]
+        assert any(pidfile in cmd[2] and "kill -TERM" in cmd[2] for cmd in container.exec_runs)
+
+
+class TestAwaitScanner:
+    @pytest.fixture(autouse=True)
+    def _no_db_poll(self, monkeypatch):
+        async def not_cancelled(scan_id):
+            return False
+
+        monkeypatch.setattr(scan_module, "_cancel_requested", not_cancelled)
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_returns_result(self):
+        async def runner():
+            return {"success": True}
+
+        result = await scan_module._await_scanner(1, runner(), ScanCancelToken(), timeout=1)
+        assert result == {"success": True}
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_timeout_releases_immediately(self):
+        token = ScanCancelToken()
+        with pytest.raises(ScanCancelled) as exc:
+            await asyncio.wait_for(scan_module._await_scanner(1, asyncio.sleep(30), token, timeout=0.05), timeout=1)
+        assert exc.value.reason == "timeout"
+        assert token.cancelled
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_cancel_request(self):
+        token = ScanCancelToken()
+        asyncio.get_running_loop().call_later(0.02, token.request, "cancelled")
+        with pytest.raises(ScanCancelled) as exc:
+            await asyncio.wait_for(scan_module._await_scanner(1, asyncio.sleep(30), token, timeout=30), timeout=1)
+        assert exc.value.reason == "cancelled"
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_cancel_from_other_worker(self, monkeypatch):
+        async def cancelled(scan_id):
+            return True
+
+        monkeypatch.setattr(scan_module, "_cancel_requested", cancelled)
+        monkeypatch.setattr(scan_module, "CANCEL_POLL_SECONDS", 0.01)
+        with pytest.raises(ScanCancelled) as exc:
+            await scan_module._await_scanner(1, asyncio.sleep(30), ScanCancelToken(), timeout=30)
+        assert exc.value.reason == "cancelled"
+
+
+def test_scan_timeout_override(monkeypatch):
+    monkeypatch.setattr(scan_module.settings, "scan_timeouts", {"openscap": 1800})
+    assert scan_module.scan_timeout_for("openscap") == 1800
+    assert scan_module.scan_timeout_for("lynis") == scan_module.settings.scan_timeout
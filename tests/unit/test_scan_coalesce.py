@@ -0,0 +1,146 @@
+"""Unit tests for scan request coalescing."""
+
+import os
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from app.models import Host, Scan
+from app.schemas import ScanCreate
+from app.services import scan as scan_module
+from app.services.scan import ScanService
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def session(db_session):
+    db_session.add(Host(id=1, name="web"))
+    await db_session.flush()
+    return db_session
+
+
+@pytest.fixture(autouse=True)
+def _no_background_scans(monkeypatch):
+    started: list[int] = []
+
+    async def fake_execute(self, scan_id):
+        started.append(scan_id)
+
+    monkeypatch.setattr(ScanService, "_execute_scan", fake_execute)
+    monkeypatch.setattr(scan_module.settings, "scan_coalesce_enabled", True)
+    monkeypatch.setattr(scan_module.settings, "scan_reuse_window", 0)
+    return started
+
+
+class TestCreateScan:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_duplicate_attaches_to_active_scan(self, session):
+        service = ScanService(session)
+        first, mode = await service.get_or_create_scan(ScanCreate(host_id=1, scanner="lynis"))
+        assert mode is None
+
+        again, mode = await service.get_or_create_scan(ScanCreate(host_id=1, scanner="lynis"))
+        assert (again.id, mode) == (first.id, "attached")
+
+        other, mode = await service.get_or_create_scan(ScanCreate(host_id=1, scanner="lynis", profile="cis"))
+        assert mode is None
+        assert other.id != first.id
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_reuse_window(self, session, monkeypatch):
+        service = ScanService(session)
+        session.add(
+            Scan(
+                host_id=1,
+                scanner="lynis",
+                status="completed",
+                score=70,
+                completed_at=datetime.now(UTC) - timedelta(seconds=30),
+            )
+        )
+        await session.flush()
+
+        assert await service.find_equivalent_scan(1, "lynis", None) == (None, None)
+
+        monkeypatch.setattr(scan_module.settings, "scan_reuse_window", 3600)
+        reused, mode = await service.get_or_create_scan(ScanCreate(host_id=1, scanner="lynis"))
+        assert mode == "reused"
+        assert reused.score == 70
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_disabled(self, session, monkeypatch):
+        monkeypatch.setattr(scan_module.settings, "scan_coalesce_enabled", False)
+        service = ScanService(session)
+        first = await service.create_scan(ScanCreate(host_id=1, scanner="lynis"))
+        second = await service.create_scan(ScanCreate(host_id=1, scanner="lynis"))
+        assert first.id != second.id
+
+
+class TestStartScan:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_second_start_links_and_inherits_outcome(self, session, _no_background_scans):
+        service = ScanService(session)
+        parent = Scan(host_id=1, scanner="lynis", status="pending")
+        child = Scan(host_id=1, scanner="lynis", status="pending")
+        session.add_all([parent, child])
+        await session.flush()
+
+        await service.start_scan(parent.id)
+        linked = await service.start_scan(child.id)
+        await scan_module.asyncio.sleep(0)
+
+        assert _no_background_scans == [parent.id]
+        assert linked.status == "running"
+        assert linked.coalesced_into_id == parent.id
+
+        parent.status = "completed"
+        parent.score = 81
+        parent.completed_at = datetime.now(UTC)
+        await scan_module._resolve_linked_scans(session, parent)
+        await session.refresh(child)
+        assert (child.status, child.score) == ("completed", 81)
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_cancelling_pending_parent_releases_linked(self, session):
+        service = ScanService(session)
+        parent = Scan(host_id=1, scanner="lynis", status="pending")
+        session.add(parent)
+        await session.flush()
+        child = Scan(host_id=1, scanner="lynis", status="running", coalesced_into_id=parent.id)
+        session.add(child)
+        await session.flush()
+
+        await service.cancel_scan(parent.id)
+        await session.refresh(child)
+        assert child.status == "cancelled"
+
+
+class TestOrphanedScans:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_stuck_scan_neither_absorbs_requests_nor_stays_running(self, session):
+        service = ScanService(session)
+        stuck = Scan(host_id=1, scanner="lynis", status="running", started_at=datetime.now(UTC) - timedelta(days=3))
+        session.add(stuck)
+        await session.flush()
+        linked = Scan(host_id=1, scanner="lynis", status="running", coalesced_into_id=stuck.id)
+        session.add(linked)
+        await session.flush()
+
+        assert await service.find_equivalent_scan(1, "lynis", None) == (None, None)
+        fresh, mode = await service.get_or_create_scan(ScanCreate(host_id=1, scanner="lynis"))
+        assert mode is None
+        assert fresh.id != stuck.id
+
+        assert await service.fail_orphaned_scans() == 1
+        await session.refresh(stuck)
+        await session.refresh(linked)
+        await session.refresh(fresh)
+        assert (stuck.status, linked.status, fresh.status) == ("failed", "failed", "pending")
@@ -0,0 +1,93 @@
+"""Unit tests for precomputed scan-to-scan finding diffs."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from app.models import Host, Scan
+from app.services.diff import ScanDiffService, diff_findings
+from app.services.rules import RuleCatalog
+
+
+@pytest_asyncio.fixture(loop_scope="function")
+async def session(db_session):
+    db_session.add(Host(name="web"))
+    await db_session.flush()
+    return db_session
+
+
+async def _completed(session, failing: list[str], profile: str | None = None, passing: list[str] = ()) -> Scan:
+    scan = Scan(host_id=1, scanner="lynis", profile=profile, status="completed")
+    session.add(scan)
+    await session.flush()
+    findings = [{"rule_id": r, "title": f"rule {r}"} for r in failing]
+    findings += [{"rule_id": r, "title": f"rule {r}", "status": "pass"} for r in passing]
+    await RuleCatalog(session).add_findings(scan.id, "lynis", findings)
+    await ScanDiffService(session).compute(scan)
+    return scan
+
+
+def test_diff_findings():
+    new, resolved, persisting = diff_findings([(1, None), (2, None), (2, "pkg b")], [(1, None), (3, None)])
+    assert new == {(2, None): 1, (2, "pkg b"): 1}
+    assert resolved == {(3, None): 1}
+    assert persisting == {(1, None): 1}
+
+
+def test_diff_findings_counts_repeated_keys():
+    new, resolved, persisting = diff_findings([(1, None)] * 8 + [(2, None)] * 3, [(1, None)] * 10 + [(2, None)])
+    assert (new.total(), resolved.total(), persisting.total()) == (2, 2, 9)
+    assert new == {(2, None): 2}
+    assert resolved == {(1, None): 2}
+
+
+class TestScanDiff:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_consecutive_scans(self, session):
+        first = await _completed(session, ["A", "B"], passing=["C"])
+        assert (first.previous_scan_id, first.findings_new, first.findings_resolved) == (None, 2, 0)
+
+        second = await _completed(session, ["B", "C", "D"], passing=["A"])
+        assert second.previous_scan_id == first.id
+        assert (second.findings_new, second.findings_resolved, second.findings_persisting) == (2, 1, 1)
+
+        changes = await ScanDiffService(session).get_changes(second, include_persisting=True)
+        assert sorted(c.rule_id for c in changes["new"]) == ["C", "D"]
+        assert [c.rule_id for c in changes["resolved"]] == ["A"]
+        assert [c.rule_id for c in changes["persisting"]] == ["B"]
+        assert changes["resolved"][0].title == "rule A"
+
+        first_changes = await ScanDiffService(session).get_changes(first)
+        assert sorted(c.rule_id for c in first_changes["new"]) == ["A", "B"]
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_profiles_and_coalesced_scans_are_separate(self, session):
+        baseline = await _completed(session, ["A"])
+        await _completed(session, ["A", "B"], profile="strict")
+        session.add(Scan(host_id=1, scanner="lynis", status="completed", coalesced_into_id=baseline.id))
+        await session.flush()
+
+        latest = await _completed(session, ["A"])
+        assert latest.previous_scan_id == baseline.id
+        assert (latest.findings_new, latest.findings_resolved, latest.findings_persisting) == (0, 0, 1)
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_repeated_findings_rows_match_counts(self, session):
+        await _completed(session, ["K8S-POD-001"] * 10 + ["A"])
+        second = await _completed(session, ["K8S-POD-001"] * 8 + ["A", "A"])
+        assert (second.findings_new, second.findings_resolved, second.findings_persisting) == (1, 2, 9)
+
+        changes = await ScanDiffService(session).get_changes(second, include_persisting=True)
+        assert [c.rule_id for c in changes["new"]] == ["A"]
+        assert [c.rule_id for c in changes["resolved"]] == ["K8S-POD-001"] * 2
+        assert len(changes["persisting"]) == second.findings_persisting
+        assert sorted(c.rule_id for c in changes["persisting"]) == ["A"] + ["K8S-POD-001"] * 8
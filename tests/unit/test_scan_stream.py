@@ -0,0 +1,156 @@
+"""Unit tests for streaming scanner output."""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from app.services.scan import ScanService
+from app.services.scan_stream import (
+    LynisStreamParser,
+    OscapStreamParser,
+    ScanStreamSink,
+    ScanTailRegistry,
+    exec_stream,
+    format_sse,
+)
+
+LYNIS_OUTPUT = """\
+[+] Boot and services
+  - Service Manager                                           [ systemd ]
+  ! Reboot of system is most likely needed [KRNL-5830]
+[+] Kernel
+  Test [WARNING] - Found some weak kernel setting
+Suggestions (2):
+  - Consider hardening SSH configuration [SSH-7408]
+  - Install a PAM module for password strength testing [AUTH-9262]
+
+  Hardening index : 67 [#############       ]
+"""
+
+
+class FakeApi:
+    def __init__(self, chunks: list[bytes], exit_code: int = 0):
+        self.chunks = chunks
+        self.exit_code = exit_code
+
+    def exec_create(self, container_id, cmd, **kwargs):
+        return {"Id": "exec-1"}
+
+    def exec_start(self, exec_id, stream=False, demux=False):
+        for chunk in self.chunks:
+            yield chunk, None
+
+    def exec_inspect(self, exec_id):
+        return {"ExitCode": self.exit_code}
+
+
+class FakeContainer:
+    id = "c1"
+
+    def __init__(self, api: FakeApi):
+        self.client = type("Client", (), {"api": api})()
+
+
+class TestLynisStreamParser:
+    def test_matches_whole_output_parse(self):
+        parser = LynisStreamParser()
+        for line in LYNIS_OUTPUT.splitlines():
+            parser.feed(line)
+
+        assert parser.result() == ScanService._parse_lynis_output(LYNIS_OUTPUT)
+        score, warnings, suggestions, findings = parser.result()
+        assert score == 67
+        assert warnings == 3
+        assert suggestions == 2
+        assert {f["rule_id"] for f in findings} >= {"LYNIS-WARN-0001", "LYNIS-SUGG-0001"}
+
+    def test_trailing_number_fallback(self):
+        assert ScanService._parse_lynis_output("Hardening\n\n  55  \n")[0] == 55
+        assert ScanService._parse_lynis_output("55\nnothing here")[0] == 0
+
+    def test_progress(self):
+        parser = LynisStreamParser()
+        for line in LYNIS_OUTPUT.splitlines():
+            parser.feed(line)
+        progress = parser.progress()
+        assert progress["sections_done"] == 2
+        assert progress["section"] == "Kernel"
+        assert 0 < progress["percent"] < 100
+
+
+class TestOscapStreamParser:
+    def test_counts_results(self):
+        parser = OscapStreamParser()
+        for line in ["Title  Ensure x", "Result pass", "Result fail", "Result notapplicable", "Rule r"]:
+            parser.feed(line)
+        assert (parser.rules_done, parser.passed, parser.failed, parser.not_applicable) == (3, 1, 1, 1)
+
+
+class TestExecStream:
+    def test_reassembles_lines_across_chunks(self):
+        # "é" split across two chunks and a final line without newline
+        api = FakeApi([b"first li", b"ne\nsecond \xc3", b"\xa9\r\nlast"], exit_code=3)
+        lines: list[str] = []
+
+        exit_code = exec_stream(FakeContainer(api), ["true"], lines.append)
+
+        assert lines == ["first line", "second é", "last"]
+        assert exit_code == 3
+
+
+class TestScanTails:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_backlog_live_and_done(self):
+        tails = ScanTailRegistry()
+        tails.open(1)
+        tails.push_line(1, "early")
+
+        backlog, progress, queue = tails.subscribe(1)
+        tails.push_progress(1, {"percent": 10})
+        tails.push_line(1, "late")
+        tails.close(1, "completed")
+
+        assert backlog == ["early"]
+        assert progress is None
+        events = [queue.get_nowait() for _ in range(3)]
+        assert events == [
+            ("progress", {"percent": 10}),
+            ("line", {"line": "late"}),
+            ("done", {"scan_id": 1, "status": "completed"}),
+        ]
+        assert tails.subscribe(1) is None
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_sink_throttles_progress(self, monkeypatch):
+        published: list[dict] = []
+
+        async def fake_publish(self, message):
+            published.append(message)
+
+        monkeypatch.setattr(ScanStreamSink, "_publish", fake_publish)
+        sink = ScanStreamSink(5, asyncio.get_running_loop(), {"scanner": "lynis"})
+
+        def run():
+            for i in range(50):
+                sink.progress({"percent": i})
+            sink.progress({"percent": 100}, force=True)
+
+        await asyncio.to_thread(run)
+        await asyncio.sleep(0.01)
+
+        assert [m["percent"] for m in published] == [0, 100]
+        assert published[0]["type"] == "scan_progress"
+        assert published[0]["scanner"] == "lynis"
+
+
+def test_format_sse():
+    assert format_sse("line", {"line": "x"}) == 'event: line\ndata: {"line": "x"}\n\n'
@@ -0,0 +1,136 @@
+"""Unit tests for cron-grouped, jittered scheduled scans."""
+
+import os
+import sys
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.cron import CronTrigger
+
+from app.models import ScanSchedule
+from app.services import scheduler as scheduler_module
+from app.services.scheduler import SchedulerService, cron_group_key, schedule_jitter
+
+
+def _service() -> SchedulerService:
+    # Bypass the singleton so each test gets its own (unstarted) scheduler
+    service = object.__new__(SchedulerService)
+    service._scheduler = AsyncIOScheduler(timezone="UTC")
+    SchedulerService.__init__(service)
+    return service
+
+
+def _schedule(schedule_id: int, cron: str = "0 2 * * *") -> ScanSchedule:
+    return ScanSchedule(id=schedule_id, name=f"s{schedule_id}", cron_expression=cron, timezone="UTC", is_active=True)
+
+
+class TestCronGroups:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_shared_cron_uses_one_job(self):
+        service = _service()
+        service.scheduler.start()
+        for i in range(1, 4):
+            service.add_schedule(_schedule(i))
+        service.add_schedule(_schedule(4, "0  2 * * *"))  # same cron, different spacing
+        assert len(service.scheduler.get_jobs()) == 1
+        assert "(4)" in service.scheduler.get_jobs()[0].name
+
+        service.update_schedule(_schedule(2, "30 3 * * *"))
+        assert len(service.scheduler.get_jobs()) == 2
+
+        service.remove_schedule(2)
+        assert len(service.scheduler.get_jobs()) == 1
+        for i in (1, 3, 4):
+            service.remove_schedule(i)
+        assert service.scheduler.get_jobs() == []
+        service.scheduler.shutdown(wait=False)
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_invalid_cron_is_ignored(self):
+        service = _service()
+        service.scheduler.start()
+        service.add_schedule(_schedule(1, "not a cron"))
+        assert service.scheduler.get_jobs() == []
+        service.scheduler.shutdown(wait=False)
+
+    def test_standby_replica_registers_nothing(self):
+        # Followers leave schedule changes to the leader's periodic sync
+        service = _service()
+        service.add_schedule(_schedule(1))
+        assert service.scheduler.get_jobs() == []
+
+    def test_group_key_ignores_spacing(self):
+        assert cron_group_key("0 2 * * *", "UTC") == cron_group_key(" 0 2  * * * ", "UTC")
+        assert cron_group_key("0 2 * * *", "UTC") != cron_group_key("0 2 * * *", "Europe/Berlin")
+
+
+class TestJitter:
+    def test_deterministic_and_spread(self):
+        offsets = [schedule_jitter(i, 300) for i in range(1000)]
+        assert offsets == [schedule_jitter(i, 300) for i in range(1000)]
+        assert all(0 <= o < 300 for o in offsets)
+        buckets = [0] * 10
+        for o in offsets:
+            buckets[int(o // 30)] += 1
+        assert min(buckets) > 50
+        assert schedule_jitter(7, 0) == 0.0
+
+    def test_window_capped_by_period(self, monkeypatch):
+        monkeypatch.setattr(scheduler_module.settings, "scheduler_jitter_window", 300)
+        assert scheduler_module._jitter_window(CronTrigger.from_crontab("* * * * *", timezone="UTC")) == 30
+        assert scheduler_module._jitter_window(CronTrigger.from_crontab("0 2 * * *", timezone="UTC")) == 300
+
+
+class TestAdmission:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_batches_follow_capacity(self, monkeypatch):
+        service = _service()
+        batches: list[list[int]] = []
+        slots = iter([0, 2, 2, 2])
+
+        async def admission_slots():
+            return next(slots)
+
+        async def start(batch, next_run_at):
+            batches.append([sid for _, sid in batch])
+
+        monkeypatch.setattr(scheduler_module.settings, "scheduler_admission_poll", 0.001)
+        monkeypatch.setattr(service, "_admission_slots", admission_slots)
+        monkeypatch.setattr(service, "_start_scheduled_scans", start)
+
+        due = datetime.now(UTC) - timedelta(seconds=1)
+        plan = [(due, sid) for sid in (1, 2, 3, 4, 5)]
+        service._waiting.update(range(1, 6))
+        await service._run_group_plan(plan, None)
+
+        assert batches == [[1, 2], [3, 4], [5]]
+        assert service._waiting == set()
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_waiting_schedules_not_queued_twice(self, monkeypatch):
+        service = _service()
+        service.scheduler.start()
+        service.add_schedule(_schedule(1))
+        service.add_schedule(_schedule(2))
+        service._waiting.add(1)
+        plans = []
+
+        async def run(plan, next_run_at):
+            plans.append(plan)
+
+        monkeypatch.setattr(service, "_run_group_plan", run)
+        await service._execute_schedule_group(cron_group_key("0 2 * * *", "UTC"))
+        for task in list(service._tasks):
+            await task
+
+        assert [sid for _, sid in plans[0]] == [2]
+        service.scheduler.shutdown(wait=False)
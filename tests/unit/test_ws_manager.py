@@ -0,0 +1,150 @@
+"""Unit tests for WebSocket fan-out."""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+BACKEND_ROOT = Path(__file__).parent.parent.parent / "dashboard" / "backend"
+sys.path.insert(0, str(BACKEND_ROOT))
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test_auth.db")
+os.environ.setdefault("SECRET_KEY", "test-secret-key-for-unit-tests-only")
+
+from app.services.ws_manager import ClientConnection, ConnectionManager, Subscription
+
+
+class FakeWebSocket:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent: list[str] = []
+        self.closed = False
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000):
+        self.closed = True
+
+
+def _event(**kwargs) -> dict:
+    return {"type": "scan_completed", "scan_id": 1, "scanner": "lynis", "host_id": 7, "host_name": "web", **kwargs}
+
+
+class TestSubscription:
+    def test_default_matches_everything(self):
+        assert Subscription().matches(_event())
+
+    def test_filters(self):
+        sub = Subscription.from_message({"types": ["scan_failed"], "scanners": ["lynis"]})
+        assert not sub.matches(_event())
+        assert sub.matches(_event(type="scan_failed"))
+        assert not sub.matches(_event(type="scan_failed", scanner="trivy"))
+
+    def test_hosts_match_id_or_name(self):
+        assert Subscription.from_message({"hosts": [7]}).matches(_event())
+        assert Subscription.from_message({"hosts": ["web"]}).matches(_event())
+        assert not Subscription.from_message({"hosts": ["db"]}).matches(_event())
+
+    def test_clusters_and_empty_lists(self):
+        sub = Subscription.from_message({"clusters": [3], "types": []})
+        assert sub.types is None
+        assert sub.matches(_event(cluster_id=3))
+        assert not sub.matches(_event(cluster_id=None))
+
+    def test_invalid_filters_rejected(self):
+        for bad in ({"types": [1, "a"]}, {"scanners": [["lynis"]]}, {"hosts": [{"id": 7}]}, {"clusters": ["x"]}):
+            with pytest.raises(ValueError):
+                Subscription.from_message(bad)
+        with pytest.raises(ValueError, match="clusters"):
+            Subscription.from_message({"clusters": [True]})
+
+    def test_values_coerced_and_listed(self):
+        sub = Subscription.from_message({"clusters": ["3", 1], "hosts": [7, "web"]})
+        assert sub.clusters == {1, 3}
+        assert sub.to_dict()["clusters"] == [1, 3]
+        assert sub.to_dict()["hosts"] == [7, "web"]
+
+
+class TestClientQueue:
+    def test_drop_oldest_when_full(self):
+        conn = ClientConnection(FakeWebSocket(), max_size=2)
+        for i in range(3):
+            conn.enqueue(str(i))
+        assert [e[1] for e in conn._pending] == ["1", "2"]
+        conn.discard_pending()
+
+    def test_coalesce_replaces_pending(self):
+        conn = ClientConnection(FakeWebSocket(), max_size=10)
+        conn.enqueue("p1", key=("scan_progress", 1))
+        conn.enqueue("done")
+        conn.enqueue("p2", key=("scan_progress", 1))
+        assert [e[1] for e in conn._pending] == ["p2", "done"]
+        conn.discard_pending()
+
+
+class TestConnectionManager:
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_slow_client_does_not_block_others(self):
+        manager = ConnectionManager()
+        fast, slow = FakeWebSocket(), FakeWebSocket(delay=0.5)
+        await manager.connect(fast)
+        await manager.connect(slow)
+
+        await asyncio.wait_for(manager.broadcast(_event()), timeout=0.1)
+        await asyncio.sleep(0.05)
+
+        assert len(fast.sent) == 1
+        assert slow.sent == []
+        manager.disconnect(fast)
+        manager.disconnect(slow)
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_payload_serialized_once_and_filtered(self):
+        manager = ConnectionManager()
+        a, b, c = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        for ws in (a, b, c):
+            await manager.connect(ws)
+        manager.subscribe(c, {"scanners": ["trivy"]})
+
+        await manager.broadcast(_event())
+        await asyncio.sleep(0.01)
+
+        assert a.sent[0] is b.sent[0]
+        assert json.loads(a.sent[0])["host_name"] == "web"
+        assert c.sent == []
+        for ws in (a, b, c):
+            manager.disconnect(ws)
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_invalid_subscribe_keeps_filters(self):
+        manager = ConnectionManager()
+        ws = FakeWebSocket()
+        await manager.connect(ws)
+        manager.subscribe(ws, {"scanners": ["trivy"]})
+        with pytest.raises(ValueError):
+            manager.subscribe(ws, {"types": [1, "a"]})
+        assert manager.active_connections[ws].subscription.scanners == {"trivy"}
+        manager.disconnect(ws)
+
+    @pytest.mark.asyncio(loop_scope="function")
+    async def test_failed_send_disconnects(self):
+        class BrokenWebSocket(FakeWebSocket):
+            async def send_text(self, text):
+                raise RuntimeError("closed")
+
+        manager = ConnectionManager()
+        ws = BrokenWebSocket()
+        await manager.connect(ws)
+        await manager.broadcast(_event())
+        await asyncio.sleep(0.01)
+
+        assert ws not in manager.active_connections